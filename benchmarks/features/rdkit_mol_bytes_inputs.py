@@ -0,0 +1,96 @@
+"""Benchmarks rdkit featurisation of a bytes-typed molecule column.
+
+Compares parsing bytes inputs through a SMILES round-trip (the default of
+rdkit fingerprints) against deserialising them directly with ``to_rdkit_mol``
+(with ``parse_via_smiles=False``), both for the parsing step alone and
+end-to-end through ``molflux.datasets.featurise_dataset``.
+
+Usage:
+
+    $ python benchmarks/features/rdkit_mol_bytes_inputs.py --num-samples 20000
+"""
+
+import argparse
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from rdkit import Chem, RDLogger
+
+import datasets
+from molflux.datasets import featurise_dataset
+from molflux.features import load_from_dicts
+from molflux.features.representations.rdkit._utils import (
+    rdkit_mol_from_smiles,
+    to_rdkit_mol,
+    to_smiles,
+)
+
+_SMILES = [
+    "CC(=O)Oc1ccccc1C(=O)O",
+    "CN1C=NC2=C1C(=O)N(C(=O)N2C)C",
+    "CC(C)Cc1ccc(cc1)[C@@H](C)C(=O)O",
+    "COc1cc2c(cc1OCCCN1CCOCC1)c(ncn2)Nc1ccc(F)c(Cl)c1",
+    "CCCC1=NN(C2=C1NC(=NC2=O)C3=C(C=CC(=C3)S(=O)(=O)N4CCN(CC4)C)OCC)C",
+    "Cc1ccc2c(=O)c3cccc(CC(=O)OC4OC(C(=O)O)[C@@H](O)[C@@H](O)[C@@H]4O)c3oc2c1C",
+    "O=C(O)c1ccccc1O",
+    "c1ccc2c(c1)ccc1ccccc12",
+]
+
+
+def _via_smiles(sample: Any) -> Chem.Mol:
+    return rdkit_mol_from_smiles(to_smiles(sample))
+
+
+def _time(func: Callable[[], Any], repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main(num_samples: int, repeat: int) -> None:
+    RDLogger.DisableLog("rdApp.*")
+
+    mols = [Chem.MolFromSmiles(smiles) for smiles in _SMILES]
+    samples = [mols[i % len(mols)].ToBinary() for i in range(num_samples)]
+
+    print(f"{num_samples} bytes samples (best of {repeat})")
+
+    round_trip = _time(lambda: [_via_smiles(s) for s in samples], repeat)
+    direct = _time(lambda: [to_rdkit_mol(s) for s in samples], repeat)
+    print(f"parse via SMILES round-trip: {round_trip:.3f}s")
+    print(f"parse directly:              {direct:.3f}s ({round_trip / direct:.1f}x)")
+
+    dataset = datasets.Dataset.from_dict({"mol_bytes": samples})
+
+    def featurise(parse_via_smiles: bool) -> Any:
+        presets = {"parse_via_smiles": parse_via_smiles}
+        representations = load_from_dicts(
+            [
+                {"name": "morgan", "presets": presets},
+                {"name": "avalon", "presets": presets},
+            ],
+        )
+        return featurise_dataset(
+            dataset,
+            column="mol_bytes",
+            representations=representations,
+            load_from_cache_file=False,
+        )
+
+    datasets.disable_progress_bars()
+    featurise(parse_via_smiles=False)  # warm-up
+    direct_end_to_end = _time(lambda: featurise(parse_via_smiles=False), repeat)
+    round_trip_end_to_end = _time(lambda: featurise(parse_via_smiles=True), repeat)
+
+    print(f"featurise_dataset via SMILES round-trip: {round_trip_end_to_end:.3f}s")
+    print(
+        f"featurise_dataset directly:              {direct_end_to_end:.3f}s "
+        f"({round_trip_end_to_end / direct_end_to_end:.1f}x)",
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-samples", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(num_samples=args.num_samples, repeat=args.repeat)
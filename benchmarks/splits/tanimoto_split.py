@@ -0,0 +1,156 @@
+"""Benchmarks splitting molecules by Tanimoto similarity with `tanimoto_rdkit`.
+
+Compares the previous implementation of `_split_fingerprints`, which compared
+each assigned molecule to all unassigned molecules with rdkit's
+`BulkTanimotoSimilarity` and deleted it from its arrays and lists, against
+the current one over fingerprints packed into 64-bit words, for datasets of
+increasing sizes. Both produce identical splits: this is checked for all
+sizes at which the previous implementation is run.
+
+Molecules are enumerated combinatorially from a set of fragments.
+
+Usage:
+
+    $ python benchmarks/splits/tanimoto_split.py --num-samples 500000 --max-previous-samples 50000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+from rdkit import Chem, DataStructs, RDLogger
+from rdkit.Chem import AllChem
+
+from molflux.splits.strategies.rdkit.tanimoto import _split_fingerprints
+
+_FRAGMENTS = [
+    "C",
+    "CC",
+    "C(C)C",
+    "O",
+    "N",
+    "C(=O)",
+    "C(=O)N",
+    "S(=O)(=O)",
+    "c1ccccc1",
+    "c1ccncc1",
+    "C1CCNCC1",
+    "C1CCOCC1",
+    "c1ccsc1",
+    "F",
+    "Cl",
+    "Br",
+    "C#N",
+    "OC",
+    "N(C)C",
+    "c1cnccn1",
+    "C1CC1",
+    "c1ccc2ccccc2c1",
+    "C(F)(F)F",
+    "CO",
+    "CN",
+    "c1ccoc1",
+    "C1CCCCC1",
+    "N1CCOCC1",
+    "c1cc[nH]c1",
+    "C=C",
+]
+
+
+def _generate_molecules(num_samples: int, seed: int = 0) -> list[Chem.Mol]:
+    """Generates molecules by joining two to six random fragments."""
+    rng = np.random.default_rng(seed)
+    mols: list[Chem.Mol] = []
+    while len(mols) < num_samples:
+        fragments = rng.integers(len(_FRAGMENTS), size=(num_samples, 6))
+        lengths = rng.integers(2, 7, size=num_samples)
+        for row, length in zip(fragments, lengths, strict=True):
+            smiles = "".join(_FRAGMENTS[j] for j in row[:length])
+            mol = Chem.MolFromSmiles(smiles)
+            if mol is not None:
+                mols.append(mol)
+    return mols[:num_samples]
+
+
+def _split_fingerprints_by_deletion(
+    fps: list,
+    size1: int,
+    size2: int,
+) -> tuple[list[int], list[int]]:
+    """The previous implementation of `_split_fingerprints`."""
+    fp_in_group: list[list[Any]] = [[fps[0]], []]
+    indices_in_group: tuple[list[int], list[int]] = ([0], [])
+    remaining_fp = fps[1:]
+    remaining_indices = list(range(1, len(fps)))
+    max_similarity_to_group = [
+        DataStructs.BulkTanimotoSimilarity(fps[0], remaining_fp),
+        [0] * len(remaining_fp),
+    ]
+    while len(remaining_fp) > 0:
+        group = 0 if len(fp_in_group[0]) / size1 <= len(fp_in_group[1]) / size2 else 1
+        i = np.argmin(max_similarity_to_group[1 - group])
+        fp = remaining_fp[i]
+        fp_in_group[group].append(fp)
+        indices_in_group[group].append(remaining_indices[i])
+        similarity = DataStructs.BulkTanimotoSimilarity(fp, remaining_fp)
+        max_similarity_to_group[group] = np.delete(
+            np.maximum(similarity, max_similarity_to_group[group]),
+            i,
+        )
+        max_similarity_to_group[1 - group] = np.delete(
+            max_similarity_to_group[1 - group],
+            i,
+        )
+        del remaining_fp[i]
+        del remaining_indices[i]
+    return indices_in_group
+
+
+def _time(func: Callable[[], Any]) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main(num_samples: int, max_previous_samples: int, train_fraction: float) -> None:
+    RDLogger.DisableLog("rdApp.*")
+
+    print(f"generating {num_samples} molecules")
+    fingerprints = [
+        AllChem.GetMorganFingerprintAsBitVect(mol, 2, 1024)
+        for mol in _generate_molecules(num_samples)
+    ]
+
+    sizes = []
+    size = 1000
+    while size < num_samples:
+        sizes.append(size)
+        size *= 4
+    sizes.append(num_samples)
+
+    print(f"{'molecules':>10} {'previous':>10} {'current':>10}")
+    for size in sizes:
+        fps = fingerprints[:size]
+        size1 = int(train_fraction * size)
+        size2 = size - size1
+
+        current, split = _time(lambda: _split_fingerprints(fps, size1, size2))  # noqa: B023
+        if size <= max_previous_samples:
+            previous, expected = _time(
+                lambda: _split_fingerprints_by_deletion(fps, size1, size2),  # noqa: B023
+            )
+            assert split == expected, "The splits of both implementations differ"
+            print(f"{size:>10} {previous:>9.2f}s {current:>9.2f}s")
+        else:
+            print(f"{size:>10} {'-':>10} {current:>9.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-samples", type=int, default=500_000)
+    parser.add_argument("--max-previous-samples", type=int, default=50_000)
+    parser.add_argument("--train-fraction", type=float, default=0.8)
+    args = parser.parse_args()
+    main(args.num_samples, args.max_previous_samples, args.train_fraction)
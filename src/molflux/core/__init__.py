@@ -1,4 +1,6 @@
 from molflux.core.featurisation.featurisation import (
+    compile_featurisation,
+    compile_replay_featurisation,
     featurise_dataset,
     replay_dataset_featurisation,
 )
@@ -1,15 +1,20 @@
 import logging
 from typing import Any, TypeVar
 
-import molflux.datasets
 import molflux.features
 from molflux.core.featurisation.metadata import (
     FeaturisationMetadataV1,
     FeaturisationMetadataV2,
+    RepresentationConfig,
     fetch_model_featurisation_metadata,
     parse_featurisation_metadata,
 )
 from molflux.core.typing import DatasetType
+from molflux.datasets.featurisation import (
+    FeaturisationPlan,
+    FeaturisationStep,
+    featurise_dataset_in_single_pass,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -64,36 +69,10 @@ def _featurise_dataset_v1(
     **map_kwargs: Any,
 ) -> DatasetType:
     """Featurises a dataset from a V1 featurisation metadata schema."""
-    featurisation_metadata_obj = FeaturisationMetadataV1(**featurisation_metadata)
-    featurisation_config = featurisation_metadata_obj.config
-    for column_featurisation_config in featurisation_config:
-        column = column_featurisation_config.column
-        representation_configs = column_featurisation_config.representations
-
-        # We allow passing single string display_names as convenience method
-        # but we need to turn them into a list to match canonical form expected
-        # by molflux.datasets.featurise_dataset()
-        display_names = [config.as_ for config in representation_configs]
-        canonical_display_names = [
-            names if isinstance(names, list) else [names] for names in display_names
-        ]
-
-        representation_configs_as_dicts = [
-            {"name": config.name, "config": config.config, "presets": config.presets}
-            for config in representation_configs
-        ]
-
-        representations = molflux.features.load_from_dicts(
-            representation_configs_as_dicts,
-        )
-        dataset = molflux.datasets.featurise_dataset(
-            dataset,
-            column=[column],
-            representations=representations,
-            display_names=canonical_display_names,  # type: ignore[arg-type]
-            **map_kwargs,
-        )
-    return dataset
+    steps = _featurisation_steps_v1(featurisation_metadata)
+
+    # all column groups are featurised in a single pass over the dataset
+    return featurise_dataset_in_single_pass(dataset, steps=steps, **map_kwargs)
 
 
 def _featurise_dataset_v2(
@@ -102,33 +81,109 @@ def _featurise_dataset_v2(
     **map_kwargs: Any,
 ) -> DatasetT:
     """Featurises a dataset from a V2 featurisation metadata schema."""
-    featurisation_metadata_obj = FeaturisationMetadataV2(**featurisation_metadata)
-    featurisation_config = featurisation_metadata_obj.config
-    for column_featurisation_config in featurisation_config:
-        columns = column_featurisation_config.columns
-        representation_configs = column_featurisation_config.representations
-
-        # We allow passing single string display_names as convenience method
-        # but we need to turn them into a list to match canonical form expected
-        # by molflux.datasets.featurise_dataset()
-        display_names = [config.as_ for config in representation_configs]
-        canonical_display_names = [
-            names if isinstance(names, list) else [names] for names in display_names
-        ]
-
-        representation_configs_as_dicts = [
-            {"name": config.name, "config": config.config, "presets": config.presets}
-            for config in representation_configs
-        ]
-
-        representations = molflux.features.load_from_dicts(
-            representation_configs_as_dicts,
+    steps = _featurisation_steps_v2(featurisation_metadata)
+
+    # all column groups are featurised in a single pass over the dataset
+    return featurise_dataset_in_single_pass(dataset, steps=steps, **map_kwargs)
+
+
+def compile_replay_featurisation(model_path: str) -> FeaturisationPlan:
+    """Compiles the featurisation of a saved model into a low-latency featurisation plan.
+
+    This is the in-memory counterpart of `replay_dataset_featurisation`, for
+    featurising a handful of samples at a time (e.g. for online inference).
+    """
+    featurisation_metadata = fetch_model_featurisation_metadata(model_path=model_path)
+    return compile_featurisation(featurisation_metadata)
+
+
+def compile_featurisation(featurisation_metadata: dict[str, Any]) -> FeaturisationPlan:
+    """Compiles featurisation metadata into a low-latency featurisation plan.
+
+    The metadata is parsed, and the representations loaded and validated,
+    once. The plan then featurises columns of samples (e.g. Python lists or
+    NumPy arrays) in-process, giving the same features as `featurise_dataset`.
+
+    Examples:
+        >>> featurisation_metadata = {
+        ...     "version": 2,
+        ...     "config": [
+        ...         {
+        ...             "columns": ["smiles"],
+        ...             "representations": [{"name": "character_count"}],
+        ...         },
+        ...     ],
+        ... }
+        >>> plan = compile_featurisation(featurisation_metadata)
+        >>> plan({"smiles": ["C", "CCO"]})
+        {'smiles': ['C', 'CCO'], 'smiles::character_count': [1, 3]}
+    """
+    featurisation_metadata, version = parse_featurisation_metadata(
+        featurisation_metadata,
+    )
+
+    if version == 1:
+        return FeaturisationPlan(_featurisation_steps_v1(featurisation_metadata))
+    if version == 2:
+        return FeaturisationPlan(_featurisation_steps_v2(featurisation_metadata))
+    else:
+        raise NotImplementedError(
+            f"No featuriser implemented for featurisation metadata version: {version!r}",
         )
-        dataset = molflux.datasets.featurise_dataset(
-            dataset,
-            column=columns,
-            representations=representations,
-            display_names=canonical_display_names,  # type: ignore[arg-type]
-            **map_kwargs,
+
+
+def _featurisation_steps_v1(
+    featurisation_metadata: dict[str, Any],
+) -> list[FeaturisationStep]:
+    """Loads the featurisation steps of a V1 featurisation metadata schema."""
+    featurisation_metadata_obj = FeaturisationMetadataV1(**featurisation_metadata)
+    return [
+        _to_featurisation_step(
+            columns=[column_featurisation_config.column],
+            representation_configs=column_featurisation_config.representations,
+        )
+        for column_featurisation_config in featurisation_metadata_obj.config
+    ]
+
+
+def _featurisation_steps_v2(
+    featurisation_metadata: dict[str, Any],
+) -> list[FeaturisationStep]:
+    """Loads the featurisation steps of a V2 featurisation metadata schema."""
+    featurisation_metadata_obj = FeaturisationMetadataV2(**featurisation_metadata)
+    return [
+        _to_featurisation_step(
+            columns=column_featurisation_config.columns,
+            representation_configs=column_featurisation_config.representations,
         )
-    return dataset
+        for column_featurisation_config in featurisation_metadata_obj.config
+    ]
+
+
+def _to_featurisation_step(
+    columns: list[str],
+    representation_configs: list[RepresentationConfig],
+) -> FeaturisationStep:
+    """Loads the representations of a column group's featurisation config."""
+
+    # We allow passing single string display_names as convenience method
+    # but we need to turn them into a list to match canonical form expected
+    # by molflux.datasets.featurise_dataset()
+    display_names = [config.as_ for config in representation_configs]
+    canonical_display_names = [
+        names if isinstance(names, list) else [names] for names in display_names
+    ]
+
+    representation_configs_as_dicts = [
+        {"name": config.name, "config": config.config, "presets": config.presets}
+        for config in representation_configs
+    ]
+
+    representations = molflux.features.load_from_dicts(
+        representation_configs_as_dicts,
+    )
+    return FeaturisationStep(
+        column=columns,
+        representations=representations,
+        display_names=canonical_display_names,  # type: ignore[arg-type]
+    )
@@ -12,6 +12,11 @@ AllowedInferenceMethods = Literal[
 ]
 PathLike = Union[str, OSPathLike]
 Dataset = datasets.Dataset
-DatasetType = Union[datasets.Dataset, datasets.DatasetDict]
+DatasetType = Union[
+    datasets.Dataset,
+    datasets.DatasetDict,
+    datasets.IterableDataset,
+    datasets.IterableDatasetDict,
+]
 TasksScores = dict[str, dict[str, Any]]
 FoldScores = dict[str, TasksScores]
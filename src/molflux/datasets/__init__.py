@@ -1,4 +1,5 @@
 from molflux.datasets.catalogue import fill_catalogue, list_datasets
+from molflux.datasets.checkpointing import featurise_dataset_to_store
 from molflux.datasets.featurisation import featurise_dataset
 from molflux.datasets.io import load_dataset_from_store, save_dataset_to_store
 from molflux.datasets.load import (
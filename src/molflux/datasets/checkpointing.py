@@ -0,0 +1,373 @@
+"""
+Resumable featurisation jobs, checkpointed as shards of featurised data.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+from typing import Any, Literal
+
+import pyarrow as pa
+from datasets.fingerprint import Hasher
+
+import datasets
+from datasets.filesystems import is_remote_filesystem
+from molflux.datasets.featurisation import (
+    FreeformDisplayNames,
+    featurise_dataset,
+)
+from molflux.datasets.interfaces import Representation, Representations
+from molflux.datasets.io import (
+    _check_compatible_filesystem,
+    _generate_shard_path,
+    _resolve_file_system_for_data_files,
+    save_dataset_to_store,
+)
+from molflux.datasets.typing import FileSystem, PathLike
+from molflux.features.cache import FeaturisationCache, _canonical
+
+MANIFEST_FILENAME = "manifest.json"
+_MANIFEST_VERSION = 1
+_SHARD_FORMAT = "parquet"
+_DEFAULT_SHARD_SIZE = 100_000
+
+# shards are written here first, and only moved into place once complete
+_STAGING_DIRNAME = ".staging"
+
+# the number of rows hashed at once to summarise the contents of datasets
+_DIGEST_BATCH_SIZE = 10_000
+
+# the arguments of featurise_dataset other than .map() arguments
+_FEATURISATION_KWARGS = frozenset(
+    ["column", "representations", "display_names", "parallel", "cache", "deduplicate"],
+)
+
+# the .map() arguments that do not change the featurised data
+_OUTPUT_INVARIANT_KWARGS = frozenset(
+    [
+        "batch_size",
+        "writer_batch_size",
+        "keep_in_memory",
+        "load_from_cache_file",
+        "cache_file_name",
+        "num_proc",
+        "desc",
+    ],
+)
+
+logger = logging.getLogger(__name__)
+
+
+def featurise_dataset_to_store(
+    dataset: datasets.Dataset | datasets.DatasetDict,
+    column: str | list[str],
+    representations: Representation | Representations,
+    path: PathLike,
+    display_names: FreeformDisplayNames = None,
+    shard_size: int = _DEFAULT_SHARD_SIZE,
+    fs: FileSystem | None = None,
+    parallel: int | None = None,
+    cache: FeaturisationCache | None = None,
+    deduplicate: Literal["batch", "global"] | None = None,
+    **map_kwargs: Any,
+) -> None:
+    """Featurises a dataset as a resumable job, checkpointed shard by shard.
+
+    The dataset is featurised in shards of `shard_size` consecutive rows with
+    `featurise_dataset`. Each completed shard is saved to a Parquet file under
+    `path`, and recorded in a manifest file alongside it. If the job is
+    interrupted, running it again with the same arguments skips all shards
+    already recorded in the manifest and continues from the first incomplete
+    one. Once all shards are complete, the featurised dataset is identical to
+    that of an uninterrupted run, and can be loaded with
+    `load_dataset_from_store(path)`. Unless output `features` are given, all
+    shards are featurised with the features of the first one, such that they
+    load back as a single dataset.
+
+    DatasetDicts are featurised split by split, with one directory of shards
+    (and one manifest) for each split.
+
+    Args:
+        dataset: The dataset to featurise.
+        column: One or multiple columns from the dataset to use as input to featurisers.
+        representations: The representation or representations to featurise the columns with.
+        path: The directory where to save the featurised shards and manifest.
+        display_names: A list of custom labels to assign to the newly
+            featurised columns, or a single string template that will be
+            used to dynamically generate labels.
+        shard_size: The number of rows of each shard. This is the granularity
+            at which progress is checkpointed.
+        fs: The filesystem object to use to save the shards. If not provided,
+            an appropriate filesystem will be automatically provided.
+        parallel: The number of worker processes to featurise each shard with.
+        cache: An optional on-disk cache of featurisation results.
+        deduplicate: Whether to featurise repeated input samples only once,
+            within each batch (`"batch"`) or within each shard (`"global"`).
+        map_kwargs: Optional keyword arguments to be passed to the underlying
+            dataset's .map() method during featurisation.
+
+    Raises:
+        ValueError: If `path` holds the checkpoints of a different job (e.g.
+            a job over a different dataset, or with different representations).
+
+    Examples:
+        >>> from molflux.datasets import featurise_dataset_to_store, load_dataset_from_store
+        >>> featurise_dataset_to_store(
+        ...     dataset,
+        ...     column="smiles",
+        ...     representations=representations,
+        ...     path="s3://my/featurised/dataset",
+        ... )  # doctest: +SKIP
+        >>> featurised_dataset = load_dataset_from_store("s3://my/featurised/dataset")  # doctest: +SKIP
+    """
+
+    path = str(path)
+
+    if shard_size < 1:
+        raise ValueError(f"shard_size must be a positive integer: {shard_size}")
+
+    # Provide a filesystem if one not specified (convenience)
+    if fs is None:
+        fs = _resolve_file_system_for_data_files(data_files=path)
+    _check_compatible_filesystem(fs, data_files=path)
+
+    featurisation_kwargs = {
+        "column": column,
+        "representations": representations,
+        "display_names": display_names,
+        "parallel": parallel,
+        "cache": cache,
+        "deduplicate": deduplicate,
+        **map_kwargs,
+    }
+
+    if isinstance(dataset, datasets.DatasetDict):
+        _mkdir(path, fs=fs)
+        dataset_dict_json_path = os.path.join(
+            path,
+            datasets.config.DATASETDICT_JSON_FILENAME,
+        )
+        with fs.open(dataset_dict_json_path, "w", encoding="utf-8") as f:
+            json.dump({"splits": list(dataset)}, f)
+
+        for k, split_dataset in dataset.items():
+            _run_featurisation_job(
+                split_dataset,
+                path=os.path.join(path, k),
+                shard_size=shard_size,
+                fs=fs,
+                **featurisation_kwargs,
+            )
+        return None
+
+    return _run_featurisation_job(
+        dataset,
+        path=path,
+        shard_size=shard_size,
+        fs=fs,
+        **featurisation_kwargs,
+    )
+
+
+def _run_featurisation_job(
+    dataset: datasets.Dataset,
+    path: str,
+    shard_size: int,
+    fs: FileSystem,
+    **featurisation_kwargs: Any,
+) -> None:
+    """Featurises the shards of a single dataset missing from its manifest."""
+
+    # empty datasets are saved as a single empty shard
+    n_shards = max(1, -(-dataset.num_rows // shard_size))
+    signature = _job_signature(
+        dataset,
+        shard_size=shard_size,
+        column=featurisation_kwargs["column"],
+        representations=featurisation_kwargs["representations"],
+        display_names=featurisation_kwargs["display_names"],
+        map_kwargs={
+            name: value
+            for name, value in featurisation_kwargs.items()
+            if name not in _FEATURISATION_KWARGS
+        },
+    )
+
+    manifest = _load_manifest(path, fs=fs)
+    if manifest is None:
+        manifest = {
+            "version": _MANIFEST_VERSION,
+            "signature": signature,
+            "num_rows": dataset.num_rows,
+            "shard_size": shard_size,
+            "num_shards": n_shards,
+            "completed_shards": {},
+        }
+    elif manifest.get("signature") != signature:
+        raise ValueError(
+            f"The checkpoints in {path!r} were written by a different featurisation job: use a different path to start a new job",
+        )
+
+    completed_shards = manifest["completed_shards"]
+    pin_features = "features" not in featurisation_kwargs
+    if completed_shards:
+        logger.info(
+            f"Resuming featurisation job in {path!r}: {len(completed_shards)}/{n_shards} shards already completed",
+        )
+
+    _mkdir(path, fs=fs)
+    staging_dir = os.path.join(path, _STAGING_DIRNAME)
+
+    for shard in range(n_shards):
+        if str(shard) in completed_shards:
+            continue
+
+        start = shard * shard_size
+        stop = min(start + shard_size, dataset.num_rows)
+        shard_kwargs = featurisation_kwargs
+        if pin_features and "features" in manifest:
+            shard_kwargs = {
+                **featurisation_kwargs,
+                "features": datasets.Features.from_dict(manifest["features"]),
+            }
+        featurised_shard = featurise_dataset(
+            dataset.select(range(start, stop)),
+            **shard_kwargs,
+        )
+
+        # write the shard in full before moving it into place and recording it
+        shard_path = _generate_shard_path(path, shard=shard, format=_SHARD_FORMAT)
+        staged_shard_path = _generate_shard_path(
+            staging_dir,
+            shard=shard,
+            format=_SHARD_FORMAT,
+        )
+        save_dataset_to_store(
+            featurised_shard,
+            path=staged_shard_path,
+            format=_SHARD_FORMAT,
+            fs=fs,
+        )
+        fs.mv(staged_shard_path, shard_path)
+
+        completed_shards[str(shard)] = {
+            "path": os.path.basename(shard_path),
+            "num_rows": featurised_shard.num_rows,
+        }
+        if pin_features and "features" not in manifest:
+            manifest["features"] = featurised_shard.features.to_dict()
+        _save_manifest(manifest, path=path, fs=fs)
+
+
+def _job_signature(
+    dataset: datasets.Dataset,
+    shard_size: int,
+    column: str | list[str],
+    representations: Representation | Representations,
+    display_names: FreeformDisplayNames,
+    map_kwargs: dict[str, Any],
+) -> str:
+    """Summarises the parameters (and input data) of a job that determine its outputs.
+
+    Raises:
+        TypeError: If the parameters of the job cannot be serialised.
+    """
+
+    if not isinstance(representations, Representations):
+        representations = [representations]
+
+    job = (
+        _digest_dataset(dataset),
+        dataset.num_rows,
+        dataset.features.to_dict(),
+        shard_size,
+        column,
+        [
+            (
+                type(representation).__qualname__,
+                getattr(representation, "tag", None),
+                _canonical(getattr(representation, "state", {})),
+            )
+            for representation in representations
+        ],
+        display_names,
+        _canonical(
+            {
+                name: value
+                for name, value in map_kwargs.items()
+                if name not in _OUTPUT_INVARIANT_KWARGS
+            },
+        ),
+    )
+    try:
+        return Hasher.hash(job)
+    except Exception as e:
+        raise TypeError(
+            f"Could not serialise the parameters of the featurisation job: {e}",
+        ) from e
+
+
+def _digest_dataset(dataset: datasets.Dataset) -> str:
+    """Hashes the contents of all columns of a dataset.
+
+    Batches of rows are hashed as serialised by Apache Arrow, without
+    converting them to python objects.
+    """
+    sink = _HashingSink()
+    with pa.ipc.new_stream(sink, dataset.data.schema) as writer:
+        for batch in dataset.with_format("arrow").iter(batch_size=_DIGEST_BATCH_SIZE):
+            # a single (unsliced) array per column, however the table is
+            # chunked or sliced, such that equal contents serialise equally
+            columns = [pa.concat_arrays(column.chunks) for column in batch.columns]
+            writer.write_batch(
+                pa.RecordBatch.from_arrays(columns, schema=batch.schema),
+            )
+    return sink.hexdigest()
+
+
+class _HashingSink:
+    """A writable file object hashing what is written to it."""
+
+    def __init__(self) -> None:
+        self._digest = hashlib.sha256()
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def _load_manifest(path: str, fs: FileSystem) -> dict[str, Any] | None:
+    manifest_path = os.path.join(path, MANIFEST_FILENAME)
+    if not fs.exists(manifest_path):
+        return None
+
+    with fs.open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest: dict[str, Any], path: str, fs: FileSystem) -> None:
+    # the manifest is replaced as a whole, so that it is never left half-written
+    manifest_path = os.path.join(path, MANIFEST_FILENAME)
+    staged_manifest_path = os.path.join(path, _STAGING_DIRNAME, MANIFEST_FILENAME)
+    _mkdir(os.path.dirname(staged_manifest_path), fs=fs)
+    with fs.open(staged_manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    fs.mv(staged_manifest_path, manifest_path)
+
+
+def _mkdir(path: str, fs: FileSystem) -> None:
+    # remote filesystems do not need directories to be created
+    if not is_remote_filesystem(fs):
+        pathlib.Path(path).resolve().mkdir(parents=True, exist_ok=True)
@@ -1,16 +1,46 @@
 import logging
 import warnings
-from typing import Any, Union
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Literal, Union
 
+import numpy as np
 import pyarrow as pa
-from more_itertools import zip_broadcast
+from more_itertools import unique_everseen, zip_broadcast
+from numpy.typing import NDArray
 
 import datasets
-from molflux.datasets.interfaces import Representation, Representations
+from molflux.datasets.interfaces import (
+    Representation,
+    Representations,
+    RepresentationWithOutputSchema,
+)
 from molflux.datasets.typing import DatasetType, DisplayNames
+from molflux.features.cache import FeaturisationCache
+from molflux.features.deduplication import featurise_unique, unique_rows
+from molflux.features.info import FeatureSchema
+from molflux.features.parallel import FeaturisationPool
+from molflux.features.typing import ArrayLike
+from molflux.features.utils import shared_molecules_context
 
 _DEFAULT_DISPLAY_NAMES_TEMPLATE = "{source_column}::{feature_name}"
 
+# The default number of rows in each batch of datasets.Dataset.map()
+_DEFAULT_MAP_BATCH_SIZE = 1000
+
+# The datasets.Dataset.map() arguments also applying to scattering the features
+# of unique rows back to all rows, with global deduplication
+_SCATTER_MAP_KWARGS = frozenset(
+    [
+        "batch_size",
+        "writer_batch_size",
+        "keep_in_memory",
+        "load_from_cache_file",
+        "num_proc",
+        "desc",
+    ],
+)
+
 FreeformDisplayNames = Union[
     str | None,
     list[str | None | list[str | None]],
@@ -113,7 +143,8 @@ def _consolidate_map_outputs(dataset: DatasetType) -> DatasetType:
     by the `datasets.map` call. This can lead to inconsistencies in output
     feature names across empty and non-empty datasets.
     """
-    if isinstance(dataset, datasets.Dataset):
+    # iterable splits are not materialised, and are featurised lazily
+    if not isinstance(dataset, datasets.DatasetDict):
         return dataset
 
     empty_splits = [k for k, v in dataset.num_rows.items() if v == 0]
@@ -141,6 +172,9 @@ def featurise_dataset(
     column: str | list[str],
     representations: Representation | Representations,
     display_names: FreeformDisplayNames = None,
+    parallel: int | None = None,
+    cache: FeaturisationCache | None = None,
+    deduplicate: Literal["batch", "global"] | None = None,
     **map_kwargs: Any,
 ) -> DatasetType:
     """Featurises a dataset column according to the given representations.
@@ -152,11 +186,25 @@ def featurise_dataset(
         display_names: A list of custom labels to assign to the newly
             featurised columns, or a single string template that will be
             used to dynamically generate labels.
+        parallel: The number of worker processes to featurise each batch with
+            (`-1` to use all available CPUs). Workers are started once and
+            reused across all batches. If `None`, batches are featurised in
+            the main process.
+        cache: An optional on-disk cache of featurisation results. Only
+            samples missing from the cache are featurised.
+        deduplicate: Whether to featurise repeated input samples only once,
+            and copy their results to all of their occurrences. If `"batch"`,
+            samples are deduplicated within each batch. If `"global"`, unique
+            samples are first collected over the whole input column(s) of each
+            split and featurised in a separate pass (not supported for
+            iterable datasets). If `None`, all samples are featurised.
         map_kwargs: Optional keyword arguments to be passed to the underlying
             dataset's .map() method during featurisation.
 
     Returns:
-        The featurised dataset.
+        The featurised dataset. `IterableDataset` and `IterableDatasetDict`
+        inputs are featurised lazily, one batch at a time, as they are
+        iterated over (e.g. with `save_dataset_to_store`).
     """
 
     # make sure we're working with a list of columns
@@ -166,12 +214,23 @@ def featurise_dataset(
     if not isinstance(representations, Representations):
         representations = [representations]
 
+    is_iterable = isinstance(
+        dataset,
+        (datasets.IterableDataset, datasets.IterableDatasetDict),
+    )
+
     # Make sure that all Datasets in the DatasetDict have the same features
-    if isinstance(dataset, datasets.DatasetDict):
-        all_features_match = len(set(map(tuple, dataset.column_names.values()))) == 1
+    if isinstance(dataset, (datasets.DatasetDict, datasets.IterableDatasetDict)):
+        # the features of iterable splits are not always known ahead of iteration
+        known_column_names = [
+            tuple(split.column_names)
+            for split in dataset.values()
+            if split.column_names is not None
+        ]
+        all_features_match = len(set(known_column_names)) <= 1
         if not all_features_match:
             raise ValueError(
-                f"Inconsistent input features across splits: got {dataset.column_names!r}",
+                f"Inconsistent input features across splits: got { {name: split.column_names for name, split in dataset.items()}!r}",
             )
 
     canonical_display_names = _to_canonical_display_names(
@@ -183,13 +242,61 @@ def featurise_dataset(
     if "batched" not in map_kwargs:
         map_kwargs["batched"] = True
 
+    if parallel is not None and map_kwargs.get("num_proc") is not None:
+        raise ValueError(
+            "Featurisation can be parallelised with either 'parallel' or 'num_proc', not both.",
+        )
+
+    if deduplicate not in {None, "batch", "global"}:
+        raise ValueError(
+            f"Unknown deduplication mode: {deduplicate!r}. Available modes: 'batch', 'global'",
+        )
+
+    if deduplicate == "global":
+        if is_iterable:
+            raise ValueError(
+                "Global deduplication is not supported for iterable datasets: use 'batch' deduplication instead.",
+            )
+        return _featurise_unique_rows(
+            dataset,
+            columns=columns,
+            representations=representations,
+            display_names=canonical_display_names,
+            parallel=parallel,
+            cache=cache,
+            map_kwargs=map_kwargs,
+        )
+
+    # Declare output features upfront to avoid inferring them on every batch
+    features = _declared_features(
+        dataset,
+        columns=columns,
+        representations=representations,
+        display_names=canonical_display_names,
+        map_kwargs=map_kwargs,
+    )
+    if features is not None:
+        map_kwargs["features"] = features
+
+    # a single pool of workers featurises all batches
+    pool = (
+        FeaturisationPool(representations, n_jobs=parallel)
+        if parallel is not None and parallel != 1
+        else None
+    )
+
     try:
-        featurized_dataset = dataset.map(
+        featurized_dataset = _map(
+            dataset,
             function=_featurise_batch,
             fn_kwargs={
                 "columns": columns,
                 "representations": representations,
                 "display_names": canonical_display_names,
+                "features": features,
+                "pool": pool,
+                "cache": cache,
+                "deduplicate": deduplicate == "batch",
             },
             **map_kwargs,
         )
@@ -197,17 +304,427 @@ def featurise_dataset(
         raise TypeError(
             "Apache Arrow serialisation error: one or more representations might be incompatible with Apache Arrow backends.",
         ) from e
+    finally:
+        # iterable datasets are only featurised once iterated over: their
+        # workers are shut down when the pool is garbage collected instead
+        if pool is not None and not is_iterable:
+            pool.close()
 
     featurized_dataset = _consolidate_map_outputs(featurized_dataset)
 
     return featurized_dataset
 
 
+@dataclass(frozen=True)
+class FeaturisationStep:
+    """A featurisation of one or more columns with one or more representations.
+
+    Attributes:
+        column: One or multiple columns to use as input to featurisers.
+        representations: The representation or representations to featurise the columns with.
+        display_names: Custom labels to assign to the featurised columns, as
+            in `featurise_dataset`.
+    """
+
+    column: str | list[str]
+    representations: Representation | Representations
+    display_names: FreeformDisplayNames = None
+
+
+def featurise_dataset_in_single_pass(
+    dataset: DatasetType,
+    steps: Sequence[FeaturisationStep],
+    **map_kwargs: Any,
+) -> DatasetType:
+    """Applies several featurisation steps to a dataset in a single pass.
+
+    All steps are applied to each batch one after the other, such that later
+    steps can featurise the columns generated by earlier ones. This gives the
+    same dataset as calling `featurise_dataset` for each step in turn, but with
+    a single `.map()` pass that only reads the input columns of the steps, and
+    only writes the featurised columns to the cache. These are then appended
+    to the input dataset without copying it.
+
+    Datasets mapping their rows to the rows of an underlying table (e.g.
+    shuffled or selected datasets) are featurised over all rows of that table,
+    and their mapping is then re-applied, for the table not to be copied. Only
+    the rows of datasets selecting fewer rows than their table holds are
+    featurised, and these rows are then copied instead.
+
+    Args:
+        dataset: The dataset to featurise.
+        steps: The featurisation steps to apply, in order.
+        map_kwargs: Optional keyword arguments to be passed to the underlying
+            dataset's .map() method during featurisation.
+
+    Returns:
+        The featurised dataset.
+
+    Examples:
+        >>> import datasets
+        >>> from molflux.features import load_representation
+        >>> dataset = datasets.Dataset.from_dict({"smiles": ["C", "CCO"]})
+        >>> featurised_dataset = featurise_dataset_in_single_pass(
+        ...     dataset,
+        ...     steps=[
+        ...         FeaturisationStep("smiles", load_representation("character_count"), "n"),
+        ...         FeaturisationStep(["n", "n"], load_representation("sum"), "n_plus_n"),
+        ...     ],
+        ... )
+        >>> featurised_dataset.column_names
+        ['smiles', 'n', 'n_plus_n']
+        >>> featurised_dataset["n_plus_n"]
+        [2, 6]
+    """
+
+    # iterable datasets are featurised lazily, without writing to any cache
+    if isinstance(dataset, (datasets.IterableDataset, datasets.IterableDatasetDict)):
+        for step in steps:
+            dataset = featurise_dataset(
+                dataset,
+                column=step.column,
+                representations=step.representations,
+                display_names=step.display_names,
+                **map_kwargs,
+            )
+        return dataset
+
+    if isinstance(dataset, datasets.DatasetDict):
+        featurised_splits = datasets.DatasetDict(
+            {
+                split: featurise_dataset_in_single_pass(
+                    split_dataset,
+                    steps=steps,
+                    **map_kwargs,
+                )
+                for split, split_dataset in dataset.items()
+            },
+        )
+        return _consolidate_map_outputs(featurised_splits)
+
+    # featurise the rows of the underlying table, for the concatenation of the
+    # featurised columns not to flatten (copy) the mapped rows of the dataset
+    indices = _indices_mapping(dataset)
+    if indices is not None and len(indices) >= dataset.data.num_rows:
+        table_dataset = datasets.Dataset(
+            dataset.data,
+            info=dataset.info.copy(),
+            split=dataset.split,
+        )
+        table_dataset.set_format(**dataset.format)
+        featurised = featurise_dataset_in_single_pass(
+            table_dataset,
+            steps=steps,
+            **map_kwargs,
+        )
+        return featurised.select(indices, keep_in_memory=True)
+
+    compiled_steps = [_compile_featurisation_step(step) for step in steps]
+
+    map_kwargs = dict(map_kwargs)
+    remove_columns = map_kwargs.pop("remove_columns", None) or []
+    if isinstance(remove_columns, str):
+        remove_columns = [remove_columns]
+
+    # Apply batched featurisation instead of row-by-row
+    if "batched" not in map_kwargs:
+        map_kwargs["batched"] = True
+
+    # only read the columns featurised by the steps (and not generated by them)
+    input_columns = [
+        column
+        for column in unique_everseen(
+            column for columns, _, _ in compiled_steps for column in columns
+        )
+        if column in dataset.column_names
+    ]
+    inputs = dataset.select_columns(input_columns)
+
+    # Declare output features upfront to avoid inferring them on every batch
+    features = None
+    if map_kwargs["batched"] and "features" not in map_kwargs:
+        features = _declared_steps_features(
+            inputs,
+            steps=compiled_steps,
+            batch_size=map_kwargs.get("batch_size"),
+        )
+        if features is not None:
+            map_kwargs["features"] = features
+
+    try:
+        featurised_columns = inputs.map(
+            function=_featurise_batch_steps,
+            fn_kwargs={"steps": compiled_steps, "features": features},
+            remove_columns=input_columns,
+            **map_kwargs,
+        )
+    except pa.ArrowInvalid as e:
+        raise TypeError(
+            "Apache Arrow serialisation error: one or more representations might be incompatible with Apache Arrow backends.",
+        ) from e
+
+    # input columns being overwritten have already been warned about
+    overwritten_columns = [
+        name for name in featurised_columns.column_names if name in dataset.column_names
+    ]
+    for name in overwritten_columns:
+        if name not in input_columns:
+            warnings.warn(
+                f"An existing column is being overwritten on featurisation: {name}",
+                stacklevel=1,
+            )
+
+    # overwritten columns keep their position, as they would with .map()
+    column_names = dataset.column_names + [
+        name
+        for name in featurised_columns.column_names
+        if name not in dataset.column_names
+    ]
+    featurised = datasets.concatenate_datasets(
+        [dataset.remove_columns(overwritten_columns), featurised_columns],
+        axis=1,
+    ).select_columns(column_names)
+
+    return featurised.remove_columns(remove_columns)
+
+
+def _indices_mapping(dataset: datasets.Dataset) -> NDArray[np.uint64] | None:
+    """Returns the rows of the underlying table of each row of the dataset, if mapped."""
+    if dataset._indices is None:
+        return None
+    return dataset._indices.column(0).to_numpy()
+
+
+def _compile_featurisation_step(
+    step: FeaturisationStep,
+) -> tuple[list[str], Representations, DisplayNames]:
+    """Resolves the columns, representations and canonical display names of a step."""
+    columns = [step.column] if isinstance(step.column, str) else step.column
+
+    representations = step.representations
+    if not isinstance(representations, Representations):
+        representations = [representations]
+
+    display_names = _to_canonical_display_names(
+        step.display_names,
+        representations=representations,
+    )
+    return columns, representations, display_names
+
+
+def _declared_steps_features(
+    inputs: datasets.Dataset,
+    steps: list[tuple[list[str], Representations, DisplayNames]],
+    batch_size: int | None,
+) -> datasets.Features | None:
+    """Builds the features of the columns featurised by several steps.
+
+    Steps whose representations do not all declare their output schema get
+    their features inferred from a first batch, as `.map()` would.
+    """
+    declared_features: dict[str, Any] = {}
+    all_declared = True
+    for columns, representations, display_names in steps:
+        step_features = _declared_output_features(
+            columns,
+            representations=representations,
+            display_names=display_names,
+        )
+        if step_features is None:
+            all_declared = False
+        else:
+            declared_features.update(step_features)
+
+    if all_declared:
+        return datasets.Features(declared_features)
+
+    # nothing to preserve by declaring features
+    if not declared_features or not inputs.num_rows:
+        return None
+
+    first_batch = inputs.with_format(None)[: batch_size or _DEFAULT_MAP_BATCH_SIZE]
+    featurised_batch = _featurise_batch_steps(
+        first_batch,
+        steps=steps,
+        features=datasets.Features(declared_features),
+    )
+    inferred_features = datasets.Dataset.from_dict(featurised_batch).features
+    return datasets.Features(
+        {
+            name: declared_features.get(name, feature)
+            for name, feature in inferred_features.items()
+        },
+    )
+
+
+def _featurise_batch_steps(
+    example: dict[str, Any],
+    steps: list[tuple[list[str], Representations, DisplayNames]],
+    features: datasets.Features | None = None,
+) -> dict[str, Any]:
+    """Applies several featurisation steps to a batch, and returns the featurised columns."""
+    batch = dict(example)
+    for columns, representations, display_names in steps:
+        batch = _featurise_batch(
+            batch,
+            columns=columns,
+            representations=representations,
+            display_names=display_names,
+            features=features,
+        )
+
+    return {
+        name: column
+        for name, column in batch.items()
+        if name not in example or column is not example[name]
+    }
+
+
+class FeaturisationPlan:
+    """Featurisation steps compiled for low-latency featurisation of in-memory samples.
+
+    The featurisation parameters of all representations are validated once,
+    when the plan is built. The plan then featurises columns of samples (e.g.
+    Python lists or NumPy arrays) in-process, without building datasets or
+    validating and logging each featurisation, such that the cost of
+    featurising a handful of samples (e.g. for online inference) is dominated
+    by the representations themselves.
+
+    Steps are applied one after the other, as in
+    `featurise_dataset_in_single_pass`, and featurised columns are named
+    according to the steps' display names.
+
+    Examples:
+        >>> from molflux.features import load_representation
+        >>> plan = FeaturisationPlan(
+        ...     [FeaturisationStep("smiles", load_representation("character_count"), "n")],
+        ... )
+        >>> plan.input_columns
+        ['smiles']
+        >>> plan({"smiles": ["C", "CCO"]})
+        {'smiles': ['C', 'CCO'], 'n': [1, 3]}
+    """
+
+    def __init__(self, steps: Sequence[FeaturisationStep]) -> None:
+        self._steps = [_compile_featurisation_step(step) for step in steps]
+        self._featurisers = [
+            [_bind(representation) for representation in representations]
+            for _, representations, _ in self._steps
+        ]
+
+        # featurised column names are only resolved once for each set of features
+        self._featurised_column_names: dict[tuple[int, int, tuple], list[str]] = {}
+
+        # the columns featurised by steps, and not generated by earlier steps
+        input_columns: list[str] = []
+        generated_columns: set[str] = set()
+        for columns, representations, display_names in self._steps:
+            input_columns.extend(
+                column
+                for column in columns
+                if column not in generated_columns and column not in input_columns
+            )
+            for representation, representation_display_names in zip(
+                representations,
+                display_names,
+                strict=False,
+            ):
+                output_schema = (
+                    representation.output_schema()
+                    if isinstance(representation, RepresentationWithOutputSchema)
+                    else None
+                )
+                if output_schema is None:
+                    # featurised column names are templated from display names
+                    generated_columns.update(
+                        name
+                        for name in representation_display_names
+                        if name is not None
+                    )
+                else:
+                    generated_columns.update(
+                        _featurised_column_names(
+                            columns,
+                            feature_names=list(output_schema.keys()),
+                            display_names=representation_display_names,
+                        ),
+                    )
+        self._input_columns = input_columns
+
+    @property
+    def input_columns(self) -> list[str]:
+        """The input columns required by the plan."""
+        return list(self._input_columns)
+
+    def __call__(self, inputs: Mapping[str, ArrayLike]) -> dict[str, Any]:
+        """Featurises columns of samples.
+
+        Args:
+            inputs: The input columns of samples, by column name.
+
+        Returns:
+            The input columns, followed by the featurised columns.
+        """
+        batch = dict(inputs)
+
+        # samples are parsed only once, and shared across all representations
+        with shared_molecules_context():
+            for i, ((columns, _, display_names), featurisers) in enumerate(
+                zip(self._steps, self._featurisers, strict=True),
+            ):
+                try:
+                    samples = [batch[column] for column in columns]
+                except KeyError as e:
+                    raise KeyError(
+                        f"Feature {e.args[0]!r} not in inputs: available features are {list(batch.keys())!r}",
+                    ) from None
+
+                for j, featurise in enumerate(featurisers):
+                    results = featurise(*samples)
+                    key = (i, j, tuple(results))
+                    featurised_column_names = self._featurised_column_names.get(key)
+                    if featurised_column_names is None:
+                        featurised_column_names = _featurised_column_names(
+                            columns,
+                            feature_names=list(results.keys()),
+                            display_names=display_names[j],
+                        )
+                        self._featurised_column_names[key] = featurised_column_names
+
+                    batch.update(
+                        zip(featurised_column_names, results.values(), strict=True),
+                    )
+
+        return batch
+
+
+def _bind(representation: Representation) -> Callable[..., dict[str, Any]]:
+    """Binds a representation's featurisation parameters, if supported."""
+    bind = getattr(representation, "bind", None)
+    if callable(bind):
+        return bind()
+    return representation.featurise
+
+
+def _map(dataset: DatasetType, **kwargs: Any) -> DatasetType:
+    """Maps a function over a dataset, or over each split of a dataset dict."""
+    # IterableDatasetDict.map() does not support declaring output features
+    if isinstance(dataset, datasets.IterableDatasetDict):
+        return datasets.IterableDatasetDict(
+            {k: split.map(**kwargs) for k, split in dataset.items()},
+        )
+    return dataset.map(**kwargs)
+
+
 def _featurise_batch(
     example: dict[str, Any],
     columns: list[str],
     representations: Representations,
     display_names: DisplayNames,
+    features: datasets.Features | None = None,
+    pool: FeaturisationPool | None = None,
+    cache: FeaturisationCache | None = None,
+    deduplicate: bool = False,
 ) -> dict[str, Any]:
     """Featurises a batch's column according to the given representations.
 
@@ -224,49 +741,355 @@ def _featurise_batch(
     # get the relevant columns from the dataset
     samples = [example[column] for column in columns]
 
-    for representation, representation_display_names in zip(
-        representations,
+    def featurise_each(*columns: Any) -> list[dict[str, Any]]:
+        if pool is not None:
+            return pool.featurise(*columns)
+
+        # samples are parsed only once per batch, and shared across all representations
+        with shared_molecules_context():
+            return [
+                representation.featurise(*columns) for representation in representations
+            ]
+
+    def featurise_cached(*columns: Any) -> list[dict[str, Any]]:
+        if cache is not None:
+            return cache.featurise(
+                list(representations),
+                *columns,
+                featurise=featurise_each,
+            )
+        return featurise_each(*columns)
+
+    if deduplicate:
+        batch_results = featurise_unique(*samples, featurise=featurise_cached)
+    else:
+        batch_results = featurise_cached(*samples)
+
+    for representation_results, representation_display_names in zip(
+        batch_results,
         display_names,
         strict=False,
     ):
-        # this could be a multi-output feature
-        representation_results = representation.featurise(*samples)
-
-        # handle template strings as display names for one-to-many representations
-        if len(representation_display_names) == 1 and len(representation_results) != 1:
-            display_name = representation_display_names[0]
-            is_template = display_name is None or (
-                "{" in display_name and "}" in display_name
-            )
-            if not is_template:
-                raise ValueError(
-                    f"Only template display names can be used as placeholders to be broadcasted: {display_name!r}",
-                )
-            representation_display_names = display_name  # type: ignore[assignment]
-
-        # templates should be broadcasted to apply to all columns of the variably sized output
-        for (feature_name, result), display_name in zip_broadcast(  # type: ignore[misc]
-            representation_results.items(),  # type: ignore[arg-type]
-            representation_display_names,  # type: ignore[arg-type]
+        featurised_column_names = _featurised_column_names(
+            columns,
+            feature_names=list(representation_results.keys()),
+            display_names=representation_display_names,
+        )
+        for featurised_column_name, (feature_name, result) in zip(
+            featurised_column_names,
+            representation_results.items(),
+            strict=False,
         ):
-            ctx = {"source_column": ":".join(columns), "feature_name": feature_name}  # type: ignore[has-type]
-            featurised_column_name = _template(
-                display_name,
-                default_template=_DEFAULT_DISPLAY_NAMES_TEMPLATE,
-                **ctx,
-            )
-
             if featurised_column_name in example:
                 warnings.warn(
-                    f"An existing column is being overwritten on featurisation: {':'.join(columns)}::{feature_name} >> {featurised_column_name}",  # type: ignore[has-type]
+                    f"An existing column is being overwritten on featurisation: {':'.join(columns)}::{feature_name} >> {featurised_column_name}",
                     stacklevel=1,
                 )
 
-            example[featurised_column_name] = result  # type: ignore[has-type]
+            declared_feature = (
+                features.get(featurised_column_name) if features is not None else None
+            )
+            example[featurised_column_name] = _to_batch_column(
+                result,
+                declared_feature=declared_feature,
+            )
 
     return example
 
 
+def _featurise_unique_rows(
+    dataset: DatasetType,
+    columns: list[str],
+    representations: Representations,
+    display_names: DisplayNames,
+    parallel: int | None,
+    cache: FeaturisationCache | None,
+    map_kwargs: dict[str, Any],
+) -> DatasetType:
+    """Featurises each unique row of the input columns once, and scatters results back.
+
+    Unique rows are found in a first pass over the input columns. They are
+    featurised as a dataset of their own, whose features are then gathered
+    back to the rows of each batch by index and appended to them in a final
+    `.map()` pass, such that the features of all rows are never held in
+    memory at once.
+    """
+    if isinstance(dataset, datasets.DatasetDict):
+        featurised_splits = datasets.DatasetDict(
+            {
+                split: _featurise_unique_rows(
+                    split_dataset,
+                    columns=columns,
+                    representations=representations,
+                    display_names=display_names,
+                    parallel=parallel,
+                    cache=cache,
+                    map_kwargs=map_kwargs,
+                )
+                for split, split_dataset in dataset.items()
+            },
+        )
+        return _consolidate_map_outputs(featurised_splits)
+
+    for column in columns:
+        if column not in dataset.column_names:
+            raise KeyError(
+                f"Feature {column!r} not in dataset: available features are {dataset.column_names!r}",
+            )
+
+    map_kwargs = dict(map_kwargs)
+    remove_columns = map_kwargs.pop("remove_columns", None) or []
+    if isinstance(remove_columns, str):
+        remove_columns = [remove_columns]
+
+    inputs = dataset.select_columns(columns).with_format(None)
+    first_indices, inverse = unique_rows(
+        zip(*(inputs[column] for column in columns), strict=True),
+    )
+
+    # nothing to gain from deduplication
+    if len(first_indices) == len(inverse):
+        return featurise_dataset(
+            dataset,
+            column=columns,
+            representations=representations,
+            display_names=display_names,
+            parallel=parallel,
+            cache=cache,
+            remove_columns=remove_columns or None,
+            **map_kwargs,
+        )
+
+    featurised_inputs = featurise_dataset(
+        inputs.select(first_indices),
+        column=columns,
+        representations=representations,
+        display_names=display_names,
+        parallel=parallel,
+        cache=cache,
+        **map_kwargs,
+    )
+    featurised_inputs = featurised_inputs.remove_columns(columns)
+
+    overwritten_columns = [
+        name for name in featurised_inputs.column_names if name in dataset.column_names
+    ]
+    for name in overwritten_columns:
+        warnings.warn(
+            f"An existing column is being overwritten on featurisation: {name}",
+            stacklevel=1,
+        )
+
+    dropped_columns = set(overwritten_columns).union(remove_columns)
+    features = datasets.Features(
+        {
+            name: feature
+            for name, feature in dataset.features.items()
+            if name not in dropped_columns
+        },
+    )
+    features.update(featurised_inputs.features)
+
+    # scatter the features of unique rows back to all rows, one batch at a time
+    featurised = dataset.with_format("arrow").map(
+        _scatter_unique_rows,
+        batched=True,
+        with_indices=True,
+        features=features,
+        fn_kwargs={
+            "unique_rows": featurised_inputs.with_format("arrow"),
+            "inverse": inverse,
+            "dropped_columns": sorted(dropped_columns),
+        },
+        **{
+            name: value
+            for name, value in map_kwargs.items()
+            if name in _SCATTER_MAP_KWARGS
+        },
+    )
+    return featurised.with_format(
+        dataset.format["type"],
+        output_all_columns=dataset.format["output_all_columns"],
+        **dataset.format["format_kwargs"],
+    )
+
+
+def _scatter_unique_rows(
+    batch: pa.Table,
+    indices: list[int],
+    unique_rows: datasets.Dataset,
+    inverse: NDArray[np.intp],
+    dropped_columns: list[str],
+) -> pa.Table:
+    """Appends the features of the unique rows of a batch of rows to the batch."""
+    features = unique_rows[inverse[indices].tolist()]
+    batch = batch.drop_columns(
+        [name for name in dropped_columns if name in batch.column_names],
+    )
+    for name in features.column_names:
+        batch = batch.append_column(name, features.column(name))
+    return batch
+
+
+def _featurised_column_names(
+    columns: list[str],
+    feature_names: list[str],
+    display_names: list[str | None],
+) -> list[str]:
+    """Generates the names of the columns holding a representation's features.
+
+    Args:
+        columns: The source columns of the featurisation.
+        feature_names: The names of the features generated by the representation.
+        display_names: The display names (or templates) for the representation.
+
+    Returns:
+        The featurised column names, one for each feature.
+    """
+    # handle template strings as display names for one-to-many representations
+    if len(display_names) == 1 and len(feature_names) != 1:
+        display_name = display_names[0]
+        is_template = display_name is None or (
+            "{" in display_name and "}" in display_name
+        )
+        if not is_template:
+            raise ValueError(
+                f"Only template display names can be used as placeholders to be broadcasted: {display_name!r}",
+            )
+        display_names = display_name  # type: ignore[assignment]
+
+    # templates should be broadcasted to apply to all columns of the variably sized output
+    source_column = ":".join(columns)
+    return [
+        _template(
+            display_name,
+            default_template=_DEFAULT_DISPLAY_NAMES_TEMPLATE,
+            source_column=source_column,
+            feature_name=feature_name,
+        )
+        for feature_name, display_name in zip_broadcast(  # type: ignore[misc]
+            feature_names,
+            display_names,
+        )
+    ]
+
+
+def _declared_features(
+    dataset: DatasetType,
+    columns: list[str],
+    representations: Representations,
+    display_names: DisplayNames,
+    map_kwargs: dict[str, Any],
+) -> datasets.Features | None:
+    """Builds the featurised dataset features from the representations' output schemas.
+
+    Declaring features upfront spares `datasets` from inferring Apache Arrow
+    types from Python objects on every batch. If the features of the featurised
+    dataset cannot be fully determined ahead of featurisation (e.g. because a
+    representation does not declare its output schema), `None` is returned and
+    features are inferred as usual.
+    """
+    if not map_kwargs.get("batched") or "features" in map_kwargs:
+        return None
+
+    if isinstance(dataset, (datasets.DatasetDict, datasets.IterableDatasetDict)):
+        all_input_features = [split.features for split in dataset.values()]
+        if not all_input_features or any(
+            input_features != all_input_features[0]
+            for input_features in all_input_features
+        ):
+            return None
+        input_features = all_input_features[0]
+    elif isinstance(dataset, (datasets.Dataset, datasets.IterableDataset)):
+        input_features = dataset.features
+    else:
+        return None
+
+    # the features of iterable datasets are not always known ahead of iteration
+    if input_features is None:
+        return None
+
+    output_features = _declared_output_features(
+        columns,
+        representations=representations,
+        display_names=display_names,
+    )
+    if output_features is None:
+        return None
+
+    features = input_features.copy()
+    features.update(output_features)
+
+    remove_columns = map_kwargs.get("remove_columns") or []
+    if isinstance(remove_columns, str):
+        remove_columns = [remove_columns]
+    for column in remove_columns:
+        features.pop(column, None)
+
+    return features
+
+
+def _declared_output_features(
+    columns: list[str],
+    representations: Representations,
+    display_names: DisplayNames,
+) -> dict[str, datasets.Value | datasets.Sequence] | None:
+    """Builds the features of the featurised columns from the representations' output schemas.
+
+    Returns `None` if any of the representations does not declare its output schema.
+    """
+    output_features: dict[str, datasets.Value | datasets.Sequence] = {}
+    for representation, representation_display_names in zip(
+        representations,
+        display_names,
+        strict=False,
+    ):
+        if not isinstance(representation, RepresentationWithOutputSchema):
+            return None
+
+        output_schema = representation.output_schema()
+        if output_schema is None:
+            return None
+
+        featurised_column_names = _featurised_column_names(
+            columns,
+            feature_names=list(output_schema.keys()),
+            display_names=representation_display_names,
+        )
+        for featurised_column_name, feature_schema in zip(
+            featurised_column_names,
+            output_schema.values(),
+            strict=False,
+        ):
+            output_features[featurised_column_name] = _to_feature(feature_schema)
+
+    return output_features
+
+
+def _to_feature(feature_schema: FeatureSchema) -> datasets.Value | datasets.Sequence:
+    """Converts a declared feature schema into a `datasets` feature."""
+    value = datasets.Value(feature_schema.dtype)
+    if feature_schema.length is None:
+        return value
+    return datasets.Sequence(value, length=feature_schema.length)
+
+
+def _to_batch_column(result: Any, declared_feature: Any | None) -> Any:
+    """Prepares a featurised column for writing to Apache Arrow.
+
+    Fixed-size list features are converted to NumPy arrays, which are written
+    to Apache Arrow straight from their buffers instead of element by element.
+    """
+    if (
+        isinstance(declared_feature, datasets.Sequence)
+        and declared_feature.length != -1
+        and not isinstance(result, np.ndarray)
+        and len(result)
+    ):
+        return np.asarray(result, dtype=declared_feature.feature.dtype)
+    return result
+
+
 def _template(target: str | None, default_template: str, **ctx: Any) -> str:
     """Templates a string with local context information.
 
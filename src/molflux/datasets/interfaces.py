@@ -12,6 +12,12 @@ class Representation(Protocol):
         """Featurises the input samples."""
 
 
+@runtime_checkable
+class RepresentationWithOutputSchema(Representation, Protocol):
+    def output_schema(self, **kwargs: Any) -> dict[str, Any] | None:
+        """Returns the schema of the features generated by featurise(), if known."""
+
+
 @runtime_checkable
 class Representations(Protocol):
     def __iter__(self) -> Iterator[Representation]: ...
@@ -1,3 +1,4 @@
+import contextlib
 import json
 import os
 import pathlib
@@ -5,10 +6,12 @@ import warnings
 from typing import Any, Literal, cast, get_args
 
 import fsspec
+import pyarrow.parquet as pq
 
 import datasets
 from datasets import Dataset, DatasetDict, IterableDataset, IterableDatasetDict
 from datasets.filesystems import is_remote_filesystem
+from datasets.table import table_cast
 from datasets.utils.py_utils import NestedDataStructure
 from molflux.datasets.typing import DataFiles, FileSystem, HFDataFiles, PathLike
 from molflux.datasets.utils import (
@@ -19,6 +22,11 @@ from molflux.datasets.utils import (
 SupportedFileFormats = Literal["disk", "parquet", "csv", "json"]
 _DEFAULT_DATASET_DICT_FORMAT: SupportedFileFormats = "parquet"
 
+# Iterable datasets are streamed to shards of Parquet files
+_ITERABLE_DATASET_FORMAT: SupportedFileFormats = "parquet"
+_DEFAULT_MAX_ROWS_PER_SHARD = 100_000
+_DEFAULT_WRITE_BATCH_SIZE = 10_000
+
 
 def __resolve_path_file_format(path: str) -> SupportedFileFormats:
     """Resolves the core file format of persisted assets.
@@ -144,7 +152,7 @@ def _resolve_file_system_for_data_files(data_files: HFDataFiles) -> FileSystem:
 
 
 def save_dataset_to_store(
-    dataset: Dataset | DatasetDict,
+    dataset: Dataset | DatasetDict | IterableDataset | IterableDatasetDict,
     path: PathLike,
     format: SupportedFileFormats | None = None,
     fs: FileSystem | None = None,
@@ -152,17 +160,29 @@ def save_dataset_to_store(
 ) -> None:
     """Save a dataset to persistent storage.
 
+    IterableDatasets (e.g. lazily featurised ones) are streamed batch by batch
+    to a directory of sharded Parquet files, without ever being materialised
+    in full. IterableDatasetDicts are streamed to one such directory per split.
+
     Args:
-        dataset: The Dataset or DatasetDict to persist.
+        dataset: The Dataset, DatasetDict, IterableDataset or
+            IterableDatasetDict to persist.
         path: The target path where to save the dataset. Should be a directory
-            for DatasetDicts or for saving datasets as 'disk' format.
+            for DatasetDicts, for iterable datasets, or for saving datasets as
+            'disk' format.
         format: The file format to save the dataset as. Should be one of
             ["disk", "parquet", "csv", "json"]. If missing, for Datasets this
             will be automatically inferred from 'path'. For DatasetDicts, it
-            will default to "parquet".
+            will default to "parquet". Iterable datasets can only be saved as
+            "parquet".
         fs: The filesystem object to use to save the dataset. If not provided,
             an appropriate filesystem will be automatically provided for
             saving the data.
+        kwargs: Keyword arguments forwarded to the underlying writer. For
+            iterable datasets, `max_rows_per_shard` (defaults to 100,000) and
+            `batch_size` (the number of rows read and written at a time,
+            defaults to 10,000) can be set, and any other keyword arguments
+            are forwarded to `pyarrow.parquet.ParquetWriter`.
 
     Examples:
         >>> from molflux.datasets import save_dataset_to_store  # doctest: +SKIP
@@ -176,6 +196,8 @@ def save_dataset_to_store(
         >>> save_dataset_to_store(dataset_dict, "s3://my/dataset/data", format="csv")  # doctest: +SKIP
         # save a DatasetDict as a bunch of .arrow files
         >>> save_dataset_to_store(dataset_dict, "s3://my/dataset/data", format="disk")  # doctest: +SKIP
+        # stream an IterableDataset to a directory of parquet shards
+        >>> save_dataset_to_store(iterable_dataset, "s3://my/dataset/data")  # doctest: +SKIP
     """
 
     path = str(path)
@@ -185,6 +207,15 @@ def save_dataset_to_store(
         fs = _resolve_file_system_for_data_files(data_files=path)
     _check_compatible_filesystem(fs, data_files=path)
 
+    if isinstance(dataset, (IterableDataset, IterableDatasetDict)):
+        return _save_iterable_dataset_to_store(
+            dataset,
+            path=path,
+            format=format or _ITERABLE_DATASET_FORMAT,
+            fs=fs,
+            **kwargs,
+        )
+
     # Resolve format if one not specified (convenience)
     is_dataset_dict = isinstance(dataset, datasets.DatasetDict)
     if format is None:
@@ -298,6 +329,141 @@ def _save_dataset_to_file(
             raise NotImplementedError(f"Invalid file format: {format}")
 
 
+def _save_iterable_dataset_to_store(
+    dataset: IterableDataset | IterableDatasetDict,
+    path: str,
+    format: SupportedFileFormats,
+    fs: FileSystem,
+    **kwargs: Any,
+) -> None:
+    """Streams an IterableDataset or IterableDatasetDict to sharded files."""
+
+    if format != _ITERABLE_DATASET_FORMAT:
+        raise ValueError(
+            f"Unsupported dataset format for iterable datasets: got {format!r} expected {_ITERABLE_DATASET_FORMAT!r}",
+        )
+
+    if pathlib.Path(path).suffix:
+        raise ValueError(
+            f"Invalid path for iterable dataset: {path!r} is not a directory-like path",
+        )
+
+    if isinstance(dataset, IterableDataset):
+        return _save_iterable_dataset_to_shards(
+            dataset,
+            dataset_path=path,
+            format=format,
+            fs=fs,
+            **kwargs,
+        )
+
+    is_local = not is_remote_filesystem(fs)
+    if is_local:
+        pathlib.Path(path).resolve().mkdir(parents=True, exist_ok=True)
+
+    # write out huggingface's dataset_dict.json metadata file
+    dataset_dict_json_filepath = os.path.join(
+        path,
+        datasets.config.DATASETDICT_JSON_FILENAME,
+    )
+    with fs.open(dataset_dict_json_filepath, "w", encoding="utf-8") as f:
+        json.dump({"splits": list(dataset)}, f)
+
+    # stream each split to its own directory of shards
+    for k, split_dataset in dataset.items():
+        _save_iterable_dataset_to_shards(
+            split_dataset,
+            dataset_path=os.path.join(path, k),
+            format=format,
+            fs=fs,
+            **kwargs,
+        )
+
+
+def _save_iterable_dataset_to_shards(
+    dataset: IterableDataset,
+    dataset_path: str,
+    format: SupportedFileFormats,
+    fs: FileSystem,
+    max_rows_per_shard: int = _DEFAULT_MAX_ROWS_PER_SHARD,
+    batch_size: int = _DEFAULT_WRITE_BATCH_SIZE,
+    **kwargs: Any,
+) -> None:
+    """Streams a single IterableDataset to a directory of Parquet shards.
+
+    Only one batch of rows is held in memory at a time. Each shard holds at
+    most `max_rows_per_shard` rows, written as one row group per batch.
+    """
+
+    if max_rows_per_shard < 1:
+        raise ValueError(
+            f"max_rows_per_shard must be a positive integer: {max_rows_per_shard}",
+        )
+
+    is_local = not is_remote_filesystem(fs)
+    if is_local:
+        pathlib.Path(dataset_path).resolve().mkdir(parents=True, exist_ok=True)
+
+    # the schema is inferred from the first batch if features are not declared
+    schema = dataset.features.arrow_schema if dataset.features is not None else None
+
+    n_shards = 0
+    rows_in_shard = 0
+    with contextlib.ExitStack() as shard:
+        writer = None
+        for table in dataset.with_format("arrow").iter(batch_size=batch_size):
+            if schema is None:
+                schema = table.schema
+            table = table_cast(table, schema)
+
+            offset = 0
+            while offset < table.num_rows:
+                if writer is None:
+                    shard_path = _generate_shard_path(
+                        dataset_path,
+                        shard=n_shards,
+                        format=format,
+                    )
+                    f = shard.enter_context(fs.open(shard_path, "wb"))
+                    writer = shard.enter_context(pq.ParquetWriter(f, schema, **kwargs))
+                    n_shards += 1
+
+                n_rows = min(
+                    table.num_rows - offset,
+                    max_rows_per_shard - rows_in_shard,
+                )
+                writer.write_table(table.slice(offset, n_rows))
+                offset += n_rows
+                rows_in_shard += n_rows
+
+                if rows_in_shard == max_rows_per_shard:
+                    shard.close()
+                    writer = None
+                    rows_in_shard = 0
+
+    # empty datasets are saved as a single empty shard, if their schema is known
+    if n_shards == 0 and schema is not None:
+        shard_path = _generate_shard_path(dataset_path, shard=0, format=format)
+        with fs.open(shard_path, "wb") as f:
+            pq.write_table(schema.empty_table(), f, **kwargs)
+
+
+def _generate_shard_path(root: str, shard: int, format: SupportedFileFormats) -> str:
+    """Generates a standardised name for shards of iterable datasets."""
+    return os.path.join(root, f"part-{shard:05d}.{format}")
+
+
+def _is_sharded_dataset_dir(
+    path: str,
+    format: SupportedFileFormats,
+    fs: FileSystem,
+) -> bool:
+    """Checks whether a directory holds the shards of a streamed iterable dataset."""
+    return bool(fs.isdir(path)) and bool(
+        fs.glob(_generate_shard_path(path, shard=0, format=format)),
+    )
+
+
 def _is_dataset_dict_dir(dest_dataset_dict_path: str, fs: FileSystem) -> bool:
     """Checks that we are in a dataset_dict artefact directory.
 
@@ -344,10 +510,20 @@ def _resolve_expected_dataset_dict_dir_data_files(
     with fs.open(dataset_dict_json_path, "r", encoding="utf-8") as f:
         splits = json.load(f)["splits"]
 
-    return {
-        k: _generate_split_path(dest_dataset_dict_path, split=k, format=format)
-        for k in splits
-    }
+    data_files: dict[str, str] = {}
+    for k in splits:
+        # splits of iterable datasets are streamed to directories of shards
+        split_dir = os.path.join(dest_dataset_dict_path, k)
+        if _is_sharded_dataset_dir(split_dir, format=format, fs=fs):
+            data_files[k] = os.path.join(split_dir, f"*.{format}")
+        else:
+            data_files[k] = _generate_split_path(
+                dest_dataset_dict_path,
+                split=k,
+                format=format,
+            )
+
+    return data_files
 
 
 def load_dataset_from_store(
@@ -401,6 +577,16 @@ def load_dataset_from_store(
 
     # Resolve format if one not specified (convenience)
     is_dataset_dict = isinstance(source, str) and _is_dataset_dict_dir(source, fs=fs)
+
+    # Expand directories of shards of streamed iterable datasets (convenience)
+    if (
+        isinstance(source, str)
+        and not is_dataset_dict
+        and format in {None, _ITERABLE_DATASET_FORMAT}
+        and _is_sharded_dataset_dir(source, format=_ITERABLE_DATASET_FORMAT, fs=fs)
+    ):
+        source = os.path.join(source, f"*.{_ITERABLE_DATASET_FORMAT}")
+
     if format is None:
         format = (
             _DEFAULT_DATASET_DICT_FORMAT
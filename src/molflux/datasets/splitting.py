@@ -2,7 +2,12 @@
 Wrappers for using splitting strategies to split datasets.Datasets.
 """
 
-from collections.abc import Iterator
+import hashlib
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+import pyarrow as pa
+from numpy.typing import NDArray
 
 from datasets import Dataset, DatasetDict
 from molflux.datasets.interfaces import SplittingStrategy
@@ -16,6 +21,13 @@ def split_dataset(
 ) -> Iterator[DatasetDict]:
     """Generates dataset splits according to given strategy.
 
+    Splits share the Arrow table of `dataset`, and only hold an in-memory
+    mapping of the indices of their rows (or a slice of the table, for
+    contiguous indices), which is never written to a cache file. Splits of
+    identical indices within a fold, or in consecutive folds, are new
+    datasets sharing the same mapping of indices. Use `flatten_indices()` on
+    a split to materialise its rows into a new table.
+
     Args:
         dataset: The dataset to split.
         strategy: A pre-configured instance of the splitting strategy to use.
@@ -31,19 +43,42 @@ def split_dataset(
     y = dataset[target_column] if target_column is not None else None
     groups = dataset[groups_column] if groups_column is not None else None
 
-    for train_indices, validation_indices, test_indices in strategy.split(
+    # the splits of the previous fold, by digest of their indices
+    previous_splits: dict[bytes, Dataset] = {}
+    for fold in strategy.split(
         dataset=dataset,
         y=y,
         groups=groups,
     ):
-        train_split = dataset.select(indices=train_indices)
-        validation_split = dataset.select(indices=validation_indices)
-        test_split = dataset.select(indices=test_indices)
-
-        yield DatasetDict(
-            {
-                "train": train_split,
-                "validation": validation_split,
-                "test": test_split,
-            },
-        )
+        splits: dict[bytes, Dataset] = {}
+        fold_splits = {}
+        for name, split_indices in zip(
+            ("train", "validation", "test"),
+            fold,
+            strict=True,
+        ):
+            indices = _as_indices_array(split_indices)
+            key = hashlib.sha1(indices.tobytes(), usedforsecurity=False).digest()
+            split = splits.get(key, previous_splits.get(key))
+            if split is None:
+                split = dataset.select(indices=indices, keep_in_memory=True)
+            elif len(split) == 0:
+                split = dataset.select(indices=range(0))
+            else:
+                # a new dataset, slicing the same mapping of indices
+                split = split.select(indices=range(len(split)))
+            splits[key] = split
+            fold_splits[name] = split
+
+        previous_splits = splits
+        yield DatasetDict(fold_splits)
+
+
+def _as_indices_array(indices: Iterable[int]) -> NDArray[np.int64]:
+    if isinstance(indices, np.ndarray):
+        return indices.astype(np.int64, copy=False).ravel()
+    if isinstance(indices, pa.Array | pa.ChunkedArray):
+        return indices.to_numpy().astype(np.int64, copy=False)
+    if not isinstance(indices, list | tuple | range):
+        indices = list(indices)
+    return np.asarray(indices, dtype=np.int64).ravel()
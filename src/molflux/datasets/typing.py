@@ -7,7 +7,7 @@ from typing import (
 
 import fsspec
 
-from datasets import Dataset, DatasetDict
+from datasets import Dataset, DatasetDict, IterableDataset, IterableDatasetDict
 
 # A list of lists of strings or Nones
 DisplayNames = list[list[str | None]]
@@ -27,4 +27,10 @@ DataFiles = Union[
     Mapping[str, PathLike | Sequence[PathLike]],
 ]
 
-DatasetType = TypeVar("DatasetType", Dataset, DatasetDict)
+DatasetType = TypeVar(
+    "DatasetType",
+    Dataset,
+    DatasetDict,
+    IterableDataset,
+    IterableDatasetDict,
+)
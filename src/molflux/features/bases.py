@@ -2,17 +2,21 @@
 Abstract Base Classes for classes implementing the Representation protocol.
 """
 
+import functools
 import inspect
 import logging
 import time
 import types
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from typing import Any
 
 from molflux import __version__
-from molflux.features.info import RepresentationInfo
+from molflux.features.cache import FeaturisationCache
+from molflux.features.deduplication import featurise_unique
+from molflux.features.info import FeatureSchema, RepresentationInfo
 from molflux.features.naming import camelcase_to_snakecase
+from molflux.features.parallel import FeaturisationPool
 from molflux.features.typing import ArrayLike, RepresentationResult
 from molflux.features.utils import copyfunc
 
@@ -20,7 +24,15 @@ logger = logging.getLogger(__name__)
 
 
 class RepresentationBase(ABC):
-    """The abstract base class for all concrete representations."""
+    """The abstract base class for all concrete representations.
+
+    Representations must not modify the molecules they featurise in place.
+    Within a `molflux.features.utils.shared_molecules_context` (e.g. when
+    featurising a collection of representations), each input sample is parsed
+    only once, and the same molecule object (e.g. a `Chem.Mol` or an `OEMol`)
+    is featurised by every representation. Representations modifying
+    molecules (e.g. adding hydrogens or conformers) must do so on a copy.
+    """
 
     def __init__(self, *, tag: str | None = None, **kwargs: Any) -> None:
         """Initialises the representation."""
@@ -96,21 +108,31 @@ class RepresentationBase(ABC):
     def tag(self) -> str:
         return self._representation_info.tag
 
-    def featurise(self, *columns: ArrayLike, **kwargs: Any) -> RepresentationResult:
-        """Featurises the input samples."""
+    def featurise(
+        self,
+        *columns: ArrayLike,
+        n_jobs: int | None = None,
+        chunk_size: int | None = None,
+        cache: FeaturisationCache | None = None,
+        deduplicate: bool = False,
+        **kwargs: Any,
+    ) -> RepresentationResult:
+        """Featurises the input samples.
+
+        Samples are featurised in chunks over `n_jobs` worker processes if
+        `n_jobs` is set (`-1` to use all available CPUs), and serially otherwise.
+        For repeated parallel featurisation, use a persistent
+        `molflux.features.parallel.FeaturisationPool` instead. If a `cache` is
+        given, only samples missing from it are featurised. If `deduplicate` is
+        set, repeated samples are featurised only once and their results are
+        copied to all of their occurrences.
+        """
 
         # Merge explicit keyword arguments with those stored in the state
         kwargs = {**self.state, **kwargs}
 
         # Safeguard against invalid kwargs
-        if not all(k in self._signature.parameters for k in kwargs.keys()):
-            unknown_kwargs = [
-                k for k in kwargs.keys() if k not in self._signature.parameters
-            ]
-            raise ValueError(
-                f"Unknown featurisation parameter(s): {unknown_kwargs}\n\n"
-                f"Expected signature self.featurise{self._signature}",
-            )
+        self._raise_on_unknown_parameters(kwargs)
 
         # Safeguard against non ArrayLike inputs
         columns = tuple(
@@ -120,6 +142,39 @@ class RepresentationBase(ABC):
             for column in columns
         )
 
+        if deduplicate:
+            return featurise_unique(
+                *columns,
+                featurise=lambda *unique_columns: [
+                    self.featurise(
+                        *unique_columns,
+                        n_jobs=n_jobs,
+                        chunk_size=chunk_size,
+                        cache=cache,
+                        **kwargs,
+                    ),
+                ],
+            )[0]
+
+        if cache is not None:
+            return cache.featurise(
+                [self],
+                *columns,
+                featurise=lambda *missing_columns: [
+                    self.featurise(
+                        *missing_columns,
+                        n_jobs=n_jobs,
+                        chunk_size=chunk_size,
+                        **kwargs,
+                    ),
+                ],
+                kwargs=[kwargs],
+            )[0]
+
+        if n_jobs is not None and n_jobs != 1:
+            with FeaturisationPool([self], n_jobs=n_jobs) as pool:
+                return pool.featurise(*columns, chunk_size=chunk_size, **kwargs)[0]
+
         logging_context: dict[str, Any] = {"molflux_representation_tag": self.tag}
         logger.info(
             f"Attempting to featurise samples... {logging_context}",
@@ -149,9 +204,60 @@ class RepresentationBase(ABC):
 
         return results
 
+    def bind(self, **kwargs: Any) -> Callable[..., RepresentationResult]:
+        """Binds featurisation parameters into a low-overhead featurisation callable.
+
+        Keyword arguments are merged with those stored in the state and
+        validated once. The returned callable featurises columns of samples
+        (e.g. lists or NumPy arrays) without the per-call validation and
+        logging of featurise(), for latency-sensitive uses such as online
+        inference.
+
+        Examples:
+            >>> from molflux.features import load_representation
+            >>> featurise = load_representation("character_count").bind()
+            >>> featurise(["C", "CCO"])
+            {'character_count': [1, 3]}
+        """
+        kwargs = {**self.state, **kwargs}
+        self._raise_on_unknown_parameters(kwargs)
+        return functools.partial(self._featurise, **kwargs)
+
+    def _raise_on_unknown_parameters(self, kwargs: dict[str, Any]) -> None:
+        if not all(k in self._signature.parameters for k in kwargs.keys()):
+            unknown_kwargs = [
+                k for k in kwargs.keys() if k not in self._signature.parameters
+            ]
+            raise ValueError(
+                f"Unknown featurisation parameter(s): {unknown_kwargs}\n\n"
+                f"Expected signature self.featurise{self._signature}",
+            )
+
     @abstractmethod
     def _featurise(self, *columns: ArrayLike, **kwargs: Any) -> RepresentationResult:
-        """The featurisation callable to be implemented by subclasses."""
+        """The featurisation callable to be implemented by subclasses.
+
+        Input molecules must not be modified in place, as they might be shared
+        with other representations.
+        """
+
+    def output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema] | None:
+        """Returns the schema of the features generated by featurise(), if known.
+
+        Keyword arguments are merged with those stored in the state, as they
+        would be on featurisation. Returns `None` if the representation does
+        not declare an output schema.
+        """
+        kwargs = {**self.state, **kwargs}
+        return self._output_schema(**kwargs)
+
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema] | None:
+        """Declares the output schema for the given featurisation parameters.
+
+        Can optionally be implemented by subclasses whose outputs have a fixed
+        type and size that is known ahead of featurisation.
+        """
+        return None
 
     def reset_state(self) -> None:
         """Resets the state."""
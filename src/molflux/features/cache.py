@@ -0,0 +1,401 @@
+"""
+A persistent, content-addressed cache of featurisation results.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any
+
+import numpy as np
+from datasets.fingerprint import Hasher
+
+import molflux
+from molflux.features.typing import ArrayLike, PathLike, RepresentationResult
+
+_DEFAULT_MAX_SIZE = 2**30  # 1 GiB
+
+# SQLite's default limit on the number of parameters of a single statement
+_MAX_QUERY_PARAMETERS = 999
+
+# The version of the layout of cached entries, part of their keys
+_ENTRY_FORMAT = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key BLOB PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+class FeaturisationCache:
+    """An on-disk cache of featurisation results, backed by SQLite.
+
+    Results are cached for each input sample, keyed by a hash of the sample,
+    the representation's name, tag and featurisation parameters, and the
+    version of molflux. Cached samples are neither parsed nor featurised again.
+    Once the cache grows beyond `max_size` bytes, the least recently used
+    results are evicted.
+
+    Hits and misses are counted for each sample looked up for each
+    representation, and are local to this cache object.
+
+    Examples:
+        >>> import tempfile
+        >>> from molflux.features import load_representation
+        >>> representation = load_representation('character_count')
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     cache = FeaturisationCache(os.path.join(tmpdir, "cache.sqlite"))
+        ...     _ = representation.featurise(['C', 'CC'], cache=cache)
+        ...     representation.featurise(['CC', 'CCC'], cache=cache)
+        ...     cache.close()
+        {'character_count': [2, 3]}
+        >>> cache.hits, cache.misses
+        (1, 3)
+    """
+
+    def __init__(self, path: PathLike, max_size: int | None = _DEFAULT_MAX_SIZE):
+        """Initialises the cache.
+
+        Args:
+            path: The path to the SQLite database file backing the cache. It is
+                created if it does not exist.
+            max_size: The maximum size of the cached results, in bytes. If
+                `None`, results are never evicted.
+        """
+        self._path = os.fspath(path)
+        self._max_size = max_size
+        self._connection: sqlite3.Connection | None = None
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> "FeaturisationCache":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        (n_entries,) = (
+            self._get_connection()
+            .execute(
+                "SELECT COUNT(*) FROM entries",
+            )
+            .fetchone()
+        )
+        return n_entries  # type: ignore[no-any-return]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # copies (e.g. in worker processes) open their own connection on first use
+        return type(self), (self._path, self._max_size)
+
+    def __repr__(self) -> str:
+        return f"FeaturisationCache(path={self._path!r}, max_size={self._max_size!r})"
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that were served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def size(self) -> int:
+        """The total size of the cached results, in bytes."""
+        self._get_connection()
+        return self._size
+
+    def clear(self) -> None:
+        """Evicts all cached results."""
+        connection = self._get_connection()
+        with connection:
+            connection.execute("DELETE FROM entries")
+        self._size = 0
+
+    def close(self) -> None:
+        """Closes the connection to the underlying database."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def reset_stats(self) -> None:
+        """Resets the hit and miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+    def featurise(
+        self,
+        representations: Sequence[Any],
+        *columns: ArrayLike,
+        featurise: Callable[..., list[RepresentationResult]],
+        kwargs: Sequence[dict[str, Any]] | None = None,
+    ) -> list[RepresentationResult]:
+        """Featurises the input samples, featurising only those not yet cached.
+
+        Args:
+            representations: The representations to featurise samples with.
+            columns: The input columns to featurise.
+            featurise: A callable featurising input columns with each of the
+                representations, in order. It is only called with the samples
+                missing from the cache for at least one of the representations.
+            kwargs: The featurisation parameters of each representation. If
+                `None`, the state of each representation is used.
+
+        Returns:
+            The featurisation results, one for each of the representations.
+        """
+        columns = tuple(_as_list(column) for column in columns)
+        n_samples = len(columns[0]) if columns else 0
+        if n_samples == 0:
+            return featurise(*columns)
+
+        if kwargs is None:
+            kwargs = [getattr(r, "state", {}) for r in representations]
+
+        samples_digests = [_digest_sample(row) for row in zip(*columns, strict=True)]
+        keys = [
+            [
+                _cache_key(representation_digest, sample_digest)
+                for sample_digest in samples_digests
+            ]
+            for representation_digest in (
+                _digest_representation(representation, representation_kwargs)
+                for representation, representation_kwargs in zip(
+                    representations,
+                    kwargs,
+                    strict=True,
+                )
+            )
+        ]
+
+        cached = self._get_many(
+            [key for representation_keys in keys for key in representation_keys],
+        )
+        # per representation, the cached entry of each sample (or None): its
+        # value for each feature, and the features returned as NumPy arrays
+        entries: list[list[dict[str, Any] | None]] = [
+            [cached.get(key) for key in representation_keys]
+            for representation_keys in keys
+        ]
+
+        n_hits = sum(entry is not None for row in entries for entry in row)
+        self.hits += n_hits
+        self.misses += len(representations) * n_samples - n_hits
+
+        missing = [
+            i for i in range(n_samples) if any(row[i] is None for row in entries)
+        ]
+        if missing:
+            missing_columns = tuple([column[i] for i in missing] for column in columns)
+            missing_results = featurise(*missing_columns)
+
+            new_entries: dict[bytes, dict[str, Any]] = {}
+            for representation_keys, row, results in zip(
+                keys,
+                entries,
+                missing_results,
+                strict=True,
+            ):
+                stacked = [
+                    name
+                    for name, values in results.items()
+                    if isinstance(values, np.ndarray)
+                ]
+                for j, i in enumerate(missing):
+                    entry = {
+                        "values": {name: values[j] for name, values in results.items()},
+                        "stacked": stacked,
+                    }
+                    row[i] = entry
+                    if samples_digests[i] is not None:
+                        new_entries[representation_keys[i]] = entry
+            self._put_many(new_entries)
+
+        return [_assemble(row) for row in entries]  # type: ignore[arg-type]
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self._path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            (self._size,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries",
+            ).fetchone()
+            self._connection = connection
+        return self._connection
+
+    def _get_many(self, keys: list[bytes | None]) -> dict[bytes, dict[str, Any]]:
+        connection = self._get_connection()
+        unique_keys = list({key for key in keys if key is not None})
+
+        cached: dict[bytes, dict[str, Any]] = {}
+        with connection:
+            for batch in _batched(unique_keys, _MAX_QUERY_PARAMETERS):
+                placeholders = ",".join("?" * len(batch))
+                rows = connection.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders})",  # noqa: S608
+                    batch,
+                ).fetchall()
+                for key, value in rows:
+                    cached[key] = pickle.loads(value)  # noqa: S301
+
+                # mark hits as recently used
+                if rows:
+                    hit_keys = [key for key, _ in rows]
+                    connection.execute(
+                        f"UPDATE entries SET accessed = ? WHERE key IN ({','.join('?' * len(hit_keys))})",  # noqa: S608
+                        [time.time_ns(), *hit_keys],
+                    )
+        return cached
+
+    def _put_many(self, entries: dict[bytes, dict[str, Any]]) -> None:
+        if not entries:
+            return
+
+        connection = self._get_connection()
+        accessed = time.time_ns()
+        rows = []
+        for key, entry in entries.items():
+            value = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, value, len(key) + len(value), accessed))
+
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        self._size += sum(size for _, _, size, _ in rows)
+
+        if self._max_size is not None and self._size > self._max_size:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Evicts the least recently used results until within the size limit."""
+        connection = self._get_connection()
+        with connection:
+            # resynchronise, as other processes might share the same database
+            (self._size,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries",
+            ).fetchone()
+            excess = self._size - self._max_size  # type: ignore[operator]
+            if excess <= 0:
+                return
+
+            evicted_keys = []
+            cursor = connection.execute(
+                "SELECT key, size FROM entries ORDER BY accessed ASC",
+            )
+            for key, size in cursor:
+                evicted_keys.append(key)
+                excess -= size
+                self._size -= size
+                if excess <= 0:
+                    break
+
+            for batch in _batched(evicted_keys, _MAX_QUERY_PARAMETERS):
+                connection.execute(
+                    f"DELETE FROM entries WHERE key IN ({','.join('?' * len(batch))})",  # noqa: S608
+                    batch,
+                )
+
+
+def _as_list(column: Any) -> list[Any]:
+    if isinstance(column, list):
+        return column
+    return list(column)
+
+
+def _batched(items: list[Any], n: int) -> Iterator[list[Any]]:
+    for start in range(0, len(items), n):
+        yield items[start : start + n]
+
+
+def _digest_representation(representation: Any, kwargs: dict[str, Any]) -> bytes:
+    """Hashes the representation name, tag, parameters and the molflux version.
+
+    Parameters are hashed by their (pickled) contents, such that e.g. NumPy
+    arrays of different values never share a digest.
+
+    Raises:
+        TypeError: If the parameters cannot be serialised.
+    """
+    name = getattr(representation, "name", type(representation).__qualname__)
+    identity = (
+        name,
+        getattr(representation, "tag", None),
+        _canonical(kwargs),
+        molflux.__version__,
+        _ENTRY_FORMAT,
+    )
+    try:
+        serialised = Hasher.hash(identity)
+    except Exception as e:
+        raise TypeError(
+            f"Could not serialise the featurisation parameters of {name!r} to cache its results: {e}",
+        ) from e
+    return hashlib.sha256(serialised.encode("utf-8")).digest()
+
+
+def _canonical(value: Any) -> Any:
+    """Orders the items of (nested) mappings, for their hash not to depend on insertion order."""
+    if isinstance(value, dict):
+        return tuple(
+            (key, _canonical(item))
+            for key, item in sorted(value.items(), key=lambda item: repr(item[0]))
+        )
+    if isinstance(value, list | tuple):
+        return type(value)(_canonical(item) for item in value)
+    return value
+
+
+def _digest_sample(row: tuple[Any, ...]) -> bytes | None:
+    """Hashes the contents of a sample, or returns None if it cannot be hashed."""
+    digest = hashlib.sha256()
+    for sample in row:
+        if isinstance(sample, str):
+            content = b"s" + sample.encode("utf-8")
+        elif isinstance(sample, bytes):
+            content = b"b" + sample
+        else:
+            try:
+                content = b"p" + pickle.dumps(sample, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                return None
+        digest.update(len(content).to_bytes(8, "little"))
+        digest.update(content)
+    return digest.digest()
+
+
+def _cache_key(
+    representation_digest: bytes,
+    sample_digest: bytes | None,
+) -> bytes | None:
+    if sample_digest is None:
+        return None
+    return hashlib.sha256(representation_digest + sample_digest).digest()
+
+
+def _assemble(entries: list[dict[str, Any]]) -> RepresentationResult:
+    """Assembles per-sample results into a representation's results.
+
+    Features returned as NumPy arrays are stacked back into arrays, and all
+    other features (e.g. lists of arrays of varying lengths) into lists.
+    """
+    results: RepresentationResult = {}
+    for feature_name in entries[0]["values"]:
+        values = [entry["values"][feature_name] for entry in entries]
+        if all(feature_name in entry["stacked"] for entry in entries):
+            results[feature_name] = np.stack(values)
+        else:
+            results[feature_name] = values
+    return results
@@ -0,0 +1,121 @@
+"""
+Featurisation of duplicated samples only once, with results scattered back by index.
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from molflux.features.typing import ArrayLike, RepresentationResult
+
+
+def unique_rows(
+    rows: Iterable[tuple[Any, ...]],
+) -> tuple[list[int], NDArray[np.intp]]:
+    """Finds the unique rows of a collection of samples.
+
+    Rows are compared by type and value if they are hashable (e.g. SMILES
+    strings or bytes), and are otherwise all considered unique.
+
+    Args:
+        rows: The samples, as tuples with one value for each input column.
+
+    Returns:
+        The index of the first occurrence of each unique row, and the index of
+        each row's unique row in that list (such that the original rows are
+        the unique rows indexed by it).
+
+    Examples:
+        >>> first_indices, inverse = unique_rows([("C",), ("CC",), ("C",)])
+        >>> first_indices
+        [0, 1]
+        >>> inverse.tolist()
+        [0, 1, 0]
+    """
+    first_occurrences: dict[Any, int] = {}
+    first_indices: list[int] = []
+    inverse: list[int] = []
+    for i, row in enumerate(rows):
+        try:
+            # values such as 1, 1.0 and True are equal, but may featurise differently
+            key = (tuple(type(value) for value in row), row)
+            j = first_occurrences.setdefault(key, len(first_indices))
+        except TypeError:
+            # unhashable rows are featurised as they are
+            j = len(first_indices)
+        if j == len(first_indices):
+            first_indices.append(i)
+        inverse.append(j)
+
+    return first_indices, np.asarray(inverse, dtype=np.intp)
+
+
+def scatter_results(
+    results: RepresentationResult,
+    inverse: NDArray[np.intp],
+) -> RepresentationResult:
+    """Scatters the results of unique samples back to all of their occurrences.
+
+    Duplicated samples share the same result objects, except for NumPy
+    outputs which are indexed into new arrays.
+
+    Args:
+        results: The featurisation results of the unique samples.
+        inverse: The index of the unique sample of each original sample.
+
+    Returns:
+        The featurisation results of the original samples.
+    """
+    scattered: RepresentationResult = {}
+    for feature_name, values in results.items():
+        if isinstance(values, np.ndarray):
+            scattered[feature_name] = values[inverse]
+        else:
+            scattered[feature_name] = [values[j] for j in inverse]
+    return scattered
+
+
+def featurise_unique(
+    *columns: ArrayLike,
+    featurise: Callable[..., list[RepresentationResult]],
+) -> list[RepresentationResult]:
+    """Featurises each unique sample only once, and scatters results back by index.
+
+    Args:
+        columns: The input columns to featurise.
+        featurise: A callable featurising input columns with each of a number
+            of representations, in order. It is only called with the unique
+            samples.
+
+    Returns:
+        The featurisation results of all samples, one for each representation.
+
+    Examples:
+        >>> from molflux.features import load_representation
+        >>> representation = load_representation("character_count")
+        >>> featurise_unique(
+        ...     ["CC", "C", "CC"],
+        ...     featurise=lambda samples: [representation.featurise(samples)],
+        ... )
+        [{'character_count': [2, 1, 2]}]
+    """
+    columns = tuple(_as_list(column) for column in columns)
+    first_indices, inverse = unique_rows(zip(*columns, strict=True))
+
+    # nothing to gain from deduplication
+    if len(first_indices) == len(inverse):
+        return featurise(*columns)
+
+    unique_columns = tuple([column[i] for i in first_indices] for column in columns)
+    return [scatter_results(results, inverse) for results in featurise(*unique_columns)]
+
+
+def _as_list(column: Any) -> Sequence[Any]:
+    # single samples are featurised as a single-sample column
+    if isinstance(column, (str, bytes)) or not isinstance(column, Iterable):
+        return [column]
+    if isinstance(column, list):
+        return column
+    return list(column)
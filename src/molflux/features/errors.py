@@ -13,6 +13,21 @@ class FeaturisationError(RuntimeError):
     def __init__(self, sample: Any):
         msg = f"Error processing sample {sample!r}"
         super().__init__(msg)
+        self.sample = sample
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # so that errors raised in worker processes are rebuilt from their sample
+        return type(self), (self.sample,)
+
+
+class ChunkFeaturisationError(RuntimeError):
+    """Raisable when featurisation of a chunk of samples fails in a worker process."""
+
+    def __init__(self, start: int, stop: int):
+        msg = f"Error processing chunk of samples [{start}:{stop}]"
+        super().__init__(msg)
+        self.start = start
+        self.stop = stop
 
 
 class ExtrasDependencyImportError(Exception):
@@ -6,6 +6,21 @@ from typing import Any
 from molflux.features import config
 
 
+@dataclass(frozen=True)
+class FeatureSchema:
+    """
+    The declared schema of a single featurised output.
+
+    Each featurised sample is either a scalar of type `dtype` (if `length` is
+    `None`), or a fixed-size list of `length` values of type `dtype`. The
+    `dtype` is an Apache Arrow type name (e.g. `"uint8"`, `"float64"`,
+    `"binary"`).
+    """
+
+    dtype: str
+    length: int | None = None
+
+
 @dataclass
 class RepresentationInfo:
     """
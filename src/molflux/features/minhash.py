@@ -0,0 +1,342 @@
+"""
+A vectorised MinHash engine for sets of shingles (e.g. molecular substructures).
+
+The permutations and hash values are compatible with those of `mhfp`'s
+`MHFPEncoder`, such that signatures and folded fingerprints computed for whole
+batches at once match those computed one set at a time.
+"""
+
+from collections.abc import Sequence
+from hashlib import sha1
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+_MAX_HASH = (1 << 32) - 1
+
+# The maximum number of (shingle, permutation) hash values held in memory at once
+_MAX_BLOCK_SIZE = 1 << 22
+
+# An odd multiplier mixing the values of a band into a single 64-bit bucket key
+_BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def hash_shinglings(
+    shinglings: Sequence[Sequence[bytes]],
+) -> tuple[NDArray[np.int64], NDArray[np.uint32]]:
+    """Hashes a batch of shinglings into a single ragged array of 32-bit hashes.
+
+    Each shingle is hashed to the first four bytes of its SHA-1 digest, read as
+    a little-endian unsigned integer.
+
+    Args:
+        shinglings: The shingles of each sample.
+
+    Returns:
+        The offsets of the hashes of each sample (of length `n_samples + 1`),
+        and the concatenated hashes of all samples.
+
+    Examples:
+        >>> indptr, hashes = hash_shinglings([[b"C", b"CC"], [], [b"C"]])
+        >>> indptr
+        array([0, 2, 2, 3])
+        >>> hashes[0] == hashes[2]
+        True
+    """
+    lengths = np.fromiter(
+        (len(shingling) for shingling in shinglings),
+        dtype=np.int64,
+        count=len(shinglings),
+    )
+    indptr = np.zeros(len(shinglings) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+
+    digests = b"".join(
+        sha1(shingle, usedforsecurity=False).digest()[:4]
+        for shingling in shinglings
+        for shingle in shingling
+    )
+    hashes = np.frombuffer(digests, dtype="<u4").astype(np.uint32)
+
+    return indptr, hashes
+
+
+def fold_hashes(
+    indptr: NDArray[np.int64],
+    hashes: NDArray[np.uint32],
+    length: int = 2048,
+) -> NDArray[np.uint8]:
+    """Folds ragged arrays of hashes into binary fingerprints.
+
+    Args:
+        indptr: The offsets of the hashes of each sample.
+        hashes: The concatenated hashes of all samples.
+        length: The length of the folded fingerprints.
+
+    Returns:
+        The folded fingerprints, as a matrix of shape `(n_samples, length)`.
+
+    Examples:
+        >>> import numpy as np
+        >>> fold_hashes(np.array([0, 2, 2]), np.array([3, 9], dtype=np.uint32), length=4)
+        array([[0, 1, 0, 1],
+               [0, 0, 0, 0]], dtype=uint8)
+    """
+    n_samples = len(indptr) - 1
+    rows = np.repeat(np.arange(n_samples), np.diff(indptr))
+
+    folded = np.zeros((n_samples, length), dtype=np.uint8)
+    folded[rows, hashes % length] = 1
+    return folded
+
+
+class MinHasher:
+    """Computes MinHash signatures of sets of 32-bit hashes.
+
+    Each of the `n_permutations` values of a signature is the minimum of a
+    random permutation `(a * x + b) mod p` over all the hashes `x` of a set. The
+    fraction of equal values in two signatures estimates the Jaccard
+    similarity of the underlying sets, which makes signatures suitable for
+    locality-sensitive hashing (LSH) indices.
+
+    The permutations are generated as in `mhfp`'s `MHFPEncoder`, such that
+    signatures match those of an encoder with the same `n_permutations` and
+    `seed`.
+
+    Examples:
+        >>> minhasher = MinHasher(n_permutations=4)
+        >>> signatures = minhasher.from_shinglings([[b"C", b"CC"], [b"CC", b"CCC"]])
+        >>> signatures.shape, signatures.dtype
+        ((2, 4), dtype('uint32'))
+        >>> float(MinHasher.jaccard(signatures[0], signatures[0]))
+        1.0
+    """
+
+    def __init__(self, n_permutations: int = 2048, seed: int = 42) -> None:
+        self.n_permutations = n_permutations
+        self.seed = seed
+        self.permutations_a, self.permutations_b = _generate_permutations(
+            n_permutations,
+            seed=seed,
+        )
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self.n_permutations, self.seed)
+
+    def from_shinglings(
+        self,
+        shinglings: Sequence[Sequence[bytes]],
+    ) -> NDArray[np.uint32]:
+        """Computes the MinHash signature of each set of shingles.
+
+        Args:
+            shinglings: The shingles of each sample.
+
+        Returns:
+            The signatures, as a matrix of shape `(n_samples, n_permutations)`.
+            Empty sets have signatures of `2**32 - 1`.
+        """
+        return self.from_hashes(*hash_shinglings(shinglings))
+
+    def from_hashes(
+        self,
+        indptr: NDArray[np.int64],
+        hashes: NDArray[np.uint32],
+    ) -> NDArray[np.uint32]:
+        """Computes the MinHash signatures of ragged arrays of 32-bit hashes.
+
+        All permutations are applied to blocks of samples at once, and reduced
+        to the minimum of each sample with a single segmented reduction.
+
+        Args:
+            indptr: The offsets of the hashes of each sample.
+            hashes: The concatenated hashes of all samples.
+
+        Returns:
+            The signatures, as a matrix of shape `(n_samples, n_permutations)`.
+            Empty sets have signatures of `2**32 - 1`.
+        """
+        n_samples = len(indptr) - 1
+        signatures = np.full(
+            (n_samples, self.n_permutations),
+            _MAX_HASH,
+            dtype=np.uint32,
+        )
+
+        hashes = np.asarray(hashes, dtype=np.uint32)
+        block_size = max(1, _MAX_BLOCK_SIZE // max(1, self.n_permutations))
+
+        start = 0
+        while start < n_samples:
+            # grow the block of samples up to the maximum number of hashes
+            stop = int(np.searchsorted(indptr, indptr[start] + block_size, "right"))
+            stop = min(max(stop - 1, start + 1), n_samples)
+
+            offsets = indptr[start : stop + 1]
+            block_hashes = hashes[offsets[0] : offsets[-1]]
+            nonempty = np.flatnonzero(np.diff(offsets)) + start
+
+            if len(nonempty):
+                # uint32 arithmetic wraps around modulo 2**32, as in `mhfp`
+                values = block_hashes[:, None] * self.permutations_a
+                values += self.permutations_b
+                values %= np.uint32(_MAX_HASH)
+                signatures[nonempty] = np.minimum.reduceat(
+                    values,
+                    indptr[nonempty] - offsets[0],
+                    axis=0,
+                )
+
+            start = stop
+
+        return signatures
+
+    @staticmethod
+    def jaccard(a: NDArray[np.uint32], b: NDArray[np.uint32]) -> NDArray[np.float64]:
+        """Estimates the Jaccard similarity of sets from their signatures.
+
+        Args:
+            a: A signature, or a matrix of signatures.
+            b: A signature, or a matrix of signatures broadcastable against `a`.
+
+        Returns:
+            The estimated Jaccard similarities.
+        """
+        return np.mean(np.asarray(a) == np.asarray(b), axis=-1)
+
+
+def lsh_clusters(
+    signatures: NDArray[np.uint32],
+    threshold: float = 0.7,
+    n_bands: int | None = None,
+) -> NDArray[np.int64]:
+    """Clusters sets with similar MinHash signatures by locality-sensitive hashing.
+
+    Signatures are divided into `n_bands` bands of consecutive values. Sets
+    whose signatures are equal over any one band fall into the same bucket,
+    which is likely for sets of Jaccard similarity above about
+    `(1 / n_bands) ** (1 / rows_per_band)`. Within each bucket, each set is
+    linked to the previous set of the bucket if their estimated similarity is
+    at least `threshold`, and clusters are the connected components of all
+    links. The run time is O(n log n) in the number of sets.
+
+    Clusters are approximate: sets of similarity above the threshold may be
+    missed if they fall into no common bucket, and sets of lower similarity
+    may be clustered transitively.
+
+    Args:
+        signatures: The (n_samples, n_permutations) MinHash signatures.
+        threshold: The Jaccard similarity above which sets are clustered.
+        n_bands: The number of bands, which must divide the number of
+            permutations. By default, the number of bands whose bucketing
+            threshold is closest to `threshold`.
+
+    Returns:
+        The cluster label of each set, numbered from zero in order of first
+        occurrence.
+
+    Examples:
+        >>> minhasher = MinHasher(n_permutations=64)
+        >>> signatures = minhasher.from_shinglings(
+        ...     [[b"C", b"CC", b"CCO"], [b"c1ccccc1"], [b"C", b"CC", b"CCO", b"CCN"]],
+        ... )
+        >>> lsh_clusters(signatures, threshold=0.5).tolist()
+        [0, 1, 0]
+    """
+    signatures = np.asarray(signatures, dtype=np.uint32)
+    n_samples, n_permutations = signatures.shape
+    if not 0 <= threshold <= 1:
+        raise ValueError(f"threshold must be between 0 and 1: {threshold}")
+    if n_bands is None:
+        n_bands = _optimal_n_bands(n_permutations, threshold=threshold)
+    if n_bands < 1 or n_permutations % n_bands:
+        raise ValueError(
+            f"The number of bands ({n_bands}) must divide the number of permutations ({n_permutations})",
+        )
+
+    rows_per_band = n_permutations // n_bands
+    sources = []
+    targets = []
+    for band in range(n_bands):
+        band_values = signatures[:, band * rows_per_band : (band + 1) * rows_per_band]
+        keys = np.zeros(n_samples, dtype=np.uint64)
+        for column in band_values.T:
+            # uint64 arithmetic wraps around modulo 2**64
+            keys *= _BAND_MULTIPLIER
+            keys += column
+
+        # link each set to the previous set of its bucket, if similar enough
+        order = np.argsort(keys, kind="stable")
+        in_bucket = np.flatnonzero(keys[order[1:]] == keys[order[:-1]])
+        block_size = max(1, _MAX_BLOCK_SIZE // max(1, n_permutations))
+        for start in range(0, len(in_bucket), block_size):
+            block = in_bucket[start : start + block_size]
+            previous, current = order[block], order[block + 1]
+            similar = (
+                MinHasher.jaccard(signatures[previous], signatures[current])
+                >= threshold
+            )
+            sources.append(previous[similar])
+            targets.append(current[similar])
+
+    sources_array = np.concatenate([np.empty(0, dtype=np.intp), *sources])
+    targets_array = np.concatenate([np.empty(0, dtype=np.intp), *targets])
+    links = coo_matrix(
+        (np.ones(len(sources_array), dtype=np.int8), (sources_array, targets_array)),
+        shape=(n_samples, n_samples),
+    )
+    _, labels = connected_components(links, directed=False)
+
+    # number clusters in order of first occurrence
+    _, first_indices, inverse = np.unique(
+        labels,
+        return_index=True,
+        return_inverse=True,
+    )
+    order = np.argsort(np.argsort(first_indices))
+    return order[inverse].astype(np.int64)
+
+
+def _optimal_n_bands(n_permutations: int, threshold: float) -> int:
+    """Finds the number of bands whose bucketing threshold is closest to `threshold`."""
+    candidates = [
+        n_bands
+        for n_bands in range(1, n_permutations + 1)
+        if n_permutations % n_bands == 0
+    ]
+    return min(
+        candidates,
+        key=lambda n_bands: abs(
+            (1 / n_bands) ** (n_bands / n_permutations) - threshold,
+        ),
+    )
+
+
+def _generate_permutations(
+    n_permutations: int,
+    seed: int,
+) -> tuple[NDArray[np.uint32], NDArray[np.uint32]]:
+    """Generates the (unique) permutation parameters of `mhfp`'s `MHFPEncoder`."""
+    rand = np.random.RandomState(seed)
+
+    # parameters are drawn until they differ from all previous ones (and from
+    # zero, which `mhfp` checks against its zero-initialised parameters)
+    permutations_a = np.zeros(n_permutations, dtype=np.uint32)
+    permutations_b = np.zeros(n_permutations, dtype=np.uint32)
+    seen_a = {0}
+    seen_b = {0}
+    for i in range(n_permutations):
+        a = int(rand.randint(1, _MAX_HASH, dtype=np.uint32))
+        b = int(rand.randint(0, _MAX_HASH, dtype=np.uint32))
+        while a in seen_a:
+            a = int(rand.randint(1, _MAX_HASH, dtype=np.uint32))
+        while b in seen_b:
+            b = int(rand.randint(0, _MAX_HASH, dtype=np.uint32))
+        seen_a.add(a)
+        seen_b.add(b)
+        permutations_a[i] = a
+        permutations_b[i] = b
+
+    return permutations_a, permutations_b
@@ -0,0 +1,475 @@
+"""
+Parallel featurisation over a persistent pool of worker processes.
+"""
+
+import itertools
+import math
+import multiprocessing
+import multiprocessing.connection
+import os
+import pickle
+import time
+import weakref
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+
+from molflux.features.errors import ChunkFeaturisationError
+from molflux.features.typing import ArrayLike, RepresentationResult
+from molflux.features.utils import shared_molecules_context
+
+# The representations featurised by the current worker process
+_WORKER_REPRESENTATIONS: list[Any] = []
+
+TaskStatus = Literal["ok", "error", "timeout"]
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    """Resolves a number of jobs into a number of worker processes.
+
+    Negative values are counted back from the number of available CPUs, such
+    that `-1` uses all of them, `-2` all but one, and so on.
+
+    Examples:
+        >>> resolve_n_jobs(4)
+        4
+        >>> resolve_n_jobs(-1) == os.cpu_count()
+        True
+    """
+    if n_jobs == 0:
+        raise ValueError("n_jobs cannot be 0: use 1 to featurise serially")
+
+    if n_jobs < 0:
+        n_cpus = os.cpu_count() or 1
+        return max(1, n_cpus + 1 + n_jobs)
+
+    return n_jobs
+
+
+class FeaturisationPool:
+    """A pool of worker processes featurising samples with fixed representations.
+
+    The representations are sent to each worker process once, when the worker
+    is started. Samples are then featurised in chunks, which are streamed to the
+    workers with a bounded number of chunks in flight, and reassembled in input
+    order. The worker processes are started on first use and persist until the
+    pool is closed, so the pool can be reused across featurisation calls.
+
+    Examples:
+        >>> from molflux.features import load_representation
+        >>> representation = load_representation('character_count')
+        >>> with FeaturisationPool([representation], n_jobs=2) as pool:
+        ...     pool.featurise(['C', 'CC', 'CCC'], chunk_size=2)
+        [{'character_count': [1, 2, 3]}]
+    """
+
+    def __init__(
+        self,
+        representations: Iterable[Any],
+        n_jobs: int = -1,
+        start_method: str | None = None,
+    ) -> None:
+        """Initialises the pool.
+
+        Args:
+            representations: The representations to featurise samples with.
+            n_jobs: The number of worker processes. Negative values are counted
+                back from the number of available CPUs (`-1` uses all of them).
+            start_method: The `multiprocessing` start method of the worker
+                processes. If `None`, the platform's default is used.
+        """
+        self._representations = list(representations)
+        self._n_jobs = n_jobs
+        self._n_workers = resolve_n_jobs(n_jobs)
+        self._start_method = start_method
+        self._executor: ProcessPoolExecutor | None = None
+        self._finaliser: weakref.finalize | None = None
+
+    def __enter__(self) -> "FeaturisationPool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # worker processes are not shared: a copy starts its own on first use
+        return type(self), (self._representations, self._n_jobs, self._start_method)
+
+    @property
+    def n_workers(self) -> int:
+        return self._n_workers
+
+    def close(self) -> None:
+        """Shuts down the worker processes."""
+        if self._finaliser is not None:
+            self._finaliser()
+            self._finaliser = None
+        self._executor = None
+
+    def featurise(
+        self,
+        *columns: ArrayLike,
+        chunk_size: int | None = None,
+        **kwargs: Any,
+    ) -> list[RepresentationResult]:
+        """Featurises the input samples with each of the pool's representations.
+
+        Args:
+            columns: The input columns to featurise.
+            chunk_size: The number of samples sent to a worker at a time. If
+                `None`, samples are split into about four chunks per worker.
+            kwargs: Keyword arguments forwarded to each representation's
+                featurise() call.
+
+        Returns:
+            The featurisation results, one for each of the pool's representations.
+
+        Raises:
+            ChunkFeaturisationError: If featurisation of a chunk fails, with the
+                worker's exception as its cause.
+        """
+        columns = tuple(_as_sequence(column) for column in columns)
+        n_samples = len(columns[0]) if columns else 0
+
+        # nothing to distribute, and featurisers define their own empty outputs
+        if n_samples == 0:
+            return _featurise_with(self._representations, columns, kwargs)
+
+        if chunk_size is None:
+            chunk_size = math.ceil(n_samples / (4 * self._n_workers))
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be a positive integer: {chunk_size}")
+
+        executor = self._get_executor()
+        max_chunks_in_flight = 2 * self._n_workers
+
+        in_flight: deque[tuple[int, int, Future]] = deque()
+        chunks_results: list[list[RepresentationResult]] = []
+        try:
+            for start in range(0, n_samples, chunk_size):
+                stop = min(start + chunk_size, n_samples)
+                chunk = tuple(column[start:stop] for column in columns)
+                future = executor.submit(_featurise_chunk, chunk, kwargs)
+                in_flight.append((start, stop, future))
+                if len(in_flight) >= max_chunks_in_flight:
+                    chunks_results.append(_chunk_result(*in_flight.popleft()))
+
+            while in_flight:
+                chunks_results.append(_chunk_result(*in_flight.popleft()))
+
+        except BaseException:
+            for _, _, future in in_flight:
+                future.cancel()
+            raise
+
+        return [
+            _concatenate([chunk_results[i] for chunk_results in chunks_results])
+            for i in range(len(self._representations))
+        ]
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._n_workers,
+                mp_context=multiprocessing.get_context(self._start_method),
+                initializer=_initialise_worker,
+                initargs=(pickle.dumps(self._representations),),
+            )
+            # workers of pools that are never closed (e.g. those featurising
+            # iterable datasets lazily) are shut down on garbage collection or exit
+            self._finaliser = weakref.finalize(
+                self,
+                self._executor.shutdown,
+                wait=True,
+                cancel_futures=True,
+            )
+        return self._executor
+
+
+@dataclass(frozen=True)
+class TaskResult:
+    """The outcome of a single task run by `map_with_deadlines`.
+
+    Attributes:
+        status: `"ok"` if the task returned, `"error"` if it raised, and
+            `"timeout"` if it raised a `TimeoutError` or ran out of time.
+        value: The value returned by the task, if it succeeded.
+        error: A description of the error or timeout, if the task failed.
+        elapsed: The wall-clock time spent on the task, in seconds. This is
+            `None` for tasks that were never started.
+    """
+
+    status: TaskStatus
+    value: Any = None
+    error: str | None = None
+    elapsed: float | None = None
+
+
+def map_with_deadlines(
+    function: Callable[[Any], Any],
+    samples: Iterable[Any],
+    n_jobs: int = 1,
+    timeout: float | None = None,
+    batch_timeout: float | None = None,
+    start_method: str | None = None,
+) -> list[TaskResult]:
+    """Applies a function to each sample over worker processes, within time budgets.
+
+    Samples are sent to the worker processes one at a time, as soon as a
+    worker is free, such that a slow sample only holds up its own worker.
+    A worker still busy with a sample after `timeout` seconds is killed and
+    replaced, and all samples still unfinished after `batch_timeout` seconds
+    are abandoned. Failures and timeouts are reported as results instead of
+    being raised, and never hold up the other samples.
+
+    If there is no time budget to enforce and a single worker, samples are
+    processed serially in the current process.
+
+    Args:
+        function: A picklable function of a single (picklable) sample.
+        samples: The samples to process.
+        n_jobs: The number of worker processes. Negative values are counted
+            back from the number of available CPUs (`-1` uses all of them).
+        timeout: The wall-clock budget of each sample, in seconds.
+        batch_timeout: The wall-clock budget of all samples, in seconds.
+        start_method: The `multiprocessing` start method of the worker
+            processes. If `None`, the platform's default is used.
+
+    Returns:
+        The results of all samples, in input order.
+
+    Examples:
+        >>> results = map_with_deadlines(abs, [-1, 2, "a"], n_jobs=2, timeout=10)
+        >>> [result.status for result in results]
+        ['ok', 'ok', 'error']
+        >>> results[0].value
+        1
+    """
+    samples = list(samples)
+    for name, budget in (("timeout", timeout), ("batch_timeout", batch_timeout)):
+        if budget is not None and budget <= 0:
+            raise ValueError(f"{name} must be a positive number of seconds: {budget}")
+
+    n_workers = min(resolve_n_jobs(n_jobs), len(samples))
+    if timeout is None and batch_timeout is None and n_workers <= 1:
+        return [_run_task(function, sample) for sample in samples]
+
+    return _DeadlineScheduler(
+        function,
+        n_workers=n_workers,
+        timeout=timeout,
+        batch_timeout=batch_timeout,
+        start_method=start_method,
+    ).run(samples)
+
+
+class _DeadlineScheduler:
+    """Schedules samples over worker processes, killing those that overrun."""
+
+    def __init__(
+        self,
+        function: Callable[[Any], Any],
+        n_workers: int,
+        timeout: float | None,
+        batch_timeout: float | None,
+        start_method: str | None,
+    ) -> None:
+        self._function = function
+        self._n_workers = n_workers
+        self._timeout = timeout
+        self._batch_timeout = batch_timeout
+        self._context = multiprocessing.get_context(start_method)
+
+        # the worker process of each connection, and the task it is busy with (if any)
+        self._processes: dict[Any, Any] = {}
+        self._tasks: dict[Any, tuple[int, float]] = {}
+
+    def run(self, samples: list[Any]) -> list[TaskResult]:
+        results: list[TaskResult | None] = [None] * len(samples)
+        pending = deque(enumerate(samples))
+        batch_deadline = (
+            None
+            if self._batch_timeout is None
+            else time.monotonic() + self._batch_timeout
+        )
+
+        try:
+            for _ in range(self._n_workers):
+                self._start_worker()
+
+            while pending or self._tasks:
+                for connection in self._processes:
+                    if pending and connection not in self._tasks:
+                        i, sample = pending.popleft()
+                        connection.send((i, sample))
+                        self._tasks[connection] = (i, time.monotonic())
+
+                now = time.monotonic()
+                if batch_deadline is not None and now >= batch_deadline:
+                    break
+
+                deadlines = [] if batch_deadline is None else [batch_deadline]
+                if self._timeout is not None:
+                    deadlines.extend(
+                        started + self._timeout for _, started in self._tasks.values()
+                    )
+                ready = multiprocessing.connection.wait(
+                    list(self._tasks),
+                    timeout=max(0.0, min(deadlines) - now) if deadlines else None,
+                )
+
+                for connection in ready:
+                    i, started = self._tasks.pop(connection)
+                    try:
+                        _, results[i] = connection.recv()
+                    except EOFError:
+                        results[i] = TaskResult(
+                            "error",
+                            error="The worker process exited unexpectedly",
+                            elapsed=time.monotonic() - started,
+                        )
+                        self._replace_worker(connection, start=bool(pending))
+
+                if self._timeout is not None:
+                    now = time.monotonic()
+                    for connection, (i, started) in list(self._tasks.items()):
+                        if now - started >= self._timeout:
+                            del self._tasks[connection]
+                            results[i] = TaskResult(
+                                "timeout",
+                                error=f"Exceeded the timeout of {self._timeout}s",
+                                elapsed=now - started,
+                            )
+                            self._replace_worker(connection, start=bool(pending))
+
+        finally:
+            now = time.monotonic()
+            for i, started in self._tasks.values():
+                results[i] = TaskResult(
+                    "timeout",
+                    error=f"Exceeded the batch timeout of {self._batch_timeout}s",
+                    elapsed=now - started,
+                )
+            for i, _ in pending:
+                results[i] = TaskResult(
+                    "timeout",
+                    error=f"Exceeded the batch timeout of {self._batch_timeout}s",
+                )
+            self._shutdown()
+
+        return results  # type: ignore[return-value]
+
+    def _start_worker(self) -> None:
+        connection, worker_connection = self._context.Pipe()
+        process = self._context.Process(
+            target=_deadline_worker,
+            args=(self._function, worker_connection),
+            daemon=True,
+        )
+        process.start()
+        worker_connection.close()
+        self._processes[connection] = process
+
+    def _replace_worker(self, connection: Any, start: bool) -> None:
+        process = self._processes.pop(connection)
+        process.kill()
+        process.join()
+        connection.close()
+        if start:
+            self._start_worker()
+
+    def _shutdown(self) -> None:
+        for connection, process in self._processes.items():
+            if connection in self._tasks:
+                process.kill()
+            else:
+                try:
+                    connection.send(None)
+                except OSError:
+                    process.kill()
+        for connection, process in self._processes.items():
+            process.join()
+            connection.close()
+        self._processes.clear()
+        self._tasks.clear()
+
+
+def _deadline_worker(function: Callable[[Any], Any], connection: Any) -> None:
+    while (task := connection.recv()) is not None:
+        i, sample = task
+        connection.send((i, _run_task(function, sample)))
+
+
+def _run_task(function: Callable[[Any], Any], sample: Any) -> TaskResult:
+    start = time.perf_counter()
+    try:
+        value = function(sample)
+    except TimeoutError as e:
+        return TaskResult("timeout", error=str(e), elapsed=time.perf_counter() - start)
+    except Exception as e:
+        return TaskResult(
+            "error",
+            error=f"{type(e).__name__}: {e}",
+            elapsed=time.perf_counter() - start,
+        )
+    return TaskResult("ok", value=value, elapsed=time.perf_counter() - start)
+
+
+def _as_sequence(column: Any) -> Sequence | np.ndarray:
+    """Materialises a column into a sliceable sequence."""
+    # single samples are featurised as a single-sample column
+    if isinstance(column, (str, bytes)) or not isinstance(column, Iterable):
+        return [column]
+
+    if isinstance(column, (Sequence, np.ndarray)):
+        return column
+
+    return list(column)
+
+
+def _initialise_worker(pickled_representations: bytes) -> None:
+    global _WORKER_REPRESENTATIONS
+    _WORKER_REPRESENTATIONS = pickle.loads(pickled_representations)  # noqa: S301
+
+
+def _featurise_chunk(
+    columns: tuple[ArrayLike, ...],
+    kwargs: dict[str, Any],
+) -> list[RepresentationResult]:
+    return _featurise_with(_WORKER_REPRESENTATIONS, columns, kwargs)
+
+
+def _featurise_with(
+    representations: list[Any],
+    columns: tuple[ArrayLike, ...],
+    kwargs: dict[str, Any],
+) -> list[RepresentationResult]:
+    # samples are parsed only once per chunk, and shared across all representations
+    with shared_molecules_context():
+        return [
+            representation.featurise(*columns, **kwargs)
+            for representation in representations
+        ]
+
+
+def _chunk_result(start: int, stop: int, future: Future) -> Any:
+    try:
+        return future.result()
+    except Exception as e:
+        raise ChunkFeaturisationError(start, stop) from e
+
+
+def _concatenate(chunks_results: list[RepresentationResult]) -> RepresentationResult:
+    """Concatenates the per-chunk results of a representation, in order."""
+    concatenated: RepresentationResult = {}
+    for feature_name in chunks_results[0]:
+        parts = [chunk_results[feature_name] for chunk_results in chunks_results]
+        if all(isinstance(part, np.ndarray) for part in parts):
+            concatenated[feature_name] = np.concatenate(parts)
+        else:
+            concatenated[feature_name] = list(itertools.chain.from_iterable(parts))
+    return concatenated
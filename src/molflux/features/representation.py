@@ -1,8 +1,12 @@
 from collections.abc import Iterator
 from typing import Any, Protocol, runtime_checkable
 
+from molflux.features.cache import FeaturisationCache
+from molflux.features.deduplication import featurise_unique
 from molflux.features.errors import DuplicateKeyError
+from molflux.features.parallel import FeaturisationPool
 from molflux.features.typing import ArrayLike, RepresentationResult
+from molflux.features.utils import shared_molecules_context
 
 
 @runtime_checkable
@@ -76,10 +80,41 @@ class Representations:
     def add_representation(self, representation: Representation) -> None:
         self[representation.tag] = representation
 
-    def featurise(self, *columns: ArrayLike, **kwargs: Any) -> RepresentationResult:
-        results = (
-            representation.featurise(*columns)
-            for representation in self._stack.values()
-        )
+    def featurise(
+        self,
+        *columns: ArrayLike,
+        n_jobs: int | None = None,
+        chunk_size: int | None = None,
+        cache: FeaturisationCache | None = None,
+        deduplicate: bool = False,
+        **kwargs: Any,
+    ) -> RepresentationResult:
+        representations = list(self._stack.values())
+
+        def featurise_each(*columns: ArrayLike) -> list[RepresentationResult]:
+            if n_jobs is not None and n_jobs != 1:
+                with FeaturisationPool(representations, n_jobs=n_jobs) as pool:
+                    return pool.featurise(*columns, chunk_size=chunk_size)
+
+            # samples are parsed only once, and shared across all representations
+            with shared_molecules_context():
+                return [
+                    representation.featurise(*columns)
+                    for representation in representations
+                ]
+
+        def featurise_cached(*columns: ArrayLike) -> list[RepresentationResult]:
+            if cache is not None:
+                return cache.featurise(
+                    representations,
+                    *columns,
+                    featurise=featurise_each,
+                )
+            return featurise_each(*columns)
+
+        if deduplicate:
+            results = featurise_unique(*columns, featurise=featurise_cached)
+        else:
+            results = featurise_cached(*columns)
         merged_results = {k: v for r in results for k, v in r.items()}
         return merged_results
@@ -0,0 +1,30 @@
+from typing import Any
+
+import numpy as np
+import pyarrow as pa
+from numpy.typing import NDArray
+
+
+def is_columnar(column: Any) -> bool:
+    """Whether a column is an Apache Arrow or NumPy array, to be featurised in bulk."""
+    return isinstance(column, (pa.Array, pa.ChunkedArray, np.ndarray))
+
+
+def to_arrow(column: pa.Array | pa.ChunkedArray | NDArray[Any]) -> pa.Array:
+    """Converts a columnar input into a single Arrow array, without copying if possible."""
+    if isinstance(column, pa.ChunkedArray):
+        if column.num_chunks == 1:
+            return column.chunk(0)
+        return (
+            column.combine_chunks() if column.num_chunks else pa.array([], column.type)
+        )
+
+    if isinstance(column, np.ndarray):
+        return pa.array(column)
+
+    return column
+
+
+def to_numpy(array: pa.Array) -> NDArray[Any]:
+    """Converts an Arrow array into a NumPy array, without copying if possible."""
+    return array.to_numpy(zero_copy_only=False)
@@ -1,7 +1,14 @@
 from typing import Any
 
+import pyarrow.compute as pc
+
 from molflux.features.bases import RepresentationBase
 from molflux.features.info import RepresentationInfo
+from molflux.features.representations.core.generic._utils import (
+    is_columnar,
+    to_arrow,
+    to_numpy,
+)
 from molflux.features.typing import SmilesArray
 from molflux.features.utils import assert_n_positional_args
 
@@ -21,14 +28,17 @@ class CharacterCount(RepresentationBase):
         *columns: SmilesArray,
         without_hs: bool = False,
         **kwargs: Any,
-    ) -> dict[str, list[Any]]:
+    ) -> dict[str, Any]:
         """Counts the charactes in each string sample.
 
+        Apache Arrow and NumPy arrays of strings are counted in bulk with
+        Arrow compute kernels, without converting them to Python objects.
+
         Args:
             samples: The data to featurise. Should consist of strings
 
         Returns:
-            The string lengths
+            The string lengths, as a NumPy array for Arrow and NumPy inputs
 
         Examples:
             >>> from molflux.features import load_representation
@@ -36,10 +46,20 @@ class CharacterCount(RepresentationBase):
             >>> samples = ["hi", "ho", "hum"]
             >>> representation.featurise(samples)
             {'character_count': [2, 2, 3]}
+            >>> import pyarrow as pa
+            >>> representation.featurise(pa.array(["hi", "ho", "hum"]))
+            {'character_count': array([2, 2, 3], dtype=int32)}
         """
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
 
+        if is_columnar(samples):
+            strings = to_arrow(samples)
+            if without_hs:
+                strings = pc.replace_substring(strings, "H", "")
+                strings = pc.replace_substring(strings, "h", "")
+            return {f"{self.tag}": to_numpy(pc.utf8_length(strings))}
+
         if without_hs:
             samples = [sample.replace("H", "").replace("h", "") for sample in samples]
 
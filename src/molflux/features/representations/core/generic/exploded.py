@@ -1,7 +1,17 @@
 from typing import Any
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from numpy.typing import NDArray
+
 from molflux.features.bases import RepresentationBase
 from molflux.features.info import RepresentationInfo
+from molflux.features.representations.core.generic._utils import (
+    is_columnar,
+    to_arrow,
+    to_numpy,
+)
 from molflux.features.typing import ArrayLike
 from molflux.features.utils import assert_n_positional_args
 
@@ -16,14 +26,20 @@ class Exploded(RepresentationBase):
             description=_DESCRIPTION,
         )
 
-    def _featurise(self, *columns: ArrayLike, **kwargs: Any) -> dict[str, list[Any]]:
+    def _featurise(self, *columns: ArrayLike, **kwargs: Any) -> dict[str, Any]:
         """Explodes each array-like sample into individual features.
 
+        Apache Arrow list arrays and 2D NumPy arrays are exploded in bulk,
+        without converting them to Python objects. Fixed-size lists (e.g.
+        fingerprints) and NumPy matrices are exploded into views of their
+        values, without copying them.
+
         Args:
             samples: The data to featurise. Should consist of iterable molfluxs.
 
         Returns:
-            A dictionary of exploded molfluxs.
+            A dictionary of exploded molfluxs, as NumPy arrays for Arrow and
+            NumPy inputs.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -31,12 +47,42 @@ class Exploded(RepresentationBase):
             >>> samples = [[1, 2, 3, 4], [10, 20, 30, 40], [100, 200, 300, 400]]
             >>> representation.featurise(samples)
             {'exploded::0': [1, 10, 100], 'exploded::1': [2, 20, 200], 'exploded::2': [3, 30, 300], 'exploded::3': [4, 40, 400]}
+            >>> import numpy as np
+            >>> representation.featurise(np.array([[1, 2], [10, 20]]))
+            {'exploded::0': array([ 1, 10]), 'exploded::1': array([ 2, 20])}
         """
 
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
 
+        if isinstance(samples, np.ndarray) and samples.ndim == 2:
+            return {f"{self.tag}::{i}": samples[:, i] for i in range(samples.shape[1])}
+
+        if is_columnar(samples) and not isinstance(samples, np.ndarray):
+            return {
+                f"{self.tag}::{i}": values
+                for i, values in enumerate(_explode_arrow(to_arrow(samples)))
+            }
+
         return {
             f"{self.tag}::{i}": value
             for i, value in enumerate(map(list, zip(*samples, strict=False)))
         }
+
+
+def _explode_arrow(samples: pa.Array) -> list[NDArray[Any]]:
+    """Explodes an Arrow list array into the columns of its elements."""
+
+    if isinstance(samples, pa.FixedSizeListArray):
+        # the values of (sliced) fixed-size lists are a contiguous matrix
+        size = samples.type.list_size
+        values = samples.values.slice(samples.offset * size, len(samples) * size)
+        matrix = to_numpy(values).reshape(len(samples), size)
+        return [matrix[:, i] for i in range(size)]
+
+    if isinstance(samples, (pa.ListArray, pa.LargeListArray)):
+        # samples are truncated to the shortest one, as when exploding Python lists
+        n_elements = pc.min(pc.list_value_length(samples)).as_py() or 0
+        return [to_numpy(pc.list_element(samples, i)) for i in range(n_elements)]
+
+    raise TypeError(f"Expected an array of lists, got: {samples.type}")
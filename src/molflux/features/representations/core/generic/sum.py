@@ -1,7 +1,16 @@
+import functools
 from typing import Any
 
+import numpy as np
+import pyarrow.compute as pc
+
 from molflux.features.bases import RepresentationBase
 from molflux.features.info import RepresentationInfo
+from molflux.features.representations.core.generic._utils import (
+    is_columnar,
+    to_arrow,
+    to_numpy,
+)
 from molflux.features.typing import ArrayLike
 
 _DESCRIPTION = """
@@ -15,14 +24,21 @@ class Sum(RepresentationBase):
             description=_DESCRIPTION,
         )
 
-    def _featurise(self, *columns: ArrayLike, **kwargs: Any) -> dict[str, list[Any]]:
+    def _featurise(self, *columns: ArrayLike, **kwargs: Any) -> dict[str, Any]:
         """Sums every input column.
 
+        If any column is an Apache Arrow or one-dimensional NumPy array (and
+        no column is a multi-dimensional NumPy array), columns are added
+        elementwise in bulk with Arrow compute kernels, without converting
+        them to Python objects. Columns must then all be of the same length,
+        and integer overflows raise an error instead of wrapping around.
+
         Args:
             *columns: The data to sum. Should consist of iterable elements.
 
         Returns:
-            A dictionary of the sum of columns.
+            A dictionary of the sum of columns, as a NumPy array if any input
+            column is an Arrow or NumPy array.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -30,6 +46,17 @@ class Sum(RepresentationBase):
             >>> columns = [1, 2, 3, 4], [10, 20, 30, 40], [100, 200, 300, 400]
             >>> representation.featurise(*columns)
             {'sum': [111, 222, 333, 444]}
+            >>> import numpy as np
+            >>> representation.featurise(*map(np.array, columns))
+            {'sum': array([111, 222, 333, 444])}
         """
 
+        # rows of multi-dimensional arrays are summed as arrays, one at a time
+        is_bulk = any(is_columnar(column) for column in columns) and not any(
+            isinstance(column, np.ndarray) and column.ndim != 1 for column in columns
+        )
+        if is_bulk:
+            arrays = [to_arrow(column) for column in columns]
+            return {f"{self.tag}": to_numpy(functools.reduce(pc.add_checked, arrays))}
+
         return {f"{self.tag}": [sum(t) for t in zip(*columns, strict=False)]}
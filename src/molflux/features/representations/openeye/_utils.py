@@ -4,10 +4,15 @@ import ctypes
 import difflib
 import logging
 from collections.abc import Callable, Iterable, Iterator
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
+from molflux.features.utils import parse_shared_molecule
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
 try:
     from openeye import oechem, oegraphsim
 except ImportError as e:
@@ -69,6 +74,9 @@ def to_oemol(molecule: Any) -> oechem.OEMolBase:
         - it is converted to an OEMol
     - else, raise an error
 
+    Within a ``shared_molecules_context``, string and bytes inputs are only
+    parsed once and the resulting OEMol is re-used across calls.
+
     Args:
         molecule: Any
 
@@ -79,6 +87,12 @@ def to_oemol(molecule: Any) -> oechem.OEMolBase:
     if isinstance(molecule, oechem.OEMolBase):
         return molecule
 
+    return parse_shared_molecule(molecule, backend="openeye", parser=_parse_oemol)
+
+
+def _parse_oemol(molecule: Any) -> oechem.OEMolBase:
+    """Parses a single string or bytes input into an OEMol object."""
+
     if isinstance(molecule, str):
         try:
             oemol = oemol_from_smiles(molecule)
@@ -257,6 +271,11 @@ def get_sd_data(
 
 def fingerprint_to_bit_vector(fingerprint: oegraphsim.OEFingerPrint) -> list[int]:
     """Casts a chemical fingerprint to a bit vector."""
+    return fingerprint_to_bits(fingerprint).tolist()  # type: ignore[no-any-return]
+
+
+def fingerprint_to_bits(fingerprint: oegraphsim.OEFingerPrint) -> NDArray[np.uint8]:
+    """Casts a chemical fingerprint to a uint8 array of bits."""
 
     # calculate the number of bytes / fingerprint can have any size
     fingerprint_size = fingerprint.GetSize()
@@ -268,4 +287,4 @@ def fingerprint_to_bit_vector(fingerprint: oegraphsim.OEFingerPrint) -> list[int
     bits = np.unpackbits(np.ctypeslib.as_array(pointer, shape=(1,)))
 
     # get correct fp length back
-    return bits.reshape(nbytes, 8)[:, ::-1].ravel()[:fingerprint_size].tolist()  # type: ignore[no-any-return]
+    return bits.reshape(nbytes, 8)[:, ::-1].ravel()[:fingerprint_size]
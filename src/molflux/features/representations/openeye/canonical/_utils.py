@@ -1,5 +1,8 @@
 import logging
-from functools import reduce
+import time
+from collections.abc import Callable, Iterable
+from functools import partial, reduce
+from typing import Any
 
 try:
     from openeye import oechem, oequacpac
@@ -8,6 +11,9 @@ except ImportError as e:
 
     raise ExtrasDependencyImportError("openeye", e) from None
 
+from molflux.features.errors import FeaturisationError
+from molflux.features.parallel import map_with_deadlines
+
 logger = logging.getLogger(__name__)
 
 _DEFAULT_TAUTOMER_TIMEOUTS = [0.01, 0.1, 1, 10, 100]
@@ -42,9 +48,15 @@ def standardise_oemol(
     gen_2d_coords: bool = False,
     tautomer_options: oequacpac.OETautomerOptions | None = None,
     tautomer_timeouts: list[float] | None = None,
+    tautomer_time_budget: float | None = None,
 ) -> oechem.OEMolBase:
     """
     Returns a standardised OEMol object.
+
+    If a `tautomer_time_budget` is given, the escalating `tautomer_timeouts`
+    are clipped such that the tautomer search takes at most that many seconds
+    in total, and a TimeoutError is raised if no reasonable tautomer is found
+    within it.
     """
 
     if remove_formal_charges and (reasonable_protomer or set_neutral_ph):
@@ -94,8 +106,22 @@ def standardise_oemol(
         # flag for whether we found a reasonable tautomer
         successful_tautomerisation = False
 
+        deadline = (
+            None
+            if tautomer_time_budget is None
+            else time.monotonic() + tautomer_time_budget
+        )
+        out_of_time = False
+
         # go through each timeout and try to generate reasonable tautomers
         for max_timeout in tautomer_timeouts:
+            if deadline is not None:
+                remaining_time = deadline - time.monotonic()
+                if remaining_time <= 0:
+                    out_of_time = True
+                    break
+                max_timeout = min(max_timeout, remaining_time)
+
             tautomer_options.SetMaxSearchTime(max_timeout)
 
             reas_tauts = list(
@@ -118,6 +144,14 @@ def standardise_oemol(
             break
 
         # if the loop above finished with no reasonable tautomer found at any stage, raise an error
+        if out_of_time or (
+            not successful_tautomerisation
+            and deadline is not None
+            and time.monotonic() >= deadline
+        ):
+            raise TimeoutError(
+                f"Could not generate a reasonable tautomer within {tautomer_time_budget}s for {oechem.OEMolToSmiles(std_mol)}",
+            )
         if not successful_tautomerisation:
             raise RuntimeError(
                 f"Could not generate a reasonable tautomer in the given time for {oechem.OEMolToSmiles(std_mol)}",
@@ -159,6 +193,69 @@ def standardise_oemol(
     return std_mol
 
 
+def canonicalise_samples(
+    canonicalise: Callable[..., Any],
+    samples: Iterable[Any],
+    n_jobs: int = 1,
+    timeout: float | None = None,
+    batch_timeout: float | None = None,
+) -> list[Any]:
+    """
+    Canonicalises samples over worker processes, within wall-clock budgets.
+
+    Each sample is canonicalised by `canonicalise(sample, idx=idx)` (where
+    `idx` is its index in `samples`) with `map_with_deadlines`, such that a
+    molecule that is slow to canonicalise only holds up its own worker, for
+    at most `timeout` seconds. Samples that time out (or are
+    abandoned once `batch_timeout` seconds have elapsed) are returned as
+    `None`, and reported in a warning.
+
+    Raises:
+        FeaturisationError: If canonicalisation of a sample fails.
+    """
+    samples = list(samples)
+
+    # OEMols cannot be sent to worker processes, unlike their binary form
+    sendable_samples = [
+        oechem.OEWriteMolToBytes(".oeb", sample)
+        if isinstance(sample, oechem.OEMolBase)
+        else sample
+        for sample in samples
+    ]
+    results = map_with_deadlines(
+        partial(_call_with_index, canonicalise),
+        list(enumerate(sendable_samples)),
+        n_jobs=n_jobs,
+        timeout=timeout,
+        batch_timeout=batch_timeout,
+    )
+
+    canonical_samples = []
+    n_timeouts = 0
+    for sample, result in zip(samples, results, strict=True):
+        if result.status == "error":
+            raise FeaturisationError(sample=sample) from RuntimeError(result.error)
+        if result.status == "timeout":
+            n_timeouts += 1
+            logger.debug("Canonicalisation of %r timed out: %s", sample, result.error)
+        canonical_samples.append(result.value)
+
+    if n_timeouts:
+        logger.warning(
+            f"Canonicalisation of {n_timeouts}/{len(samples)} molecules timed out: these are featurised as None",
+        )
+
+    return canonical_samples
+
+
+def _call_with_index(
+    function: Callable[..., Any],
+    indexed_sample: tuple[int, Any],
+) -> Any:
+    idx, sample = indexed_sample
+    return function(sample, idx=idx)
+
+
 def remove_mol_stereo(mol: oechem.OEMolBase) -> oechem.OEMolBase:
     """
     Returns a copy of the input molecule `mol` with all stereochemistry
@@ -1,3 +1,4 @@
+import functools
 from typing import Any
 
 try:
@@ -9,8 +10,9 @@ except ImportError as e:
 
 from molflux.features.bases import RepresentationBase
 from molflux.features.info import RepresentationInfo
-from molflux.features.representations.openeye._utils import to_oemol
+from molflux.features.representations.openeye._utils import oemol_from_bytes, to_oemol
 from molflux.features.representations.openeye.canonical._utils import (
+    canonicalise_samples,
     ensure_oemol_title,
     standardise_oemol,
 )
@@ -49,8 +51,11 @@ class CanonicalOemol(RepresentationBase):
         as_bytes: bool = True,
         tautomer_options: dict[str, Any] | None = None,
         tautomer_timeouts: list[float] | None = None,
+        n_workers: int = 1,
+        timeout: float | None = None,
+        batch_timeout: float | None = None,
         **kwargs: Any,
-    ) -> dict[str, list[bytes | OEMolBase]]:
+    ) -> dict[str, list[bytes | OEMolBase | None]]:
         r"""Featurises the input molecules as canonical OEMols.
 
         Args:
@@ -115,11 +120,23 @@ class CanonicalOemol(RepresentationBase):
                 For each molecule, each timeout is tried at the tautomerisation step until the first reasonable
                 tautomer is generated. Once one is found, the other timeouts are skipped.
                 NOTE: This parameter has an effect only if `reasonable_tautomer` is set to True.
+            n_workers: The number of worker processes to canonicalise
+                molecules over, one molecule at a time, such that a slow
+                molecule only holds up its own worker (unlike `n_jobs`, which
+                featurises whole chunks of molecules per worker). Defaults to
+                `1`.
+            timeout: The wall-clock budget of each molecule, in seconds. The
+                tautomer search is clipped to fit within it, and molecules
+                exceeding it are abandoned. Defaults to `None` (no budget).
+            batch_timeout: The wall-clock budget of all molecules, in seconds,
+                after which unfinished molecules are abandoned. Defaults to
+                `None` (no budget).
 
         Returns:
             Canonicalised copies of the input molecules. These are returned
             as bytes if `as_bytes` was set to `True`, and as OEMol objects
-            otherwise.
+            otherwise. Molecules whose canonicalisation timed out are
+            featurised as `None`.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -132,33 +149,64 @@ class CanonicalOemol(RepresentationBase):
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
 
+        canonicalise = functools.partial(
+            _canonical_oemol,
+            strip_salts=strip_salts,
+            set_neutral_ph=set_neutral_ph,
+            reasonable_protomer=reasonable_protomer,
+            reasonable_tautomer=reasonable_tautomer,
+            explicit_h=explicit_h,
+            remove_formal_charges=remove_formal_charges,
+            perceive_chiral=perceive_chiral,
+            assign_hyb=assign_hyb,
+            rekekulize=rekekulise,
+            remove_stereo=remove_stereo,
+            clear_non_chiral_stereo=clear_non_chiral_stereo,
+            remove_non_standard_stereo=remove_non_standard_stereo,
+            sd_title_tag=sd_title_tag,
+            clear_sd_data=clear_sd_data,
+            gen_2d_coords=gen_2d_coords,
+            tautomer_options=tautomer_options,
+            tautomer_timeouts=tautomer_timeouts,
+            tautomer_time_budget=timeout,
+        )
+
+        if n_workers != 1 or timeout is not None or batch_timeout is not None:
+            # molecules are sent back from worker processes as bytes
+            canonical_mols = canonicalise_samples(
+                functools.partial(canonicalise, as_bytes=True),
+                samples,
+                n_jobs=n_workers,
+                timeout=timeout,
+                batch_timeout=batch_timeout,
+            )
+            if not as_bytes:
+                canonical_mols = [
+                    None if mol is None else oemol_from_bytes(mol)
+                    for mol in canonical_mols
+                ]
+            return {self.tag: canonical_mols}
+
         canonical_mols = []
         for idx, sample in enumerate(samples):
             with featurisation_error_harness(sample):
-                mol = to_oemol(sample)
-                canonical_mol = standardise_oemol(
-                    mol,
-                    strip_salts=strip_salts,
-                    set_neutral_ph=set_neutral_ph,
-                    reasonable_protomer=reasonable_protomer,
-                    reasonable_tautomer=reasonable_tautomer,
-                    explicit_h=explicit_h,
-                    remove_formal_charges=remove_formal_charges,
-                    perceive_chiral=perceive_chiral,
-                    assign_hyb=assign_hyb,
-                    rekekulize=rekekulise,
-                    remove_stereo=remove_stereo,
-                    clear_non_chiral_stereo=clear_non_chiral_stereo,
-                    remove_non_standard_stereo=remove_non_standard_stereo,
-                    sd_title_tag=sd_title_tag,
-                    clear_sd_data=clear_sd_data,
-                    gen_2d_coords=gen_2d_coords,
-                    tautomer_options=tautomer_options,
-                    tautomer_timeouts=tautomer_timeouts,
+                canonical_mols.append(
+                    canonicalise(sample, idx=idx, as_bytes=as_bytes),
                 )
-                canonical_mol = ensure_oemol_title(canonical_mol, title=f"mol_{idx}")
-                if as_bytes:
-                    canonical_mol = OEWriteMolToBytes(".oeb", canonical_mol)
-                canonical_mols.append(canonical_mol)
 
         return {self.tag: canonical_mols}
+
+
+def _canonical_oemol(
+    sample: Any,
+    idx: int | None = None,
+    as_bytes: bool = True,
+    **kwargs: Any,
+) -> bytes | OEMolBase:
+    """Canonicalises a single sample into an OEMol, titled after its index if untitled."""
+    canonical_mol = standardise_oemol(to_oemol(sample), **kwargs)
+    if idx is not None:
+        canonical_mol = ensure_oemol_title(canonical_mol, title=f"mol_{idx}")
+    if as_bytes:
+        return OEWriteMolToBytes(".oeb", canonical_mol)
+    return canonical_mol
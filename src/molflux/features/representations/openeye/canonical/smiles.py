@@ -1,3 +1,4 @@
+import functools
 from typing import Any
 
 try:
@@ -9,7 +10,10 @@ except ImportError as e:
 from molflux.features.bases import RepresentationBase
 from molflux.features.info import RepresentationInfo
 from molflux.features.representations.openeye._utils import smiles_from_oemol, to_oemol
-from molflux.features.representations.openeye.canonical._utils import standardise_oemol
+from molflux.features.representations.openeye.canonical._utils import (
+    canonicalise_samples,
+    standardise_oemol,
+)
 from molflux.features.typing import MolArray
 from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
 
@@ -42,8 +46,11 @@ class CanonicalSmiles(RepresentationBase):
         clear_sd_data: bool = False,
         tautomer_options: dict[str, Any] | None = None,
         tautomer_timeouts: list[float] | None = None,
+        n_workers: int = 1,
+        timeout: float | None = None,
+        batch_timeout: float | None = None,
         **kwargs: Any,
-    ) -> dict[str, list[str]]:
+    ) -> dict[str, list[str | None]]:
         """Featurises the input molecules as canonical SMILES strings.
 
         Args:
@@ -101,9 +108,21 @@ class CanonicalSmiles(RepresentationBase):
                 For each molecule, each timeout is tried at the tautomerisation step until the first reasonable
                 tautomer is generated. Once one is found, the other timeouts are skipped.
                 NOTE: This parameter has an effect only if `reasonable_tautomer` is set to True.
+            n_workers: The number of worker processes to canonicalise
+                molecules over, one molecule at a time, such that a slow
+                molecule only holds up its own worker (unlike `n_jobs`, which
+                featurises whole chunks of molecules per worker). Defaults to
+                `1`.
+            timeout: The wall-clock budget of each molecule, in seconds. The
+                tautomer search is clipped to fit within it, and molecules
+                exceeding it are abandoned. Defaults to `None` (no budget).
+            batch_timeout: The wall-clock budget of all molecules, in seconds,
+                after which unfinished molecules are abandoned. Defaults to
+                `None` (no budget).
 
         Returns:
-            inputs featurised as canonical SMILES strings.
+            inputs featurised as canonical SMILES strings. Molecules whose
+            canonicalisation timed out are featurised as `None`.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -116,36 +135,58 @@ class CanonicalSmiles(RepresentationBase):
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
 
-        canonical_smiles = []
         flavor = oechem.OEGetDefaultOFlavor(oechem.OEFormat_SMI)
         if explicit_h:
             flavor |= oechem.OEOFlavor_SMI_Hydrogens
         if rekekulise:
             flavor |= oechem.OEOFlavor_SMI_Kekule
+        canonicalise = functools.partial(
+            _canonical_smiles,
+            flavor=flavor,
+            strip_salts=strip_salts,
+            set_neutral_ph=set_neutral_ph,
+            reasonable_protomer=reasonable_protomer,
+            reasonable_tautomer=reasonable_tautomer,
+            explicit_h=explicit_h,
+            remove_formal_charges=remove_formal_charges,
+            perceive_chiral=True,
+            assign_hyb=assign_hyb,
+            rekekulize=rekekulise,
+            remove_stereo=remove_stereo,
+            clear_non_chiral_stereo=clear_non_chiral_stereo,
+            remove_non_standard_stereo=remove_non_standard_stereo,
+            sd_title_tag=sd_title_tag,
+            clear_sd_data=clear_sd_data,
+            gen_2d_coords=False,
+            tautomer_options=tautomer_options,
+            tautomer_timeouts=tautomer_timeouts,
+            tautomer_time_budget=timeout,
+        )
+
+        if n_workers != 1 or timeout is not None or batch_timeout is not None:
+            canonical_smiles = canonicalise_samples(
+                canonicalise,
+                samples,
+                n_jobs=n_workers,
+                timeout=timeout,
+                batch_timeout=batch_timeout,
+            )
+            return {self.tag: canonical_smiles}
+
+        canonical_smiles = []
         for sample in samples:
             with featurisation_error_harness(sample):
-                mol = to_oemol(sample)
-                canonical_mol = standardise_oemol(
-                    mol,
-                    strip_salts=strip_salts,
-                    set_neutral_ph=set_neutral_ph,
-                    reasonable_protomer=reasonable_protomer,
-                    reasonable_tautomer=reasonable_tautomer,
-                    explicit_h=explicit_h,
-                    remove_formal_charges=remove_formal_charges,
-                    perceive_chiral=True,
-                    assign_hyb=assign_hyb,
-                    rekekulize=rekekulise,
-                    remove_stereo=remove_stereo,
-                    clear_non_chiral_stereo=clear_non_chiral_stereo,
-                    remove_non_standard_stereo=remove_non_standard_stereo,
-                    sd_title_tag=sd_title_tag,
-                    clear_sd_data=clear_sd_data,
-                    gen_2d_coords=False,
-                    tautomer_options=tautomer_options,
-                    tautomer_timeouts=tautomer_timeouts,
-                )
-                smiles = smiles_from_oemol(canonical_mol, flavor=flavor)
-                canonical_smiles.append(smiles)
+                canonical_smiles.append(canonicalise(sample))
 
         return {self.tag: canonical_smiles}
+
+
+def _canonical_smiles(
+    sample: Any,
+    flavor: int,
+    idx: int | None = None,
+    **kwargs: Any,
+) -> str:
+    """Canonicalises a single sample into a SMILES string (its index is unused)."""
+    canonical_mol = standardise_oemol(to_oemol(sample), **kwargs)
+    return smiles_from_oemol(canonical_mol, flavor=flavor)
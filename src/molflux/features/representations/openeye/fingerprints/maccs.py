@@ -1,5 +1,7 @@
 from typing import Any
 
+import numpy as np
+
 try:
     from openeye import oegraphsim
 except ImportError as e:
@@ -8,13 +10,19 @@ except ImportError as e:
     raise ExtrasDependencyImportError("openeye", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
+from molflux.features.info import FeatureSchema, RepresentationInfo
 from molflux.features.representations.openeye._utils import (
-    fingerprint_to_bit_vector,
+    fingerprint_to_bits,
     to_oemol,
 )
-from molflux.features.typing import Fingerprint, MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.typing import FingerprintFormat, Fingerprints, MolArray
+from molflux.features.utils import (
+    assert_n_positional_args,
+    featurisation_error_harness,
+    fingerprint_schema,
+    format_fingerprints,
+    validate_fingerprint_format,
+)
 
 _DESCRIPTION = """
 MACCS fingerprint. [OpenEye]
@@ -23,6 +31,8 @@ MACCS keys are 166 bit structural key descriptors in which each bit is
 associated with a SMARTS pattern.
 """
 
+_MACCS_FINGERPRINT_LENGTH = 166
+
 
 class MACCS(RepresentationBase):
     def _info(self) -> RepresentationInfo:
@@ -30,18 +40,31 @@ class MACCS(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            self.tag: fingerprint_schema(
+                _MACCS_FINGERPRINT_LENGTH,
+                output_format=kwargs["output_format"],
+            ),
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
+        output_format: FingerprintFormat = "bits",
         **kwargs: Any,
-    ) -> dict[str, list[Fingerprint]]:
+    ) -> dict[str, Fingerprints]:
         """Generates MACCS fingerprints for each input molecule.
 
         Args:
             samples: The molecules to featurise
+            output_format: The format of the output fingerprints. One of
+                `"bits"` (lists of bits), `"packed"` (bytes of bits packed
+                eight per byte) or `"numpy"` (a contiguous `uint8` matrix).
+                Defaults to `"bits"`.
 
         Returns:
-            MACCS fingerprints, as lists of bits.
+            MACCS fingerprints, in the requested output format.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -51,21 +74,25 @@ class MACCS(RepresentationBase):
             {'maccs': [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0]]}
         """
         assert_n_positional_args(*columns, expected_size=1)
+        validate_fingerprint_format(output_format)
         samples = columns[0]
-        maccs_fp_list: list[Fingerprint] = []
+        maccs_fp_list: list[np.ndarray] = []
         for sample in samples:
             with featurisation_error_harness(sample):
                 # patch openeye support for fingerprints of empty SMILES
                 if sample == "":
-                    _MACCS_FINGERPRINT_LENGTH = 166
-                    bit_vector = [0] * _MACCS_FINGERPRINT_LENGTH
+                    bit_vector = np.zeros(_MACCS_FINGERPRINT_LENGTH, dtype=np.uint8)
 
                 else:
                     mol = to_oemol(sample)
                     fp = oegraphsim.OEFingerPrint()
                     oegraphsim.OEMakeMACCS166FP(fp, mol)
-                    bit_vector = fingerprint_to_bit_vector(fp)
+                    bit_vector = fingerprint_to_bits(fp)
 
                 maccs_fp_list.append(bit_vector)
 
-        return {self.tag: maccs_fp_list}
+        bits = np.array(maccs_fp_list, dtype=np.uint8).reshape(
+            len(maccs_fp_list),
+            _MACCS_FINGERPRINT_LENGTH,
+        )
+        return {self.tag: format_fingerprints(bits, output_format=output_format)}
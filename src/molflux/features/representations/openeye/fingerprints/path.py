@@ -1,5 +1,7 @@
 from typing import Any
 
+import numpy as np
+
 try:
     from openeye import oegraphsim
 except ImportError as e:
@@ -8,13 +10,19 @@ except ImportError as e:
     raise ExtrasDependencyImportError("openeye", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
+from molflux.features.info import FeatureSchema, RepresentationInfo
 from molflux.features.representations.openeye._utils import (
-    fingerprint_to_bit_vector,
+    fingerprint_to_bits,
     to_oemol,
 )
-from molflux.features.typing import Fingerprint, MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.typing import FingerprintFormat, Fingerprints, MolArray
+from molflux.features.utils import (
+    assert_n_positional_args,
+    featurisation_error_harness,
+    fingerprint_schema,
+    format_fingerprints,
+    validate_fingerprint_format,
+)
 
 _DESCRIPTION = """
 Path fingerprint.
@@ -31,6 +39,14 @@ class Path(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            self.tag: fingerprint_schema(
+                kwargs["length"],
+                output_format=kwargs["output_format"],
+            ),
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
@@ -38,8 +54,9 @@ class Path(RepresentationBase):
         diameter: int = 6,
         atom_type: int = oegraphsim.OEFPAtomType_DefaultAtom,
         bond_type: int = oegraphsim.OEFPBondType_DefaultBond,
+        output_format: FingerprintFormat = "bits",
         **kwargs: Any,
-    ) -> dict[str, list[Fingerprint]]:
+    ) -> dict[str, Fingerprints]:
         """Generates a path fingerprint for each input molecule.
 
         Args:
@@ -55,9 +72,13 @@ class Path(RepresentationBase):
             bond_type: Defines which bond properties are encoded during the
                 fingerprint generation. This value has to be either a value or
                 a set of bitwise OR`d values from the `OEFPBondType` namespace.
+            output_format: The format of the output fingerprints. One of
+                `"bits"` (lists of bits), `"packed"` (bytes of bits packed
+                eight per byte) or `"numpy"` (a contiguous `uint8` matrix).
+                Defaults to `"bits"`.
 
         Returns:
-            Path fingerprints, as lists of bits.
+            Path fingerprints, in the requested output format.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -67,6 +88,7 @@ class Path(RepresentationBase):
             {'path': [[0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 1, 1, 0, 0, 0, 0]]}
         """
         assert_n_positional_args(*columns, expected_size=1)
+        validate_fingerprint_format(output_format)
         samples = columns[0]
         if not ((length & (length - 1) == 0) and length != 0):
             raise RuntimeError(f"length: {length} must be a power of 2")
@@ -79,12 +101,12 @@ class Path(RepresentationBase):
         if not ((diameter % 2 == 0) and diameter >= 0):
             raise RuntimeError(f"diameter: {diameter} must be even and >= 0")
 
-        path_fp_list: list[Fingerprint] = []
+        path_fp_list: list[np.ndarray] = []
         for sample in samples:
             with featurisation_error_harness(sample):
                 # patch openeye support for fingerprints of empty SMILES
                 if sample == "":
-                    bit_vector = [0] * length
+                    bit_vector = np.zeros(length, dtype=np.uint8)
 
                 else:
                     mol = to_oemol(sample)
@@ -98,8 +120,9 @@ class Path(RepresentationBase):
                         atom_type,
                         bond_type,
                     )
-                    bit_vector = fingerprint_to_bit_vector(fp)
+                    bit_vector = fingerprint_to_bits(fp)
 
                 path_fp_list.append(bit_vector)
 
-        return {self.tag: path_fp_list}
+        bits = np.array(path_fp_list, dtype=np.uint8).reshape(len(path_fp_list), length)
+        return {self.tag: format_fingerprints(bits, output_format=output_format)}
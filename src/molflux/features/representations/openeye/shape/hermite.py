@@ -103,6 +103,8 @@ def _get_hermite_coeffs(
     hermite = oeshape.OEHermite(opts)
 
     if orient_by_moments_of_inertia:
+        # orient a copy, as the input molecule may be shared with other representations
+        mol = oechem.OEMol(mol)
         trans = oechem.OETrans()
         oeshape.OEOrientByMomentsOfInertia(mol, trans)
 
@@ -1,7 +1,14 @@
+from collections.abc import Iterable, Sequence
 from typing import Any
 
+import numpy as np
+from numpy.typing import NDArray
+
+from molflux.features.utils import featurisation_error_harness, parse_shared_molecule
+
 try:
-    from rdkit import Chem, rdBase
+    from rdkit import Chem, DataStructs, rdBase
+    from rdkit.Chem import rdFingerprintGenerator
 
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
@@ -73,9 +80,19 @@ def rdkit_mol_from_bytes(bytes_molecule: bytes) -> Chem.Mol:
     """Returns a Chem.Mol object representing the input bytes string."""
     rdkit_mol = Chem.Mol(bytes_molecule)
     if rdkit_mol:
+        _ensure_ring_info(rdkit_mol)
         return rdkit_mol
 
 
+def _ensure_ring_info(rdkit_mol: Chem.Mol) -> None:
+    """Perceives rings and valences of molecules pickled without them."""
+    try:
+        rdkit_mol.GetRingInfo().NumRings()
+    except RuntimeError:
+        rdkit_mol.UpdatePropertyCache(strict=False)
+        Chem.GetSymmSSSR(rdkit_mol)
+
+
 def rdkit_mol_from_hex(hex_molecule: str) -> Chem.Mol:
     """Returns a Chem.Mol object representing the input hex string."""
     bytes_molecule = bytes.fromhex(hex_molecule)
@@ -111,16 +128,28 @@ def to_rdkit_mol(molecule: Any) -> Chem.Mol:
         - it is converted to an Chem.Mol
     - else, raise an error
 
+    Within a ``shared_molecules_context``, string and bytes inputs are only
+    parsed once and the resulting Chem.Mol is re-used across calls.
+
     Args:
         molecule: Any
 
     Returns:
         Chem.Mol
     """
-    with RDKitLogContext():
-        if isinstance(molecule, Chem.Mol):
-            return molecule
+    if isinstance(molecule, Chem.Mol):
+        return molecule
+
+    return parse_shared_molecule(
+        molecule,
+        backend="rdkit:input",
+        parser=_parse_rdkit_mol,
+    )
 
+
+def _parse_rdkit_mol(molecule: Any) -> Chem.Mol:
+    """Parses a single string or bytes input into a Chem.Mol object."""
+    with RDKitLogContext():
         if isinstance(molecule, str):
             try:
                 rdkit_mol = rdkit_mol_from_smiles(molecule)
@@ -174,6 +203,43 @@ def to_smiles(molecule: Any) -> str:
             raise TypeError(f"Unsupported input sample type: {type(molecule)!r}")
 
 
+def rdkit_mol_from_sample(sample: Any, parse_via_smiles: bool = True) -> Chem.Mol:
+    """
+    Returns a Chem.Mol object representing the input sample, parsed via its SMILES.
+
+    Chem.Mol, bytes and hex string inputs are converted to SMILES and parsed
+    again, such that they are featurised as the molecule of their SMILES (with
+    implicit hydrogens, and without conformers nor properties). If
+    `parse_via_smiles` is not set, they are converted with `to_rdkit_mol`
+    instead, and used as they are.
+
+    Within a ``shared_molecules_context``, each sample is only parsed once and
+    the resulting Chem.Mol is re-used across calls.
+    """
+    if not parse_via_smiles:
+        return to_rdkit_mol(sample)
+
+    return parse_shared_molecule(
+        sample,
+        backend="rdkit",
+        parser=_parse_rdkit_mol_via_smiles,
+    )
+
+
+def _parse_rdkit_mol_via_smiles(sample: Any) -> Chem.Mol:
+    """Parses a single sample into a Chem.Mol object via its SMILES."""
+    # valid SMILES inputs are parsed directly, rather than once for validation
+    # in to_smiles() and once more for conversion
+    if isinstance(sample, str):
+        with RDKitLogContext():
+            mol = Chem.MolFromSmiles(sample)
+        if mol is not None:
+            return mol
+
+    smiles = to_smiles(sample)
+    return rdkit_mol_from_smiles(smiles)
+
+
 def to_hex(molecule: Any) -> str:
     """
     Converts a single sample to bytes and then to a hex string.
@@ -186,3 +252,104 @@ def to_hex(molecule: Any) -> str:
     mol_hex = str(mol_bytes.hex())
 
     return mol_hex
+
+
+def bit_vectors_to_numpy(
+    fingerprints: Sequence[DataStructs.ExplicitBitVect],
+    n_bits: int,
+) -> NDArray[np.uint8]:
+    """Stacks rdkit bit vectors into a (n_samples, n_bits) uint8 matrix."""
+    bit_strings = "".join(fingerprint.ToBitString() for fingerprint in fingerprints)
+    bits = np.frombuffer(bit_strings.encode("ascii"), dtype=np.uint8) - ord("0")
+    return bits.reshape(len(fingerprints), n_bits)
+
+
+def generate_fingerprints(
+    generator: rdFingerprintGenerator.FingeprintGenerator64,
+    samples: Iterable[Any],
+    sparse_counts: bool = False,
+    n_threads: int = 1,
+    from_atoms: list[int] | None = None,
+    ignore_atoms: list[int] | None = None,
+    atom_invariants: list[int] | None = None,
+    conf_id: int = -1,
+    bit_info: dict | None = None,
+    parse_via_smiles: bool = True,
+) -> list[Any]:
+    """Generates fingerprints of input samples with an rdkit fingerprint generator.
+
+    Molecules are fingerprinted in bulk by the generator, over `n_threads`
+    threads. Options specific to each molecule (atoms to fingerprint or to
+    ignore, custom atom invariants, a conformer, or bit info to collect)
+    require fingerprinting molecules one at a time instead.
+
+    Args:
+        generator: The rdkit fingerprint generator.
+        samples: The molecules to be fingerprinted.
+        sparse_counts: If set, sparse count fingerprints are generated instead
+            of folded bit vectors.
+        n_threads: The number of threads used to fingerprint molecules in bulk.
+        from_atoms: If provided, only these atoms are used in the fingerprint.
+        ignore_atoms: If provided, these atoms are excluded from the fingerprint.
+        atom_invariants: If provided, custom atom invariants to be used instead
+            of those of the generator.
+        conf_id: The conformer to be used, for 3D fingerprints.
+        bit_info: If provided (and not empty), it is filled with a mapping of
+            each bit to the atoms and radii setting it, for the last molecule.
+        parse_via_smiles: If set, samples are parsed via their SMILES (see
+            `rdkit_mol_from_sample`).
+
+    Returns:
+        The fingerprints of each sample.
+
+    Raises:
+        FeaturisationError: If a sample cannot be parsed or fingerprinted.
+    """
+    samples = list(samples)
+    mols = []
+    for sample in samples:
+        with featurisation_error_harness(sample):
+            mols.append(
+                rdkit_mol_from_sample(sample, parse_via_smiles=parse_via_smiles),
+            )
+
+    per_molecule = bool(from_atoms or ignore_atoms or atom_invariants or bit_info)
+    if not per_molecule and conf_id == -1:
+        bulk_fingerprint = (
+            generator.GetSparseCountFingerprints
+            if sparse_counts
+            else generator.GetFingerprints
+        )
+        try:
+            return list(bulk_fingerprint(mols, numThreads=n_threads))
+        except Exception:  # noqa: S110
+            # fingerprint molecules one at a time to report the failing sample
+            pass
+
+    fingerprint = (
+        generator.GetSparseCountFingerprint
+        if sparse_counts
+        else generator.GetFingerprint
+    )
+    options = {
+        "fromAtoms": from_atoms or [],
+        "ignoreAtoms": ignore_atoms or [],
+        "confId": conf_id,
+        "customAtomInvariants": atom_invariants or [],
+    }
+    additional_output = None
+    if bit_info:
+        additional_output = rdFingerprintGenerator.AdditionalOutput()
+        additional_output.AllocateBitInfoMap()
+        options["additionalOutput"] = additional_output
+
+    fingerprints = []
+    for sample, mol in zip(samples, mols, strict=True):
+        with featurisation_error_harness(sample):
+            fingerprints.append(fingerprint(mol, **options))
+
+        if additional_output is not None:
+            bit_info.clear()  # type: ignore[union-attr]
+            bit_info.update(additional_output.GetBitInfoMap())  # type: ignore[union-attr]
+
+    return fingerprints
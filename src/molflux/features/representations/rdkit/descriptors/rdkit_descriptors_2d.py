@@ -1,22 +1,28 @@
 from __future__ import annotations
 
 import difflib
-import itertools
+import functools
 from typing import TYPE_CHECKING, Any, Literal, get_args
 
+import numpy as np
+
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
+from molflux.features.info import FeatureSchema, RepresentationInfo
 from molflux.features.representations.rdkit._utils import (
-    rdkit_mol_from_smiles,
-    to_smiles,
+    rdkit_mol_from_sample,
 )
 from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from numpy.typing import NDArray
+
     from molflux.features.typing import MolArray
 
 try:
-    from rdkit.ML.Descriptors import MoleculeDescriptors
+    from rdkit.Chem import Descriptors
+    from rdkit.Chem.EState import EStateIndices
 
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
@@ -239,12 +245,51 @@ _Descriptor2D = Literal[
 ]
 _ALL_AVAILABLE_DESCRIPTORS = list(get_args(_Descriptor2D))
 
+_Preset = Literal["all", "fast"]
+_DType = Literal["float32", "float64"]
+
+# descriptors costing about ten times more than most others to calculate (or
+# more), excluded from the "fast" preset
+_EXPENSIVE_DESCRIPTORS = frozenset(
+    [
+        "qed",
+        "SPS",
+        "FpDensityMorgan1",
+        "FpDensityMorgan2",
+        "FpDensityMorgan3",
+        "BCUT2D_MWHI",
+        "BCUT2D_MWLOW",
+        "BCUT2D_CHGHI",
+        "BCUT2D_CHGLO",
+        "BCUT2D_LOGPHI",
+        "BCUT2D_LOGPLOW",
+        "BCUT2D_MRHI",
+        "BCUT2D_MRLOW",
+        "AvgIpc",
+        "BertzCT",
+        "Ipc",
+    ],
+)
+
+# descriptors derived from the molecule's EState indices, calculated only once
+_ESTATE_DESCRIPTORS: dict[str, Callable[[list[float]], float]] = {
+    "MaxAbsEStateIndex": lambda indices: max(abs(x) for x in indices),
+    "MaxEStateIndex": max,
+    "MinAbsEStateIndex": lambda indices: min(abs(x) for x in indices),
+    "MinEStateIndex": min,
+}
+
+# the value of descriptors failing to calculate, as set by rdkit
+_ERROR_VALUE = -666
+
 
 _DESCRIPTION = f"""
 209 rdkit 2d molecular descriptors.
 
 The following descriptors are available: {_ALL_AVAILABLE_DESCRIPTORS!r}
 
+The "fast" preset excludes the most expensive descriptors: {sorted(_EXPENSIVE_DESCRIPTORS)!r}
+
 For further info and references, see
 https://www.rdkit.org/docs/GettingStartedInPython.html#list-of-available-descriptors.
 """
@@ -256,26 +301,53 @@ class RdkitDescriptors_2d(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        descriptors = _select_descriptors(
+            kwargs["include"],
+            kwargs["exclude"],
+            preset=kwargs["preset"],
+        )
+        return {
+            f"{self.tag}::{name}": FeatureSchema(dtype=kwargs["dtype"] or "float64")
+            for name in descriptors
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
         include: list[_Descriptor2D] | None = None,
         exclude: list[_Descriptor2D] | None = None,
+        preset: _Preset = "all",
+        dtype: _DType | None = None,
+        parse_via_smiles: bool = True,
         **kwargs: Any,
-    ) -> dict[str, list[float]]:
+    ) -> dict[str, list[float]] | dict[str, NDArray[np.floating]]:
         """Calculates 2D molecular descriptors.
 
         Args:
             samples: The molecules for which to calculate descriptors.
             include: A list of specific 2D descriptor names to calculate. If
-                `None`, all available 2D descriptors are calculated. Defaults to
-                `None`.
+                `None`, all descriptors of the `preset` are calculated.
+                Defaults to `None`.
             exclude: A list of specific 2D descriptor names to not calculate. If
                 `None`, no descriptors are excluded. Defaults to `None`.
+            preset: The descriptors to calculate if `include` is `None`. One
+                of `"all"` (all available 2D descriptors) or `"fast"` (all but
+                the most expensive ones to calculate). Defaults to `"all"`.
+            dtype (optional): The dtype of NumPy columns of calculated values,
+                `"float32"` or `"float64"`. Values beyond the range of
+                `"float32"` (e.g. `Ipc` of large molecules) overflow to
+                infinity. If `None`, values are returned as lists of (double
+                precision) floats. Defaults to `None`.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
             Calculated values of the 2D descriptor, each descriptor as its own
-             feature.
+             feature. With a `dtype`, features are contiguous columns of a
+             single column-major `(n_samples, n_descriptors)` array.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -283,61 +355,168 @@ class RdkitDescriptors_2d(RepresentationBase):
             >>> samples = ['COc1cc2c(cc1OCCCN3CCOCC3)c(ncn2)Sc4nccs4', 'c1ccccc1']
             >>> representation.featurise(samples, include=["SlogP_VSA8", "VSA_EState8"])
             {'rdkit_descriptors_2d::SlogP_VSA8': [10.90..., 0.0], 'rdkit_descriptors_2d::VSA_EState8': [5.25..., 0.0]}
+            >>> representation.featurise(samples, include=["SlogP_VSA8"], dtype="float32")
+            {'rdkit_descriptors_2d::SlogP_VSA8': array([10.90...,  0. ...], dtype=float32)}
         """
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
-        # not using set difference to avoid possible internal shuffling
-        descriptors_to_calculate = [
-            x
-            for x in (include or _ALL_AVAILABLE_DESCRIPTORS)
-            if x not in (exclude or [])
-        ]
+        descriptors_to_calculate = _select_descriptors(
+            include,
+            exclude,
+            preset=preset,
+        )
+        calculator = get_descriptors_calculator(tuple(descriptors_to_calculate))
 
-        if not descriptors_to_calculate:
-            raise ValueError(
-                "No descriptors to calculate: please expand your 'select' filter and / or reduce your 'exclude' filter.",
-            )
+        mols = []
+        for sample in samples:
+            with featurisation_error_harness(sample):
+                mols.append(
+                    (
+                        sample,
+                        rdkit_mol_from_sample(
+                            sample,
+                            parse_via_smiles=parse_via_smiles,
+                        ),
+                    ),
+                )
 
-        invalid_descriptors = set(descriptors_to_calculate).difference(
-            _ALL_AVAILABLE_DESCRIPTORS,
+        # column-major, so that each descriptor's values are contiguous
+        results = np.empty(
+            (len(mols), len(descriptors_to_calculate)),
+            dtype=dtype or np.float64,
+            order="F",
         )
-        if invalid_descriptors:
-            msg = "The following descriptor(s) are not available:"
-            for invalid_descriptor in invalid_descriptors:
-                msg += f"\n\t{invalid_descriptor!r}"
-                similar = difflib.get_close_matches(
-                    invalid_descriptor,
-                    _ALL_AVAILABLE_DESCRIPTORS,
+        # values beyond the range of the dtype are set to infinity
+        with np.errstate(over="ignore"):
+            for i, (sample, mol) in enumerate(mols):
+                with featurisation_error_harness(sample):
+                    calculator.calculate(mol, out=results[i])
+
+        if dtype is None:
+            return {
+                f"{self.tag}::{name}": values
+                for name, values in zip(
+                    descriptors_to_calculate,
+                    results.T.tolist(),
+                    strict=True,
                 )
-                if similar:
-                    msg += f" -> You might be looking for one of these: {similar}"
-            raise ValueError(msg)
+            }
+
+        return {
+            f"{self.tag}::{name}": results[:, j]
+            for j, name in enumerate(descriptors_to_calculate)
+        }
 
-        calculator = MoleculeDescriptors.MolecularDescriptorCalculator(
-            descriptors_to_calculate,
+
+class _DescriptorsCalculator:
+    """Calculates a fixed selection of 2D descriptors, in order."""
+
+    def __init__(self, descriptors: tuple[str, ...]) -> None:
+        functions = dict(Descriptors._descList)
+        self._functions = [
+            (j, functions[name])
+            for j, name in enumerate(descriptors)
+            if name not in _ESTATE_DESCRIPTORS
+        ]
+        self._estate_functions = [
+            (j, _ESTATE_DESCRIPTORS[name])
+            for j, name in enumerate(descriptors)
+            if name in _ESTATE_DESCRIPTORS
+        ]
+
+    def calculate(self, mol: Any, out: NDArray[np.floating]) -> None:
+        """Calculates the descriptors of a molecule into a preallocated row."""
+        for j, function in self._functions:
+            try:
+                out[j] = function(mol)
+            except Exception:
+                out[j] = _ERROR_VALUE
+
+        if self._estate_functions:
+            try:
+                indices = EStateIndices(mol)
+            except Exception:
+                indices = []
+
+            for j, function in self._estate_functions:
+                try:
+                    out[j] = function(indices)
+                except Exception:
+                    out[j] = _ERROR_VALUE
+
+
+@functools.lru_cache(maxsize=32)
+def get_descriptors_calculator(descriptors: tuple[str, ...]) -> _DescriptorsCalculator:
+    """Returns a (cached) calculator of the given descriptors, in order."""
+    return _DescriptorsCalculator(descriptors)
+
+
+def _select_descriptors(
+    include: list[_Descriptor2D] | None,
+    exclude: list[_Descriptor2D] | None,
+    preset: _Preset = "all",
+) -> list[str]:
+    """Returns the validated names of the descriptors to calculate, in order."""
+    return list(
+        _select_descriptors_cached(
+            tuple(include) if include is not None else None,
+            tuple(exclude) if exclude is not None else None,
+            preset,
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _select_descriptors_cached(
+    include: tuple[str, ...] | None,
+    exclude: tuple[str, ...] | None,
+    preset: _Preset,
+) -> tuple[str, ...]:
+    # not using set difference to avoid possible internal shuffling
+    descriptors_to_calculate = [
+        x
+        for x in (include or list_available_rdkit_descriptors_2d(preset))
+        if x not in (exclude or [])
+    ]
+
+    if not descriptors_to_calculate:
+        raise ValueError(
+            "No descriptors to calculate: please expand your 'select' filter and / or reduce your 'exclude' filter.",
         )
 
-        descriptors_results_list: list[list[float]] = []
-        for sample in samples:
-            with featurisation_error_harness(sample):
-                smiles = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smiles)
-                descriptors_results_list.append(calculator.CalcDescriptors(mol))
-
-        # Transpose the results and return one feature for each descriptor
-        return {  # type: ignore[var-annotated]
-            f"{self.tag}::{name}": v
-            for name, v in itertools.zip_longest(
-                calculator.descriptorNames,
-                map(list, zip(*descriptors_results_list, strict=False)),
-                fillvalue=[],
+    invalid_descriptors = set(descriptors_to_calculate).difference(
+        _ALL_AVAILABLE_DESCRIPTORS,
+    )
+    if invalid_descriptors:
+        msg = "The following descriptor(s) are not available:"
+        for invalid_descriptor in invalid_descriptors:
+            msg += f"\n\t{invalid_descriptor!r}"
+            similar = difflib.get_close_matches(
+                invalid_descriptor,
+                _ALL_AVAILABLE_DESCRIPTORS,
             )
-        }
+            if similar:
+                msg += f" -> You might be looking for one of these: {similar}"
+        raise ValueError(msg)
+
+    return tuple(descriptors_to_calculate)
 
 
-def list_available_rdkit_descriptors_2d() -> list[str]:
+def list_available_rdkit_descriptors_2d(preset: _Preset = "all") -> list[str]:
     """Returns all available 2D descriptors names.
 
     This is a convenience function to abstract away the rdkit backend details.
+
+    Args:
+        preset: One of `"all"` (all available descriptors) or `"fast"` (all
+            but the most expensive descriptors to calculate).
     """
-    return _ALL_AVAILABLE_DESCRIPTORS
+    if preset == "all":
+        return _ALL_AVAILABLE_DESCRIPTORS
+    if preset == "fast":
+        return [
+            x for x in _ALL_AVAILABLE_DESCRIPTORS if x not in _EXPENSIVE_DESCRIPTORS
+        ]
+    raise ValueError(
+        f"Unknown descriptors preset: {preset!r}. Available presets: {get_args(_Preset)!r}",
+    )
@@ -3,17 +3,24 @@ from typing import Any
 try:
     from rdkit.Chem import rdFingerprintGenerator
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import (
+        bit_vectors_to_numpy,
+        generate_fingerprints,
+    )
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
-from molflux.features.typing import Fingerprint, MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.typing import FingerprintFormat, Fingerprints, MolArray
+from molflux.features.utils import (
+    assert_n_positional_args,
+    fingerprint_schema,
+    format_fingerprints,
+    validate_fingerprint_format,
+)
 
 _DESCRIPTION = """
 The atom-pair fingerprint for a molecule.
@@ -50,6 +57,14 @@ class AtomPair(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            self.tag: fingerprint_schema(
+                kwargs["fp_size"],
+                output_format=kwargs["output_format"],
+            ),
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
@@ -61,8 +76,11 @@ class AtomPair(RepresentationBase):
         count_bounds: object | None = None,
         fp_size: int = 2048,
         atom_invariants_generator: object | None = None,
+        output_format: FingerprintFormat = "bits",
+        n_threads: int = 1,
+        parse_via_smiles: bool = True,
         **kwargs: Any,
-    ) -> dict[str, list[Fingerprint]]:
+    ) -> dict[str, Fingerprints]:
         """
         Generates a folded atom-pair fingerprint for each input molecule from a fingerprint generator.
 
@@ -86,9 +104,19 @@ class AtomPair(RepresentationBase):
                 sparse versions. Defaults is 2048.
             atom_invariants_generator: atom invariants to be used during
                 fingerprint generation. Defaults to `None`.
+            output_format: The format of the output fingerprints. One of
+                `"bits"` (lists of bits), `"packed"` (bytes of bits packed
+                eight per byte) or `"numpy"` (a contiguous `uint8` matrix).
+                Defaults to `"bits"`.
+            n_threads: The number of threads used by rdkit to fingerprint
+                molecules in bulk. Defaults to `1`.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
-            Folded atom-pair fingerprints, as lists of bits.
+            Folded atom-pair fingerprints, in the requested output format.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -98,6 +126,7 @@ class AtomPair(RepresentationBase):
             {'atom_pair': [[1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]]}
         """
         assert_n_positional_args(*columns, expected_size=1)
+        validate_fingerprint_format(output_format)
         samples = columns[0]
         apgen = rdFingerprintGenerator.GetAtomPairGenerator(
             minDistance=min_distance,
@@ -110,12 +139,12 @@ class AtomPair(RepresentationBase):
             atomInvariantsGenerator=atom_invariants_generator,
         )
 
-        atom_pairs_fp_list: list[Fingerprint] = []
-        for sample in samples:
-            with featurisation_error_harness(sample):
-                smiles = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smiles)
-                fingerprint = list(apgen.GetFingerprint(mol))
-                atom_pairs_fp_list.append(fingerprint)
+        atom_pairs_fp_list = generate_fingerprints(
+            apgen,
+            samples,
+            n_threads=n_threads,
+            parse_via_smiles=parse_via_smiles,
+        )
 
-        return {self.tag: atom_pairs_fp_list}
+        bits = bit_vectors_to_numpy(atom_pairs_fp_list, n_bits=fp_size)
+        return {self.tag: format_fingerprints(bits, output_format=output_format)}
@@ -1,19 +1,25 @@
-from typing import Any
+from typing import Any, get_args
+
+import numpy as np
 
 try:
-    from rdkit.Chem.AtomPairs.Pairs import GetAtomPairFingerprint
+    from rdkit.Chem import rdFingerprintGenerator
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import generate_fingerprints
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
-from molflux.features.typing import MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.typing import MolArray, SparseFingerprintFormat
+from molflux.features.utils import (
+    assert_n_positional_args,
+    format_sparse_fingerprints,
+    sparse_fingerprint_schema,
+    validate_fingerprint_format,
+)
 
 _DESCRIPTION = """
 The atom-pair fingerprint for a molecule.
@@ -48,6 +54,13 @@ class AtomPairUnfolded(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema] | None:
+        return sparse_fingerprint_schema(
+            self.tag,
+            output_format=kwargs["output_format"],
+            index_dtype="uint32",
+        )
+
     def _featurise(
         self,
         *columns: MolArray,
@@ -59,8 +72,11 @@ class AtomPairUnfolded(RepresentationBase):
         include_chirality: bool = False,
         use_2d: bool = True,
         conf_id: int = -1,
+        output_format: SparseFingerprintFormat = "dict",
+        n_threads: int = 1,
+        parse_via_smiles: bool = True,
         **kwargs: Any,
-    ) -> dict[str, list[dict[str, int]]]:
+    ) -> dict[str, list[Any]]:
         """Generates an atom-pair fingerprint for each input molecule.
 
         Args:
@@ -84,6 +100,17 @@ class AtomPairUnfolded(RepresentationBase):
                 Defaults to `True`.
             conf_id: The conformation to use if 3D distances are being used.
                 Defaults to `-1`.
+            output_format: The format of the output fingerprints. One of
+                `"dict"` (dictionaries of stringified hashes to counts) or
+                `"sparse"` (arrays of sorted hashes and of their counts, as
+                separate `"::indices"` and `"::counts"` features). Defaults to
+                `"dict"`.
+            n_threads: The number of threads used by rdkit to fingerprint
+                molecules in bulk. Defaults to `1`.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
             Unfolded Atom-pair fingerprints, as dictionaries.
@@ -97,24 +124,34 @@ class AtomPairUnfolded(RepresentationBase):
         """
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
-        atom_pairs_fp_list: list[dict[str, int]] = []
-        for sample in samples:
-            with featurisation_error_harness(sample):
-                smile = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smile)
-                rd_fp = GetAtomPairFingerprint(
-                    mol,
-                    minLength=min_length,
-                    maxLength=max_length,
-                    fromAtoms=from_atoms or [],
-                    ignoreAtoms=ignore_atoms or [],
-                    atomInvariants=atom_invariants or [],
-                    includeChirality=include_chirality,
-                    use2D=use_2d,
-                    confId=conf_id,
-                )
-                atom_pairs_fp_list.append(
-                    {str(k): v for k, v in rd_fp.GetNonzeromolfluxs().items()},
-                )
-
-        return {self.tag: atom_pairs_fp_list}
+        validate_fingerprint_format(
+            output_format,
+            supported_formats=get_args(SparseFingerprintFormat),
+        )
+        generator = rdFingerprintGenerator.GetAtomPairGenerator(
+            minDistance=min_length,
+            maxDistance=max_length,
+            includeChirality=include_chirality,
+            use2D=use_2d,
+        )
+        fingerprints = generate_fingerprints(
+            generator,
+            samples,
+            sparse_counts=True,
+            n_threads=n_threads,
+            from_atoms=from_atoms,
+            ignore_atoms=ignore_atoms,
+            atom_invariants=atom_invariants,
+            conf_id=conf_id,
+            parse_via_smiles=parse_via_smiles,
+        )
+        atom_pairs_fp_list = [
+            fingerprint.GetNonzeroElements() for fingerprint in fingerprints
+        ]
+
+        return format_sparse_fingerprints(
+            atom_pairs_fp_list,
+            tag=self.tag,
+            output_format=output_format,
+            index_dtype=np.uint32,
+        )
@@ -3,7 +3,7 @@ from typing import Any
 try:
     from rdkit.Avalon.pyAvalonTools import GetAvalonFP
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import rdkit_mol_from_sample
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
@@ -11,7 +11,6 @@ except ImportError as e:
 
 from molflux.features.bases import RepresentationBase
 from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
 from molflux.features.typing import Fingerprint, MolArray
 from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
 
@@ -33,6 +32,7 @@ class Avalon(RepresentationBase):
         is_query: bool = False,
         reset_vect: bool = False,
         bit_flags: int = 15761407,
+        parse_via_smiles: bool = True,
         **kwargs: Any,
     ) -> dict[str, list[Fingerprint]]:
         """Generates the Avalon fingerprint for each input molecule.
@@ -43,6 +43,10 @@ class Avalon(RepresentationBase):
             is_query:
             reset_vect:
             bit_flags:
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
             Avalon fingerprints, as lists of bits.
@@ -59,8 +63,7 @@ class Avalon(RepresentationBase):
         avalon_fp_list: list[list] = []
         for sample in samples:
             with featurisation_error_harness(sample):
-                smile = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smile)
+                mol = rdkit_mol_from_sample(sample, parse_via_smiles=parse_via_smiles)
                 rd_fp = GetAvalonFP(
                     mol,
                     nBits=n_bits,
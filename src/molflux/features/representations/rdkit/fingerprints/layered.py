@@ -4,17 +4,25 @@ try:
     from rdkit.Chem.rdmolops import LayeredFingerprint
     from rdkit.DataStructs.cDataStructs import ExplicitBitVect
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import (
+        bit_vectors_to_numpy,
+        rdkit_mol_from_sample,
+    )
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
-from molflux.features.typing import Fingerprint, MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.typing import FingerprintFormat, Fingerprints, MolArray
+from molflux.features.utils import (
+    assert_n_positional_args,
+    featurisation_error_harness,
+    fingerprint_schema,
+    format_fingerprints,
+    validate_fingerprint_format,
+)
 
 _DESCRIPTION = """
 Layered fingerprint for a molecule.
@@ -40,6 +48,14 @@ class Layered(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            self.tag: fingerprint_schema(
+                kwargs["fp_size"],
+                output_format=kwargs["output_format"],
+            ),
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
@@ -51,8 +67,10 @@ class Layered(RepresentationBase):
         set_only_bits: ExplicitBitVect | None = None,
         branched_paths: bool = True,
         from_atoms: list | None = None,
+        output_format: FingerprintFormat = "bits",
+        parse_via_smiles: bool = True,
         **kwargs: Any,
-    ) -> dict[str, list[Fingerprint]]:
+    ) -> dict[str, Fingerprints]:
         """Generates a layered fingerprint for each input molecule.
 
         Args:
@@ -75,6 +93,10 @@ class Layered(RepresentationBase):
                 linear paths. Defaults to `None`.
             from_atoms: If provided, only the atoms in the vector will be used
                 as centers in the fingerprint. Defaults to `None`.
+            output_format: The format of the output fingerprints. One of
+                `"bits"` (lists of bits), `"packed"` (bytes of bits packed
+                eight per byte) or `"numpy"` (a contiguous `uint8` matrix).
+                Defaults to `"bits"`.
 
         Layer definitions:
 
@@ -84,9 +106,13 @@ class Layered(RepresentationBase):
             * 0x08: presence of rings
             * 0x10: ring sizes
             * 0x20: aromaticity
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
-            Layered fingerprints, as lists of bits.
+            Layered fingerprints, in the requested output format.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -96,12 +122,12 @@ class Layered(RepresentationBase):
             {'layered': [[1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1]]}
         """
         assert_n_positional_args(*columns, expected_size=1)
+        validate_fingerprint_format(output_format)
         samples = columns[0]
-        layered_fp_list: list[list] = []
+        layered_fp_list: list[ExplicitBitVect] = []
         for sample in samples:
             with featurisation_error_harness(sample):
-                smile = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smile)
+                mol = rdkit_mol_from_sample(sample, parse_via_smiles=parse_via_smiles)
                 rd_fp = LayeredFingerprint(
                     mol,
                     layerFlags=layer_flags,
@@ -114,9 +140,7 @@ class Layered(RepresentationBase):
                     fromAtoms=from_atoms or [],
                 )
 
-                if rd_fp.GetNumOnBits() == 0:
-                    layered_fp_list.append([0] * rd_fp.GetNumBits())
-                else:
-                    layered_fp_list.append(rd_fp.ToList())
+                layered_fp_list.append(rd_fp)
 
-        return {self.tag: layered_fp_list}
+        bits = bit_vectors_to_numpy(layered_fp_list, n_bits=fp_size)
+        return {self.tag: format_fingerprints(bits, output_format=output_format)}
@@ -1,19 +1,30 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 try:
     from rdkit.Chem.MACCSkeys import GenMACCSKeys
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import (
+        bit_vectors_to_numpy,
+        rdkit_mol_from_sample,
+    )
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
-from molflux.features.typing import Fingerprint, MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.typing import FingerprintFormat, Fingerprints, MolArray
+from molflux.features.utils import (
+    assert_n_positional_args,
+    featurisation_error_harness,
+    fingerprint_schema,
+    format_fingerprints,
+    validate_fingerprint_format,
+)
+
+if TYPE_CHECKING:
+    from rdkit.DataStructs.cDataStructs import ExplicitBitVect
 
 _DESCRIPTION = """
 MACCS fingerprint. [rdkit]
@@ -22,6 +33,8 @@ MACCS keys are 166 bit structural key descriptors in which each bit is
 associated with a SMARTS pattern.
 """
 
+_RDKIT_MACCS_LENGTH = 167
+
 
 class MACCSRdkit(RepresentationBase):
     def _info(self) -> RepresentationInfo:
@@ -29,18 +42,36 @@ class MACCSRdkit(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            self.tag: fingerprint_schema(
+                _RDKIT_MACCS_LENGTH - 1,
+                output_format=kwargs["output_format"],
+            ),
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
+        output_format: FingerprintFormat = "bits",
+        parse_via_smiles: bool = True,
         **kwargs: Any,
-    ) -> dict[str, list[Fingerprint]]:
+    ) -> dict[str, Fingerprints]:
         """Generates MACCS fingerprints for each input molecule.
 
         Args:
             samples: The molecules to be fingerprinted.
+            output_format: The format of the output fingerprints. One of
+                `"bits"` (lists of bits), `"packed"` (bytes of bits packed
+                eight per byte) or `"numpy"` (a contiguous `uint8` matrix).
+                Defaults to `"bits"`.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
-            MACCS fingerprints, as lists of bits.
+            MACCS fingerprints, in the requested output format.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -50,19 +81,15 @@ class MACCSRdkit(RepresentationBase):
             {'maccs_rdkit': [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 1, 0]]}
         """
         assert_n_positional_args(*columns, expected_size=1)
+        validate_fingerprint_format(output_format)
         samples = columns[0]
-        maccs_fp_list: list[list] = []
+        maccs_fp_list: list[ExplicitBitVect] = []
         for sample in samples:
             with featurisation_error_harness(sample):
-                smile = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smile)
+                mol = rdkit_mol_from_sample(sample, parse_via_smiles=parse_via_smiles)
                 rd_fp = GenMACCSKeys(mol)
+                maccs_fp_list.append(rd_fp)
 
-                if rd_fp.GetNumOnBits() == 0:
-                    bit_vector = [0] * rd_fp.GetNumBits()
-                else:
-                    bit_vector = rd_fp.ToList()
-
-                maccs_fp_list.append(bit_vector[1:])
-
-        return {self.tag: maccs_fp_list}
+        # the first of the 167 rdkit MACCS bits is unused
+        bits = bit_vectors_to_numpy(maccs_fp_list, n_bits=_RDKIT_MACCS_LENGTH)[:, 1:]
+        return {self.tag: format_fingerprints(bits, output_format=output_format)}
@@ -1,25 +1,27 @@
-from typing import Any
+from typing import Any, Literal
 
 from molflux.features.utils import assert_n_positional_args
 
 try:
+    from rdkit import Chem
     from rdkit.Avalon.pyAvalonTools import GetAvalonCountFP
-    from rdkit.Chem import DataStructs, rdReducedGraphs
-    from rdkit.Chem.rdMolDescriptors import GetHashedMorganFingerprint
-    from rdkit.ML.Descriptors.MoleculeDescriptors import MolecularDescriptorCalculator
+    from rdkit.Chem import rdFingerprintGenerator, rdReducedGraphs
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import rdkit_mol_from_sample
+    from molflux.features.representations.rdkit.descriptors.rdkit_descriptors_2d import (
+        get_descriptors_calculator,
+    )
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 import numpy as np
+from numpy.typing import NDArray
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
-from molflux.features.typing import Fingerprint, MolArray
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.typing import MolArray
 from molflux.features.utils import featurisation_error_harness
 
 _DESCRIPTION = """
@@ -28,6 +30,15 @@ MapLight features, as detailed in the ADMET property prediction through combinat
 Source code adapted to molflux: https://github.com/maplightrx/MapLight-TDC/blob/main/maplight.py
 """
 
+_N_BITS = 1024
+_N_ERG_FEATURES = 315
+
+# the columns of each block of features
+_MORGAN_COLUMNS = slice(0, _N_BITS)
+_AVALON_COLUMNS = slice(_N_BITS, 2 * _N_BITS)
+_ERG_COLUMNS = slice(2 * _N_BITS, 2 * _N_BITS + _N_ERG_FEATURES)
+_DESCRIPTORS_COLUMNS = slice(2 * _N_BITS + _N_ERG_FEATURES, None)
+
 
 class MapLight(RepresentationBase):
     OUTPUT_SIZE: int = 2563
@@ -37,20 +48,44 @@ class MapLight(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            self.tag: FeatureSchema(
+                dtype=kwargs["dtype"] or "float64",
+                length=self.OUTPUT_SIZE,
+            ),
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
+        dtype: Literal["float32", "float64"] | None = None,
+        parse_via_smiles: bool = True,
         **kwargs: Any,
-    ) -> dict[str, list[Fingerprint]]:
+    ) -> dict[str, list[list[float]]] | dict[str, NDArray[np.floating]]:
         """Generates the MapLight features for each input molecule.
         This includes 1024 Morgan bits, 1024 Avalon bits, 315 Reduced Graph bits and 200 descriptors, for a total
         of 2563 features.
 
+        All features of a molecule are written directly into its row of a
+        single preallocated matrix. Pass `n_jobs` to `featurise` to spread
+        batches of molecules over worker processes.
+
         Args:
             samples: The molecules to be featurised.
+            dtype (optional): The dtype of a NumPy matrix of features,
+                `"float32"` or `"float64"`. Descriptor values beyond the range
+                of `"float32"` (e.g. `Ipc` of large molecules) overflow to
+                infinity. If `None`, features are returned as lists of
+                (double precision) floats. Defaults to `None`.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
-            MapLight features, as lists of floats.
+            MapLight features, as lists of floats, or as a `(n_samples, 2563)`
+            matrix of the given `dtype`.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -58,62 +93,80 @@ class MapLight(RepresentationBase):
             >>> samples = ['c1ccccc1']
             >>> representation.featurise(samples)  # doctest:+ELLIPSIS
             {'map_light': [[0.0, 0.0, 0.0, 0.0, ...
+            >>> features = representation.featurise(samples, dtype="float32")['map_light']
+            >>> features.shape, features.dtype
+            ((1, 2563), dtype('float32'))
         """
 
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
 
-        morgan_fingerprint_list = []
-        avalon_fingerprint_list = []
-        erg_fingerprint_list = []
-        rdkit_features_list = []
-
-        calculator = MolecularDescriptorCalculator(get_chosen_descriptors())
-
+        mols = []
         for sample in samples:
             with featurisation_error_harness(sample):
-                smile = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smile)
+                mols.append(
+                    (
+                        sample,
+                        rdkit_mol_from_sample(
+                            sample,
+                            parse_via_smiles=parse_via_smiles,
+                        ),
+                    ),
+                )
+
+        morgan_generator = rdFingerprintGenerator.GetMorganGenerator(
+            radius=2,
+            fpSize=_N_BITS,
+        )
+        calculator = get_descriptors_calculator(tuple(get_chosen_descriptors()))
+
+        result = np.zeros((len(mols), self.OUTPUT_SIZE), dtype=dtype or np.float64)
+        # descriptor values beyond the range of the dtype are set to infinity
+        with np.errstate(over="ignore"):
+            for i, (sample, mol) in enumerate(mols):
+                with featurisation_error_harness(sample):
+                    row = result[i]
 
-                # compute the Morgan Fingerprint
-                morgan_fp = GetHashedMorganFingerprint(mol, nBits=1024, radius=2)
-                morgan_fp = count_to_array(morgan_fp)
-                morgan_fingerprint_list.append(morgan_fp)
+                    # compute the Morgan Fingerprint
+                    row[_MORGAN_COLUMNS] = _to_int8_counts(
+                        morgan_generator.GetCountFingerprintAsNumPy(mol),
+                    )
 
-                # compute the Avalon Fingerprint
-                avalon_fp = GetAvalonCountFP(mol, nBits=1024)
-                avalon_fp = count_to_array(avalon_fp)
-                avalon_fingerprint_list.append(avalon_fp)
+                    # compute the Avalon Fingerprint
+                    avalon_fp = GetAvalonCountFP(mol, nBits=_N_BITS)
+                    _scatter_counts(avalon_fp, out=row[_AVALON_COLUMNS])
 
-                # compute the Reduced Graph Fingerprint
-                erg_fp = rdReducedGraphs.GetErGFingerprint(mol)
-                erg_fingerprint_list.append(erg_fp)
+                    # compute the Reduced Graph Fingerprint, on a copy free of
+                    # the distance matrices other representations may have
+                    # cached on the (shared) molecule, which it would misread
+                    erg_mol = Chem.Mol(mol)
+                    erg_mol.ClearComputedProps(includeRings=False)
+                    row[_ERG_COLUMNS] = rdReducedGraphs.GetErGFingerprint(erg_mol)
 
-                # compute the RDKit descriptors
-                rdkit_features = calculator.CalcDescriptors(mol)
-                rdkit_features = np.array(rdkit_features)
-                rdkit_features_list.append(rdkit_features)
+                    # compute the RDKit descriptors
+                    calculator.calculate(mol, out=row[_DESCRIPTORS_COLUMNS])
 
-        # stack the features vertically in 4 2-dimensional numpy arrays
-        fingerprints = [
-            np.vstack(morgan_fingerprint_list),
-            np.vstack(avalon_fingerprint_list),
-            np.vstack(erg_fingerprint_list),
-            np.vstack(rdkit_features_list),
-        ]
+        if dtype is None:
+            return {self.tag: result.tolist()}
 
-        # concatenate the features along the column axis
-        result = np.concatenate(fingerprints, axis=1)
+        return {self.tag: result}
 
-        return {self.tag: result.tolist()}
 
+def _to_int8_counts(counts: NDArray[np.integer]) -> NDArray[np.int8]:
+    """Casts fingerprint counts to int8, as done by the reference implementation.
 
-def count_to_array(fingerprint: Any) -> np.ndarray:
-    array = np.zeros((0,), dtype=np.int8)
+    Counts above 127 wrap around.
+    """
+    return counts.astype(np.int8)
 
-    DataStructs.ConvertToNumpyArray(fingerprint, array)
 
-    return array
+def _scatter_counts(fingerprint: Any, out: NDArray[np.floating]) -> None:
+    """Writes the non-zero counts of a count fingerprint into a (zeroed) row."""
+    elements = fingerprint.GetNonzeroElements()
+    if elements:
+        indices = np.fromiter(elements.keys(), dtype=np.intp, count=len(elements))
+        counts = np.fromiter(elements.values(), dtype=np.int64, count=len(elements))
+        out[indices] = _to_int8_counts(counts)
 
 
 # from https://www.blopig.com/blog/2022/06/how-to-turn-a-molecule-into-a-vector-of-physicochemical-descriptors-using-rdkit/
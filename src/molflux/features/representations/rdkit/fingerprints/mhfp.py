@@ -8,10 +8,17 @@ except ImportError as e:
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.minhash import fold_hashes, hash_shinglings
 from molflux.features.representations.rdkit._utils import to_smiles
-from molflux.features.typing import Fingerprint, MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.typing import FingerprintFormat, Fingerprints, MolArray
+from molflux.features.utils import (
+    assert_n_positional_args,
+    featurisation_error_harness,
+    fingerprint_schema,
+    format_fingerprints,
+    validate_fingerprint_format,
+)
 
 _DESCRIPTION = """
 MHFP6 (MinHash fingerprint, up to six bonds) is a molecular fingerprint which
@@ -38,6 +45,14 @@ class MHFP(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            self.tag: fingerprint_schema(
+                kwargs["length"],
+                output_format=kwargs["output_format"],
+            ),
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
@@ -46,8 +61,9 @@ class MHFP(RepresentationBase):
         rings: bool = True,
         kekulise: bool = True,
         sanitise: bool = True,
+        output_format: FingerprintFormat = "bits",
         **kwargs: Any,
-    ) -> dict[str, list[Fingerprint]]:
+    ) -> dict[str, Fingerprints]:
         """Featurises the input molecules as SECFP (SMILES Extended
         Connectifity Fingerprint) MinHash Fingerprint.
 
@@ -64,6 +80,8 @@ class MHFP(RepresentationBase):
                 substructure SMILES. Defaults to `True`.
             sanitise: Whether or not to sanitise the molecule (using RDKit)
                 before extracting substructure SMILES. Defaults to `True`.
+            output_format: The format of the output fingerprints. One of
+                `"bits"`, `"packed"` or `"numpy"`. Defaults to `"bits"`.
 
         Returns:
             MHFP fingerpints.
@@ -76,19 +94,23 @@ class MHFP(RepresentationBase):
             {'mhfp': [[1, 1, 1, 1]]}
         """
         assert_n_positional_args(*columns, expected_size=1)
+        validate_fingerprint_format(output_format)
         samples = columns[0]
-        fingerprints = []
+
+        shinglings = []
         for sample in samples:
             with featurisation_error_harness(sample):
                 smiles = to_smiles(sample)
-                fingerprint = MHFPEncoder.secfp_from_smiles(
+                shingling = MHFPEncoder.shingling_from_smiles(
                     smiles,
-                    length=length,
                     radius=radius,
                     rings=rings,
                     kekulize=kekulise,
                     sanitize=sanitise,
-                ).tolist()
-                fingerprints.append(fingerprint)
+                )
+                shinglings.append(shingling)
+
+        # hash and fold the shingles of all samples at once
+        bits = fold_hashes(*hash_shinglings(shinglings), length=length)
 
-        return {self.tag: fingerprints}
+        return {self.tag: format_fingerprints(bits, output_format=output_format)}
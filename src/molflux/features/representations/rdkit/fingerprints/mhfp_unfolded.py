@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from typing import TYPE_CHECKING, Any
 
 try:
@@ -10,11 +11,15 @@ except ImportError as e:
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.minhash import MinHasher
 from molflux.features.representations.rdkit._utils import to_smiles
 from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
 
 if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
     from molflux.features.typing import MolArray
 
 _DESCRIPTION = """
@@ -42,6 +47,11 @@ class MHFPUnfolded(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            self.tag: FeatureSchema(dtype="uint32", length=kwargs["n_permutations"]),
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
@@ -52,9 +62,14 @@ class MHFPUnfolded(RepresentationBase):
         sanitise: bool = True,
         seed: int = 42,
         **kwargs: Any,
-    ) -> dict[str, list[list[int]]]:
+    ) -> dict[str, NDArray[np.uint32]]:
         """Featurises the input molecules as unfolded MinHash fingerprints.
 
+        The MinHash signatures of all molecules are computed at once. As the
+        fraction of equal values in two signatures estimates the Jaccard
+        similarity of the underlying substructures, they can be used directly
+        in locality-sensitive hashing (LSH) indices for similarity search.
+
         Args:
             samples: The array of samples to featurise.
             n_permutations: Analogous to the number of bits ECFP fingerprints
@@ -74,31 +89,37 @@ class MHFPUnfolded(RepresentationBase):
                 comparable fingerprints. Defaults to 42.
 
         Returns:
-            MHFP fingerpints.
+            MHFP fingerpints, as a `(n_samples, n_permutations)` matrix of
+            MinHash signatures.
 
         Examples:
             >>> from molflux.features import load_representation
             >>> representation = load_representation("mhfp_unfolded")
             >>> samples = ["CCCC1=NN(C2=C1NC(=NC2=O)C3=C(C=CC(=C3)S(=O)(=O)N4CCN(CC4)C)OCC)C"]
             >>> representation.featurise(samples, n_permutations=4)
-            {'mhfp_unfolded': [[15876248, 33988699, 14316170, 98479663]]}
+            {'mhfp_unfolded': array([[15876248, 33988699, 14316170, 98479663]], dtype=uint32)}
         """
 
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
-        encoder = MHFPEncoder(n_permutations=n_permutations, seed=seed)
+        minhasher = _get_minhasher(n_permutations, seed=seed)
 
-        fingerprints: list[list[int]] = []
+        shinglings = []
         for sample in samples:
             with featurisation_error_harness(sample):
                 smiles = to_smiles(sample)
-                fingerprint = encoder.encode(
+                shingling = MHFPEncoder.shingling_from_smiles(
                     smiles,
                     radius=radius,
                     rings=rings,
                     kekulize=kekulise,
                     sanitize=sanitise,
-                ).tolist()
-                fingerprints.append(fingerprint)
+                )
+                shinglings.append(shingling)
+
+        return {self.tag: minhasher.from_shinglings(shinglings)}
+
 
-        return {self.tag: fingerprints}
+@functools.lru_cache(maxsize=8)
+def _get_minhasher(n_permutations: int, seed: int) -> MinHasher:
+    return MinHasher(n_permutations=n_permutations, seed=seed)
@@ -1,19 +1,26 @@
 from typing import Any
 
 try:
-    from rdkit.Chem.AllChem import GetMorganFingerprintAsBitVect
+    from rdkit.Chem import rdFingerprintGenerator
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import (
+        bit_vectors_to_numpy,
+        generate_fingerprints,
+    )
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
-from molflux.features.typing import Fingerprint, MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.typing import FingerprintFormat, Fingerprints, MolArray
+from molflux.features.utils import (
+    assert_n_positional_args,
+    fingerprint_schema,
+    format_fingerprints,
+    validate_fingerprint_format,
+)
 
 _DESCRIPTION = """
 Morgan fingerprint.
@@ -47,6 +54,14 @@ class Morgan(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            self.tag: fingerprint_schema(
+                kwargs["n_bits"],
+                output_format=kwargs["output_format"],
+            ),
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
@@ -59,8 +74,11 @@ class Morgan(RepresentationBase):
         use_features: bool = False,
         bit_info: dict | None = None,
         include_redundant_environments: bool = False,
+        output_format: FingerprintFormat = "bits",
+        n_threads: int = 1,
+        parse_via_smiles: bool = True,
         **kwargs: Any,
-    ) -> dict[str, list[Fingerprint]]:
+    ) -> dict[str, Fingerprints]:
         """Generates Morgan fingerprints for each input molecule.
 
         Args:
@@ -80,9 +98,19 @@ class Morgan(RepresentationBase):
             bit_info: Defaults to `None`.
             include_redundant_environments: If not None, the check for redundant
                 atom environments will not be done. Defaults to `False`.
+            output_format: The format of the output fingerprints. One of
+                `"bits"` (lists of bits), `"packed"` (bytes of bits packed
+                eight per byte) or `"numpy"` (a contiguous `uint8` matrix).
+                Defaults to `"bits"`.
+            n_threads: The number of threads used by rdkit to fingerprint
+                molecules in bulk. Defaults to `1`.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
-            MACCS fingerprints, as lists of bits.
+            Morgan fingerprints, in the requested output format.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -92,28 +120,29 @@ class Morgan(RepresentationBase):
             {'morgan': [[1, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]]}
         """
         assert_n_positional_args(*columns, expected_size=1)
+        validate_fingerprint_format(output_format)
         samples = columns[0]
-        morgan_fp_list: list[list] = []
-        for sample in samples:
-            with featurisation_error_harness(sample):
-                smile = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smile)
-                rd_fp = GetMorganFingerprintAsBitVect(
-                    mol,
-                    radius=radius,
-                    nBits=n_bits,
-                    invariants=invariants or [],
-                    fromAtoms=from_atoms or [],
-                    useChirality=use_chirality,
-                    useBondTypes=use_bond_types,
-                    useFeatures=use_features,
-                    bitInfo=bit_info or {},
-                    includeRedundantEnvironments=include_redundant_environments,
-                )
-
-                if rd_fp.GetNumOnBits() == 0:
-                    morgan_fp_list.append([0] * rd_fp.GetNumBits())
-                else:
-                    morgan_fp_list.append(rd_fp.ToList())
-
-        return {self.tag: morgan_fp_list}
+        generator = rdFingerprintGenerator.GetMorganGenerator(
+            radius=radius,
+            includeChirality=use_chirality,
+            useBondTypes=use_bond_types,
+            fpSize=n_bits,
+            atomInvariantsGenerator=(
+                rdFingerprintGenerator.GetMorganFeatureAtomInvGen()
+                if use_features
+                else None
+            ),
+            includeRedundantEnvironments=include_redundant_environments,
+        )
+        morgan_fp_list = generate_fingerprints(
+            generator,
+            samples,
+            n_threads=n_threads,
+            from_atoms=from_atoms,
+            atom_invariants=invariants,
+            bit_info=bit_info,
+            parse_via_smiles=parse_via_smiles,
+        )
+
+        bits = bit_vectors_to_numpy(morgan_fp_list, n_bits=n_bits)
+        return {self.tag: format_fingerprints(bits, output_format=output_format)}
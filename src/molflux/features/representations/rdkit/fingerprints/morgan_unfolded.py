@@ -1,19 +1,25 @@
-from typing import Any
+from typing import Any, get_args
+
+import numpy as np
 
 try:
-    from rdkit.Chem.AllChem import GetMorganFingerprint
+    from rdkit.Chem import rdFingerprintGenerator
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import generate_fingerprints
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
-from molflux.features.typing import MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.typing import MolArray, SparseFingerprintFormat
+from molflux.features.utils import (
+    assert_n_positional_args,
+    format_sparse_fingerprints,
+    sparse_fingerprint_schema,
+    validate_fingerprint_format,
+)
 
 _DESCRIPTION = """
 Raw/Unfolded Morgan fingerprint.
@@ -28,6 +34,13 @@ class MorganUnfolded(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema] | None:
+        return sparse_fingerprint_schema(
+            self.tag,
+            output_format=kwargs["output_format"],
+            index_dtype="uint32",
+        )
+
     def _featurise(
         self,
         *columns: MolArray,
@@ -40,8 +53,11 @@ class MorganUnfolded(RepresentationBase):
         use_counts: bool = False,
         bit_info: dict | None = None,
         include_redundant_environments: bool = False,
+        output_format: SparseFingerprintFormat = "dict",
+        n_threads: int = 1,
+        parse_via_smiles: bool = True,
         **kwargs: Any,
-    ) -> dict[str, list[dict[str, int]]]:
+    ) -> dict[str, list[Any]]:
         """Featurises the input molecules as unfolded Morgan fingerprints.
 
         Args:
@@ -61,10 +77,21 @@ class MorganUnfolded(RepresentationBase):
             bit_info: Defaults to `None`.
             include_redundant_environments: If not None, the check for redundant
                 atom environments will not be done. Defaults to `False`.
+            output_format: The format of the output fingerprints. One of
+                `"dict"` (dictionaries of stringified hashes to counts) or
+                `"sparse"` (arrays of sorted hashes and of their counts, as
+                separate `"::indices"` and `"::counts"` features). Defaults to
+                `"dict"`.
+            n_threads: The number of threads used by rdkit to fingerprint
+                molecules in bulk. Defaults to `1`.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
             Dict[str, List[Dict]]
-                inputs featurised as unfolded (sparse) fingerprint (returned as a dictionary of non-zero molfluxs)
+                inputs featurised as unfolded (sparse) fingerprint (returned as a dictionary of non-zero elements)
 
         Examples:
             >>> from molflux.features import load_representation
@@ -93,26 +120,42 @@ class MorganUnfolded(RepresentationBase):
         """
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
-        unfolded_morgan_fp_list: list[dict[str, int]] = []
-        for sample in samples:
-            with featurisation_error_harness(sample):
-                smile = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smile)
-                rd_fp = GetMorganFingerprint(
-                    mol,
-                    radius=radius,
-                    invariants=invariants or [],
-                    fromAtoms=from_atoms or [],
-                    useChirality=use_chirality,
-                    useBondTypes=use_bond_types,
-                    useFeatures=use_features,
-                    useCounts=use_counts,
-                    bitInfo=bit_info or {},
-                    includeRedundantEnvironments=include_redundant_environments,
-                )
-
-                unfolded_morgan_fp_list.append(
-                    {str(k): v for k, v in rd_fp.GetNonzeromolfluxs().items()},
-                )
-
-        return {self.tag: unfolded_morgan_fp_list}
+        validate_fingerprint_format(
+            output_format,
+            supported_formats=get_args(SparseFingerprintFormat),
+        )
+        generator = rdFingerprintGenerator.GetMorganGenerator(
+            radius=radius,
+            includeChirality=use_chirality,
+            useBondTypes=use_bond_types,
+            atomInvariantsGenerator=(
+                rdFingerprintGenerator.GetMorganFeatureAtomInvGen()
+                if use_features
+                else None
+            ),
+            includeRedundantEnvironments=include_redundant_environments,
+        )
+        fingerprints = generate_fingerprints(
+            generator,
+            samples,
+            sparse_counts=True,
+            n_threads=n_threads,
+            from_atoms=from_atoms,
+            atom_invariants=invariants,
+            bit_info=bit_info,
+            parse_via_smiles=parse_via_smiles,
+        )
+        unfolded_morgan_fp_list = [
+            fingerprint.GetNonzeroElements() for fingerprint in fingerprints
+        ]
+        if not use_counts:
+            unfolded_morgan_fp_list = [
+                dict.fromkeys(elements, 1) for elements in unfolded_morgan_fp_list
+            ]
+
+        return format_sparse_fingerprints(
+            unfolded_morgan_fp_list,
+            tag=self.tag,
+            output_format=output_format,
+            index_dtype=np.uint32,
+        )
@@ -5,17 +5,25 @@ try:
     from rdkit.Chem.rdmolops import PatternFingerprint
     from rdkit.DataStructs.cDataStructs import ExplicitBitVect
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import (
+        bit_vectors_to_numpy,
+        rdkit_mol_from_sample,
+    )
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
-from molflux.features.typing import Fingerprint, MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.typing import FingerprintFormat, Fingerprints, MolArray
+from molflux.features.utils import (
+    assert_n_positional_args,
+    featurisation_error_harness,
+    fingerprint_schema,
+    format_fingerprints,
+    validate_fingerprint_format,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +65,14 @@ class Pattern(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            self.tag: fingerprint_schema(
+                kwargs["fp_size"],
+                output_format=kwargs["output_format"],
+            ),
+        }
+
     def _featurise(
         self,
         *columns: MolArray,
@@ -64,8 +80,10 @@ class Pattern(RepresentationBase):
         atom_counts: list[int] | None = None,
         set_only_bits: ExplicitBitVect | None = None,
         tautomer_fingerprints: bool = False,
+        output_format: FingerprintFormat = "bits",
+        parse_via_smiles: bool = True,
         **kwargs: Any,
-    ) -> dict[str, list[Fingerprint]]:
+    ) -> dict[str, Fingerprints]:
         """Generates topological fingerprints for each input molecule using a
         series of pre-defined structural patterns.
 
@@ -81,9 +99,17 @@ class Pattern(RepresentationBase):
                 as doing: `(*res) &= (*setOnlyBits)`; but also has an impact on
                 the `atom_counts` (if being used). Defaults to `None`.
             tautomer_fingerprints: Defaults to `False`.
+            output_format: The format of the output fingerprints. One of
+                `"bits"` (lists of bits), `"packed"` (bytes of bits packed
+                eight per byte) or `"numpy"` (a contiguous `uint8` matrix).
+                Defaults to `"bits"`.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
-            Pattern fingerprints, as lists of bits.
+            Pattern fingerprints, in the requested output format.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -93,12 +119,12 @@ class Pattern(RepresentationBase):
             {'pattern': [[0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]]}
         """
         assert_n_positional_args(*columns, expected_size=1)
+        validate_fingerprint_format(output_format)
         samples = columns[0]
-        pattern_fp_list: list[list] = []
+        pattern_fp_list: list[ExplicitBitVect] = []
         for sample in samples:
             with featurisation_error_harness(sample):
-                smile = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smile)
+                mol = rdkit_mol_from_sample(sample, parse_via_smiles=parse_via_smiles)
                 rd_fp = PatternFingerprint(
                     mol,
                     fpSize=fp_size,
@@ -107,9 +133,7 @@ class Pattern(RepresentationBase):
                     tautomerFingerprints=tautomer_fingerprints,
                 )
 
-                if rd_fp.GetNumOnBits() == 0:
-                    pattern_fp_list.append([0] * rd_fp.GetNumBits())
-                else:
-                    pattern_fp_list.append(rd_fp.ToList())
+                pattern_fp_list.append(rd_fp)
 
-        return {self.tag: pattern_fp_list}
+        bits = bit_vectors_to_numpy(pattern_fp_list, n_bits=fp_size)
+        return {self.tag: format_fingerprints(bits, output_format=output_format)}
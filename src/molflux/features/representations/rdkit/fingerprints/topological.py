@@ -3,7 +3,7 @@ from typing import Any
 try:
     from rdkit.Chem import RDKFingerprint
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import rdkit_mol_from_sample
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
@@ -11,7 +11,6 @@ except ImportError as e:
 
 from molflux.features.bases import RepresentationBase
 from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
 from molflux.features.typing import Fingerprint, MolArray
 from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
 
@@ -58,6 +57,7 @@ class Topological(RepresentationBase):
         from_atoms: list | None = None,
         atom_bits: list | None = None,
         bit_info: dict | None = None,
+        parse_via_smiles: bool = True,
         **kwargs: Any,
     ) -> dict[str, list[Fingerprint]]:
         """Generates topological (Daylight like) fingerprints for each input
@@ -89,6 +89,10 @@ class Topological(RepresentationBase):
             atom_bits: Used to return the bits that each atom is involved in
                 (should be at least mol.numAtoms long). Defaults to `None`.
             bit_info: Defaults to `None`.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
             Topological (Daylight like) fingerprints, as lists of bits.
@@ -105,8 +109,7 @@ class Topological(RepresentationBase):
         topo_fp_list: list[list] = []
         for sample in samples:
             with featurisation_error_harness(sample):
-                smile = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smile)
+                mol = rdkit_mol_from_sample(sample, parse_via_smiles=parse_via_smiles)
                 rd_fp = RDKFingerprint(
                     mol,
                     minPath=min_path,
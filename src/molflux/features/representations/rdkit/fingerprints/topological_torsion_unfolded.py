@@ -1,19 +1,30 @@
-from typing import Any
+from typing import Any, get_args
+
+import numpy as np
 
 try:
+    from rdkit.Chem import rdFingerprintGenerator
     from rdkit.Chem.AtomPairs.Torsions import GetTopologicalTorsionFingerprint
 
-    from molflux.features.representations.rdkit._utils import rdkit_mol_from_smiles
+    from molflux.features.representations.rdkit._utils import (
+        generate_fingerprints,
+        rdkit_mol_from_sample,
+    )
 except ImportError as e:
     from molflux.features.errors import ExtrasDependencyImportError
 
     raise ExtrasDependencyImportError("rdkit", e) from None
 
 from molflux.features.bases import RepresentationBase
-from molflux.features.info import RepresentationInfo
-from molflux.features.representations.rdkit._utils import to_smiles
-from molflux.features.typing import MolArray
-from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.typing import MolArray, SparseFingerprintFormat
+from molflux.features.utils import (
+    assert_n_positional_args,
+    featurisation_error_harness,
+    format_sparse_fingerprints,
+    sparse_fingerprint_schema,
+    validate_fingerprint_format,
+)
 
 _DESCRIPTION = """
 Topological-torsion fingerprints, as described in:
@@ -50,6 +61,13 @@ class TopologicalTorsionUnfolded(RepresentationBase):
             description=_DESCRIPTION,
         )
 
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema] | None:
+        return sparse_fingerprint_schema(
+            self.tag,
+            output_format=kwargs["output_format"],
+            index_dtype="uint64",
+        )
+
     def _featurise(
         self,
         *columns: MolArray,
@@ -58,8 +76,11 @@ class TopologicalTorsionUnfolded(RepresentationBase):
         ignore_atoms: list[int] | None = None,
         atom_invariants: list[int] | None = None,
         include_chirality: bool = False,
+        output_format: SparseFingerprintFormat = "dict",
+        n_threads: int = 1,
+        parse_via_smiles: bool = True,
         **kwargs: Any,
-    ) -> dict[str, list[dict[str, int]]]:
+    ) -> dict[str, list[Any]]:
         """Generates unfolded topological-torsion fingerprints for each input
         molecule.
 
@@ -79,10 +100,21 @@ class TopologicalTorsionUnfolded(RepresentationBase):
             include_chirality: If set, chirality will be used in the atom
                 invariants. Note that this is ignored if `atom_invariants` are
                 provided. Defaults to `False`.
+            output_format: The format of the output fingerprints. One of
+                `"dict"` (dictionaries of stringified hashes to counts) or
+                `"sparse"` (arrays of sorted hashes and of their counts, as
+                separate `"::indices"` and `"::counts"` features). Defaults to
+                `"dict"`.
+            n_threads: The number of threads used by rdkit to fingerprint
+                molecules in bulk. Defaults to `1`.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
             Unfolded (sparse) topological-torsion fingerprints, as dictionaries
-            of non-zero molfluxs.
+            of non-zero elements.
 
         Examples:
             >>> from molflux.features import load_representation
@@ -93,21 +125,50 @@ class TopologicalTorsionUnfolded(RepresentationBase):
         """
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
-        torsion_fp_list: list[dict[str, int]] = []
-        for sample in samples:
-            with featurisation_error_harness(sample):
-                smile = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smile)
-                rd_fp = GetTopologicalTorsionFingerprint(
-                    mol,
-                    targetSize=target_size,
-                    fromAtoms=from_atoms or [],
-                    ignoreAtoms=ignore_atoms or [],
-                    atomInvariants=atom_invariants or [],
-                    includeChirality=include_chirality,
-                )
-                torsion_fp_list.append(
-                    {str(k): v for k, v in rd_fp.GetNonzeromolfluxs().items()},
-                )
-
-        return {self.tag: torsion_fp_list}
+        validate_fingerprint_format(
+            output_format,
+            supported_formats=get_args(SparseFingerprintFormat),
+        )
+        torsion_fp_list: list[dict[int, int]] = []
+        if include_chirality:
+            # the fingerprint generator encodes chirality differently from the
+            # original implementation, so keep fingerprints consistent with it
+            for sample in samples:
+                with featurisation_error_harness(sample):
+                    mol = rdkit_mol_from_sample(
+                        sample,
+                        parse_via_smiles=parse_via_smiles,
+                    )
+                    rd_fp = GetTopologicalTorsionFingerprint(
+                        mol,
+                        targetSize=target_size,
+                        fromAtoms=from_atoms or [],
+                        ignoreAtoms=ignore_atoms or [],
+                        atomInvariants=atom_invariants or [],
+                        includeChirality=include_chirality,
+                    )
+                    torsion_fp_list.append(rd_fp.GetNonzeroElements())
+        else:
+            generator = rdFingerprintGenerator.GetTopologicalTorsionGenerator(
+                torsionAtomCount=target_size,
+            )
+            fingerprints = generate_fingerprints(
+                generator,
+                samples,
+                sparse_counts=True,
+                n_threads=n_threads,
+                from_atoms=from_atoms,
+                ignore_atoms=ignore_atoms,
+                atom_invariants=atom_invariants,
+                parse_via_smiles=parse_via_smiles,
+            )
+            torsion_fp_list = [
+                fingerprint.GetNonzeroElements() for fingerprint in fingerprints
+            ]
+
+        return format_sparse_fingerprints(
+            torsion_fp_list,
+            tag=self.tag,
+            output_format=output_format,
+            index_dtype=np.uint64,
+        )
@@ -3,8 +3,7 @@ from typing import Any
 from molflux.features.bases import RepresentationBase
 from molflux.features.info import RepresentationInfo
 from molflux.features.representations.rdkit._utils import (
-    rdkit_mol_from_smiles,
-    to_smiles,
+    rdkit_mol_from_sample,
 )
 from molflux.features.typing import MolArray
 from molflux.features.utils import assert_n_positional_args, featurisation_error_harness
@@ -73,6 +72,7 @@ class Toxicophores(RepresentationBase):
     def _featurise(
         self,
         *columns: MolArray,
+        parse_via_smiles: bool = True,
         **kwargs: Any,
     ) -> dict[str, list[list[Any]]]:
         """
@@ -80,6 +80,10 @@ class Toxicophores(RepresentationBase):
 
         Args:
             samples: The molecules for which to calculate descriptors.
+            parse_via_smiles: If set, `Chem.Mol` and mol bytes inputs are
+                featurised as the molecule parsed from their SMILES (with
+                implicit hydrogens, and without conformers). Otherwise, they
+                are featurised as they are. Defaults to `True`.
 
         Returns:
             Boolean vector corresponding to absence/presence of substruct
@@ -98,8 +102,7 @@ class Toxicophores(RepresentationBase):
 
         for sample in samples:
             with featurisation_error_harness(sample):
-                smiles = to_smiles(sample)
-                mol = rdkit_mol_from_smiles(smiles)
+                mol = rdkit_mol_from_sample(sample, parse_via_smiles=parse_via_smiles)
                 match = [int(mol.HasSubstructMatch(alert)) for alert in _ALERTS]
                 match_list.append(match)
 
@@ -4,7 +4,8 @@ https://raw.githubusercontent.com/reymond-group/drfp/main/src/drfp/fingerprint.p
 https://github.com/reymond-group/drfp/commit/6c5db5cc7d2057e932cb1e1be8d697dc2c3327e1
 """
 
-from collections.abc import Iterable
+import functools
+from collections.abc import Iterable, Sequence
 from hashlib import blake2b
 from typing import Any
 
@@ -12,6 +13,10 @@ import numpy as np
 from rdkit.Chem import AllChem
 from rdkit.Chem.rdchem import Mol
 
+# The maximum number of reaction components whose shingling is cached. Reagents,
+# solvents and common building blocks recur across most reactions of a dataset.
+SHINGLING_CACHE_SIZE = 8192
+
 
 class NoReactionError(Exception):
     """Raised when the encoder attempts to encode a non-reaction SMILES.
@@ -139,6 +144,41 @@ class DrfpEncoder:
             A tuple with two arrays, the first containing the drfp hash values, the second the substructure SMILES
         """
 
+        s_diff = DrfpEncoder.shingling_difference(
+            in_smiles,
+            max_radius=max_radius,
+            min_radius=min_radius,
+            include_rings=include_rings,
+            root_central_atom=root_central_atom,
+            include_hydrogens=include_hydrogens,
+        )
+
+        return DrfpEncoder.hash(s_diff), s_diff
+
+    @staticmethod
+    def shingling_difference(
+        in_smiles: str,
+        max_radius: int = 3,
+        min_radius: int = 0,
+        include_rings: bool = True,
+        root_central_atom: bool = True,
+        include_hydrogens: bool = False,
+    ) -> list[bytes]:
+        """Creates the symmetric difference of the shinglings of both sides of a reaction.
+
+        The shingling of each reaction component is cached, such that components
+        recurring across reactions are only parsed and shingled once.
+
+        Arguments:
+            in_smiles: A valid reaction SMILES string
+            max_radius: The drfp radius (a radius of 3 corresponds to drfp6)
+            min_radius: The minimum radius that is used to extract n-grams
+            include_rings: Whether or not to include rings in the shingling
+
+        Returns:
+            The substructure SMILES found on only one side of the reaction
+        """
+
         sides = in_smiles.split(">")
         if len(sides) < 3:
             raise NoReactionError(
@@ -148,45 +188,23 @@ class DrfpEncoder:
         if len(sides[1]) > 0:
             sides[0] += "." + sides[1]
 
-        left = sides[0].split(".")
-        right = sides[2].split(".")
-
         left_shingles: set[bytes] = set()
         right_shingles: set[bytes] = set()
 
-        for component in left:
-            mol = AllChem.MolFromSmiles(component)
-
-            sh = DrfpEncoder.shingling_from_mol(
-                mol,
-                max_radius=max_radius,
-                include_rings=include_rings,
-                min_radius=min_radius,
-                root_central_atom=root_central_atom,
-                include_hydrogens=include_hydrogens,
-            )
-
-            for s in sh:
-                right_shingles.add(s)
-
-        for component in right:
-            mol = AllChem.MolFromSmiles(component)
-
-            sh = DrfpEncoder.shingling_from_mol(
-                mol,
-                max_radius=max_radius,
-                include_rings=include_rings,
-                min_radius=min_radius,
-                root_central_atom=root_central_atom,
-                include_hydrogens=include_hydrogens,
-            )
-
-            for s in sh:
-                left_shingles.add(s)
-
-        s_diff = right_shingles.symmetric_difference(left_shingles)
+        for shingles, side in ((left_shingles, sides[0]), (right_shingles, sides[2])):
+            for component in side.split("."):
+                shingles.update(
+                    _component_shingling(
+                        component,
+                        max_radius=max_radius,
+                        include_rings=include_rings,
+                        min_radius=min_radius,
+                        root_central_atom=root_central_atom,
+                        include_hydrogens=include_hydrogens,
+                    ),
+                )
 
-        return DrfpEncoder.hash(list(s_diff)), list(s_diff)
+        return list(left_shingles.symmetric_difference(right_shingles))
 
     @staticmethod
     def hash(shingling: list[bytes]) -> np.ndarray:
@@ -199,9 +217,9 @@ class DrfpEncoder:
             A list of hashed n-grams
         """
 
-        return np.array(
-            [int(blake2b(t, digest_size=4).hexdigest(), 16) for t in shingling],
-        ).astype(np.int32)
+        # read all (big-endian) digests at once, rather than parsing each one
+        digests = b"".join(blake2b(t, digest_size=4).digest() for t in shingling)
+        return np.frombuffer(digests, dtype=">u4").astype(np.int32)
 
     @staticmethod
     def fold(
@@ -248,10 +266,9 @@ class DrfpEncoder:
             A list of drfp fingerprints.
         """
 
-        return [
-            DrfpEncoder.encode_one(
+        shinglings = [
+            DrfpEncoder.shingling_difference(
                 reaction,
-                length=length,
                 min_radius=min_radius,
                 max_radius=max_radius,
                 include_rings=include_rings,
@@ -261,6 +278,38 @@ class DrfpEncoder:
             for reaction in reactions
         ]
 
+        return DrfpEncoder.fold_batch(shinglings, length=length).tolist()  # type: ignore[no-any-return]
+
+    @staticmethod
+    def fold_batch(
+        shinglings: Sequence[list[bytes]],
+        length: int = 2048,
+    ) -> np.ndarray:
+        """Hashes and folds the shinglings of a batch of reactions at once.
+
+        Arguments:
+            shinglings: The shingling (difference) of each reaction
+            length: The length of the folded fingerprints
+
+        Returns:
+            The folded fingerprints, as a matrix of shape (n_reactions, length)
+        """
+
+        lengths = np.fromiter(
+            (len(shingling) for shingling in shinglings),
+            dtype=np.intp,
+            count=len(shinglings),
+        )
+        hash_values = DrfpEncoder.hash(
+            [shingle for shingling in shinglings for shingle in shingling],
+        )
+
+        folded = np.zeros((len(shinglings), length), dtype=np.uint8)
+        rows = np.repeat(np.arange(len(shinglings)), lengths)
+        folded[rows, hash_values % length] = 1
+
+        return folded
+
     @staticmethod
     def encode_one(
         reaction: str,
@@ -300,3 +349,27 @@ class DrfpEncoder:
         )
 
         return difference_folded.tolist()  # type: ignore[no-any-return]
+
+
+@functools.lru_cache(maxsize=SHINGLING_CACHE_SIZE)
+def _component_shingling(
+    component: str,
+    max_radius: int,
+    include_rings: bool,
+    min_radius: int,
+    root_central_atom: bool,
+    include_hydrogens: bool,
+) -> frozenset[bytes]:
+    """Creates the (cached) shingling of a single reaction component SMILES."""
+    mol = AllChem.MolFromSmiles(component)
+
+    return frozenset(
+        DrfpEncoder.shingling_from_mol(
+            mol,
+            max_radius=max_radius,
+            include_rings=include_rings,
+            min_radius=min_radius,
+            root_central_atom=root_central_atom,
+            include_hydrogens=include_hydrogens,
+        ),
+    )
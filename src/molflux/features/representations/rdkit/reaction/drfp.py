@@ -73,18 +73,20 @@ class DRFP(RepresentationBase):
         assert_n_positional_args(*columns, expected_size=1)
         samples = columns[0]
 
-        fingerprints: list[Fingerprint] = []
+        shinglings: list[list[bytes]] = []
         for sample in samples:
             with featurisation_error_harness(sample):
-                fingerprint = DrfpEncoder.encode_one(
+                shingling = DrfpEncoder.shingling_difference(
                     sample,
-                    length=length,
                     min_radius=min_radius,
                     max_radius=max_radius,
                     include_rings=include_rings,
                     root_central_atom=root_central_atom,
                     include_hydrogens=include_hydrogens,
                 )
-                fingerprints.append(fingerprint)
+                shinglings.append(shingling)
 
-        return {self.tag: fingerprints}
+        # hash and fold the whole batch at once
+        fingerprints = DrfpEncoder.fold_batch(shinglings, length=length)
+
+        return {self.tag: fingerprints.tolist()}
@@ -0,0 +1,229 @@
+import functools
+from collections.abc import Sequence
+from typing import Any
+
+import fsspec
+import numpy as np
+
+try:
+    from rdkit.Chem import rdFingerprintGenerator
+
+    from molflux.features.representations.rdkit._utils import (
+        bit_vectors_to_numpy,
+        generate_fingerprints,
+    )
+except ImportError as e:
+    from molflux.features.errors import ExtrasDependencyImportError
+
+    raise ExtrasDependencyImportError("rdkit", e) from None
+
+from molflux.features.bases import RepresentationBase
+from molflux.features.cache import _digest_sample
+from molflux.features.info import FeatureSchema, RepresentationInfo
+from molflux.features.similarity import TanimotoIndex
+from molflux.features.typing import Fingerprints, MolArray
+from molflux.features.utils import assert_n_positional_args
+
+_DESCRIPTION = """
+Tanimoto similarities of molecules to their nearest neighbours in a reference set.
+
+Query molecules are compared to reference molecules (e.g. the training set
+of a model) by the Tanimoto similarity of their Morgan fingerprints. The
+similarities to, and indices of, the `k` most similar references are
+returned for each query, for example as applicability domain features.
+
+The reference fingerprints are packed into an index of 64-bit words once,
+and each batch of queries is compared to it with vectorised population
+counts. The index can be built with `build_tanimoto_index`, saved next to a
+model, and loaded from its path.
+"""
+
+
+class TanimotoKNN(RepresentationBase):
+    def __init__(self, *, tag: str | None = None, **kwargs: Any) -> None:
+        super().__init__(tag=tag, **kwargs)
+        # the digest of the references of the state, computed once when fitted
+        self._references_digest: bytes | None = None
+        # the index of the last set of references, and the parameters it was built with
+        self._index_cache: tuple[tuple[Any, ...], TanimotoIndex] | None = None
+
+    def reset_state(self) -> None:
+        super().reset_state()
+        self._references_digest = None
+
+    def update_state(self, **kwargs: Any) -> None:
+        super().update_state(**kwargs)
+        if "references" in kwargs:
+            self._references_digest = _digest_references(kwargs["references"])
+
+    def _info(self) -> RepresentationInfo:
+        return RepresentationInfo(
+            description=_DESCRIPTION,
+        )
+
+    def _output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema]:
+        return {
+            f"{self.tag}::similarities": FeatureSchema("float32", kwargs["k"]),
+            f"{self.tag}::indices": FeatureSchema("int64", kwargs["k"]),
+        }
+
+    def _featurise(
+        self,
+        *columns: MolArray,
+        references: Sequence[Any] | None = None,
+        index_path: str | None = None,
+        k: int = 5,
+        radius: int = 2,
+        n_bits: int = 2048,
+        use_chirality: bool = False,
+        n_threads: int = 1,
+        **kwargs: Any,
+    ) -> dict[str, Fingerprints]:
+        """Finds the most similar reference molecules of each input molecule.
+
+        Either `references` or `index_path` must be provided, usually by
+        fitting the representation with `update_state()`.
+
+        Args:
+            samples: The molecules to be compared to the references.
+            references: The reference molecules. Their index is built on first
+                use, and reused for as long as the references are unchanged.
+                The references fitted with `update_state()` are hashed once,
+                and must not be modified in place afterwards.
+            index_path: The path to an index saved with
+                `build_tanimoto_index(...).save(index_path)`. The fingerprint
+                parameters it was built with are used instead of `radius`,
+                `n_bits` and `use_chirality`. The loaded index is reused for
+                as long as the file is unchanged.
+            k: The number of nearest references to find. Defaults to `5`.
+            radius: The radius of the Morgan fingerprints. Defaults to `2`.
+            n_bits: The size of the Morgan fingerprints. Defaults to `2048`.
+            use_chirality: If set, chirality is included in the Morgan
+                fingerprints. Defaults to `False`.
+            n_threads: The number of threads used by rdkit to fingerprint
+                molecules in bulk. Defaults to `1`.
+
+        Returns:
+            The similarities to the `k` nearest references of each molecule,
+            in decreasing order, and the indices of those references. If
+            there are fewer than `k` references, missing neighbours have a
+            similarity of `nan` and an index of `-1`.
+
+        Examples:
+            >>> from molflux.features import load_representation
+            >>> representation = load_representation('tanimoto_knn')
+            >>> representation.update_state(references=['CCO', 'c1ccccc1', 'CCN'])
+            >>> result = representation.featurise(['CCO'], k=2)
+            >>> result['tanimoto_knn::similarities'].astype(float).round(2).tolist()
+            [[1.0, 0.33]]
+            >>> result['tanimoto_knn::indices'].tolist()
+            [[0, 2]]
+        """
+        assert_n_positional_args(*columns, expected_size=1)
+        samples = columns[0]
+
+        if index_path is not None:
+            index = _load_index(index_path)
+        elif references is not None:
+            index = self._reference_index(
+                references,
+                radius=radius,
+                n_bits=n_bits,
+                use_chirality=use_chirality,
+                n_threads=n_threads,
+            )
+        else:
+            raise ValueError(
+                "The representation must be fitted with either 'references' or an 'index_path'",
+            )
+
+        bits = _morgan_bits(
+            samples,
+            n_threads=n_threads,
+            **index.metadata,
+        )
+        similarities, indices = index.search(bits, k=k)
+        return {
+            f"{self.tag}::similarities": similarities,
+            f"{self.tag}::indices": indices,
+        }
+
+    def _reference_index(
+        self,
+        references: Sequence[Any],
+        radius: int,
+        n_bits: int,
+        use_chirality: bool,
+        n_threads: int,
+    ) -> TanimotoIndex:
+        if references is self.state.get("references"):
+            digest = self._references_digest
+        else:
+            digest = _digest_references(references)
+
+        key = (digest, radius, n_bits, use_chirality)
+        if digest is None or self._index_cache is None or self._index_cache[0] != key:
+            index = build_tanimoto_index(
+                references,
+                radius=radius,
+                n_bits=n_bits,
+                use_chirality=use_chirality,
+                n_threads=n_threads,
+            )
+            self._index_cache = (key, index)
+        return self._index_cache[1]
+
+
+def build_tanimoto_index(
+    references: Sequence[Any],
+    radius: int = 2,
+    n_bits: int = 2048,
+    use_chirality: bool = False,
+    n_threads: int = 1,
+) -> TanimotoIndex:
+    """Builds the index of reference molecules used by `tanimoto_knn`.
+
+    The fingerprint parameters are stored in the index, such that the index
+    can be saved (e.g. next to a model) and queried consistently once loaded.
+
+    Examples:
+        >>> index = build_tanimoto_index(['CCO', 'c1ccccc1'], n_bits=1024)
+        >>> len(index), index.n_bits
+        (2, 1024)
+    """
+    metadata = {"radius": radius, "n_bits": n_bits, "use_chirality": use_chirality}
+    bits = _morgan_bits(references, n_threads=n_threads, **metadata)
+    return TanimotoIndex.from_bits(bits, metadata=metadata)
+
+
+def _digest_references(references: Sequence[Any]) -> bytes | None:
+    """Hashes the contents of the references, or returns None if they cannot be hashed."""
+    return _digest_sample(tuple(references))
+
+
+def _load_index(index_path: str) -> TanimotoIndex:
+    """Loads a saved index, re-using previous loads for as long as the file is unchanged."""
+    fs, path = fsspec.core.url_to_fs(index_path)
+    # e.g. the modification time and size of a local file, or the etag of a remote one
+    return _load_index_version(index_path, fs.ukey(path))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_index_version(index_path: str, version: str) -> TanimotoIndex:
+    return TanimotoIndex.load(index_path)
+
+
+def _morgan_bits(
+    samples: Any,
+    radius: int,
+    n_bits: int,
+    use_chirality: bool,
+    n_threads: int,
+) -> np.ndarray:
+    generator = rdFingerprintGenerator.GetMorganGenerator(
+        radius=radius,
+        includeChirality=use_chirality,
+        fpSize=n_bits,
+    )
+    fingerprints = generate_fingerprints(generator, samples, n_threads=n_threads)
+    return bit_vectors_to_numpy(fingerprints, n_bits=n_bits)
@@ -0,0 +1,475 @@
+"""
+Tanimoto similarity search over binary fingerprints packed into 64-bit words.
+
+Fingerprints are packed 64 bits per `uint64` word, such that the number of
+bits in common between two fingerprints is the population count of the
+bitwise AND of their words. Similarities between blocks of queries and
+references are computed all at once, with the size of the blocks bounded to
+bound memory usage.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import fsspec
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+from scipy.sparse import csr_matrix
+
+# The maximum number of (query, reference) pairs compared at once
+_MAX_BLOCK_SIZE = 1 << 20
+
+# Masks of the SWAR population count of 64-bit words, for NumPy versions without np.bitwise_count
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+_HAS_BITWISE_COUNT = hasattr(np, "bitwise_count")
+
+# The number of bits set in each 16-bit integer, to count bits one lookup at a time
+_POPCOUNT_TABLE = (
+    np.unpackbits(np.arange(1 << 16, dtype="<u2").view(np.uint8))
+    .reshape(-1, 16)
+    .sum(axis=1, dtype=np.uint8)
+)
+
+# Keys of neighbours hold the bits of their similarity, then the complement of their index
+_INDEX_BITS = 32
+_INDEX_MASK = (1 << _INDEX_BITS) - 1
+
+
+def pack_fingerprints(bits: NDArray[np.uint8]) -> NDArray[np.uint64]:
+    """Packs a (n_samples, n_bits) matrix of fingerprint bits into 64-bit words.
+
+    Args:
+        bits: The matrix of fingerprint bits, one row per sample.
+
+    Returns:
+        A (n_samples, ceil(n_bits / 64)) matrix of words, zero-padded.
+
+    Examples:
+        >>> import numpy as np
+        >>> pack_fingerprints(np.array([[1, 1, 0, 1]], dtype=np.uint8))
+        array([[11]], dtype=uint64)
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    n_samples, n_bits = bits.shape
+    n_words = -(-n_bits // 64)
+
+    packed = np.zeros((n_samples, n_words * 8), dtype=np.uint8)
+    packed[:, : -(-n_bits // 8)] = np.packbits(bits, axis=1, bitorder="little")
+    return packed.view("<u8").astype(np.uint64)
+
+
+def popcount(words: NDArray[np.uint64]) -> NDArray[np.int32]:
+    """Counts the bits set in the words of each fingerprint (along the last axis).
+
+    Examples:
+        >>> import numpy as np
+        >>> popcount(np.array([[11, 1 << 63]], dtype=np.uint64))
+        array([4], dtype=int32)
+    """
+    words = np.asarray(words, dtype=np.uint64)
+    counts = np.zeros(words.shape[:-1], dtype=np.uint64)
+    x = np.empty_like(counts)
+    scratch = np.empty_like(counts)
+    for j in range(words.shape[-1]):
+        x[...] = words[..., j]
+        counts += _popcount_words(x, scratch=scratch)
+    return counts.astype(np.int32)
+
+
+def tanimoto_similarities(
+    queries: NDArray[np.uint64],
+    references: NDArray[np.uint64],
+    dtype: DTypeLike = np.float32,
+    query_popcounts: NDArray[np.int32] | None = None,
+    reference_popcounts: NDArray[np.int32] | None = None,
+) -> NDArray[np.floating]:
+    """Computes the Tanimoto similarity of each query to each reference.
+
+    The similarity of two empty fingerprints is one, as in rdkit. In double
+    precision, similarities are identical to those of rdkit.
+
+    Args:
+        queries: The (n_queries, n_words) packed query fingerprints.
+        references: The (n_references, n_words) packed reference fingerprints.
+        dtype: The floating point type of the similarities.
+        query_popcounts: The number of bits set in each query, if known.
+        reference_popcounts: The number of bits set in each reference, if known.
+
+    Returns:
+        The (n_queries, n_references) matrix of similarities.
+    """
+    queries = np.asarray(queries, dtype=np.uint64)
+    reference_columns = np.ascontiguousarray(np.transpose(references), dtype=np.uint64)
+    if query_popcounts is None:
+        query_popcounts = popcount(queries)
+    if reference_popcounts is None:
+        reference_popcounts = popcount(references)
+
+    n_references = reference_columns.shape[1]
+    block_size = max(1, _MAX_BLOCK_SIZE // max(1, n_references))
+    similarities = np.empty((len(queries), n_references), dtype=dtype)
+    for start in range(0, len(queries), block_size):
+        stop = min(start + block_size, len(queries))
+        similarities[start:stop] = _tanimoto_block(
+            queries[start:stop],
+            reference_columns,
+            query_popcounts=query_popcounts[start:stop],
+            reference_popcounts=reference_popcounts,
+            dtype=dtype,
+        )
+    return similarities
+
+
+def bulk_tanimoto_similarity(
+    query: NDArray[np.uint64],
+    references: NDArray[np.uint64],
+    query_popcount: int | None = None,
+    reference_popcounts: NDArray[np.int32] | None = None,
+) -> NDArray[np.float64]:
+    """Computes the Tanimoto similarity of a single query to each reference.
+
+    This is the packed equivalent of rdkit's `BulkTanimotoSimilarity`, with
+    identical (double precision) results. The bits in common with all
+    references are counted at once, which makes it faster than
+    `tanimoto_similarities` for a single query.
+
+    Args:
+        query: The (n_words,) packed query fingerprint.
+        references: The (n_references, n_words) packed reference fingerprints.
+        query_popcount: The number of bits set in the query, if known.
+        reference_popcounts: The number of bits set in each reference, if known.
+
+    Returns:
+        The (n_references,) similarities of the query to each reference.
+
+    Examples:
+        >>> import numpy as np
+        >>> bulk_tanimoto_similarity(
+        ...     np.array([0b0111], dtype=np.uint64),
+        ...     np.array([[0b0011], [0b1000]], dtype=np.uint64),
+        ... ).round(3).tolist()
+        [0.667, 0.0]
+    """
+    query = np.asarray(query, dtype=np.uint64)
+    references = np.asarray(references, dtype=np.uint64)
+    if query_popcount is None:
+        query_popcount = int(_count_bits(query[None, :])[0])
+    if reference_popcounts is None:
+        reference_popcounts = _count_bits(references)
+
+    intersection = _count_bits(references & query).astype(np.float64)
+    union = (reference_popcounts + query_popcount).astype(np.float64)
+    union -= intersection
+
+    similarities = np.ones(len(references), dtype=np.float64)
+    np.divide(intersection, union, out=similarities, where=union > 0)
+    return similarities
+
+
+def tanimoto_neighbours(
+    words: NDArray[np.uint64],
+    threshold: float,
+    n_threads: int = 1,
+) -> csr_matrix:
+    """Finds the pairs of fingerprints of Tanimoto similarity at least `threshold`.
+
+    Fingerprints are compared to each other in blocks of bounded size, and
+    only the similarities above the threshold are kept, such that memory
+    usage is proportional to the number of neighbours rather than to the
+    square of the number of fingerprints. Blocks are compared over several
+    threads, as NumPy releases the GIL while comparing them.
+
+    Args:
+        words: The (n_samples, n_words) packed fingerprints.
+        threshold: The similarity above which fingerprints are neighbours.
+        n_threads: The number of threads comparing blocks of fingerprints.
+
+    Returns:
+        The symmetric (n_samples, n_samples) sparse matrix of the (double
+        precision) similarities of each fingerprint to its neighbours, with
+        the neighbours of each fingerprint in increasing order of index.
+        Fingerprints are not their own neighbours.
+
+    Examples:
+        >>> import numpy as np
+        >>> neighbours = tanimoto_neighbours(
+        ...     np.array([[0b0111], [0b0011], [0b1000]], dtype=np.uint64),
+        ...     threshold=0.5,
+        ... )
+        >>> neighbours.toarray().round(3).tolist()
+        [[0.0, 0.667, 0.0], [0.667, 0.0, 0.0], [0.0, 0.0, 0.0]]
+    """
+    words = np.asarray(words, dtype=np.uint64)
+    n_samples = len(words)
+    word_columns = np.ascontiguousarray(words.T)
+    popcounts = popcount(words)
+
+    def find_neighbours(
+        start: int,
+    ) -> tuple[NDArray[np.int64], NDArray[np.intp], NDArray[np.float64]]:
+        stop = min(start + block_size, n_samples)
+        similarities = _tanimoto_block(
+            words[start:stop],
+            word_columns,
+            query_popcounts=popcounts[start:stop],
+            reference_popcounts=popcounts,
+            dtype=np.float64,
+        )
+        # fingerprints are not their own neighbours
+        np.fill_diagonal(similarities[:, start:stop], -1)
+        rows, columns = np.nonzero(similarities >= threshold)
+        counts = np.bincount(rows, minlength=stop - start)
+        return counts, columns, similarities[rows, columns]
+
+    block_size = max(1, _MAX_BLOCK_SIZE // max(1, n_samples))
+    with ThreadPoolExecutor(max_workers=max(1, n_threads)) as executor:
+        blocks = list(executor.map(find_neighbours, range(0, n_samples, block_size)))
+
+    indptr = np.zeros(n_samples + 1, dtype=np.int64)
+    np.cumsum(
+        np.concatenate([np.empty(0, dtype=np.int64), *(block[0] for block in blocks)]),
+        out=indptr[1:],
+    )
+    indices = np.concatenate(
+        [np.empty(0, dtype=np.intp), *(block[1] for block in blocks)],
+    )
+    data = np.concatenate([np.empty(0), *(block[2] for block in blocks)])
+    return csr_matrix((data, indices, indptr), shape=(n_samples, n_samples))
+
+
+class TanimotoIndex:
+    """An index of packed binary fingerprints for Tanimoto nearest neighbour search.
+
+    Blocks of queries are compared to blocks of references at a time, keeping
+    track of the `k` most similar references of each query. Ties are broken
+    in favour of the references indexed first.
+
+    Examples:
+        >>> import numpy as np
+        >>> index = TanimotoIndex.from_bits(
+        ...     np.array([[1, 1, 0, 0], [1, 0, 1, 0], [0, 0, 1, 1]], dtype=np.uint8),
+        ... )
+        >>> similarities, indices = index.search(
+        ...     np.array([[1, 1, 1, 0]], dtype=np.uint8),
+        ...     k=2,
+        ... )
+        >>> similarities.astype(float).round(3).tolist(), indices.tolist()
+        ([[0.667, 0.667]], [[0, 1]])
+    """
+
+    def __init__(
+        self,
+        words: NDArray[np.uint64],
+        n_bits: int,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialises the index.
+
+        Args:
+            words: The (n_references, n_words) packed reference fingerprints.
+            n_bits: The number of bits of the fingerprints.
+            metadata: JSON-serialisable information about how the fingerprints
+                were generated, persisted along with the index.
+        """
+        words = np.asarray(words, dtype=np.uint64)
+        if len(words) > _INDEX_MASK:
+            raise ValueError(f"Cannot index more than {_INDEX_MASK} fingerprints")
+
+        # words are stored word by word, to compare references to each query word at once
+        self._word_columns = np.ascontiguousarray(words.T)
+        self.n_bits = n_bits
+        self.metadata = metadata or {}
+        self.popcounts = popcount(words)
+
+    @classmethod
+    def from_bits(
+        cls,
+        bits: NDArray[np.uint8],
+        metadata: dict[str, Any] | None = None,
+    ) -> "TanimotoIndex":
+        """Builds an index from a (n_references, n_bits) matrix of fingerprint bits."""
+        bits = np.asarray(bits, dtype=np.uint8)
+        return cls(pack_fingerprints(bits), n_bits=bits.shape[1], metadata=metadata)
+
+    @property
+    def words(self) -> NDArray[np.uint64]:
+        """The (n_references, n_words) packed reference fingerprints."""
+        return self._word_columns.T
+
+    def __len__(self) -> int:
+        return self._word_columns.shape[1]
+
+    def search(
+        self,
+        bits: NDArray[np.uint8],
+        k: int = 1,
+    ) -> tuple[NDArray[np.float32], NDArray[np.int64]]:
+        """Finds the `k` most similar references of each query.
+
+        Args:
+            bits: The (n_queries, n_bits) matrix of query fingerprint bits.
+            k: The number of nearest references to find.
+
+        Returns:
+            The (n_queries, k) matrices of similarities, in decreasing order,
+            and of the indices of the corresponding references. If there are
+            fewer than `k` references, missing neighbours have similarities
+            of `nan` and indices of `-1`.
+        """
+        bits = np.asarray(bits, dtype=np.uint8)
+        if bits.ndim != 2 or bits.shape[1] != self.n_bits:
+            raise ValueError(
+                f"Expected query fingerprints of {self.n_bits} bits: got shape {bits.shape}",
+            )
+        if k < 1:
+            raise ValueError(f"k must be a positive integer: {k}")
+
+        queries = pack_fingerprints(bits)
+        query_popcounts = popcount(queries)
+        n_queries = len(queries)
+
+        top_similarities = np.full((n_queries, k), np.nan, dtype=np.float32)
+        top_indices = np.full((n_queries, k), -1, dtype=np.int64)
+        if not len(self) or not n_queries:
+            return top_similarities, top_indices
+
+        reference_block_size = min(len(self), _MAX_BLOCK_SIZE)
+        query_block_size = max(1, _MAX_BLOCK_SIZE // reference_block_size)
+
+        for start in range(0, n_queries, query_block_size):
+            stop = min(start + query_block_size, n_queries)
+            best_keys = np.empty((stop - start, 0), dtype=np.int64)
+
+            for reference_start in range(0, len(self), reference_block_size):
+                reference_stop = min(reference_start + reference_block_size, len(self))
+                similarities = _tanimoto_block(
+                    queries[start:stop],
+                    self._word_columns[:, reference_start:reference_stop],
+                    query_popcounts=query_popcounts[start:stop],
+                    reference_popcounts=self.popcounts[reference_start:reference_stop],
+                )
+                keys = _neighbour_keys(
+                    similarities,
+                    np.arange(reference_start, reference_stop),
+                )
+                best_keys = _largest(np.concatenate([best_keys, keys], axis=1), k=k)
+
+            # neighbours in decreasing order of similarity, then increasing index
+            best_keys = -np.sort(-best_keys, axis=1)
+            n_found = best_keys.shape[1]
+            top_similarities[start:stop, :n_found] = (
+                (best_keys >> _INDEX_BITS).astype(np.int32).view(np.float32)
+            )
+            top_indices[start:stop, :n_found] = _INDEX_MASK - (best_keys & _INDEX_MASK)
+
+        return top_similarities, top_indices
+
+    def save(self, path: str) -> None:
+        """Saves the index to a file (e.g. next to a model), locally or in the cloud."""
+        with fsspec.open(path, "wb") as f:
+            np.savez(
+                f,
+                words=self.words,
+                n_bits=np.int64(self.n_bits),
+                metadata=np.array(json.dumps(self.metadata)),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "TanimotoIndex":
+        """Loads an index saved with `save()`."""
+        with fsspec.open(path, "rb") as f, np.load(f, allow_pickle=False) as arrays:
+            return cls(
+                arrays["words"],
+                n_bits=int(arrays["n_bits"]),
+                metadata=json.loads(str(arrays["metadata"])),
+            )
+
+
+def _popcount_words(
+    x: NDArray[np.uint64],
+    scratch: NDArray[np.uint64],
+) -> NDArray[np.uint64]:
+    """Counts the bits set in each word, in place."""
+    if _HAS_BITWISE_COUNT:
+        return np.bitwise_count(x, out=x)  # type: ignore[no-any-return]
+
+    np.right_shift(x, np.uint64(1), out=scratch)
+    scratch &= _M1
+    x -= scratch
+    np.right_shift(x, np.uint64(2), out=scratch)
+    scratch &= _M2
+    x &= _M2
+    x += scratch
+    np.right_shift(x, np.uint64(4), out=scratch)
+    x += scratch
+    x &= _M4
+    x *= _H01
+    x >>= np.uint64(56)
+    return x
+
+
+def _count_bits(words: NDArray[np.uint64]) -> NDArray[np.int32]:
+    """Counts the bits set in each row of words, with a lookup per 16 bits."""
+    if _HAS_BITWISE_COUNT:
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int32)  # type: ignore[no-any-return]
+
+    halfwords = np.ascontiguousarray(words).view(np.uint16)
+    return np.take(_POPCOUNT_TABLE, halfwords).sum(axis=-1, dtype=np.int32)
+
+
+def _tanimoto_block(
+    queries: NDArray[np.uint64],
+    reference_columns: NDArray[np.uint64],
+    query_popcounts: NDArray[np.int32],
+    reference_popcounts: NDArray[np.int32],
+    dtype: DTypeLike = np.float32,
+) -> NDArray[np.floating]:
+    """Computes the similarities of a block of queries to a block of references.
+
+    References are given word by word, as a (n_words, n_references) matrix,
+    such that each query word is compared to all references at once.
+    """
+    shape = (len(queries), reference_columns.shape[1])
+    common = np.zeros(shape, dtype=np.uint64)
+    x = np.empty(shape, dtype=np.uint64)
+    scratch = np.empty(shape, dtype=np.uint64)
+    for j in range(reference_columns.shape[0]):
+        np.bitwise_and(queries[:, j, None], reference_columns[j], out=x)
+        common += _popcount_words(x, scratch=scratch)
+
+    # bit counts are exact in floating point, and empty fingerprints are identical
+    intersection = common.astype(dtype)
+    union = (
+        query_popcounts.astype(dtype)[:, None]
+        + reference_popcounts.astype(dtype)[None, :]
+        - intersection
+    )
+    similarities = np.ones(shape, dtype=dtype)
+    np.divide(intersection, union, out=similarities, where=union > 0)
+    return similarities
+
+
+def _neighbour_keys(
+    similarities: NDArray[np.float32],
+    indices: NDArray[np.int64],
+) -> NDArray[np.int64]:
+    """Encodes neighbours as keys ordered by similarity, then by decreasing index.
+
+    The bits of non-negative floats are ordered as the floats themselves, such
+    that the largest keys are those of the most similar neighbours, with ties
+    broken in favour of the lowest indices.
+    """
+    similarity_bits = similarities.view(np.int32).astype(np.int64)
+    return (similarity_bits << _INDEX_BITS) | (_INDEX_MASK - indices)
+
+
+def _largest(keys: NDArray[np.int64], k: int) -> NDArray[np.int64]:
+    """Selects the (unordered) `k` largest keys of each row."""
+    if keys.shape[1] <= k:
+        return keys
+    return np.partition(keys, keys.shape[1] - k, axis=1)[:, -k:]
@@ -0,0 +1,190 @@
+"""
+Utilities for assembling sparse unfolded fingerprints into sparse matrices.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import pyarrow as pa
+from numpy.typing import NDArray
+from scipy import sparse
+
+# The largest number of columns of a sparse matrix (of int64 indices)
+_MAX_N_FEATURES = np.iinfo(np.int64).max
+
+
+def to_csr_matrix(
+    indices: Any,
+    counts: Any,
+    n_features: int | None = None,
+) -> sparse.csr_matrix:
+    """Assembles sparse fingerprints into a CSR matrix, one row per sample.
+
+    Args:
+        indices: The sorted hashes of each sample, as generated with
+            `output_format="sparse"`. Either a sequence of arrays or a pyarrow
+            list column (e.g. a column of a featurised dataset), whose buffers
+            are used without copying them into python objects.
+        counts: The counts of each hash, in the same layout as `indices`.
+        n_features: The number of columns of the matrix. If `None`, defaults
+            to the range of the integer type of the hashes (e.g. `2**32` for
+            the `uint32` hashes of unfolded Morgan fingerprints), capped at
+            `2**63 - 1` for 64-bit hashes.
+
+    Returns:
+        The fingerprints, as a matrix of shape `(n_samples, n_features)`.
+
+    Raises:
+        TypeError: If the hashes are not integers.
+        ValueError: If any hash is out of the range of the columns of the
+            matrix.
+
+    Examples:
+        >>> import numpy as np
+        >>> indices = [np.array([1, 5]), np.array([2])]
+        >>> counts = [np.array([2, 1]), np.array([3])]
+        >>> to_csr_matrix(indices, counts, n_features=8).toarray()
+        array([[0, 2, 0, 0, 0, 1, 0, 0],
+               [0, 0, 3, 0, 0, 0, 0, 0]])
+    """
+    indptr, flat_indices = _flatten(indices)
+    counts_indptr, flat_counts = _flatten(counts)
+    if not np.array_equal(indptr, counts_indptr):
+        raise ValueError("indices and counts must have the same layout")
+
+    if not np.issubdtype(flat_indices.dtype, np.integer):
+        raise TypeError(f"Expected integer hashes, got: {flat_indices.dtype}")
+
+    if n_features is None:
+        n_features = min(np.iinfo(flat_indices.dtype).max + 1, _MAX_N_FEATURES)
+
+    if len(flat_indices) and (
+        flat_indices.min() < 0 or int(flat_indices.max()) >= n_features
+    ):
+        raise ValueError(
+            f"Hashes must be in the range [0, {n_features}) of the matrix columns, got hashes in [{flat_indices.min()}, {flat_indices.max()}]",
+        )
+
+    return sparse.csr_matrix(
+        (flat_counts, flat_indices.astype(np.int64, copy=False), indptr),
+        shape=(len(indptr) - 1, n_features),
+    )
+
+
+class SparseVocabulary:
+    """A vocabulary of fingerprint hashes, mapped to contiguous column indices.
+
+    Raw hashes of unfolded fingerprints span a very large range. Fitting a
+    vocabulary on a set of fingerprints keeps only the observed (and
+    optionally frequent enough) hashes, such that fingerprints can be
+    transformed into compact sparse matrices with one column per hash.
+
+    Examples:
+        >>> import numpy as np
+        >>> indices = [np.array([10, 500]), np.array([10, 70])]
+        >>> counts = [np.array([1, 2]), np.array([3, 1])]
+        >>> vocabulary = SparseVocabulary().fit(indices)
+        >>> vocabulary.hashes
+        array([ 10,  70, 500])
+        >>> vocabulary.transform(indices, counts).toarray()
+        array([[1, 0, 2],
+               [3, 1, 0]])
+    """
+
+    def __init__(self) -> None:
+        self.hashes: NDArray[Any] = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def fit(
+        self,
+        indices: Any,
+        min_frequency: int = 1,
+        max_features: int | None = None,
+    ) -> "SparseVocabulary":
+        """Fits the vocabulary on the hashes of a set of fingerprints.
+
+        Args:
+            indices: The sorted hashes of each sample, in any of the layouts
+                accepted by `to_csr_matrix`.
+            min_frequency: The minimum number of samples a hash must occur in
+                to be kept in the vocabulary.
+            max_features: If provided, only the `max_features` hashes occurring
+                in the most samples are kept.
+
+        Returns:
+            The fitted vocabulary.
+        """
+        _, flat_indices = _flatten(indices)
+        hashes, frequencies = np.unique(flat_indices, return_counts=True)
+
+        keep = frequencies >= min_frequency
+        hashes, frequencies = hashes[keep], frequencies[keep]
+
+        if max_features is not None and len(hashes) > max_features:
+            # most frequent first, ties broken by hash for reproducibility
+            selected = np.lexsort((hashes, -frequencies))[:max_features]
+            hashes = np.sort(hashes[selected])
+
+        self.hashes = hashes
+        return self
+
+    def transform(self, indices: Any, counts: Any) -> sparse.csr_matrix:
+        """Transforms fingerprints into a matrix with one column per known hash.
+
+        Hashes not in the vocabulary are dropped.
+
+        Args:
+            indices: The sorted hashes of each sample, in any of the layouts
+                accepted by `to_csr_matrix`.
+            counts: The counts of each hash, in the same layout as `indices`.
+
+        Returns:
+            The fingerprints, as a matrix of shape `(n_samples, len(self))`.
+        """
+        indptr, flat_indices = _flatten(indices)
+        counts_indptr, flat_counts = _flatten(counts)
+        if not np.array_equal(indptr, counts_indptr):
+            raise ValueError("indices and counts must have the same layout")
+
+        columns = np.searchsorted(self.hashes, flat_indices)
+        known = columns < len(self.hashes)
+        known[known] = self.hashes[columns[known]] == flat_indices[known]
+
+        # count the known hashes left in each row to rebuild row offsets
+        cumulative_known = np.concatenate(([0], np.cumsum(known)))
+        known_indptr = cumulative_known[indptr]
+
+        return sparse.csr_matrix(
+            (flat_counts[known], columns[known], known_indptr),
+            shape=(len(indptr) - 1, len(self.hashes)),
+        )
+
+
+def _flatten(rows: Any) -> tuple[NDArray[np.int64], NDArray[Any]]:
+    """Flattens variable-length rows into row offsets and concatenated values."""
+    if isinstance(rows, pa.ChunkedArray):
+        rows = rows.combine_chunks() if rows.num_chunks else pa.array([], rows.type)
+
+    if isinstance(rows, (pa.ListArray, pa.LargeListArray)):
+        # rebase offsets of sliced arrays, and ignore values outside the slice
+        offsets = rows.offsets.to_numpy().astype(np.int64)
+        values = rows.values.to_numpy(zero_copy_only=False)
+        values = values[offsets[0] : offsets[-1]]
+        return offsets - offsets[0], values
+
+    if isinstance(rows, pa.Array):
+        raise TypeError(f"Expected a pyarrow list array, got: {rows.type}")
+
+    rows = _as_arrays(rows)
+    lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    values = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    return offsets, values
+
+
+def _as_arrays(rows: Sequence[Any]) -> list[NDArray[Any]]:
+    return [np.asarray(row) for row in rows]
@@ -1,6 +1,9 @@
 from collections.abc import Iterable
 from os import PathLike as OSPathLike
-from typing import Any, Union
+from typing import Any, Literal, Union
+
+import numpy as np
+from numpy.typing import NDArray
 
 RepresentationResult = dict[str, Any]
 ArrayLike = Iterable[Any]
@@ -10,3 +13,6 @@ MolArray = Union[SmilesArray, OEMolArray, Iterable[bytes]]
 
 PathLike = Union[str, OSPathLike]
 Fingerprint = list[int]
+FingerprintFormat = Literal["bits", "packed", "numpy"]
+Fingerprints = Union[list[Fingerprint], list[bytes], NDArray[np.uint8]]
+SparseFingerprintFormat = Literal["dict", "sparse"]
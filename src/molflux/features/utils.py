@@ -1,9 +1,28 @@
 import contextlib
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from contextvars import ContextVar
 from types import FunctionType
-from typing import Any
+from typing import Any, get_args
+
+import numpy as np
+from numpy.typing import NDArray
 
 from molflux.features.errors import FeaturisationError, InvalidNumberOfPositionalArgs
+from molflux.features.info import FeatureSchema
+from molflux.features.typing import (
+    FingerprintFormat,
+    Fingerprints,
+    SparseFingerprintFormat,
+)
+
+# Parsed molecules shared across representations, keyed by (backend, sample)
+_SHARED_MOLECULES: ContextVar[dict[tuple[str, Any], Any] | None] = ContextVar(
+    "_SHARED_MOLECULES",
+    default=None,
+)
+
+# Counts of sparse fingerprints are clipped to fit in uint16
+_MAX_SPARSE_COUNT = np.iinfo(np.uint16).max
 
 
 def copyfunc(func: Callable) -> FunctionType:
@@ -46,6 +65,63 @@ def featurisation_error_harness(sample: Any) -> Iterator:
         raise FeaturisationError(sample=sample) from e
 
 
+@contextlib.contextmanager
+def shared_molecules_context() -> Iterator[None]:
+    """Creates a context within which parsed molecules are shared across representations.
+
+    Within this context, each input sample is parsed at most once per backend
+    (e.g. into a ``Chem.Mol`` for rdkit, or an ``OEMol`` for openeye), and the
+    parsed molecule is re-used by every representation featurising that same
+    sample. Nested contexts re-use the outermost context.
+
+    Examples:
+
+        >>> with shared_molecules_context():  # doctest: +SKIP
+        >>>     representations.featurise(samples)  # doctest: +SKIP
+    """
+    if _SHARED_MOLECULES.get() is not None:
+        yield
+        return
+
+    token = _SHARED_MOLECULES.set({})
+    try:
+        yield
+    finally:
+        _SHARED_MOLECULES.reset(token)
+
+
+def parse_shared_molecule(
+    sample: Any,
+    *,
+    backend: str,
+    parser: Callable[[Any], Any],
+) -> Any:
+    """Parses a sample into a backend molecule, re-using previous results if possible.
+
+    Outside of a :func:`shared_molecules_context` this is equivalent to
+    calling ``parser(sample)``.
+
+    Args:
+        sample: The sample to parse.
+        backend: The name of the backend the sample is parsed for.
+        parser: The callable parsing the sample into a backend molecule.
+
+    Returns:
+        The parsed molecule.
+    """
+    shared_molecules = _SHARED_MOLECULES.get()
+    if shared_molecules is None or not isinstance(sample, Hashable):
+        return parser(sample)
+
+    key = (backend, sample)
+    molecule = shared_molecules.get(key)
+    if molecule is None:
+        molecule = parser(sample)
+        shared_molecules[key] = molecule
+
+    return molecule
+
+
 def assert_n_positional_args(*args: Any, expected_size: int) -> None:
     """Checks that the number of positional arguments given matches the expected size.
 
@@ -60,3 +136,169 @@ def assert_n_positional_args(*args: Any, expected_size: int) -> None:
     actual_size = len(args)
     if actual_size != expected_size:
         raise InvalidNumberOfPositionalArgs(expected_size, actual_size)
+
+
+def validate_fingerprint_format(
+    output_format: str,
+    supported_formats: tuple[str, ...] = get_args(FingerprintFormat),
+) -> None:
+    """Checks that a fingerprint output format is supported.
+
+    Raises:
+        ValueError: If the output format is not supported.
+    """
+    if output_format not in supported_formats:
+        raise ValueError(
+            f"Unsupported fingerprint output format: {output_format!r}. Available formats: {supported_formats!r}",
+        )
+
+
+def format_fingerprints(
+    bits: NDArray[np.uint8],
+    output_format: FingerprintFormat,
+) -> Fingerprints:
+    """Formats a (n_samples, n_bits) matrix of fingerprint bits.
+
+    Args:
+        bits: The matrix of fingerprint bits, one row per sample.
+        output_format: The desired output format. One of `"bits"` (a list of
+            bits for each sample), `"packed"` (bytes of bits packed eight per
+            byte, in big-endian bit order, for each sample) or `"numpy"` (a
+            contiguous `uint8` matrix).
+
+    Returns:
+        The formatted fingerprints.
+
+    Examples:
+        >>> import numpy as np
+        >>> bits = np.array([[1, 0, 0, 0, 0, 0, 0, 1, 1]], dtype=np.uint8)
+        >>> format_fingerprints(bits, output_format="bits")
+        [[1, 0, 0, 0, 0, 0, 0, 1, 1]]
+        >>> format_fingerprints(bits, output_format="packed")
+        [b'\\x81\\x80']
+    """
+    validate_fingerprint_format(output_format)
+
+    if output_format == "packed":
+        packed = np.packbits(bits, axis=1)
+        return [row.tobytes() for row in packed]
+
+    if output_format == "numpy":
+        return np.ascontiguousarray(bits, dtype=np.uint8)
+
+    return bits.tolist()  # type: ignore[no-any-return]
+
+
+def fingerprint_schema(n_bits: int, output_format: FingerprintFormat) -> FeatureSchema:
+    """Returns the schema of fingerprints generated by `format_fingerprints`.
+
+    Examples:
+        >>> fingerprint_schema(2048, output_format="bits")
+        FeatureSchema(dtype='uint8', length=2048)
+        >>> fingerprint_schema(2048, output_format="packed")
+        FeatureSchema(dtype='binary', length=None)
+    """
+    if output_format == "packed":
+        return FeatureSchema(dtype="binary")
+
+    return FeatureSchema(dtype="uint8", length=n_bits)
+
+
+def unpack_fingerprints(
+    packed: Iterable[bytes],
+    n_bits: int,
+) -> NDArray[np.uint8]:
+    """Unpacks fingerprints generated with the `"packed"` output format.
+
+    Args:
+        packed: The packed fingerprints, as bytes.
+        n_bits: The number of bits in each fingerprint.
+
+    Returns:
+        A (n_samples, n_bits) matrix of fingerprint bits.
+
+    Examples:
+        >>> unpack_fingerprints([b'\\x81\\x80'], n_bits=9)
+        array([[1, 0, 0, 0, 0, 0, 0, 1, 1]], dtype=uint8)
+    """
+    n_bytes = (n_bits + 7) // 8
+    buffer = np.frombuffer(b"".join(packed), dtype=np.uint8).reshape(-1, n_bytes)
+    return np.unpackbits(buffer, axis=1, count=n_bits)
+
+
+def format_sparse_fingerprints(
+    nonzero_elements: list[dict[int, int]],
+    tag: str,
+    output_format: SparseFingerprintFormat,
+    index_dtype: type[np.unsignedinteger] = np.uint32,
+) -> dict[str, Any]:
+    """Formats unfolded fingerprints given as their non-zero elements.
+
+    Args:
+        nonzero_elements: The non-zero elements of each fingerprint, as a
+            mapping of hashed feature to count.
+        tag: The name of the featurised output.
+        output_format: The desired output format. One of `"dict"` (a
+            dictionary of stringified hashes to counts for each sample, as
+            feature `tag`) or `"sparse"` (arrays of sorted hashes, as feature
+            `"{tag}::indices"`, and of their `uint16` counts, as feature
+            `"{tag}::counts"`, for each sample).
+        index_dtype: The dtype of the hashes in the `"sparse"` output format.
+
+    Returns:
+        The formatted fingerprints.
+
+    Examples:
+        >>> nonzero_elements = [{7: 2, 3: 1}]
+        >>> format_sparse_fingerprints(nonzero_elements, "fp", output_format="dict")
+        {'fp': [{'7': 2, '3': 1}]}
+        >>> format_sparse_fingerprints(nonzero_elements, "fp", output_format="sparse")
+        {'fp::indices': [array([3, 7], dtype=uint32)], 'fp::counts': [array([1, 2], dtype=uint16)]}
+    """
+    validate_fingerprint_format(
+        output_format,
+        supported_formats=get_args(SparseFingerprintFormat),
+    )
+
+    if output_format == "dict":
+        return {
+            tag: [
+                {str(k): v for k, v in elements.items()}
+                for elements in nonzero_elements
+            ],
+        }
+
+    indices = []
+    counts = []
+    for elements in nonzero_elements:
+        row_indices = np.fromiter(
+            elements.keys(),
+            dtype=index_dtype,
+            count=len(elements),
+        )
+        row_counts = np.fromiter(elements.values(), dtype=np.int64, count=len(elements))
+        order = np.argsort(row_indices)
+        indices.append(row_indices[order])
+        counts.append(
+            np.minimum(row_counts[order], _MAX_SPARSE_COUNT).astype(np.uint16),
+        )
+
+    return {f"{tag}::indices": indices, f"{tag}::counts": counts}
+
+
+def sparse_fingerprint_schema(
+    tag: str,
+    output_format: SparseFingerprintFormat,
+    index_dtype: str = "uint32",
+) -> dict[str, FeatureSchema] | None:
+    """Returns the schema of fingerprints generated by `format_sparse_fingerprints`.
+
+    Dictionary outputs have no fixed schema, in which case `None` is returned.
+    """
+    if output_format == "sparse":
+        return {
+            f"{tag}::indices": FeatureSchema(dtype=index_dtype, length=-1),
+            f"{tag}::counts": FeatureSchema(dtype="uint16", length=-1),
+        }
+
+    return None
@@ -0,0 +1,239 @@
+"""
+Scaffolds of molecules computed over worker processes, and memoised by input content.
+"""
+
+import functools
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from molflux.features.parallel import resolve_n_jobs
+from molflux.splits.typing import ArrayLike
+
+logger = logging.getLogger(__name__)
+
+# The number of molecules sent to worker processes at once
+_CHUNK_SIZE = 1_000
+
+# The number of failed molecules quoted in warnings
+_MAX_QUOTED_FAILURES = 5
+
+_DEFAULT_MAX_SIZE = 1_000_000
+
+
+class ScaffoldIndex:
+    """An in-memory index of the scaffolds of molecules, keyed by their content.
+
+    Molecules are keyed by a digest of their content (e.g. of their SMILES, or
+    of their serialised bytes) and of the options their scaffolds are computed
+    with, such that the scaffolds of a dataset only need to be computed once
+    across repeated scaffold splits (e.g. for each seed of a repeated
+    cross-validation). The least recently used scaffolds are evicted once the
+    index holds `max_size` of them.
+
+    Examples:
+        >>> index = ScaffoldIndex(max_size=2)
+        >>> index.update([b"a", b"b", b"c"], ["c1ccccc1", "", "C1CC1"])
+        >>> index.lookup([b"a", b"c"])
+        [None, 'C1CC1']
+    """
+
+    def __init__(self, max_size: int | None = _DEFAULT_MAX_SIZE) -> None:
+        """Initialises the index.
+
+        Args:
+            max_size: The maximum number of scaffolds held, or `None` for no
+                limit. An index of size `0` holds nothing.
+        """
+        self.max_size = max_size
+        self._scaffolds: OrderedDict[bytes, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._scaffolds)
+
+    def lookup(self, keys: Sequence[bytes]) -> list[str | None]:
+        """Returns the scaffold of each key, or `None` for keys not in the index."""
+        with self._lock:
+            scaffolds = []
+            for key in keys:
+                scaffold = self._scaffolds.get(key)
+                if scaffold is not None:
+                    self._scaffolds.move_to_end(key)
+                scaffolds.append(scaffold)
+            return scaffolds
+
+    def update(self, keys: Sequence[bytes], scaffolds: Sequence[str]) -> None:
+        """Adds the scaffolds of the given keys to the index."""
+        if self.max_size == 0:
+            return
+
+        with self._lock:
+            for key, scaffold in zip(keys, scaffolds, strict=True):
+                self._scaffolds[key] = scaffold
+                self._scaffolds.move_to_end(key)
+
+            if self.max_size is not None:
+                while len(self._scaffolds) > self.max_size:
+                    self._scaffolds.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all scaffolds from the index."""
+        with self._lock:
+            self._scaffolds.clear()
+
+
+# The index shared by scaffold splits by default
+_DEFAULT_SCAFFOLD_INDEX = ScaffoldIndex()
+
+
+def default_scaffold_index() -> ScaffoldIndex:
+    """Returns the index of scaffolds shared by scaffold splits by default."""
+    return _DEFAULT_SCAFFOLD_INDEX
+
+
+def compute_scaffolds(
+    samples: ArrayLike,
+    scaffold: Callable[[str | bytes], str | None],
+    serialise: Callable[[Any], bytes],
+    options: Hashable,
+    n_jobs: int = 1,
+    scaffold_index: ScaffoldIndex | None = None,
+) -> list[str]:
+    """Computes the scaffold of each sample, over worker processes.
+
+    Samples are keyed by their content and `options`, and only the scaffolds
+    of samples missing from `scaffold_index` are computed (once per distinct
+    sample). Samples which are neither strings nor bytes (e.g. molecule
+    objects) are serialised to bytes with `serialise`, both to key them and to
+    send them to worker processes.
+
+    If the scaffold of a sample cannot be found, the sample itself is used as
+    its scaffold (its hexadecimal serialisation, for molecule objects), and a
+    single warning is logged for all such samples.
+
+    Args:
+        samples: The molecules, as SMILES, bytes or molecule objects.
+        scaffold: A picklable function returning the scaffold of a SMILES or
+            serialised molecule, or `None` if no scaffold can be found.
+        serialise: A function serialising molecule objects to bytes.
+        options: The (hashable) options the scaffolds are computed with.
+        n_jobs: The number of worker processes. Negative values are counted
+            back from the number of available CPUs.
+        scaffold_index: The index memoising scaffolds. Defaults to the index
+            shared by all scaffold splits.
+
+    Returns:
+        The scaffold of each sample.
+    """
+    if scaffold_index is None:
+        scaffold_index = default_scaffold_index()
+
+    payloads = [
+        sample if isinstance(sample, str | bytes) else serialise(sample)
+        for sample in samples
+    ]
+    option_digest = repr(options).encode("utf-8")
+    keys = [_content_key(payload, option_digest) for payload in payloads]
+    scaffolds = scaffold_index.lookup(keys)
+
+    # compute the scaffold of each distinct missing sample once
+    missing = {
+        key: payload
+        for key, payload, found in zip(keys, payloads, scaffolds, strict=True)
+        if found is None
+    }
+    if missing:
+        missing_keys = list(missing)
+        missing_payloads = list(missing.values())
+        computed = _map_scaffolds(scaffold, missing_payloads, n_jobs=n_jobs)
+
+        failures = [
+            payload
+            for payload, result in zip(missing_payloads, computed, strict=True)
+            if result is None
+        ]
+        if failures:
+            quoted = ", ".join(
+                _describe(payload) for payload in failures[:_MAX_QUOTED_FAILURES]
+            )
+            logger.warning(
+                f"Could not find scaffold for {len(failures)} molecule(s) (e.g. {quoted}). Will use the molecules themselves as scaffolds.",
+            )
+
+        new_scaffolds = [
+            result if result is not None else _describe(payload)
+            for payload, result in zip(missing_payloads, computed, strict=True)
+        ]
+        scaffold_index.update(missing_keys, new_scaffolds)
+        computed_scaffolds = dict(zip(missing_keys, new_scaffolds, strict=True))
+        scaffolds = [
+            found if found is not None else computed_scaffolds[key]
+            for key, found in zip(keys, scaffolds, strict=True)
+        ]
+
+    return scaffolds  # type: ignore[return-value]
+
+
+def bucket_scaffolds(scaffolds: Sequence[str]) -> list[list[int]]:
+    """Groups the indices of samples by scaffold, from the largest to the smallest group.
+
+    Groups of the same size are ordered by decreasing index of their first sample.
+
+    Examples:
+        >>> bucket_scaffolds(["a", "b", "a", "c"])
+        [[0, 2], [3], [1]]
+    """
+    groups: dict[str, list[int]] = {}
+    for index, scaffold in enumerate(scaffolds):
+        groups.setdefault(scaffold, []).append(index)
+
+    return sorted(
+        groups.values(),
+        key=lambda group: (len(group), group[0]),
+        reverse=True,
+    )
+
+
+def _content_key(payload: str | bytes, option_digest: bytes) -> bytes:
+    # strings and bytes of the same content are different samples
+    if isinstance(payload, str):
+        content = b"s" + payload.encode("utf-8")
+    else:
+        content = b"b" + payload
+    digest = hashlib.sha1(option_digest, usedforsecurity=False)
+    digest.update(content)
+    return digest.digest()
+
+
+def _describe(payload: str | bytes) -> str:
+    return payload if isinstance(payload, str) else payload.hex()
+
+
+def _map_scaffolds(
+    scaffold: Callable[[str | bytes], str | None],
+    payloads: list[str | bytes],
+    n_jobs: int,
+) -> list[str | None]:
+    n_workers = min(resolve_n_jobs(n_jobs), -(-len(payloads) // _CHUNK_SIZE))
+    if n_workers <= 1:
+        return [scaffold(payload) for payload in payloads]
+
+    chunks = [
+        payloads[start : start + _CHUNK_SIZE]
+        for start in range(0, len(payloads), _CHUNK_SIZE)
+    ]
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = executor.map(functools.partial(_scaffold_chunk, scaffold), chunks)
+        return [result for chunk_results in results for result in chunk_results]
+
+
+def _scaffold_chunk(
+    scaffold: Callable[[str | bytes], str | None],
+    payloads: list[str | bytes],
+) -> list[str | None]:
+    return [scaffold(payload) for payload in payloads]
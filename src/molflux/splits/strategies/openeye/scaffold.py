@@ -1,3 +1,4 @@
+import functools
 import logging
 from collections.abc import Iterator
 from typing import Any
@@ -5,8 +6,10 @@ from typing import Any
 import numpy as np
 from openeye import oechem, oemedchem
 
+from molflux.features.representations.openeye._utils import to_oemol
 from molflux.splits.bases import SplittingStrategyBase
 from molflux.splits.info import SplittingStrategyInfo
+from molflux.splits.scaffolds import ScaffoldIndex, bucket_scaffolds, compute_scaffolds
 from molflux.splits.typing import ArrayLike, SplitIndices, Splittable
 from molflux.splits.utils import partition
 
@@ -22,6 +25,10 @@ the number of molecules in each group in decreasing order.
 
 IMPORTANT NOTE: If no core can be extracted, a warning will be raised and the SMILES itself is used as a scaffold.
 
+Scaffolds can be computed over several worker processes (`n_jobs`), and are memoised by
+the content of molecules, such that repeated scaffold splits of the same molecules (e.g. for
+each seed of a repeated cross-validation) only need to group them by scaffold.
+
 References:
     .. [1] Bemis, Guy W., and Mark A. Murcko. "The properties of known drugs.
     1. Molecular frameworks." Journal of medicinal chemistry 39.15 (1996): 2887-2893.
@@ -45,6 +52,8 @@ class Scaffold(SplittingStrategyBase):
         adjust_h_count: bool = True,
         r_group: bool = False,
         include_unsaturated_heterobonds: bool = True,
+        n_jobs: int = 1,
+        scaffold_index: ScaffoldIndex | None = None,
         **kwargs: Any,
     ) -> Iterator[SplitIndices]:
         """
@@ -56,6 +65,10 @@ class Scaffold(SplittingStrategyBase):
             adjust_h_count: Adjust hydrogen count of the framework.
             r_group: Add R-groups as replacement for bonds broken during fragmentation.
             include_unsaturated_heterobonds: Include unsaturated heterobonds in frameworks (eg exocyclic carbonyls).
+            n_jobs: The number of worker processes computing scaffolds. Defaults to 1.
+            scaffold_index (optional): The index memoising the scaffolds of
+                molecules across splits. Defaults to the index shared by all
+                scaffold splits.
 
         Examples:
             >>> from molflux.splits import load_splitting_strategy
@@ -82,6 +95,8 @@ class Scaffold(SplittingStrategyBase):
             adjust_h_count=adjust_h_count,
             r_group=r_group,
             include_unsaturated_heterobonds=include_unsaturated_heterobonds,
+            n_jobs=n_jobs,
+            scaffold_index=scaffold_index,
         )
 
         train_indices: list[int] = []
@@ -104,13 +119,15 @@ class Scaffold(SplittingStrategyBase):
 
 
 def _generate_scaffold(
-    smiles: str,
+    molecule: str | bytes,
     adjust_h_count: bool = True,
     r_group: bool = False,
     include_unsaturated_heterobonds: bool = True,
-) -> str:
-    mol = oechem.OEGraphMol()
-    oechem.OESmilesToMol(mol, smiles)
+) -> str | None:
+    try:
+        mol = to_oemol(molecule)
+    except Exception:
+        return None
 
     options = oemedchem.OEBemisMurckoOptions()
 
@@ -132,10 +149,7 @@ def _generate_scaffold(
         scaffold_smiles: str = oechem.OEMolToSmiles(framework)
         return scaffold_smiles
     else:
-        logger.warning(
-            f"Could not find scaffold for molecule {smiles}. Will use the smiles itself as a scaffold.",
-        )
-        return smiles
+        return None
 
 
 def generate_scaffolds(
@@ -143,35 +157,43 @@ def generate_scaffolds(
     adjust_h_count: bool = True,
     r_group: bool = False,
     include_unsaturated_heterobonds: bool = True,
+    n_jobs: int = 1,
+    scaffold_index: ScaffoldIndex | None = None,
 ) -> list[list[int]]:
-    """Returns all scaffolds from the SMILES string provided.
+    """Returns all scaffolds from the molecules provided.
+
+    Args:
+        y: The molecules, as SMILES, oeb bytes or ``OEMol`` objects.
+        adjust_h_count: Adjust hydrogen count of the framework.
+        r_group: Add R-groups as replacement for bonds broken during fragmentation.
+        include_unsaturated_heterobonds: Include unsaturated heterobonds in frameworks.
+        n_jobs: The number of worker processes computing scaffolds.
+        scaffold_index (optional): The index memoising scaffolds across calls.
+            Defaults to the index shared by all scaffold splits.
 
     Returns:
         List of indices of each scaffold in y.
     """
-
-    scaffolds = {}
-    for ind, smiles in enumerate(y):
-        scaffold = _generate_scaffold(
-            smiles=smiles,
+    scaffolds = compute_scaffolds(
+        y,
+        scaffold=functools.partial(
+            _generate_scaffold,
             adjust_h_count=adjust_h_count,
             r_group=r_group,
             include_unsaturated_heterobonds=include_unsaturated_heterobonds,
+        ),
+        serialise=_serialise,
+        options=("openeye", adjust_h_count, r_group, include_unsaturated_heterobonds),
+        n_jobs=n_jobs,
+        scaffold_index=scaffold_index,
+    )
+    return bucket_scaffolds(scaffolds)
+
+
+def _serialise(mol: oechem.OEMolBase) -> bytes:
+    if not isinstance(mol, oechem.OEMolBase):
+        raise TypeError(
+            "Scaffold splitting strategy expects a collection of SMILES, oeb bytes or OEMol as input.",
         )
-
-        if scaffold not in scaffolds:
-            scaffolds[scaffold] = [ind]
-        else:
-            scaffolds[scaffold].append(ind)
-
-    # Sort from largest to smallest scaffold sets
-    scaffolds = {key: sorted(value) for key, value in scaffolds.items()}
-    scaffold_sets = [
-        scaffold_set
-        for (scaffold, scaffold_set) in sorted(
-            scaffolds.items(),
-            key=lambda x: (len(x[1]), x[1][0]),
-            reverse=True,
-        )
-    ]
-    return scaffold_sets
+    mol_bytes: bytes = oechem.OEWriteMolToBytes(".oeb", mol)
+    return mol_bytes
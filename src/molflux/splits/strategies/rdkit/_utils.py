@@ -0,0 +1,19 @@
+import numpy as np
+from numpy.typing import NDArray
+from rdkit import DataStructs
+
+
+def pack_bit_vectors(fps: list) -> NDArray[np.uint64]:
+    """Packs rdkit bit vectors into a (n_samples, n_words) matrix of 64-bit words."""
+    if not fps:
+        return np.empty((0, 0), dtype=np.uint64)
+
+    n_bytes = -(-fps[0].GetNumBits() // 8)
+    hex_bytes = "".join(DataStructs.BitVectToFPSText(fp) for fp in fps)
+    packed = np.frombuffer(bytes.fromhex(hex_bytes), dtype=np.uint8)
+
+    # bits are packed in little-endian order, into zero-padded words
+    n_words = -(-n_bytes // 8)
+    words = np.zeros((len(fps), n_words * 8), dtype=np.uint8)
+    words[:, :n_bytes] = packed.reshape(len(fps), n_bytes)
+    return words.view("<u8").astype(np.uint64)
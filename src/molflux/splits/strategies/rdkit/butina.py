@@ -0,0 +1,232 @@
+"""Taylor-Butina (and sphere exclusion) clustering splitting strategy.
+
+References:
+    .. [1] Butina, Darko. "Unsupervised data base clustering based on Daylight's
+    fingerprint and Tanimoto similarity: A fast and automated way to cluster
+    small and large data sets." Journal of Chemical Information and Computer
+    Sciences 39.4 (1999): 747-750.
+"""
+
+import logging
+from collections.abc import Iterator
+from typing import Any, Literal
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.sparse import csr_matrix
+
+try:
+    from rdkit import Chem
+    from rdkit.Chem import rdFingerprintGenerator
+
+    from molflux.splits.strategies.rdkit._utils import pack_bit_vectors
+except ImportError as e:
+    from molflux.splits.errors import ExtrasDependencyImportError
+
+    raise ExtrasDependencyImportError("rdkit", e) from e
+
+from molflux.features.similarity import tanimoto_neighbours
+from molflux.splits.bases import SplittingStrategyBase
+from molflux.splits.info import SplittingStrategyInfo
+from molflux.splits.load import load_splitting_strategy
+from molflux.splits.typing import ArrayLike, SplitIndices, Splittable
+
+logger = logging.getLogger(__name__)
+
+ClusteringMethod = Literal["butina", "sphere_exclusion"]
+GroupSplittingStrategy = Literal["group_shuffle_split", "group_k_fold"]
+
+_DESCRIPTION = """
+Class for doing data splits based on Taylor-Butina clusters of Morgan fingerprints.
+
+Molecules are clustered by the Tanimoto similarity of their Morgan
+fingerprints: molecules of similarity at least `threshold` are neighbours,
+and the molecule with the most unassigned neighbours is repeatedly chosen as
+the centroid of a new cluster, made of itself and its unassigned neighbours.
+With `method="sphere_exclusion"`, centroids are chosen in the order of the
+dataset instead. The clusters are then used as the groups of a group-based
+splitting strategy (`group_shuffle_split` or `group_k_fold`), such that
+whole clusters are assigned to each split.
+
+Only the pairs of neighbours are kept in memory, as a sparse graph built
+by comparing blocks of molecules at a time (over `n_threads` threads), so
+memory usage is proportional to the number of neighbours rather than to the
+square of the number of samples. The running time still scales as O(n^2).
+
+Note:
+    This strategy requires rdkit to be installed.
+"""
+
+
+class Butina(SplittingStrategyBase):
+    def _info(self) -> SplittingStrategyInfo:
+        return SplittingStrategyInfo(
+            description=_DESCRIPTION,
+        )
+
+    def _split(
+        self,
+        dataset: Splittable,
+        y: ArrayLike | None = None,
+        groups: ArrayLike | None = None,
+        n_splits: int | None = None,
+        train_fraction: float = 0.8,
+        validation_fraction: float = 0.1,
+        test_fraction: float = 0.1,
+        seed: int | None = None,
+        threshold: float = 0.65,
+        method: ClusteringMethod = "butina",
+        group_strategy: GroupSplittingStrategy = "group_shuffle_split",
+        radius: int = 2,
+        n_bits: int = 2048,
+        n_threads: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[SplitIndices]:
+        """Splits clusters of molecules of similar Morgan fingerprints.
+
+        Args:
+            dataset: The data to be split.
+            y: List of smiles to be used for clustering.
+            groups (optional): Group labels for the samples used while splitting the dataset.
+            n_splits (optional): The number of splits to generate. Defaults to
+                the default of the group-based splitting strategy.
+            train_fraction: The proportion of clusters to include in the train
+                split, with `group_shuffle_split`.
+            validation_fraction: The proportion of clusters to include in the
+                validation split, with `group_shuffle_split`.
+            test_fraction: The proportion of clusters to include in the test
+                split, with `group_shuffle_split`.
+            seed (optional): Controls the shuffling of clusters, with
+                `group_shuffle_split`. Defaults to None.
+            threshold: The Tanimoto similarity above which molecules are
+                neighbours. Defaults to `0.65` (a distance of `0.35`).
+            method: The clustering method, `"butina"` or `"sphere_exclusion"`.
+                Defaults to `"butina"`.
+            group_strategy: The group-based splitting strategy splitting the
+                clusters, `"group_shuffle_split"` or `"group_k_fold"`. Defaults
+                to `"group_shuffle_split"`.
+            radius: The radius of the Morgan fingerprints. Defaults to `2`.
+            n_bits: The size of the Morgan fingerprints. Defaults to `2048`.
+            n_threads: The number of threads used to fingerprint molecules and
+                to find their neighbours. Defaults to `1`.
+
+        Yields:
+            A tuple of train, validation, and test indices.
+
+        Examples:
+            >>> from molflux.splits import load_splitting_strategy
+            >>> strategy = load_splitting_strategy('butina_rdkit')
+            >>> dataset = ['CCCC', 'CC', 'c1ccncc1']
+            >>> folds = strategy.split(dataset=dataset, y=dataset)
+        """
+        if y is None:
+            raise ValueError("""y parameter should be provided for butina splits.""")
+
+        if group_strategy not in ("group_shuffle_split", "group_k_fold"):
+            raise ValueError(
+                f"Unknown group splitting strategy {group_strategy!r}: expected 'group_shuffle_split' or 'group_k_fold'",
+            )
+
+        fingerprints = _morgan_fingerprints(
+            y,
+            radius=radius,
+            n_bits=n_bits,
+            n_threads=n_threads,
+        )
+        neighbours = tanimoto_neighbours(
+            pack_bit_vectors(fingerprints),
+            threshold=threshold,
+            n_threads=n_threads,
+        )
+        clusters = cluster_neighbours(neighbours, method=method)
+
+        group_kwargs: dict[str, Any] = {}
+        if n_splits is not None:
+            group_kwargs["n_splits"] = n_splits
+        if group_strategy == "group_shuffle_split":
+            group_kwargs.update(
+                train_fraction=train_fraction,
+                validation_fraction=validation_fraction,
+                test_fraction=test_fraction,
+                seed=seed,
+            )
+
+        strategy = load_splitting_strategy(group_strategy)
+        yield from strategy.split(dataset, y=None, groups=clusters, **group_kwargs)
+
+
+def cluster_neighbours(
+    neighbours: csr_matrix,
+    method: ClusteringMethod = "butina",
+) -> NDArray[np.int64]:
+    """Clusters samples from the sparse graph of their neighbours.
+
+    Each centroid forms a cluster with all its neighbours not yet assigned to
+    a cluster. Centroids are chosen among unassigned samples, in decreasing
+    order of their (initial) number of neighbours for Taylor-Butina
+    clustering, with ties broken in favour of the highest indices as in
+    rdkit's `Butina.ClusterData`, or in order of index for sphere exclusion.
+
+    Args:
+        neighbours: The symmetric (n_samples, n_samples) sparse matrix of
+            neighbours, e.g. from `molflux.features.similarity.tanimoto_neighbours`.
+        method: The clustering method, `"butina"` or `"sphere_exclusion"`.
+
+    Returns:
+        The cluster label of each sample, numbered in order of creation.
+
+    Examples:
+        >>> from scipy.sparse import csr_matrix
+        >>> neighbours = csr_matrix([[0, 1, 0, 0], [1, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 0]])
+        >>> cluster_neighbours(neighbours).tolist()
+        [0, 0, 0, 1]
+        >>> cluster_neighbours(neighbours, method="sphere_exclusion").tolist()
+        [0, 0, 1, 2]
+    """
+    neighbours = csr_matrix(neighbours)
+    n_samples = neighbours.shape[0]
+    indptr, indices = neighbours.indptr, neighbours.indices
+
+    if method == "butina":
+        centroids = np.lexsort((-np.arange(n_samples), -np.diff(indptr)))
+    elif method == "sphere_exclusion":
+        centroids = np.arange(n_samples)
+    else:
+        raise ValueError(
+            f"Unknown clustering method {method!r}: expected 'butina' or 'sphere_exclusion'",
+        )
+
+    labels = np.full(n_samples, -1, dtype=np.int64)
+    n_clusters = 0
+    for centroid in centroids.tolist():
+        if labels[centroid] >= 0:
+            continue
+
+        members = indices[indptr[centroid] : indptr[centroid + 1]]
+        labels[members[labels[members] < 0]] = n_clusters
+        labels[centroid] = n_clusters
+        n_clusters += 1
+
+    return labels
+
+
+def _morgan_fingerprints(
+    y: ArrayLike,
+    radius: int,
+    n_bits: int,
+    n_threads: int,
+) -> list:
+    smiles_list = list(y)
+    try:
+        mols = [Chem.MolFromSmiles(smiles) for smiles in smiles_list]
+    except TypeError as e:
+        raise TypeError(
+            "Butina splitting strategy expects a collection of SMILES as input.",
+        ) from e
+
+    for smiles, mol in zip(smiles_list, mols, strict=True):
+        if mol is None:
+            raise ValueError(f"Could not parse SMILES {smiles!r}")
+
+    generator = rdFingerprintGenerator.GetMorganGenerator(radius=radius, fpSize=n_bits)
+    return list(generator.GetFingerprints(mols, numThreads=n_threads))
@@ -0,0 +1,200 @@
+"""Approximate similarity clustering splitting strategy, by MinHash locality-sensitive hashing."""
+
+import logging
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    from rdkit import Chem
+    from rdkit.Chem import rdFingerprintGenerator
+except ImportError as e:
+    from molflux.splits.errors import ExtrasDependencyImportError
+
+    raise ExtrasDependencyImportError("rdkit", e) from e
+
+from molflux.features.minhash import MinHasher, lsh_clusters
+from molflux.splits.bases import SplittingStrategyBase
+from molflux.splits.info import SplittingStrategyInfo
+from molflux.splits.typing import ArrayLike, SplitIndices, Splittable
+from molflux.splits.utils import partition
+
+logger = logging.getLogger(__name__)
+
+# The number of molecules fingerprinted and hashed at once
+_BATCH_SIZE = 10_000
+
+_DESCRIPTION = """
+Class for doing data splits based on clusters of similar molecules, found by MinHash locality-sensitive hashing.
+
+Molecules are represented by the sets of substructures of their (unfolded)
+Morgan fingerprints, and summarised by MinHash signatures. Molecules whose
+signatures collide over any band of the signatures are compared, and merged
+into the same cluster if their estimated Tanimoto similarity is at least
+`threshold`. Whole clusters are then assigned to the train, validation and
+test splits, from the largest to the smallest one, such that similar
+molecules never end up in different splits.
+
+Unlike `tanimoto_rdkit`, clusters are approximate, but the running time of
+this splitter scales as O(n log n) in the number of samples, which makes it
+suitable for splitting libraries of millions of molecules. Memory usage is
+dominated by the signatures, of `4 * n_permutations` bytes per molecule.
+
+Note:
+    This strategy requires rdkit to be installed.
+"""
+
+
+class MinHashLSH(SplittingStrategyBase):
+    def _info(self) -> SplittingStrategyInfo:
+        return SplittingStrategyInfo(
+            description=_DESCRIPTION,
+        )
+
+    def _split(
+        self,
+        dataset: Splittable,
+        y: ArrayLike | None = None,
+        groups: ArrayLike | None = None,
+        train_fraction: float = 0.8,
+        validation_fraction: float = 0.1,
+        test_fraction: float = 0.1,
+        threshold: float = 0.7,
+        n_permutations: int = 128,
+        n_bands: int | None = None,
+        radius: int = 2,
+        include_chirality: bool = False,
+        seed: int = 42,
+        n_threads: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[SplitIndices]:
+        """Splits clusters of molecules of similar Morgan fingerprints.
+
+        Args:
+            dataset: The data to be split.
+            y: List of smiles to be used for the split.
+            groups (optional): Group labels for the samples used while splitting the dataset.
+            train_fraction: The proportion of the dataset to include in the train split.
+            validation_fraction: The proportion of the dataset to include in the validation split.
+            test_fraction: The proportion of the dataset to include in the test split.
+            threshold: The Tanimoto similarity above which molecules are
+                clustered together. Defaults to `0.7`.
+            n_permutations: The number of values of the MinHash signatures.
+                More permutations give more accurate clusters, at the cost of
+                memory. Defaults to `128`.
+            n_bands: The number of bands that signatures are divided into for
+                locality-sensitive hashing. By default, the number of bands
+                best suited to `threshold`.
+            radius: The radius of the Morgan fingerprints. Defaults to `2`.
+            include_chirality: Whether to include chirality in the Morgan
+                fingerprints. Defaults to `False`.
+            seed: The seed of the MinHash permutations. Defaults to `42`.
+            n_threads: The number of threads used by rdkit to fingerprint
+                molecules in bulk. Defaults to `1`.
+
+        Yields:
+            A tuple of train, validation, and test indices.
+
+        Examples:
+            >>> from molflux.splits import load_splitting_strategy
+            >>> strategy = load_splitting_strategy('minhash_lsh_rdkit')
+            >>> dataset = ['CCCC', 'CC', 'c1ccncc1']
+            >>> folds = strategy.split(dataset=dataset, y=dataset)
+        """
+        if y is None:
+            raise ValueError(
+                """y parameter should be provided for minhash_lsh splits.""",
+            )
+
+        np.testing.assert_almost_equal(
+            train_fraction + validation_fraction + test_fraction,
+            1.0,
+        )
+
+        train_cutoff, validation_cutoff = partition(
+            dataset,
+            train_fraction,
+            validation_fraction,
+        )
+
+        signatures = _morgan_signatures(
+            y,
+            radius=radius,
+            include_chirality=include_chirality,
+            n_permutations=n_permutations,
+            seed=seed,
+            n_threads=n_threads,
+        )
+        labels = lsh_clusters(signatures, threshold=threshold, n_bands=n_bands)
+
+        # Assign whole clusters, from the largest to the smallest one.
+
+        cluster_sizes = np.bincount(labels)
+        cluster_splits = np.empty(len(cluster_sizes), dtype=np.int8)
+        n_train = n_validation = 0
+        for cluster in np.argsort(-cluster_sizes, kind="stable").tolist():
+            size = int(cluster_sizes[cluster])
+            if n_train + size > train_cutoff:
+                if n_train + n_validation + size > validation_cutoff:
+                    cluster_splits[cluster] = 2
+                else:
+                    cluster_splits[cluster] = 1
+                    n_validation += size
+            else:
+                cluster_splits[cluster] = 0
+                n_train += size
+
+        splits = cluster_splits[labels]
+        train_indices = np.flatnonzero(splits == 0).tolist()
+        validation_indices = np.flatnonzero(splits == 1).tolist()
+        test_indices = np.flatnonzero(splits == 2).tolist()
+
+        yield train_indices, validation_indices, test_indices
+
+
+def _morgan_signatures(
+    y: ArrayLike,
+    radius: int,
+    include_chirality: bool,
+    n_permutations: int,
+    seed: int,
+    n_threads: int,
+) -> NDArray[np.uint32]:
+    """Computes the MinHash signatures of the Morgan substructures of molecules."""
+    generator = rdFingerprintGenerator.GetMorganGenerator(
+        radius=radius,
+        includeChirality=include_chirality,
+    )
+    minhasher = MinHasher(n_permutations=n_permutations, seed=seed)
+
+    smiles = list(y)
+    signatures = np.empty((len(smiles), n_permutations), dtype=np.uint32)
+    for start in range(0, len(smiles), _BATCH_SIZE):
+        batch = smiles[start : start + _BATCH_SIZE]
+        try:
+            mols = [Chem.MolFromSmiles(sample) for sample in batch]
+        except TypeError as e:
+            raise TypeError(
+                "MinHash LSH splitting strategy expects a collection of SMILES as input.",
+            ) from e
+
+        for sample, mol in zip(batch, mols, strict=True):
+            if mol is None:
+                raise ValueError(f"Could not parse SMILES {sample!r}")
+
+        fingerprints = generator.GetSparseCountFingerprints(mols, numThreads=n_threads)
+        elements = [
+            list(fingerprint.GetNonzeroElements()) for fingerprint in fingerprints
+        ]
+        indptr = np.zeros(len(elements) + 1, dtype=np.int64)
+        np.cumsum([len(element) for element in elements], out=indptr[1:])
+        hashes = np.fromiter(
+            (element for substructures in elements for element in substructures),
+            dtype=np.uint32,
+            count=indptr[-1],
+        )
+        signatures[start : start + len(batch)] = minhasher.from_hashes(indptr, hashes)
+
+    return signatures
@@ -1,3 +1,4 @@
+import functools
 import logging
 from collections.abc import Iterator
 from typing import Any
@@ -6,6 +7,8 @@ try:
     import numpy as np
     from rdkit import Chem
     from rdkit.Chem.Scaffolds.MurckoScaffold import MurckoScaffoldSmiles
+
+    from molflux.features.representations.rdkit._utils import to_rdkit_mol
 except ImportError as e:
     from molflux.splits.errors import ExtrasDependencyImportError
 
@@ -13,6 +16,7 @@ except ImportError as e:
 
 from molflux.splits.bases import SplittingStrategyBase
 from molflux.splits.info import SplittingStrategyInfo
+from molflux.splits.scaffolds import ScaffoldIndex, bucket_scaffolds, compute_scaffolds
 from molflux.splits.typing import ArrayLike, SplitIndices, Splittable
 from molflux.splits.utils import partition
 
@@ -28,6 +32,10 @@ the number of molecules in each group in decreasing order.
 
 IMPORTANT NOTE: If no core can be extracted, a warning will be raised and the SMILES itself is used as a scaffold.
 
+Scaffolds can be computed over several worker processes (`n_jobs`), and are memoised by
+the content of molecules, such that repeated scaffold splits of the same molecules (e.g. for
+each seed of a repeated cross-validation) only need to group them by scaffold.
+
 References:
     .. [1] Bemis, Guy W., and Mark A. Murcko. "The properties of known drugs.
     1. Molecular frameworks." Journal of medicinal chemistry 39.15 (1996): 2887-2893.
@@ -49,6 +57,8 @@ class Scaffold(SplittingStrategyBase):
         validation_fraction: float = 0.1,
         test_fraction: float = 0.1,
         include_chirality: bool = False,
+        n_jobs: int = 1,
+        scaffold_index: ScaffoldIndex | None = None,
         **kwargs: Any,
     ) -> Iterator[SplitIndices]:
         """
@@ -60,6 +70,10 @@ class Scaffold(SplittingStrategyBase):
             test_fraction: The proportion of the dataset to include in the test split.
             include_chirality (optional): Whether to include chirality in scaffolds or not.
                 Defaults to False.
+            n_jobs: The number of worker processes computing scaffolds. Defaults to 1.
+            scaffold_index (optional): The index memoising the scaffolds of
+                molecules across splits. Defaults to the index shared by all
+                scaffold splits.
 
         Examples:
             >>> from molflux.splits import load_splitting_strategy
@@ -81,7 +95,12 @@ class Scaffold(SplittingStrategyBase):
             validation_fraction,
         )
 
-        scaffold_sets = generate_scaffolds(y=y, include_chirality=include_chirality)
+        scaffold_sets = generate_scaffolds(
+            y=y,
+            include_chirality=include_chirality,
+            n_jobs=n_jobs,
+            scaffold_index=scaffold_index,
+        )
 
         train_indices: list[int] = []
         validation_indices: list[int] = []
@@ -102,19 +121,19 @@ class Scaffold(SplittingStrategyBase):
         yield train_indices, validation_indices, test_indices
 
 
-def _generate_scaffold(smiles: str, include_chirality: bool) -> str:
-    """Compute the Bemis-Murcko scaffold for a SMILES string.
+def _generate_scaffold(molecule: str | bytes, include_chirality: bool) -> str | None:
+    """Compute the Bemis-Murcko scaffold of a molecule.
 
     Bemis-Murcko scaffolds are described in DOI: 10.1021/jm9602928.
     They are essentially that part of the molecule consisting of
     rings and the linker atoms between them.
 
     Args:
-        smiles: The SMILES string.
+        molecule: The SMILES string, or binary mol bytes, of the molecule.
         include_chirality: Whether to include chirality in scaffolds or not.
 
     Returns:
-        The MurckScaffold SMILES from the original SMILES
+        The MurckScaffold SMILES of the molecule, or None if it could not be computed.
 
     References:
         .. [1] Bemis, Guy W., and Mark A. Murcko. "The properties of known drugs.
@@ -122,46 +141,53 @@ def _generate_scaffold(smiles: str, include_chirality: bool) -> str:
     """
 
     try:
-        mol = Chem.MolFromSmiles(smiles)
+        mol = to_rdkit_mol(molecule)
         scaffold: str = MurckoScaffoldSmiles(
             mol=mol,
             includeChirality=include_chirality,
         )
         return scaffold
     except Exception:
-        logger.warning(
-            f"Could not find scaffold for molecule {smiles}. Will use the smiles itself as a scaffold.",
-        )
-        return smiles
+        return None
 
 
-def generate_scaffolds(y: ArrayLike, include_chirality: bool) -> list[list[int]]:
-    """Returns all scaffolds from the SMILES string provided.
+def generate_scaffolds(
+    y: ArrayLike,
+    include_chirality: bool,
+    n_jobs: int = 1,
+    scaffold_index: ScaffoldIndex | None = None,
+) -> list[list[int]]:
+    """Returns all scaffolds from the molecules provided.
+
+    Args:
+        y: The molecules, as SMILES, binary mol bytes or ``Chem.Mol`` objects.
+        include_chirality: Whether to include chirality in scaffolds or not.
+        n_jobs: The number of worker processes computing scaffolds.
+        scaffold_index (optional): The index memoising scaffolds across calls.
+            Defaults to the index shared by all scaffold splits.
 
     Returns:
         List of indices of each scaffold in y.
     """
-
-    scaffolds = {}
-    for ind, smiles in enumerate(y):
-        scaffold = _generate_scaffold(
-            smiles=smiles,
+    scaffolds = compute_scaffolds(
+        y,
+        scaffold=functools.partial(
+            _generate_scaffold,
             include_chirality=include_chirality,
-        )
+        ),
+        serialise=_serialise,
+        options=("rdkit", include_chirality),
+        n_jobs=n_jobs,
+        scaffold_index=scaffold_index,
+    )
+    return bucket_scaffolds(scaffolds)
 
-        if scaffold not in scaffolds:
-            scaffolds[scaffold] = [ind]
-        else:
-            scaffolds[scaffold].append(ind)
-
-    # Sort from largest to smallest scaffold sets
-    scaffolds = {key: sorted(value) for key, value in scaffolds.items()}
-    scaffold_sets = [
-        scaffold_set
-        for (scaffold, scaffold_set) in sorted(
-            scaffolds.items(),
-            key=lambda x: (len(x[1]), x[1][0]),
-            reverse=True,
-        )
-    ]
-    return scaffold_sets
+
+def _serialise(mol: Chem.Mol) -> bytes:
+    try:
+        mol_bytes: bytes = mol.ToBinary()
+        return mol_bytes
+    except AttributeError as e:
+        raise TypeError(
+            "Scaffold splitting strategy expects a collection of SMILES, mol bytes or Chem.Mol as input.",
+        ) from e
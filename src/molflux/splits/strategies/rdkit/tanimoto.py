@@ -4,26 +4,34 @@ References:
     https://github.com/deepchem/deepchem/blob/master/deepchem/splits/splitters.py#L1193
 """
 
+import heapq
 import logging
 from collections.abc import Iterator
 from typing import Any
 
 import numpy as np
+from numpy.typing import NDArray
 
 try:
-    from rdkit import Chem, DataStructs
+    from rdkit import Chem
     from rdkit.Chem import AllChem
+
+    from molflux.splits.strategies.rdkit._utils import pack_bit_vectors
 except ImportError as e:
     from molflux.splits.errors import ExtrasDependencyImportError
 
     raise ExtrasDependencyImportError("rdkit", e) from e
 
+from molflux.features.similarity import bulk_tanimoto_similarity, popcount
 from molflux.splits.bases import SplittingStrategyBase
 from molflux.splits.info import SplittingStrategyInfo
 from molflux.splits.typing import ArrayLike, SplitIndices, Splittable
 
 logger = logging.getLogger(__name__)
 
+# The number of group members that bounds are brought up to date against at once
+_REFRESH_SIZE = 4096
+
 _DESCRIPTION = """
 Class for doing data splits based on the Tanimoto similarity between ECFP4 fingerprints.
 
@@ -32,8 +40,11 @@ as different as possible from the ones in the other datasets.  This makes it a
 very stringent test of models.  Predicting the test and validation sets may
 require extrapolating far outside the training data.
 
-The running time for this splitter scales as O(n^2) in the number of samples.
-Splitting large datasets can take a long time.
+Fingerprints are packed into 64-bit words, and the similarity of each
+molecule to each dataset is only brought up to date when it may be the least
+similar one. The running time for this splitter still scales as O(n^2) in
+the number of samples in the worst case. Splitting large datasets can take a
+long time.
 
 Note:
     This strategy requires rdkit to be installed.
@@ -59,8 +70,8 @@ class Tanimoto(SplittingStrategyBase):
     ) -> Iterator[SplitIndices]:
         """Splits compounds according to the Tanimoto similarity of their ECFP4 fingerprints.
 
-        This splitting algorithm has an O(N^2) run time, where N is the number
-        of molfluxs in the dataset.
+        This splitting algorithm has an O(N^2) worst-case run time, where N is
+        the number of molecules in the dataset.
 
         Args:
             dataset: The data to be split.
@@ -145,44 +156,114 @@ def _split_fingerprints(
             f"Incompatible fingerprint splitting sizes for dataset of length {len(fps)}.",
         )
 
-    # Begin by assigning the first molecule to the first group.
+    if not fps:
+        return [], []
 
-    fp_in_group = [[fps[0]], []]
-    indices_in_group: tuple[list[int], list[int]] = ([0], [])
-    remaining_fp = fps[1:]
-    remaining_indices = list(range(1, len(fps)))
-    max_similarity_to_group = [
-        DataStructs.BulkTanimotoSimilarity(fps[0], remaining_fp),
-        [0] * len(remaining_fp),
-    ]
-    while len(remaining_fp) > 0:
-        # Decide which group to assign a molecule to.
+    return _split_packed_fingerprints(pack_bit_vectors(fps), size1, size2)
 
-        group = 0 if len(fp_in_group[0]) / size1 <= len(fp_in_group[1]) / size2 else 1
 
-        # Identify the unassigned molecule that is least similar to everything in
-        # the other group.
+def _split_packed_fingerprints(
+    words: NDArray[np.uint64],
+    size1: int,
+    size2: int,
+) -> tuple[list[int], list[int]]:
+    """Divides fingerprints packed into 64-bit words into two groups.
+
+    Molecules are assigned one at a time to the group furthest below its
+    target size, picking the unassigned molecule least similar to everything
+    in the other group (the first one, on ties).
+
+    The maximum similarity of a molecule to a group only grows as the group
+    grows, so it is tracked lazily: each molecule has a lower bound of its
+    maximum similarity to each group, accounting for the first members of the
+    group only, in a heap per group. Bounds at the top of a heap are brought
+    up to date against more members until the top of the heap is up to date,
+    at which point it is the least similar molecule to the group.
+    """
+
+    n = len(words)
+    sizes = (size1, size2)
+    popcounts = popcount(words)
+    assigned = np.zeros(n, dtype=bool)
+
+    # the members of each group, and their fingerprints, in order of assignment
+    members = (np.empty(n, dtype=np.intp), np.empty(n, dtype=np.intp))
+    member_words = (np.empty_like(words), np.empty_like(words))
+    member_popcounts = (np.empty_like(popcounts), np.empty_like(popcounts))
+    n_members = [0, 0]
+
+    # lower bounds of the maximum similarity of molecules to each group, and
+    # the number of members of the group that each bound accounts for
+    max_similarity_to_group = (np.zeros(n), np.zeros(n))
+    n_members_seen = (np.zeros(n, dtype=np.intp), np.zeros(n, dtype=np.intp))
+
+    def assign(i: int, group: int) -> None:
+        members[group][n_members[group]] = i
+        member_words[group][n_members[group]] = words[i]
+        member_popcounts[group][n_members[group]] = popcounts[i]
+        n_members[group] += 1
+        assigned[i] = True
+
+    def least_similar_to_group(group: int) -> int:
+        heap = heaps[group]
+        bounds = max_similarity_to_group[group]
+        seen = n_members_seen[group]
+        while True:
+            bound, i = heap[0]
+            if assigned[i]:
+                heapq.heappop(heap)
+                continue
+
+            if seen[i] == n_members[group]:
+                return i
+
+            # Bring the bound up to date, stopping early once the molecule is
+            # no longer at the top of the heap.
+
+            runner_up = min(heap[1:3], default=(np.inf, n))
+            while seen[i] < n_members[group] and (bound, i) < runner_up:
+                start, stop = seen[i], min(seen[i] + _REFRESH_SIZE, n_members[group])
+                similarities = bulk_tanimoto_similarity(
+                    words[i],
+                    member_words[group][start:stop],
+                    query_popcount=popcounts[i],
+                    reference_popcounts=member_popcounts[group][start:stop],
+                )
+                bound = max(bound, similarities.max())
+                seen[i] = stop
+
+            bounds[i] = bound
+            heapq.heapreplace(heap, (bound, i))
 
-        i = np.argmin(max_similarity_to_group[1 - group])
+    # Begin by assigning the first molecule to the first group.
 
-        # Add it to the group.
+    assign(0, group=0)
+    max_similarity_to_group[0][1:] = bulk_tanimoto_similarity(
+        words[0],
+        words[1:],
+        query_popcount=popcounts[0],
+        reference_popcounts=popcounts[1:],
+    )
+    n_members_seen[0][1:] = 1
+
+    heaps: tuple[list[tuple[float, int]], ...] = tuple(
+        list(zip(bounds[1:].tolist(), range(1, n), strict=True))
+        for bounds in max_similarity_to_group
+    )
+    for heap in heaps:
+        heapq.heapify(heap)
+
+    while n_members[0] + n_members[1] < n:
+        # Decide which group to assign a molecule to.
 
-        fp = remaining_fp[i]
-        fp_in_group[group].append(fp)
-        indices_in_group[group].append(remaining_indices[i])
+        group = 0 if n_members[0] / sizes[0] <= n_members[1] / sizes[1] else 1
 
-        # Update the data on unassigned molecules.
+        # Identify the unassigned molecule that is least similar to everything in
+        # the other group, and add it to the group.
 
-        similarity = DataStructs.BulkTanimotoSimilarity(fp, remaining_fp)
-        max_similarity_to_group[group] = np.delete(
-            np.maximum(similarity, max_similarity_to_group[group]),
-            i,
-        )
-        max_similarity_to_group[1 - group] = np.delete(
-            max_similarity_to_group[1 - group],
-            i,
-        )
-        del remaining_fp[i]
-        del remaining_indices[i]
+        assign(least_similar_to_group(1 - group), group=group)
 
-    return indices_in_group
+    return (
+        members[0][: n_members[0]].tolist(),
+        members[1][: n_members[1]].tolist(),
+    )
@@ -18,6 +18,8 @@ def test_exports_version():
     [
         "featurise_dataset",
         "replay_dataset_featurisation",
+        "compile_featurisation",
+        "compile_replay_featurisation",
         "fetch_model_featurisation_metadata",
         "load_featurisation_metadata",
         "get_inputs",
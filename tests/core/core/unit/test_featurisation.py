@@ -4,7 +4,12 @@ import pytest
 
 import datasets
 import molflux.modelzoo
-from molflux.core import featurise_dataset, replay_dataset_featurisation, save_model
+from molflux.core import (
+    compile_featurisation,
+    featurise_dataset,
+    replay_dataset_featurisation,
+    save_model,
+)
 
 
 @pytest.fixture()
@@ -267,3 +272,66 @@ def test_replay_featurisation_with_map_kwargs(
         batch_size=2,
     )
     assert replayed_dataset.column_names == featurised_dataset.column_names
+
+
+def test_featurise_dataset_in_single_pass(
+    monkeypatch,
+    fixture_sample_dataset,
+    fixture_sample_featurisation_metadata_v1,
+):
+    """That all column groups of featurisation metadata are featurised in a
+    single pass over the dataset."""
+
+    dataset = fixture_sample_dataset.add_column(
+        "other_smiles",
+        fixture_sample_dataset["canonical_smiles"],
+    )
+    column_featurisation_config = fixture_sample_featurisation_metadata_v1["config"][0]
+    featurisation_metadata = {
+        **fixture_sample_featurisation_metadata_v1,
+        "config": [
+            column_featurisation_config,
+            {**column_featurisation_config, "column": "other_smiles"},
+        ],
+    }
+
+    map_calls = []
+    original_map = datasets.Dataset.map
+
+    def counting_map(self, *args, **kwargs):
+        map_calls.append(kwargs.get("function"))
+        return original_map(self, *args, **kwargs)
+
+    monkeypatch.setattr(datasets.Dataset, "map", counting_map)
+    featurise_dataset(dataset, featurisation_metadata=featurisation_metadata)
+
+    assert len(map_calls) == 1
+
+
+def test_compiled_featurisation_matches_featurise_dataset(
+    fixture_sample_dataset,
+    fixture_sample_featurisation_metadata_v1,
+):
+    """That compiled featurisation plans give the same features as featurising
+    datasets."""
+
+    dataset = fixture_sample_dataset
+    featurisation_metadata = fixture_sample_featurisation_metadata_v1
+    featurised_dataset = featurise_dataset(
+        dataset,
+        featurisation_metadata=featurisation_metadata,
+    )
+
+    plan = compile_featurisation(featurisation_metadata)
+    featurised = plan(dataset.to_dict())
+
+    assert list(featurised) == featurised_dataset.column_names
+    assert featurised == featurised_dataset.to_dict()
+
+
+def test_compile_featurisation_with_unsupported_featurisation_metadata_version_raises():
+    """That compiling featurisation metadata of unsupported versions raises."""
+    featurisation_metadata = {"version": 0, "config": {}}
+
+    with pytest.raises(NotImplementedError, match="version"):
+        compile_featurisation(featurisation_metadata)
@@ -353,3 +353,71 @@ def test_round_trip_dataset_dict_io(tmp_path, fixture_mock_dataset_dict, path, f
     assert loaded_dataset_dict.column_names == dataset_dict.column_names
     assert loaded_dataset_dict.shape == dataset_dict.shape
     assert list(loaded_dataset_dict.keys()) == list(dataset_dict.keys())
+
+
+def test_save_iterable_dataset_as_parquet_shards(tmp_path, fixture_mock_dataset):
+    """That IterableDatasets are streamed to a directory of parquet shards of
+    at most the requested number of rows."""
+    dataset = datasets.concatenate_datasets([fixture_mock_dataset] * 3)
+    path = tmp_path / "data"
+
+    save_dataset_to_store(
+        dataset.to_iterable_dataset(),
+        path=str(path),
+        max_rows_per_shard=4,
+        batch_size=3,
+    )
+
+    shards = sorted(path.glob("*.parquet"))
+    assert [pyarrow.parquet.read_metadata(shard).num_rows for shard in shards] == [4, 2]
+
+
+def test_round_trip_iterable_dataset_io(tmp_path, fixture_mock_dataset):
+    """That IterableDatasets streamed to parquet shards can be loaded back."""
+    dataset = fixture_mock_dataset
+    path = tmp_path / "data"
+
+    save_dataset_to_store(
+        dataset.to_iterable_dataset(),
+        path=str(path),
+        max_rows_per_shard=1,
+    )
+    loaded_dataset = load_dataset_from_store(str(path))
+
+    assert loaded_dataset.features == dataset.features
+    assert loaded_dataset.to_dict() == dataset.to_dict()
+
+
+def test_round_trip_iterable_dataset_dict_io(tmp_path, fixture_mock_dataset_dict):
+    """That IterableDatasetDicts streamed to parquet shards can be loaded back."""
+    dataset_dict = fixture_mock_dataset_dict
+    path = tmp_path / "data"
+
+    iterable_dataset_dict = datasets.IterableDatasetDict(
+        {k: split.to_iterable_dataset() for k, split in dataset_dict.items()},
+    )
+    save_dataset_to_store(iterable_dataset_dict, path=str(path))
+    loaded_dataset_dict = load_dataset_from_store(str(path))
+
+    assert list(loaded_dataset_dict.keys()) == list(dataset_dict.keys())
+    assert loaded_dataset_dict.shape == dataset_dict.shape
+
+
+@pytest.mark.parametrize(
+    ("path", "format", "match"),
+    [
+        ("data.parquet", "parquet", "Invalid path"),
+        ("data", "csv", "Unsupported dataset format"),
+    ],
+)
+def test_save_iterable_dataset_to_unsupported_store_raises(
+    tmp_path,
+    fixture_mock_dataset,
+    path,
+    format,
+    match,
+):
+    """That IterableDatasets can only be saved as parquet to directories."""
+    dataset = fixture_mock_dataset.to_iterable_dataset()
+    with pytest.raises(ValueError, match=match):
+        save_dataset_to_store(dataset, path=str(tmp_path / path), format=format)
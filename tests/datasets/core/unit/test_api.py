@@ -15,6 +15,7 @@ import molflux.datasets
         "load_dataset_from_store",
         "save_dataset_to_store",
         "featurise_dataset",
+        "featurise_dataset_to_store",
         "load_dataset",
         "load_dataset_builder",
         "load_from_dict",
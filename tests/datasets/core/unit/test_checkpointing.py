@@ -0,0 +1,317 @@
+import json
+
+import pyarrow.parquet as pq
+import pytest
+
+import datasets
+import molflux.datasets.checkpointing
+from molflux.datasets import (
+    featurise_dataset,
+    featurise_dataset_to_store,
+    load_dataset_from_store,
+)
+from molflux.datasets.checkpointing import MANIFEST_FILENAME, _job_signature
+from molflux.features import load_representation
+
+
+@pytest.fixture(scope="module")
+def fixture_mock_dataset() -> datasets.Dataset:
+    return datasets.Dataset.from_dict({"smiles": ["C", "CC", "CCO", "CCN", "O"] * 2})
+
+
+@pytest.fixture(scope="function")
+def fixture_mock_representation():
+    return load_representation(name="character_count")
+
+
+class MockInferredRepresentation:
+    """Implements the interfaces.Representation protocol.
+
+    Here we define a representation without an output schema, returning the
+    length of multi-character samples, and nothing for others.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def featurise(self, *columns, **kwargs):
+        return {self.name: [len(s) if len(s) > 1 else None for s in columns[0]]}
+
+
+class Interruption(Exception):
+    pass
+
+
+def _record_featurised_shards(monkeypatch, interrupt_after=None):
+    """Records the size of featurised shards, optionally interrupting
+    featurisation after the given number of shards."""
+    featurised_shards = []
+
+    def interruptible_featurise_dataset(*args, **kwargs):
+        if len(featurised_shards) == interrupt_after:
+            raise Interruption
+        featurised_shards.append(args[0].num_rows)
+        return featurise_dataset(*args, **kwargs)
+
+    monkeypatch.setattr(
+        molflux.datasets.checkpointing,
+        "featurise_dataset",
+        interruptible_featurise_dataset,
+    )
+    return featurised_shards
+
+
+def test_featurised_shards_match_featurisation(
+    tmp_path,
+    fixture_mock_dataset,
+    fixture_mock_representation,
+):
+    """That the shards of a featurisation job load as the featurised dataset."""
+    dataset = fixture_mock_dataset
+    representation = fixture_mock_representation
+    path = tmp_path / "job"
+
+    featurise_dataset_to_store(
+        dataset,
+        column="smiles",
+        representations=representation,
+        path=path,
+        shard_size=3,
+    )
+
+    expected = featurise_dataset(
+        dataset,
+        column="smiles",
+        representations=representation,
+    )
+    assert len(list(path.glob("*.parquet"))) == 4
+    assert load_dataset_from_store(str(path)).to_dict() == expected.to_dict()
+
+
+def test_interrupted_job_resumes_from_incomplete_shard(
+    tmp_path,
+    monkeypatch,
+    fixture_mock_dataset,
+    fixture_mock_representation,
+):
+    """That resumed jobs skip completed shards, and give the same dataset as
+    uninterrupted jobs."""
+    dataset = fixture_mock_dataset
+    representation = fixture_mock_representation
+    path = tmp_path / "job"
+
+    featurised_shards = _record_featurised_shards(monkeypatch, interrupt_after=2)
+    with pytest.raises(Interruption):
+        featurise_dataset_to_store(
+            dataset,
+            column="smiles",
+            representations=representation,
+            path=path,
+            shard_size=3,
+        )
+
+    manifest = json.loads((path / MANIFEST_FILENAME).read_text())
+    assert list(manifest["completed_shards"]) == ["0", "1"]
+
+    featurised_shards = _record_featurised_shards(monkeypatch)
+    featurise_dataset_to_store(
+        dataset,
+        column="smiles",
+        representations=representation,
+        path=path,
+        shard_size=3,
+    )
+
+    # only the last two shards are featurised on resumption
+    assert featurised_shards == [3, 1]
+    expected = featurise_dataset(
+        dataset,
+        column="smiles",
+        representations=representation,
+    )
+    assert load_dataset_from_store(str(path)).to_dict() == expected.to_dict()
+
+
+def test_resuming_a_different_job_raises(
+    tmp_path,
+    fixture_mock_dataset,
+    fixture_mock_representation,
+):
+    """That checkpoints of a job are not mixed with those of another job."""
+    dataset = fixture_mock_dataset
+    path = tmp_path / "job"
+
+    featurise_dataset_to_store(
+        dataset,
+        column="smiles",
+        representations=fixture_mock_representation,
+        path=path,
+        shard_size=3,
+    )
+
+    with pytest.raises(ValueError, match="different featurisation job"):
+        featurise_dataset_to_store(
+            dataset,
+            column="smiles",
+            representations=fixture_mock_representation,
+            path=path,
+            shard_size=4,
+        )
+
+
+def test_resuming_a_job_over_different_data_raises(
+    tmp_path,
+    fixture_mock_dataset,
+    fixture_mock_representation,
+):
+    """That checkpoints of a job are not reused for different data of the same shape."""
+    dataset = fixture_mock_dataset
+    path = tmp_path / "job"
+
+    featurise_dataset_to_store(
+        dataset,
+        column="smiles",
+        representations=fixture_mock_representation,
+        path=path,
+        shard_size=3,
+    )
+
+    other_smiles = [*dataset["smiles"][:-1], "N"]
+    other_dataset = datasets.Dataset.from_dict({"smiles": other_smiles})
+    assert other_dataset.num_rows == dataset.num_rows
+    assert other_dataset.features == dataset.features
+    with pytest.raises(ValueError, match="different featurisation job"):
+        featurise_dataset_to_store(
+            other_dataset,
+            column="smiles",
+            representations=fixture_mock_representation,
+            path=path,
+            shard_size=3,
+        )
+
+
+def test_resuming_a_job_with_different_representation_config_raises(
+    tmp_path,
+    fixture_mock_dataset,
+):
+    """That checkpoints of a job are not reused with differently configured representations."""
+    dataset = fixture_mock_dataset
+    path = tmp_path / "job"
+
+    featurise_dataset_to_store(
+        dataset,
+        column="smiles",
+        representations=load_representation(name="character_count"),
+        path=path,
+        shard_size=3,
+    )
+
+    representation = load_representation(name="character_count")
+    representation.update_state(without_hs=True)
+    with pytest.raises(ValueError, match="different featurisation job"):
+        featurise_dataset_to_store(
+            dataset,
+            column="smiles",
+            representations=representation,
+            path=path,
+            shard_size=3,
+        )
+
+
+def test_resuming_a_job_over_equal_data_succeeds(
+    tmp_path,
+    fixture_mock_dataset,
+    fixture_mock_representation,
+):
+    """That checkpoints of a job are reused for a new dataset of the same data."""
+    dataset = fixture_mock_dataset
+    path = tmp_path / "job"
+
+    featurise_dataset_to_store(
+        dataset,
+        column="smiles",
+        representations=fixture_mock_representation,
+        path=path,
+        shard_size=3,
+    )
+
+    same_dataset = datasets.Dataset.from_dict({"smiles": list(dataset["smiles"])})
+    featurise_dataset_to_store(
+        same_dataset,
+        column="smiles",
+        representations=fixture_mock_representation,
+        path=path,
+        shard_size=3,
+    )
+    assert load_dataset_from_store(str(path)).num_rows == dataset.num_rows
+
+
+def test_job_signature_is_independent_of_state_order(fixture_mock_dataset):
+    """That the signature of a job does not depend on the order of nested parameters."""
+    representation = MockInferredRepresentation("length")
+    other_representation = MockInferredRepresentation("length")
+    representation.state = {"a": 1, "b": {"c": [1, 2], "d": {"e": 3, "f": 4}}}
+    other_representation.state = {"b": {"d": {"f": 4, "e": 3}, "c": [1, 2]}, "a": 1}
+
+    signatures = [
+        _job_signature(
+            fixture_mock_dataset,
+            shard_size=3,
+            column="smiles",
+            representations=r,
+            display_names=None,
+            map_kwargs={},
+        )
+        for r in (representation, other_representation)
+    ]
+    assert signatures[0] == signatures[1]
+
+
+def test_shards_are_featurised_with_the_features_of_the_first(
+    tmp_path,
+    fixture_mock_dataset,
+):
+    """That shards of inferred features have those of the first shard."""
+    path = tmp_path / "job"
+
+    # the last shard only holds "O", of no inferable type on its own
+    featurise_dataset_to_store(
+        fixture_mock_dataset,
+        column="smiles",
+        representations=MockInferredRepresentation("length"),
+        path=path,
+        shard_size=3,
+    )
+
+    schemas = [pq.read_schema(shard) for shard in sorted(path.glob("*.parquet"))]
+    assert len(schemas) == 4
+    assert all(schema.field("smiles::length").type == "int64" for schema in schemas)
+    featurised_dataset = load_dataset_from_store(str(path))
+    assert featurised_dataset["smiles::length"] == [None, 2, 3, 3, None] * 2
+
+
+def test_featurise_dataset_dict_to_store(
+    tmp_path,
+    fixture_mock_dataset,
+    fixture_mock_representation,
+):
+    """That DatasetDicts are featurised into a directory of shards per split."""
+    dataset_dict = datasets.DatasetDict(
+        {
+            "train": fixture_mock_dataset,
+            "test": fixture_mock_dataset.select(range(2)),
+        },
+    )
+    path = tmp_path / "job"
+
+    featurise_dataset_to_store(
+        dataset_dict,
+        column="smiles",
+        representations=fixture_mock_representation,
+        path=path,
+        shard_size=4,
+    )
+
+    featurised_dataset_dict = load_dataset_from_store(str(path))
+    assert list(featurised_dataset_dict) == ["train", "test"]
+    assert featurised_dataset_dict.num_rows == {"train": 10, "test": 2}
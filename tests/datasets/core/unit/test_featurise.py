@@ -1,9 +1,18 @@
 from typing import Any
 
+import numpy as np
+import pyarrow as pa
 import pytest
 
 import datasets
 from molflux.datasets import featurise_dataset
+from molflux.datasets.featurisation import (
+    FeaturisationPlan,
+    FeaturisationStep,
+    featurise_dataset_in_single_pass,
+)
+from molflux.features.cache import FeaturisationCache
+from molflux.features.info import FeatureSchema
 
 
 class MockRepresentation:
@@ -51,6 +60,42 @@ class MockMultiColumnRepresentation:
         return {self.name: concat_columns}
 
 
+class MockSchemaRepresentation:
+    """Implements the interfaces.RepresentationWithOutputSchema protocol.
+
+    Here we define a single representation that returns a fixed-size vector of
+    ones for each input sample, and declares its output schema upfront.
+    """
+
+    def __init__(self, name: str, length: int, as_numpy: bool = False) -> None:
+        self.name = name
+        self.length = length
+        self.as_numpy = as_numpy
+
+    def featurise(self, *columns: Any, **kwargs: Any) -> dict[str, Any]:
+        vectors = np.ones((len(columns[0]), self.length), dtype=np.uint8)
+        return {self.name: vectors if self.as_numpy else vectors.tolist()}
+
+    def output_schema(self, **kwargs: Any) -> dict[str, FeatureSchema] | None:
+        return {self.name: FeatureSchema(dtype="uint8", length=self.length)}
+
+
+class MockCountingRepresentation:
+    """Implements the interfaces.Representation protocol.
+
+    Here we define a single representation that doubles the input samples,
+    and records all samples it featurised.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.featurised: list[Any] = []
+
+    def featurise(self, *columns: Any, **kwargs: Any) -> dict[str, Any]:
+        self.featurised.extend(columns[0])
+        return {self.name: [2 * sample for sample in columns[0]]}
+
+
 @pytest.fixture(scope="module")
 def fixture_mock_dataset() -> datasets.Dataset:
     data = {
@@ -695,3 +740,493 @@ def test_raises_on_inconsistent_dataset_dict(fixture_mock_representations):
             column=column_to_featurise,
             representations=representations,
         )
+
+
+@pytest.mark.parametrize("as_numpy", [False, True])
+def test_declared_output_schema_gives_fixed_size_list_columns(
+    fixture_mock_dataset,
+    as_numpy,
+):
+    """That representations declaring their output schema are featurised into
+    Apache Arrow fixed-size list columns of the declared type."""
+    dataset = fixture_mock_dataset
+    representation = MockSchemaRepresentation("vector", length=4, as_numpy=as_numpy)
+
+    featurised_dataset = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representation,
+    )
+
+    assert featurised_dataset.features["a::vector"] == datasets.Sequence(
+        datasets.Value("uint8"),
+        length=4,
+    )
+    arrow_type = featurised_dataset.data.schema.field("a::vector").type
+    assert arrow_type == pa.list_(pa.uint8(), 4)
+    assert featurised_dataset["a::vector"] == [[1, 1, 1, 1]] * len(dataset)
+
+
+def test_declared_output_schemas_are_ignored_if_not_all_declared(
+    fixture_mock_dataset,
+):
+    """That output features are inferred as usual if any of the representations
+    does not declare its output schema."""
+    dataset = fixture_mock_dataset
+    representations = [
+        MockSchemaRepresentation("vector", length=4),
+        MockRepresentation("original_name_a"),
+    ]
+
+    featurised_dataset = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representations,
+    )
+
+    assert featurised_dataset.features["a::vector"] == datasets.Sequence(
+        datasets.Value("int64"),
+    )
+    assert featurised_dataset["a::vector"] == [[1, 1, 1, 1]] * len(dataset)
+
+
+def test_declared_output_schema_uses_display_names(fixture_mock_dataset):
+    """That declared output features are assigned to custom display names."""
+    dataset = fixture_mock_dataset
+    representation = MockSchemaRepresentation("vector", length=2)
+
+    featurised_dataset = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representation,
+        display_names="custom_{feature_name}",
+    )
+
+    assert featurised_dataset.features["custom_vector"] == datasets.Sequence(
+        datasets.Value("uint8"),
+        length=2,
+    )
+
+
+def test_parallel_featurisation_matches_serial(
+    fixture_mock_dataset,
+    fixture_mock_representations,
+):
+    """That featurising batches over worker processes gives the same dataset."""
+    dataset = fixture_mock_dataset
+    representations = fixture_mock_representations
+
+    expected = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representations,
+    )
+    featurised_dataset = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representations,
+        parallel=2,
+        batch_size=2,
+    )
+
+    assert featurised_dataset.to_dict() == expected.to_dict()
+
+
+def test_parallel_featurisation_with_num_proc_raises(
+    fixture_mock_dataset,
+    fixture_mock_representations,
+):
+    """That featurisation cannot be parallelised with both 'parallel' and 'num_proc'."""
+    with pytest.raises(ValueError, match="either 'parallel' or 'num_proc'"):
+        featurise_dataset(
+            fixture_mock_dataset,
+            column="a",
+            representations=fixture_mock_representations,
+            parallel=2,
+            num_proc=2,
+        )
+
+
+def test_cached_featurisation_matches_uncached(
+    fixture_mock_dataset,
+    fixture_mock_representations,
+    tmp_path,
+):
+    """That featurising with a cache gives the same dataset, from cache hits."""
+    dataset = fixture_mock_dataset
+    representations = fixture_mock_representations
+    expected = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representations,
+    )
+
+    with FeaturisationCache(tmp_path / "cache.sqlite") as cache:
+        for _ in range(2):
+            featurised_dataset = featurise_dataset(
+                dataset,
+                column="a",
+                representations=representations,
+                cache=cache,
+                load_from_cache_file=False,
+            )
+            assert featurised_dataset.to_dict() == expected.to_dict()
+
+        n_lookups = len(dataset) * len(representations)
+        assert (cache.hits, cache.misses) == (n_lookups, n_lookups)
+
+
+@pytest.mark.parametrize("deduplicate", ["batch", "global"])
+def test_deduplicated_featurisation_matches_featurisation(
+    fixture_mock_representations,
+    deduplicate,
+):
+    """That deduplicated featurisation gives the same dataset."""
+    dataset = datasets.Dataset.from_dict({"a": [1, 2, 1, 3, 2, 1], "b": list("abcdef")})
+    representations = fixture_mock_representations
+    expected = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representations,
+    )
+    featurised_dataset = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representations,
+        deduplicate=deduplicate,
+    )
+    assert featurised_dataset.to_dict() == expected.to_dict()
+
+
+@pytest.mark.parametrize(
+    ["deduplicate", "batch_size", "expected_featurised"],
+    [
+        ("batch", 3, [1, 2, 3, 1]),
+        ("global", 3, [1, 2, 3]),
+    ],
+)
+def test_deduplicated_featurisation_featurises_unique_samples(
+    deduplicate,
+    batch_size,
+    expected_featurised,
+):
+    """That repeated samples are featurised only once per batch, or overall."""
+    dataset = datasets.Dataset.from_dict({"a": [1, 2, 1, 3, 1, 3]})
+    representation = MockCountingRepresentation("doubled")
+    featurised_dataset = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representation,
+        deduplicate=deduplicate,
+        batch_size=batch_size,
+    )
+    assert featurised_dataset["a::doubled"] == [2, 4, 2, 6, 2, 6]
+    assert representation.featurised == expected_featurised
+
+
+def test_globally_deduplicated_featurisation_scatters_by_batch(
+    fixture_mock_representations,
+):
+    """That features of unique rows are scattered back batch by batch, keeping the dataset format."""
+    dataset = datasets.Dataset.from_dict(
+        {"a": [1, 2, 1, 3, 2, 1, 4], "b": list("abcdefg")},
+    ).with_format("numpy")
+    representations = fixture_mock_representations
+    expected = featurise_dataset(
+        dataset.with_format(None),
+        column="a",
+        representations=representations,
+        remove_columns="b",
+    )
+    featurised_dataset = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representations,
+        deduplicate="global",
+        remove_columns="b",
+        batch_size=2,
+    )
+    assert featurised_dataset.format["type"] == "numpy"
+    assert featurised_dataset.column_names == expected.column_names
+    assert featurised_dataset.features == expected.features
+    assert featurised_dataset.with_format(None).to_dict() == expected.to_dict()
+
+
+def test_globally_deduplicated_featurisation_of_dataset_dict(
+    fixture_mock_dataset_dict_with_empty_splits,
+    fixture_mock_representations,
+):
+    """That dataset dicts with empty splits can be featurised with global deduplication."""
+    dataset = fixture_mock_dataset_dict_with_empty_splits
+    representations = fixture_mock_representations
+    expected = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representations,
+    )
+    featurised_dataset = featurise_dataset(
+        dataset,
+        column="a",
+        representations=representations,
+        deduplicate="global",
+    )
+    for split in expected:
+        assert featurised_dataset[split].to_dict() == expected[split].to_dict()
+
+
+def test_unknown_deduplication_mode_raises(
+    fixture_mock_dataset,
+    fixture_mock_representations,
+):
+    """That an unknown deduplication mode raises an error."""
+    with pytest.raises(ValueError, match="Unknown deduplication mode"):
+        featurise_dataset(
+            fixture_mock_dataset,
+            column="a",
+            representations=fixture_mock_representations,
+            deduplicate="everything",
+        )
+
+
+def test_featurisation_of_iterable_dataset_is_lazy(fixture_mock_dataset):
+    """That iterable datasets are featurised lazily, as they are iterated."""
+    dataset = fixture_mock_dataset
+    representation = MockCountingRepresentation("doubled")
+
+    featurised_dataset = featurise_dataset(
+        dataset.to_iterable_dataset(),
+        column="a",
+        representations=representation,
+    )
+    assert isinstance(featurised_dataset, datasets.IterableDataset)
+    assert representation.featurised == []
+
+    featurised = [example["a::doubled"] for example in featurised_dataset]
+    assert featurised == [2 * a for a in dataset["a"]]
+
+
+def test_featurisation_of_iterable_dataset_matches_dataset(
+    fixture_mock_dataset,
+    fixture_mock_representations,
+):
+    """That featurised iterable datasets yield the same examples as datasets,
+    with the same declared features."""
+    dataset = fixture_mock_dataset
+    representation = MockSchemaRepresentation("vector", length=4)
+
+    expected = featurise_dataset(
+        dataset,
+        column="a",
+        representations=[representation, *fixture_mock_representations],
+    )
+    featurised_dataset = featurise_dataset(
+        dataset.to_iterable_dataset(),
+        column="a",
+        representations=[representation, *fixture_mock_representations],
+        batch_size=2,
+    )
+
+    assert list(featurised_dataset) == list(expected)
+
+
+def test_featurisation_of_iterable_dataset_dict(fixture_mock_dataset_dict):
+    """That can featurise an IterableDatasetDict."""
+    dataset_dict = datasets.IterableDatasetDict(
+        {
+            k: split.to_iterable_dataset()
+            for k, split in fixture_mock_dataset_dict.items()
+        },
+    )
+    representation = MockSchemaRepresentation("vector", length=2)
+
+    featurised_dataset_dict = featurise_dataset(
+        dataset_dict,
+        column="a",
+        representations=representation,
+    )
+
+    assert isinstance(featurised_dataset_dict, datasets.IterableDatasetDict)
+    for split in featurised_dataset_dict.values():
+        assert split.features["a::vector"] == datasets.Sequence(
+            datasets.Value("uint8"),
+            length=2,
+        )
+
+
+def test_global_deduplication_of_iterable_dataset_raises(
+    fixture_mock_dataset,
+    fixture_mock_representations,
+):
+    """That global deduplication of iterable datasets raises an error."""
+    with pytest.raises(ValueError, match="not supported for iterable datasets"):
+        featurise_dataset(
+            fixture_mock_dataset.to_iterable_dataset(),
+            column="a",
+            representations=fixture_mock_representations,
+            deduplicate="global",
+        )
+
+
+@pytest.fixture(scope="module")
+def fixture_mock_featurisation_steps():
+    """Featurisation steps, of which the last featurises the outputs of others."""
+    return [
+        FeaturisationStep("a", MockSchemaRepresentation("vector", length=2)),
+        FeaturisationStep(
+            ["a", "b"],
+            MockMultiColumnRepresentation("a_plus_b"),
+            display_names="a_plus_b",
+        ),
+        FeaturisationStep(
+            ["a_plus_b", "b"],
+            MockMultiColumnRepresentation("total"),
+            display_names="total",
+        ),
+    ]
+
+
+def test_single_pass_featurisation_matches_featurisation(
+    fixture_mock_dataset,
+    fixture_mock_featurisation_steps,
+):
+    """That applying featurisation steps in a single pass gives the same dataset
+    as applying them one after the other."""
+    dataset = fixture_mock_dataset
+    steps = fixture_mock_featurisation_steps
+
+    expected = dataset
+    for step in steps:
+        expected = featurise_dataset(
+            expected,
+            column=step.column,
+            representations=step.representations,
+            display_names=step.display_names,
+        )
+
+    featurised_dataset = featurise_dataset_in_single_pass(
+        dataset,
+        steps=steps,
+        batch_size=2,
+    )
+
+    assert featurised_dataset.column_names == expected.column_names
+    assert featurised_dataset.features == expected.features
+    assert featurised_dataset.to_dict() == expected.to_dict()
+
+
+def test_single_pass_featurisation_only_writes_featurised_columns(
+    tmp_path,
+    fixture_mock_dataset,
+    fixture_mock_featurisation_steps,
+):
+    """That only the featurised columns are written to the cache."""
+    fixture_mock_dataset.save_to_disk(tmp_path / "dataset")
+    dataset = datasets.load_from_disk(tmp_path / "dataset")
+
+    featurised_dataset = featurise_dataset_in_single_pass(
+        dataset,
+        steps=fixture_mock_featurisation_steps,
+    )
+
+    new_cache_files = [
+        cache_file["filename"]
+        for cache_file in featurised_dataset.cache_files
+        if cache_file not in dataset.cache_files
+    ]
+    assert len(new_cache_files) == 1
+    with pa.memory_map(new_cache_files[0]) as source:
+        schema = pa.ipc.open_stream(source).schema
+    assert schema.names == ["a::vector", "a_plus_b", "total"]
+
+
+def test_single_pass_featurisation_of_selected_dataset(
+    tmp_path,
+    fixture_mock_dataset,
+    fixture_mock_featurisation_steps,
+):
+    """That the rows of a selected dataset are featurised without copying them."""
+    fixture_mock_dataset.save_to_disk(tmp_path / "dataset")
+    dataset = datasets.load_from_disk(tmp_path / "dataset").select([4, 0, 2, 2, 1, 3])
+    steps = fixture_mock_featurisation_steps
+
+    expected = featurise_dataset_in_single_pass(dataset.flatten_indices(), steps)
+    featurised_dataset = featurise_dataset_in_single_pass(dataset, steps=steps)
+
+    assert featurised_dataset.column_names == expected.column_names
+    assert featurised_dataset.to_dict() == expected.to_dict()
+
+    new_cache_files = [
+        cache_file["filename"]
+        for cache_file in featurised_dataset.cache_files
+        if cache_file not in dataset.cache_files
+    ]
+    assert len(new_cache_files) == 1
+    with pa.memory_map(new_cache_files[0]) as source:
+        schema = pa.ipc.open_stream(source).schema
+    assert schema.names == ["a::vector", "a_plus_b", "total"]
+
+
+def test_single_pass_featurisation_of_subset(
+    fixture_mock_dataset,
+    fixture_mock_featurisation_steps,
+):
+    """That only the rows of a subset of a dataset are featurised."""
+    dataset = fixture_mock_dataset.select([3, 1])
+    steps = fixture_mock_featurisation_steps
+
+    expected = featurise_dataset_in_single_pass(dataset.flatten_indices(), steps)
+    featurised_dataset = featurise_dataset_in_single_pass(dataset, steps=steps)
+
+    assert len(featurised_dataset) == 2
+    assert featurised_dataset.to_dict() == expected.to_dict()
+
+
+def test_single_pass_featurisation_of_dataset_dict(
+    fixture_mock_dataset_dict_with_empty_splits,
+    fixture_mock_featurisation_steps,
+):
+    """That DatasetDicts are featurised in a single pass over each split."""
+    dataset_dict = fixture_mock_dataset_dict_with_empty_splits.map(
+        lambda example: {"b": example["a"]},
+    )
+
+    featurised_dataset_dict = featurise_dataset_in_single_pass(
+        dataset_dict,
+        steps=fixture_mock_featurisation_steps,
+    )
+
+    for split in featurised_dataset_dict.values():
+        assert split.column_names == ["a", "b", "a::vector", "a_plus_b", "total"]
+    assert featurised_dataset_dict["validation"]["total"] == [3, 9, 12, 6]
+
+
+def test_featurisation_plan_matches_featurisation(
+    fixture_mock_dataset,
+    fixture_mock_featurisation_steps,
+):
+    """That featurisation plans give the same features as dataset featurisation."""
+    dataset = fixture_mock_dataset
+    steps = fixture_mock_featurisation_steps
+    expected = featurise_dataset_in_single_pass(dataset, steps=steps)
+
+    plan = FeaturisationPlan(steps)
+    featurised = plan({"a": dataset["a"], "b": np.asarray(dataset["b"])})
+
+    assert list(featurised) == ["a", "b", "a::vector", "a_plus_b", "total"]
+    for name in expected.column_names:
+        assert np.asarray(featurised[name]).tolist() == expected[name]
+
+
+def test_featurisation_plan_input_columns(fixture_mock_featurisation_steps):
+    """That featurisation plans only require the columns not generated by steps."""
+    plan = FeaturisationPlan(fixture_mock_featurisation_steps)
+    assert plan.input_columns == ["a", "b"]
+
+
+def test_featurisation_plan_with_missing_input_raises(
+    fixture_mock_featurisation_steps,
+):
+    """That featurising inputs without a required column raises."""
+    plan = FeaturisationPlan(fixture_mock_featurisation_steps)
+    with pytest.raises(KeyError, match="not in inputs"):
+        plan({"a": [1, 2]})
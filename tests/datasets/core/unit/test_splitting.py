@@ -1,3 +1,5 @@
+import numpy as np
+
 import datasets
 from molflux.datasets.splitting import split_dataset
 
@@ -46,3 +48,68 @@ def test_generates_test_split(fixture_splitting_strategy_mock, fixture_dataset):
     splits = split_dataset(dataset=dataset, strategy=strategy)
     for split in splits:
         assert "test" in split
+
+
+class RepeatedSplitMock:
+    """A mock SplittingStrategy yielding the same NumPy indices several times."""
+
+    def split(self, dataset, y=None, groups=None, **kwargs):
+        indices = np.arange(len(dataset))
+        for _ in range(3):
+            yield indices[::2], indices[1::4], indices[3::4]
+
+
+def test_splits_select_rows():
+    """That splits hold the rows of their indices."""
+    dataset = datasets.Dataset.from_dict({"x": list(range(10))})
+    folds = split_dataset(dataset=dataset, strategy=RepeatedSplitMock())
+    split = next(folds)
+    assert split["train"]["x"] == [0, 2, 4, 6, 8]
+    assert split["validation"]["x"] == [1, 5, 9]
+    assert split["test"]["x"] == [3, 7]
+
+
+class KFoldMock:
+    """A mock SplittingStrategy yielding two folds of swapped halves, and empty test splits."""
+
+    def split(self, dataset, y=None, groups=None, **kwargs):
+        indices = np.arange(len(dataset))
+        first_half, second_half = (
+            indices[: len(indices) // 2],
+            indices[len(indices) // 2 :],
+        )
+        yield first_half, second_half, []
+        yield second_half, first_half, []
+
+
+def test_identical_splits_are_distinct_datasets():
+    """That splits of identical indices are distinct datasets of the same rows."""
+    dataset = datasets.Dataset.from_dict({"x": list(range(10))})
+    folds = list(split_dataset(dataset=dataset, strategy=RepeatedSplitMock()))
+    trains = [fold["train"] for fold in folds]
+    assert len({id(train) for train in trains}) == len(trains)
+    assert all(train["x"] == [0, 2, 4, 6, 8] for train in trains)
+
+
+def test_splits_formats_are_independent():
+    """That formatting a split does not format splits of identical indices."""
+    dataset = datasets.Dataset.from_dict({"x": list(range(10))})
+    first_fold, second_fold = split_dataset(dataset=dataset, strategy=KFoldMock())
+    assert first_fold["validation"]["x"] == second_fold["train"]["x"]
+    assert first_fold["test"] is not second_fold["test"]
+
+    first_fold["validation"].set_format("numpy")
+    first_fold["test"].set_format("numpy")
+    assert second_fold["train"].format["type"] is None
+    assert second_fold["test"].format["type"] is None
+    assert first_fold["train"].format["type"] is None
+
+
+def test_splits_share_dataset_table():
+    """That splits hold the rows of the dataset without copying them."""
+    dataset = datasets.Dataset.from_dict({"x": list(range(10))})
+    split = next(split_dataset(dataset=dataset, strategy=RepeatedSplitMock()))
+    view_buffers = split["train"].data.column("x").chunk(0).buffers()
+    dataset_buffers = dataset.data.column("x").chunk(0).buffers()
+    assert view_buffers[1].address == dataset_buffers[1].address
+    assert split["train"].flatten_indices()["x"] == split["train"]["x"]
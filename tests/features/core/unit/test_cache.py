@@ -0,0 +1,202 @@
+import numpy as np
+import pytest
+
+from molflux.features import load_representation
+from molflux.features.cache import FeaturisationCache, _digest_representation
+
+
+@pytest.fixture(scope="function")
+def fixture_mock_representation():
+    return load_representation(name="character_count")
+
+
+@pytest.fixture(scope="function")
+def fixture_cache(tmp_path):
+    with FeaturisationCache(tmp_path / "cache.sqlite") as cache:
+        yield cache
+
+
+def test_cached_featurisation_matches_uncached(
+    fixture_mock_representation,
+    fixture_cache,
+):
+    """That cached results are the same as freshly featurised ones."""
+    representation = fixture_mock_representation
+    cache = fixture_cache
+    data = ["C", "CC", "CCC", "CC"]
+    expected = representation.featurise(data)
+    assert representation.featurise(data, cache=cache) == expected
+    assert representation.featurise(data, cache=cache) == expected
+
+
+def test_hits_and_misses_are_counted(fixture_mock_representation, fixture_cache):
+    """That lookups are counted as hits or misses."""
+    representation = fixture_mock_representation
+    cache = fixture_cache
+    representation.featurise(["C", "CC"], cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    representation.featurise(["CC", "CCC"], cache=cache)
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert cache.hit_rate == 0.25
+
+
+def test_hits_are_not_featurised(
+    fixture_mock_representation,
+    fixture_cache,
+    monkeypatch,
+):
+    """That only samples missing from the cache are featurised."""
+    representation = fixture_mock_representation
+    cache = fixture_cache
+    representation.featurise(["C", "CC"], cache=cache)
+
+    featurised = []
+    original_featurise = representation._featurise
+
+    def spy(*columns, **kwargs):
+        featurised.extend(columns[0])
+        return original_featurise(*columns, **kwargs)
+
+    monkeypatch.setattr(representation, "_featurise", spy)
+    result = representation.featurise(["CC", "CCC", "C"], cache=cache)
+    assert result == {representation.tag: [2, 3, 1]}
+    assert featurised == ["CCC"]
+
+
+@pytest.mark.parametrize("output_format", ["sparse", "dict"])
+def test_cached_sparse_featurisation_matches_uncached(fixture_cache, output_format):
+    """That ragged per-sample results are cached and returned as lists."""
+    representation = load_representation(name="morgan_unfolded")
+    cache = fixture_cache
+    data = ["CCO", "c1ccccc1O", "CC(=O)N"]
+    expected = representation.featurise(data, output_format=output_format)
+    representation.featurise(data[:2], output_format=output_format, cache=cache)
+    result = representation.featurise(data, output_format=output_format, cache=cache)
+    assert cache.hits == 2
+    assert result.keys() == expected.keys()
+    for name, values in result.items():
+        assert isinstance(values, list)
+        assert len(values) == len(expected[name])
+        for value, expected_value in zip(values, expected[name], strict=True):
+            if isinstance(expected_value, np.ndarray):
+                np.testing.assert_array_equal(value, expected_value)
+            else:
+                assert value == expected_value
+
+
+def test_cached_array_featurisation_matches_uncached(fixture_cache):
+    """That results returned as arrays are stacked back into arrays."""
+    representation = load_representation(name="morgan")
+    cache = fixture_cache
+    data = ["CCO", "c1ccccc1O", "CC(=O)N"]
+    expected = representation.featurise(data, output_format="numpy", n_bits=16)
+    representation.featurise(data[:2], output_format="numpy", n_bits=16, cache=cache)
+    result = representation.featurise(
+        data,
+        output_format="numpy",
+        n_bits=16,
+        cache=cache,
+    )
+    assert cache.hits == 2
+    for name, values in result.items():
+        assert isinstance(values, np.ndarray)
+        assert values.dtype == expected[name].dtype
+        np.testing.assert_array_equal(values, expected[name])
+
+
+def test_featurisation_parameters_are_cached_separately(
+    fixture_mock_representation,
+    fixture_cache,
+):
+    """That results for different featurisation parameters do not collide."""
+    representation = fixture_mock_representation
+    cache = fixture_cache
+    assert representation.featurise(["CHH"], cache=cache) == {
+        representation.tag: [3],
+    }
+    assert representation.featurise(["CHH"], without_hs=True, cache=cache) == {
+        representation.tag: [1],
+    }
+    assert cache.hits == 0
+
+
+def test_cache_persists_on_disk(fixture_mock_representation, tmp_path):
+    """That cached results are available to other caches using the same file."""
+    representation = fixture_mock_representation
+    path = tmp_path / "cache.sqlite"
+    with FeaturisationCache(path) as cache:
+        representation.featurise(["C", "CC"], cache=cache)
+
+    with FeaturisationCache(path) as cache:
+        representation.featurise(["C", "CC"], cache=cache)
+        assert cache.hits == 2
+        assert len(cache) == 2
+
+
+def test_least_recently_used_results_are_evicted(
+    fixture_mock_representation,
+    tmp_path,
+):
+    """That the least recently used results are evicted beyond the size limit."""
+    representation = fixture_mock_representation
+    with FeaturisationCache(tmp_path / "cache.sqlite", max_size=None) as cache:
+        representation.featurise(["C"], cache=cache)
+        entry_size = cache.size
+
+    with FeaturisationCache(
+        tmp_path / "cache.sqlite",
+        max_size=2 * entry_size,
+    ) as cache:
+        representation.featurise(["N"], cache=cache)
+        # "C" is now the most recently used result
+        representation.featurise(["C"], cache=cache)
+        representation.featurise(["O"], cache=cache)
+        assert len(cache) == 2
+        assert cache.size <= 2 * entry_size
+
+        cache.reset_stats()
+        representation.featurise(["C", "O"], cache=cache)
+        assert cache.hits == 2
+
+
+def test_clear_evicts_all_results(fixture_mock_representation, fixture_cache):
+    """That clearing the cache evicts all cached results."""
+    representation = fixture_mock_representation
+    cache = fixture_cache
+    representation.featurise(["C", "CC"], cache=cache)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_array_parameters_are_hashed_by_content(fixture_mock_representation):
+    """That large arrays of different values (of identical reprs) do not collide."""
+    representation = fixture_mock_representation
+    weights = np.zeros(5000)
+    other_weights = weights.copy()
+    other_weights[2500] = 1
+    assert repr(weights) == repr(other_weights)
+    assert _digest_representation(
+        representation,
+        {"weights": weights},
+    ) != _digest_representation(representation, {"weights": other_weights})
+    assert _digest_representation(
+        representation,
+        {"weights": weights},
+    ) == _digest_representation(representation, {"weights": weights.copy()})
+
+
+def test_parameters_are_hashed_independently_of_order(fixture_mock_representation):
+    """That the order of parameters does not change their digest."""
+    representation = fixture_mock_representation
+    assert _digest_representation(
+        representation,
+        {"a": 1, "b": {"c": 2, "d": 3}},
+    ) == _digest_representation(representation, {"b": {"d": 3, "c": 2}, "a": 1})
+
+
+def test_unserialisable_parameters_raise(fixture_mock_representation):
+    """That parameters which cannot be serialised are rejected."""
+    representation = fixture_mock_representation
+    with pytest.raises(TypeError, match="Could not serialise"):
+        _digest_representation(representation, {"values": (i for i in range(3))})
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from molflux.features import load_representation
+from molflux.features.deduplication import (
+    featurise_unique,
+    scatter_results,
+    unique_rows,
+)
+
+
+@pytest.fixture(scope="function")
+def fixture_mock_representation():
+    return load_representation(name="character_count")
+
+
+def test_unique_rows():
+    """That unique rows are found in order of first occurrence."""
+    first_indices, inverse = unique_rows([("b", 1), ("a", 1), ("b", 1), ("b", 2)])
+    assert first_indices == [0, 1, 3]
+    assert inverse.tolist() == [0, 1, 0, 2]
+
+
+def test_unique_rows_compare_types():
+    """That equal values of different types are not considered duplicates."""
+    first_indices, _ = unique_rows([(1,), (1.0,), (True,), (1,)])
+    assert first_indices == [0, 1, 2]
+
+
+def test_unhashable_rows_are_unique():
+    """That unhashable rows are all considered unique."""
+    first_indices, inverse = unique_rows([([1],), ([1],)])
+    assert first_indices == [0, 1]
+    assert inverse.tolist() == [0, 1]
+
+
+def test_scatter_results():
+    """That results are scattered back to all occurrences of their samples."""
+    results = {"a": [10, 20], "b": np.array([[1, 2], [3, 4]])}
+    scattered = scatter_results(results, np.array([1, 0, 1]))
+    assert scattered["a"] == [20, 10, 20]
+    assert scattered["b"].tolist() == [[3, 4], [1, 2], [3, 4]]
+
+
+def test_featurise_unique_featurises_each_sample_once():
+    """That each unique sample is featurised once."""
+    featurised = []
+
+    def featurise(samples):
+        featurised.extend(samples)
+        return [{"length": [len(sample) for sample in samples]}]
+
+    results = featurise_unique(["CCO", "C", "CCO", "C"], featurise=featurise)
+    assert results == [{"length": [3, 1, 3, 1]}]
+    assert featurised == ["CCO", "C"]
+
+
+def test_deduplicated_featurisation_matches_featurisation(fixture_mock_representation):
+    """That deduplicated featurisation gives the same results."""
+    representation = fixture_mock_representation
+    data = ["C", "CC", "CCC", "CC", "C"]
+    expected = representation.featurise(data)
+    assert representation.featurise(data, deduplicate=True) == expected
+
+
+def test_deduplicated_featurisation_of_single_sample(fixture_mock_representation):
+    """That single samples can be featurised with deduplication."""
+    representation = fixture_mock_representation
+    assert representation.featurise("CC", deduplicate=True) == {
+        representation.tag: [2],
+    }
@@ -41,3 +41,18 @@ def test_invalid_kwarg_raises_value_error(fixture_mock_representation):
     data = ["cccc", "cc"]
     with pytest.raises(ValueError, match=r"Unknown featurisation parameter\(s\)"):
         representation.featurise(data, invalid_kwarg=True)
+
+
+def test_bound_featurisation_matches_featurisation(fixture_mock_representation):
+    """That bound featurisation callables give the same results as featurise()."""
+    representation = fixture_mock_representation
+    data = ["cccc", "cc"]
+    featurise = representation.bind()
+    assert featurise(data) == representation.featurise(data)
+
+
+def test_binding_invalid_kwarg_raises_value_error(fixture_mock_representation):
+    """That invalid keyword arguments are rejected when binding them."""
+    representation = fixture_mock_representation
+    with pytest.raises(ValueError, match=r"Unknown featurisation parameter\(s\)"):
+        representation.bind(invalid_kwarg=True)
@@ -0,0 +1,155 @@
+import pickle
+
+import numpy as np
+import pytest
+
+import molflux.features.minhash
+from molflux.features.minhash import (
+    MinHasher,
+    fold_hashes,
+    hash_shinglings,
+    lsh_clusters,
+)
+
+shinglings = [
+    [b"C", b"CC", b"CCO"],
+    [],
+    [b"CC", b"CCN", b"c1ccccc1", b"CCO"],
+    [b"C"],
+]
+
+
+def _reference_signature(minhasher, hashes):
+    """Computes the signature of a single set of hashes one hash at a time."""
+    signature = np.full(minhasher.n_permutations, 2**32 - 1, dtype=np.int64)
+    for x in hashes:
+        a = minhasher.permutations_a.astype(np.int64)
+        b = minhasher.permutations_b.astype(np.int64)
+        values = ((a * int(x) + b) % 2**32) % (2**32 - 1)
+        signature = np.minimum(signature, values)
+    return signature
+
+
+def test_hash_shinglings_layout():
+    """That shinglings are hashed into a ragged array with one hash per shingle."""
+    indptr, hashes = hash_shinglings(shinglings)
+    assert indptr.tolist() == [0, 3, 3, 7, 8]
+    assert hashes.dtype == np.uint32
+    assert hashes[1] == hashes[3]
+    assert hashes[0] == hashes[7]
+
+
+def test_fold_hashes():
+    """That hashes are folded into the bits of their sample's fingerprint."""
+    indptr = np.array([0, 2, 2, 3])
+    hashes = np.array([1, 6, 3], dtype=np.uint32)
+    folded = fold_hashes(indptr, hashes, length=4)
+    assert folded.tolist() == [[0, 1, 1, 0], [0, 0, 0, 0], [0, 0, 0, 1]]
+
+
+def test_signatures_match_reference():
+    """That batched signatures match signatures computed one hash at a time."""
+    minhasher = MinHasher(n_permutations=32)
+    signatures = minhasher.from_shinglings(shinglings)
+    assert signatures.shape == (len(shinglings), 32)
+    assert signatures.dtype == np.uint32
+
+    indptr, hashes = hash_shinglings(shinglings)
+    for i, signature in enumerate(signatures):
+        expected = _reference_signature(minhasher, hashes[indptr[i] : indptr[i + 1]])
+        assert signature.tolist() == expected.tolist()
+
+
+def test_signatures_do_not_depend_on_block_size(monkeypatch):
+    """That signatures computed over small blocks match those of a single block."""
+    minhasher = MinHasher(n_permutations=8)
+    expected = minhasher.from_shinglings(shinglings)
+    monkeypatch.setattr(molflux.features.minhash, "_MAX_BLOCK_SIZE", 16)
+    np.testing.assert_array_equal(minhasher.from_shinglings(shinglings), expected)
+
+
+def test_permutations_are_unique_and_seeded():
+    """That permutations are unique and reproducible for a given seed."""
+    minhasher = MinHasher(n_permutations=256, seed=3)
+    assert len(set(minhasher.permutations_a.tolist())) == 256
+    assert len(set(minhasher.permutations_b.tolist())) == 256
+    np.testing.assert_array_equal(
+        MinHasher(n_permutations=256, seed=3).permutations_a,
+        minhasher.permutations_a,
+    )
+    assert not np.array_equal(
+        MinHasher(n_permutations=256, seed=4).permutations_a,
+        minhasher.permutations_a,
+    )
+
+
+def test_jaccard_estimate():
+    """That signatures estimate the Jaccard similarity of their sets."""
+    minhasher = MinHasher(n_permutations=2048)
+    signatures = minhasher.from_shinglings(
+        [[b"A", b"B", b"C", b"D"], [b"C", b"D", b"E", b"F"]],
+    )
+    similarity = MinHasher.jaccard(signatures[0], signatures[1])
+    assert similarity == pytest.approx(1 / 3, abs=0.05)
+
+
+def test_minhasher_is_picklable():
+    """That minhashers can be sent to worker processes."""
+    minhasher = MinHasher(n_permutations=16, seed=1)
+    unpickled = pickle.loads(pickle.dumps(minhasher))  # noqa: S301
+    np.testing.assert_array_equal(
+        unpickled.from_shinglings(shinglings),
+        minhasher.from_shinglings(shinglings),
+    )
+
+
+def _shingling(*elements):
+    return [str(element).encode() for element in elements]
+
+
+def test_lsh_clusters_similar_sets():
+    """That sets of similarity above the threshold are clustered together."""
+    minhasher = MinHasher(n_permutations=128)
+    signatures = minhasher.from_shinglings(
+        [
+            _shingling(*range(100)),
+            _shingling(*range(200, 300)),
+            _shingling(*range(95)),
+            _shingling(*range(200, 290)),
+            _shingling(*range(1000, 1010)),
+        ],
+    )
+    labels = lsh_clusters(signatures, threshold=0.8)
+    assert labels.tolist() == [0, 1, 0, 1, 2]
+
+
+def test_lsh_clusters_are_transitive():
+    """That clusters are the connected components of similar sets."""
+    minhasher = MinHasher(n_permutations=128)
+    signatures = minhasher.from_shinglings(
+        [_shingling(*range(start, start + 100)) for start in (0, 5, 10, 15)],
+    )
+    labels = lsh_clusters(signatures, threshold=0.85)
+    assert labels.tolist() == [0, 0, 0, 0]
+
+
+def test_lsh_clusters_with_threshold_of_one():
+    """That only identical sets are clustered with a threshold of one."""
+    minhasher = MinHasher(n_permutations=64)
+    signatures = minhasher.from_shinglings(
+        [_shingling(*range(100)), _shingling(*range(99)), _shingling(*range(100))],
+    )
+    assert lsh_clusters(signatures, threshold=1).tolist() == [0, 1, 0]
+
+
+def test_lsh_clusters_of_no_sets():
+    """That no sets give no clusters."""
+    signatures = np.empty((0, 16), dtype=np.uint32)
+    assert lsh_clusters(signatures).tolist() == []
+
+
+def test_lsh_clusters_bands_must_divide_permutations():
+    """That the number of bands must divide the number of permutations."""
+    signatures = MinHasher(n_permutations=16).from_shinglings(shinglings)
+    with pytest.raises(ValueError, match="must divide"):
+        lsh_clusters(signatures, n_bands=3)
@@ -0,0 +1,150 @@
+import os
+import time
+
+import pytest
+
+from molflux.features import load_from_dicts, load_representation
+from molflux.features.errors import ChunkFeaturisationError
+from molflux.features.parallel import (
+    FeaturisationPool,
+    map_with_deadlines,
+    resolve_n_jobs,
+)
+
+
+@pytest.fixture(scope="module")
+def fixture_mock_representation():
+    return load_representation(name="character_count")
+
+
+def test_parallel_featurisation_matches_serial(fixture_mock_representation):
+    """That featurising over worker processes preserves the input order."""
+    representation = fixture_mock_representation
+    data = ["c" * i for i in range(50)]
+    expected = representation.featurise(data)
+    result = representation.featurise(data, n_jobs=2, chunk_size=7)
+    assert result == expected
+
+
+def test_parallel_featurisation_of_single_sample(fixture_mock_representation):
+    """That a single sample is featurised as a single-sample column."""
+    representation = fixture_mock_representation
+    result = representation.featurise("cccc", n_jobs=2)
+    assert result == {representation.tag: [4]}
+
+
+def test_parallel_featurisation_of_empty_data(fixture_mock_representation):
+    """That can featurise an empty array without starting workers."""
+    representation = fixture_mock_representation
+    assert representation.featurise([], n_jobs=2) == representation.featurise([])
+
+
+def test_parallel_featurisation_of_representations():
+    """That a collection of representations can be featurised in parallel."""
+    representations = load_from_dicts(
+        [
+            {"name": "character_count"},
+            {"name": "character_count", "config": {"tag": "other"}},
+        ],
+    )
+    data = ["c" * i for i in range(20)]
+    result = representations.featurise(data, n_jobs=2, chunk_size=3)
+    assert result == representations.featurise(data)
+    assert set(result) == {"character_count", "other"}
+
+
+def test_pool_can_be_reused(fixture_mock_representation):
+    """That a pool featurises consecutive calls with the same workers."""
+    representation = fixture_mock_representation
+    with FeaturisationPool([representation], n_jobs=2) as pool:
+        first = pool.featurise(["c", "cc"], chunk_size=1)
+        second = pool.featurise(["ccc"], chunk_size=1)
+    assert first == [{representation.tag: [1, 2]}]
+    assert second == [{representation.tag: [3]}]
+
+
+def test_failed_chunk_is_reported(fixture_mock_representation):
+    """That a failure in a worker reports the chunk of samples that failed."""
+    representation = fixture_mock_representation
+    data = ["c", "cc", None, "cccc"]
+    with pytest.raises(ChunkFeaturisationError, match=r"\[2:4\]") as excinfo:
+        representation.featurise(data, n_jobs=2, chunk_size=2)
+    assert excinfo.value.__cause__ is not None
+
+
+@pytest.mark.parametrize(
+    ["n_jobs", "expected"],
+    [(1, 1), (3, 3)],
+)
+def test_resolve_n_jobs(n_jobs, expected):
+    """That positive numbers of jobs are used as the number of workers."""
+    assert resolve_n_jobs(n_jobs) == expected
+
+
+def test_resolve_zero_n_jobs_raises():
+    """That requesting zero jobs raises."""
+    with pytest.raises(ValueError, match="n_jobs cannot be 0"):
+        resolve_n_jobs(0)
+
+
+def _sleep_for(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _raise_timeout(sample):
+    raise TimeoutError(f"gave up on {sample}")
+
+
+def _exit_worker(sample):
+    os._exit(1)
+
+
+def test_map_with_deadlines_preserves_order():
+    """That results are returned in input order."""
+    results = map_with_deadlines(_sleep_for, [0.2, 0, 0.1], n_jobs=2, timeout=10)
+    assert [result.status for result in results] == ["ok", "ok", "ok"]
+    assert [result.value for result in results] == [0.2, 0, 0.1]
+
+
+def test_map_with_deadlines_serially():
+    """That samples are processed serially without time budgets."""
+    results = map_with_deadlines(abs, [-1, "a"])
+    assert results[0].value == 1
+    assert results[1].status == "error"
+    assert "TypeError" in results[1].error
+
+
+def test_slow_sample_times_out_without_blocking_others():
+    """That a sample over its timeout is abandoned, and others still processed."""
+    start = time.monotonic()
+    results = map_with_deadlines(_sleep_for, [60, 0, 0, 0], n_jobs=1, timeout=1)
+    assert time.monotonic() - start < 30
+    assert [result.status for result in results] == ["timeout", "ok", "ok", "ok"]
+    assert results[0].elapsed >= 1
+
+
+def test_batch_timeout():
+    """That all unfinished samples time out once the batch timeout is exceeded."""
+    results = map_with_deadlines(_sleep_for, [0, 60, 60], n_jobs=1, batch_timeout=1)
+    assert [result.status for result in results] == ["ok", "timeout", "timeout"]
+    assert results[2].elapsed is None
+
+
+def test_timeout_errors_are_reported_as_timeouts():
+    """That samples raising a TimeoutError are reported as timeouts."""
+    (result,) = map_with_deadlines(_raise_timeout, ["C"])
+    assert result.status == "timeout"
+    assert result.error == "gave up on C"
+
+
+def test_exited_worker_is_reported_and_replaced():
+    """That a worker exiting is reported as an error, and replaced."""
+    results = map_with_deadlines(_exit_worker, [0, 1], n_jobs=1, timeout=30)
+    assert [result.status for result in results] == ["error", "error"]
+
+
+def test_map_with_deadlines_raises_on_invalid_timeout():
+    """That non-positive timeouts raise."""
+    with pytest.raises(ValueError, match="timeout"):
+        map_with_deadlines(abs, [1], timeout=0)
@@ -0,0 +1,173 @@
+import numpy as np
+import pytest
+
+from molflux.features import similarity
+from molflux.features.similarity import (
+    TanimotoIndex,
+    bulk_tanimoto_similarity,
+    pack_fingerprints,
+    popcount,
+    tanimoto_neighbours,
+    tanimoto_similarities,
+)
+
+
+@pytest.fixture(scope="function")
+def fixture_bits():
+    rng = np.random.default_rng(0)
+    return (rng.random((50, 100)) < 0.2).astype(np.uint8)
+
+
+def _brute_force_similarities(queries, references):
+    common = queries.astype(int) @ references.T.astype(int)
+    union = queries.sum(axis=1)[:, None] + references.sum(axis=1)[None, :] - common
+    return np.divide(common, union, out=np.ones(common.shape), where=union > 0)
+
+
+def test_pack_fingerprints_pads_to_whole_words(fixture_bits):
+    """That fingerprints are packed into zero-padded 64-bit words."""
+    words = pack_fingerprints(fixture_bits)
+    assert words.dtype == np.uint64
+    assert words.shape == (50, 2)
+
+
+def test_popcount_of_packed_fingerprints(fixture_bits):
+    """That the population count of packed fingerprints is the number of bits set."""
+    counts = popcount(pack_fingerprints(fixture_bits))
+    np.testing.assert_array_equal(counts, fixture_bits.sum(axis=1))
+
+
+def test_tanimoto_similarities(fixture_bits):
+    """That similarities match a brute force calculation."""
+    queries, references = fixture_bits[:10], fixture_bits[10:]
+    similarities = tanimoto_similarities(
+        pack_fingerprints(queries),
+        pack_fingerprints(references),
+    )
+    np.testing.assert_allclose(
+        similarities,
+        _brute_force_similarities(queries, references),
+        rtol=1e-6,
+    )
+
+
+def test_similarity_of_empty_fingerprints_is_one():
+    """That empty fingerprints have a similarity of one, as in rdkit."""
+    words = pack_fingerprints(np.array([[0, 0], [1, 0]], dtype=np.uint8))
+    assert tanimoto_similarities(words, words).tolist() == [[1, 0], [0, 1]]
+
+
+def test_double_precision_similarities(fixture_bits):
+    """That similarities are exact in double precision."""
+    queries, references = fixture_bits[:10], fixture_bits[10:]
+    similarities = tanimoto_similarities(
+        pack_fingerprints(queries),
+        pack_fingerprints(references),
+        dtype=np.float64,
+    )
+    assert similarities.dtype == np.float64
+    np.testing.assert_array_equal(
+        similarities,
+        _brute_force_similarities(queries, references),
+    )
+
+
+def test_bulk_tanimoto_similarity(fixture_bits):
+    """That the similarities of a single query are those of all queries."""
+    words = pack_fingerprints(fixture_bits)
+    expected = tanimoto_similarities(words, words, dtype=np.float64)
+    for i in (0, 7):
+        similarities = bulk_tanimoto_similarity(words[i], words)
+        assert similarities.dtype == np.float64
+        np.testing.assert_array_equal(similarities, expected[i])
+
+
+def test_bulk_tanimoto_similarity_matches_rdkit(fixture_bits):
+    """That similarities are identical to those of rdkit."""
+    DataStructs = pytest.importorskip("rdkit.DataStructs")
+    fingerprints = []
+    for row in fixture_bits:
+        fingerprint = DataStructs.ExplicitBitVect(fixture_bits.shape[1])
+        fingerprint.SetBitsFromList(np.flatnonzero(row).tolist())
+        fingerprints.append(fingerprint)
+
+    words = pack_fingerprints(fixture_bits)
+    similarities = bulk_tanimoto_similarity(words[0], words)
+    expected = DataStructs.BulkTanimotoSimilarity(fingerprints[0], fingerprints)
+    assert similarities.tolist() == expected
+
+
+@pytest.mark.parametrize("max_block_size", [1, 64, 1 << 22])
+@pytest.mark.parametrize("n_threads", [1, 3])
+def test_tanimoto_neighbours(fixture_bits, monkeypatch, max_block_size, n_threads):
+    """That all pairs of similar fingerprints are found, in blocks of any size."""
+    monkeypatch.setattr(similarity, "_MAX_BLOCK_SIZE", max_block_size)
+    similarities = _brute_force_similarities(fixture_bits, fixture_bits)
+    np.fill_diagonal(similarities, 0)
+    expected = np.where(similarities >= 0.2, similarities, 0)
+
+    neighbours = tanimoto_neighbours(
+        pack_fingerprints(fixture_bits),
+        threshold=0.2,
+        n_threads=n_threads,
+    )
+    assert neighbours.has_sorted_indices
+    np.testing.assert_array_equal(neighbours.toarray(), expected)
+
+
+def test_tanimoto_neighbours_of_no_fingerprints():
+    """That no fingerprints have no neighbours."""
+    neighbours = tanimoto_neighbours(np.empty((0, 2), dtype=np.uint64), threshold=0.5)
+    assert neighbours.shape == (0, 0)
+
+
+@pytest.mark.parametrize("max_block_size", [1, 64, 1 << 22])
+def test_search_finds_nearest_neighbours(fixture_bits, monkeypatch, max_block_size):
+    """That the k nearest neighbours are found, for any block size."""
+    monkeypatch.setattr(similarity, "_MAX_BLOCK_SIZE", max_block_size)
+    queries, references = fixture_bits[:10], fixture_bits[10:]
+    index = TanimotoIndex.from_bits(references)
+    similarities, indices = index.search(queries, k=3)
+
+    expected = _brute_force_similarities(queries, references)
+    expected_indices = np.argsort(-expected, axis=1, kind="stable")[:, :3]
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_allclose(
+        similarities,
+        np.take_along_axis(expected, expected_indices, axis=1),
+        rtol=1e-6,
+    )
+
+
+def test_search_breaks_ties_by_index():
+    """That equally similar references are returned in order of indexing."""
+    index = TanimotoIndex.from_bits(np.ones((4, 8), dtype=np.uint8))
+    _, indices = index.search(np.ones((1, 8), dtype=np.uint8), k=3)
+    assert indices.tolist() == [[0, 1, 2]]
+
+
+def test_search_pads_missing_neighbours(fixture_bits):
+    """That missing neighbours are padded if k exceeds the number of references."""
+    index = TanimotoIndex.from_bits(fixture_bits[:2])
+    similarities, indices = index.search(fixture_bits[:1], k=4)
+    assert indices[0, 2:].tolist() == [-1, -1]
+    assert np.isnan(similarities[0, 2:]).all()
+
+
+def test_search_raises_on_wrong_number_of_bits(fixture_bits):
+    """That queries of a different number of bits raise."""
+    index = TanimotoIndex.from_bits(fixture_bits)
+    with pytest.raises(ValueError, match="100 bits"):
+        index.search(fixture_bits[:, :64])
+
+
+def test_save_and_load(fixture_bits, tmp_path):
+    """That indices are saved and loaded with their metadata."""
+    path = str(tmp_path / "index.npz")
+    index = TanimotoIndex.from_bits(fixture_bits, metadata={"radius": 2})
+    index.save(path)
+
+    loaded = TanimotoIndex.load(path)
+    assert loaded.n_bits == 100
+    assert loaded.metadata == {"radius": 2}
+    np.testing.assert_array_equal(loaded.words, index.words)
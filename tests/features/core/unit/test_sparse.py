@@ -0,0 +1,116 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from molflux.features import load_representation
+from molflux.features.sparse import SparseVocabulary, to_csr_matrix
+
+
+@pytest.fixture(scope="function")
+def fixture_sparse_fingerprints():
+    indices = [
+        np.array([3, 70000], dtype=np.uint32),
+        np.array([], dtype=np.uint32),
+        np.array([3, 9, 12], dtype=np.uint32),
+    ]
+    counts = [
+        np.array([1, 4], dtype=np.uint16),
+        np.array([], dtype=np.uint16),
+        np.array([2, 1, 1], dtype=np.uint16),
+    ]
+    return indices, counts
+
+
+def test_to_csr_matrix_from_arrays(fixture_sparse_fingerprints):
+    """That sparse fingerprints are assembled into a CSR matrix."""
+    indices, counts = fixture_sparse_fingerprints
+    matrix = to_csr_matrix(indices, counts)
+    assert matrix.shape == (3, 2**32)
+    assert matrix[0, 70000] == 4
+    assert matrix[2, 3] == 2
+    assert matrix[1].nnz == 0
+    assert matrix.nnz == 5
+
+
+def test_to_csr_matrix_from_arrow_matches_arrays(fixture_sparse_fingerprints):
+    """That arrow list columns give the same matrix as arrays, also if sliced."""
+    indices, counts = fixture_sparse_fingerprints
+    arrow_indices = pa.array(indices, type=pa.list_(pa.uint32()))
+    arrow_counts = pa.array(counts, type=pa.list_(pa.uint16()))
+
+    expected = to_csr_matrix(indices, counts, n_features=2**17)
+    matrix = to_csr_matrix(
+        pa.chunked_array([arrow_indices]),
+        pa.chunked_array([arrow_counts]),
+        n_features=2**17,
+    )
+    assert (matrix != expected).nnz == 0
+
+    sliced = to_csr_matrix(
+        arrow_indices.slice(1),
+        arrow_counts.slice(1),
+        n_features=2**17,
+    )
+    assert (sliced != expected[1:]).nnz == 0
+
+
+def test_to_csr_matrix_mismatched_layouts_raises(fixture_sparse_fingerprints):
+    """That indices and counts of different layouts raise an error."""
+    indices, counts = fixture_sparse_fingerprints
+    with pytest.raises(ValueError, match="same layout"):
+        to_csr_matrix(indices, counts[::-1])
+
+
+def test_to_csr_matrix_of_64_bit_hashes():
+    """That the 64-bit hashes of unfolded torsion fingerprints give a valid matrix."""
+    representation = load_representation(name="topological_torsion_unfolded")
+    tag = representation.tag
+    fingerprints = representation.featurise(
+        ["CCCCO", "c1ccccc1CCN"],
+        output_format="sparse",
+    )
+    indices = fingerprints[f"{tag}::indices"]
+    counts = fingerprints[f"{tag}::counts"]
+    assert max(row.max() for row in indices) >= 2**32
+
+    matrix = to_csr_matrix(indices, counts)
+    matrix.check_format(full_check=True)
+    assert matrix.shape == (2, 2**63 - 1)
+    for i, (row_indices, row_counts) in enumerate(zip(indices, counts, strict=True)):
+        assert matrix[i].indices.tolist() == row_indices.tolist()
+        assert matrix[i].data.tolist() == row_counts.tolist()
+
+
+def test_to_csr_matrix_out_of_range_hashes_raises(fixture_sparse_fingerprints):
+    """That hashes beyond the columns of the matrix raise an error."""
+    indices, counts = fixture_sparse_fingerprints
+    with pytest.raises(ValueError, match="range"):
+        to_csr_matrix(indices, counts, n_features=2**16)
+
+
+def test_vocabulary_maps_hashes_to_columns(fixture_sparse_fingerprints):
+    """That a vocabulary maps observed hashes to contiguous columns."""
+    indices, counts = fixture_sparse_fingerprints
+    vocabulary = SparseVocabulary().fit(indices)
+    assert len(vocabulary) == 4
+    matrix = vocabulary.transform(indices, counts)
+    assert matrix.toarray().tolist() == [
+        [1, 0, 0, 4],
+        [0, 0, 0, 0],
+        [2, 1, 1, 0],
+    ]
+
+
+def test_vocabulary_min_frequency_and_max_features(fixture_sparse_fingerprints):
+    """That infrequent hashes are dropped from the vocabulary."""
+    indices, _ = fixture_sparse_fingerprints
+    assert SparseVocabulary().fit(indices, min_frequency=2).hashes.tolist() == [3]
+    assert SparseVocabulary().fit(indices, max_features=2).hashes.tolist() == [3, 9]
+
+
+def test_vocabulary_drops_unknown_hashes(fixture_sparse_fingerprints):
+    """That hashes not in the vocabulary are dropped on transform."""
+    indices, counts = fixture_sparse_fingerprints
+    vocabulary = SparseVocabulary().fit(indices[:1])
+    matrix = vocabulary.transform(indices, counts)
+    assert matrix.toarray().tolist() == [[1, 4], [0, 0], [2, 0]]
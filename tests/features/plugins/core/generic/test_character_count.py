@@ -0,0 +1,49 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from molflux.features import Representation, list_representations, load_representation
+from molflux.features.representations.core.generic.character_count import (
+    CharacterCount,
+)
+
+representation_name = "character_count"
+
+
+@pytest.fixture(scope="function")
+def fixture_representation() -> Representation:
+    return load_representation(representation_name)
+
+
+def test_representation_in_catalogue():
+    """That the representation is registered in the catalogue."""
+    catalogue = list_representations()
+    all_representation_names = [name for names in catalogue.values() for name in names]
+    assert representation_name in all_representation_names
+
+
+def test_representation_is_mapped_to_correct_class(fixture_representation):
+    """That the catalogue name is mapped to the appropriate class."""
+    representation = fixture_representation
+    assert isinstance(representation, CharacterCount)
+
+
+@pytest.mark.parametrize(
+    "samples",
+    [
+        ["CCO", "c1ccccc1", "[H]C"],
+        pa.array(["CCO", "c1ccccc1", "[H]C"]),
+        pa.chunked_array([["CCO"], ["c1ccccc1", "[H]C"]]),
+        np.array(["CCO", "c1ccccc1", "[H]C"]),
+    ],
+)
+@pytest.mark.parametrize("without_hs", [False, True])
+def test_columnar_inputs_match_lists(fixture_representation, samples, without_hs):
+    """That Arrow and NumPy columns are counted as lists of strings are."""
+    representation = fixture_representation
+    expected = representation.featurise(
+        ["CCO", "c1ccccc1", "[H]C"],
+        without_hs=without_hs,
+    )
+    result = representation.featurise(samples, without_hs=without_hs)
+    assert list(result[representation_name]) == expected[representation_name]
@@ -1,3 +1,5 @@
+import numpy as np
+import pyarrow as pa
 import pytest
 
 from molflux.features import Representation, list_representations, load_representation
@@ -50,3 +52,45 @@ def test_enumerate_fingerprints(fixture_representation):
     expected_results = [[1, 1, 1, 1], [0, 1, 1, 1], [0, 0, 1, 1], [0, 0, 0, 1]]
     for actual, expected in zip(results.values(), expected_results, strict=False):
         assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "samples",
+    [
+        pa.array([[1, 0, 0], [1, 1, 0]], type=pa.list_(pa.uint8(), 3)),
+        pa.array([[1, 0, 0], [1, 1, 0]], type=pa.list_(pa.uint8())),
+        pa.chunked_array([[[1, 0, 0]], [[1, 1, 0]]], type=pa.list_(pa.uint8(), 3)),
+        np.array([[1, 0, 0], [1, 1, 0]], dtype=np.uint8),
+    ],
+)
+def test_columnar_inputs(fixture_representation, samples):
+    """That Arrow list arrays and NumPy matrices are exploded into NumPy columns."""
+    representation = fixture_representation
+    results = representation.featurise(samples)
+    assert list(results) == ["exploded::0", "exploded::1", "exploded::2"]
+    for actual, expected in zip(
+        results.values(),
+        [[1, 1], [0, 1], [0, 0]],
+        strict=True,
+    ):
+        assert isinstance(actual, np.ndarray)
+        assert actual.tolist() == expected
+
+
+def test_sliced_fixed_size_list_array(fixture_representation):
+    """That sliced Arrow fixed-size list arrays are exploded from their offset."""
+    representation = fixture_representation
+    samples = pa.array([[1, 2], [3, 4], [5, 6]], type=pa.list_(pa.int64(), 2))
+    results = representation.featurise(samples.slice(1, 2))
+    assert results["exploded::0"].tolist() == [3, 5]
+    assert results["exploded::1"].tolist() == [4, 6]
+
+
+def test_variable_length_list_array_is_truncated(fixture_representation):
+    """That Arrow list arrays are exploded up to their shortest sample."""
+    representation = fixture_representation
+    results = representation.featurise(pa.array([[1, 2, 3], [4, 5]]))
+    assert {k: v.tolist() for k, v in results.items()} == {
+        "exploded::0": [1, 4],
+        "exploded::1": [2, 5],
+    }
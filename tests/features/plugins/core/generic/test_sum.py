@@ -1,3 +1,5 @@
+import numpy as np
+import pyarrow as pa
 import pytest
 
 from molflux.features import Representation, list_representations, load_representation
@@ -86,3 +88,32 @@ def test_sum_features(fixture_representation, columns, expected_output_column):
 
     # check that the expected sums match
     assert expected_output_column == results[fixture_representation.tag]
+
+
+def test_sum_columnar_features(fixture_representation):
+    """That Arrow and NumPy columns are added elementwise into a NumPy column."""
+    representation = fixture_representation
+    columns = [
+        pa.chunked_array([[1, 2], [3]]),
+        np.array([10, 20, 30]),
+        [100, 200, 300],
+    ]
+    result = representation.featurise(*columns)
+    assert isinstance(result[representation_name], np.ndarray)
+    assert result[representation_name].tolist() == [111, 222, 333]
+
+
+def test_sum_two_dimensional_features(fixture_representation):
+    """That rows of two-dimensional NumPy columns are added as vectors."""
+    representation = fixture_representation
+    columns = [np.array([[1, 2], [3, 4]]), np.array([[1, 2], [3, 4]])]
+    result = representation.featurise(*columns)
+    assert [row.tolist() for row in result[representation_name]] == [[2, 4], [6, 8]]
+
+
+def test_sum_integer_overflow_raises(fixture_representation):
+    """That integer overflows of columnar features raise instead of wrapping around."""
+    representation = fixture_representation
+    columns = [np.array([2**62], dtype=np.int64), np.array([2**62], dtype=np.int64)]
+    with pytest.raises(pa.ArrowInvalid, match="overflow"):
+        representation.featurise(*columns)
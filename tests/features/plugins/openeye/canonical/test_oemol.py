@@ -80,3 +80,12 @@ def test_with_tautomer_options(
 
     assert representation_name in result
     assert result[representation_name] == expected_result
+
+
+def test_with_n_workers_matches_serial(fixture_representation):
+    """That canonicalising over worker processes gives the same molecules, in order."""
+    representation = fixture_representation
+    samples = ["OCC", "c1ccccc1C", "C(=O)O", "CCCC"]
+    expected_result = representation.featurise(samples)
+    result = representation.featurise(samples, n_workers=2, timeout=60)
+    assert result == expected_result
@@ -311,3 +311,28 @@ def test_with_tautomer_timeouts(
 
     assert representation_name in result
     assert result[representation_name] == expected_result
+
+
+def test_with_n_workers_matches_serial(fixture_representation):
+    """That canonicalising over worker processes preserves the input order."""
+    representation = fixture_representation
+    samples = ["OCC", "c1ccccc1C", "C(=O)O", "CCCC"]
+    expected_result = representation.featurise(samples)
+    result = representation.featurise(samples, n_workers=2, timeout=60)
+    assert result == expected_result
+
+
+def test_with_batch_timeout(fixture_representation):
+    """That molecules not canonicalised within the batch timeout are featurised as None."""
+    representation = fixture_representation
+    samples = ["OCC", "c1ccccc1C"]
+    result = representation.featurise(samples, batch_timeout=1e-6)
+    assert result[representation_name] == [None, None]
+
+
+def test_with_timeout_and_invalid_sample_raises(fixture_representation):
+    """That canonicalisation errors are raised when canonicalising within a timeout."""
+    representation = fixture_representation
+    samples = ["OCC", "not a molecule"]
+    with pytest.raises(FeaturisationError):
+        representation.featurise(samples, timeout=60)
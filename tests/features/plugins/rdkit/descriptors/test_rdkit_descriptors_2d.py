@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import numpy as np
 import pytest
 import rdkit
 
 from molflux.features import Representation, list_representations, load_representation
 from molflux.features.errors import FeaturisationError
+from molflux.features.info import FeatureSchema
 from molflux.features.representations.rdkit.descriptors.rdkit_descriptors_2d import (
     RdkitDescriptors_2d,
     list_available_rdkit_descriptors_2d,
@@ -205,6 +207,89 @@ def test_ordered_results(fixture_representation):
     assert list(result_a.keys()) == list(result_b.keys())[::-1]
 
 
+def test_output_schema_matches_featurised_outputs(fixture_representation):
+    """That the declared output schema lists the calculated descriptors in order."""
+    representation = fixture_representation
+    samples = ["c1ccccc1"]
+    include = ["MaxEStateIndex", "qed", "MolWt"]
+
+    result = representation.featurise(samples, include=include)
+    schema = representation.output_schema(include=include)
+
+    assert list(schema) == list(result)
+    assert all(
+        feature_schema == FeatureSchema(dtype="float64")
+        for feature_schema in schema.values()
+    )
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+def test_numpy_dtype(fixture_representation, dtype):
+    """That descriptors can be calculated as NumPy columns of a given dtype."""
+    representation = fixture_representation
+    samples = ["COc1cc2c(cc1OCCCN3CCOCC3)c(ncn2)Sc4nccs4", "c1ccccc1"]
+    include = ["MolWt", "qed"]
+
+    expected = representation.featurise(samples, include=include)
+    result = representation.featurise(samples, include=include, dtype=dtype)
+    schema = representation.output_schema(include=include, dtype=dtype)
+
+    for name, values in result.items():
+        assert values.dtype == np.dtype(dtype)
+        assert schema[name] == FeatureSchema(dtype=dtype)
+        np.testing.assert_array_equal(values, np.array(expected[name], dtype=dtype))
+
+
+def test_fast_preset_excludes_expensive_descriptors(fixture_representation):
+    """That the fast preset calculates all but the most expensive descriptors."""
+    representation = fixture_representation
+    samples = ["c1ccccc1"]
+    result = representation.featurise(samples, preset="fast")
+
+    fast = list_available_rdkit_descriptors_2d(preset="fast")
+    assert [name.split("::")[-1] for name in result] == fast
+    assert "qed" not in fast
+    assert "Ipc" not in fast
+    assert "MolWt" in fast
+    assert len(fast) < _EXPECTED_NUM_2D_DESCRIPTORS
+
+
+def test_fast_preset_values_match_all_preset(fixture_representation):
+    """That descriptors calculated with the fast preset match all descriptors."""
+    representation = fixture_representation
+    samples = ["COc1cc2c(cc1OCCCN3CCOCC3)c(ncn2)Sc4nccs4", "c1ccccc1"]
+    result_all = representation.featurise(samples)
+    result_fast = representation.featurise(samples, preset="fast")
+
+    for name, values in result_fast.items():
+        np.testing.assert_array_equal(values, result_all[name])
+
+
+def test_estate_descriptors_match_rdkit(fixture_representation):
+    """That EState index descriptors, calculated together, match rdkit's."""
+    representation = fixture_representation
+    samples = ["COc1cc2c(cc1OCCCN3CCOCC3)c(ncn2)Sc4nccs4", "c1ccccc1"]
+    include = [
+        "MaxAbsEStateIndex",
+        "MaxEStateIndex",
+        "MinAbsEStateIndex",
+        "MinEStateIndex",
+    ]
+    result = representation.featurise(samples, include=include)
+
+    for name in include:
+        function = getattr(rdkit.Chem.Descriptors, name)
+        expected = [function(rdkit.Chem.MolFromSmiles(sample)) for sample in samples]
+        assert result[f"rdkit_descriptors_2d::{name}"] == expected
+
+
+def test_unknown_preset_raises(fixture_representation):
+    """That an error is raised if requesting an unknown preset."""
+    representation = fixture_representation
+    with pytest.raises(ValueError, match="Unknown descriptors preset"):
+        representation.featurise(["c1ccccc1"], preset="slow")
+
+
 @pytest.mark.parametrize(
     ["samples", "index_problematic"],
     [(["CC", "Cc1c(c2ncc(c(n2n1)C(=O)NC3CC(C3)(F)F)N$C)C(=O)N"], 1)],  # MLOPS-991
@@ -2,6 +2,7 @@ import pytest
 
 from molflux.features import Representation, list_representations, load_representation
 from molflux.features.representations.rdkit.fingerprints.maccs import MACCSRdkit
+from molflux.features.utils import unpack_fingerprints
 
 representation_name = "maccs_rdkit"
 
@@ -580,3 +581,15 @@ def test_batch_compute(fixture_representation):
     ]
     assert representation_name in result
     assert result[representation_name] == expected_result
+
+
+def test_packed_output_format(fixture_representation):
+    """That packed MACCS keys unpack to the default bit lists."""
+    representation = fixture_representation
+    samples = ["CCCC", "c1ccccc1"]
+    bits = representation.featurise(samples)[representation_name]
+    packed = representation.featurise(samples, output_format="packed")[
+        representation_name
+    ]
+    assert all(len(fingerprint) == 21 for fingerprint in packed)
+    assert unpack_fingerprints(packed, n_bits=166).tolist() == bits
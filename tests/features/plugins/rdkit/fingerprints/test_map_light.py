@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from molflux.features import Representation, list_representations, load_representation
@@ -7769,3 +7770,25 @@ def test_batch_compute(fixture_representation):
 
     assert representation_name in result
     assert result[representation_name] == expected_result
+
+
+def test_numpy_dtype(fixture_representation):
+    """That features are returned as a matrix of the requested dtype."""
+    representation = fixture_representation
+    samples = ["c1ccccc1", "CC(=O)Oc1ccccc1C(=O)O"]
+    default = representation.featurise(samples)[representation_name]
+    double = representation.featurise(samples, dtype="float64")[representation_name]
+    single = representation.featurise(samples, dtype="float32")[representation_name]
+    assert double.dtype == np.float64
+    assert double.shape == (2, MapLight.OUTPUT_SIZE)
+    assert double.tolist() == default
+    assert single.dtype == np.float32
+    np.testing.assert_array_equal(single, double.astype(np.float32))
+
+
+def test_output_schema_dtype(fixture_representation):
+    """That the output schema declares the requested dtype."""
+    representation = fixture_representation
+    assert representation.output_schema()[representation_name].dtype == "float64"
+    schema = representation.output_schema(dtype="float32")
+    assert schema[representation_name].dtype == "float32"
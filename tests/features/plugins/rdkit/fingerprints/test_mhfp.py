@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from molflux.features import Representation, list_representations, load_representation
@@ -74,3 +75,28 @@ def test_default_compute(fixture_representation):
     expected_result = [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
     assert "mhfp" in result
     assert result["mhfp"] == [expected_result]
+
+
+def test_batch_compute_matches_mhfp_encoder(fixture_representation):
+    """That batched fingerprints match those of the reference MHFP encoder."""
+    from mhfp.encoder import MHFPEncoder
+
+    representation = fixture_representation
+    samples = ["c1ccccc1", "CCO", "", "CC(=O)Oc1ccccc1C(=O)O"]
+    result = representation.featurise(samples, length=256)
+    expected = [
+        MHFPEncoder.secfp_from_smiles(sample, length=256, sanitize=True).tolist()
+        for sample in samples
+    ]
+    assert result[representation_name] == expected
+
+
+def test_numpy_output_format(fixture_representation):
+    """That fingerprints can be returned as a uint8 matrix."""
+    representation = fixture_representation
+    samples = ["c1ccccc1", "CCO"]
+    bits = representation.featurise(samples, length=64)[representation_name]
+    result = representation.featurise(samples, length=64, output_format="numpy")
+    matrix = result[representation_name]
+    assert matrix.dtype == np.uint8
+    assert matrix.tolist() == bits
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from molflux.features import Representation, list_representations, load_representation
@@ -77,4 +78,28 @@ def test_default_compute(fixture_representation):
         147129299,
     ]
     assert "mhfp_unfolded" in result
-    assert result["mhfp_unfolded"] == [expected_result]
+    assert result["mhfp_unfolded"].tolist() == [expected_result]
+
+
+def test_signatures_match_mhfp_encoder(fixture_representation):
+    """That batched signatures match those of the reference MHFP encoder."""
+    from mhfp.encoder import MHFPEncoder
+
+    representation = fixture_representation
+    samples = ["c1ccccc1", "CCO", "CC(=O)Oc1ccccc1C(=O)O"]
+    result = representation.featurise(samples, n_permutations=64, seed=7)
+    signatures = result[representation_name]
+    assert signatures.dtype == np.uint32
+    assert signatures.shape == (3, 64)
+
+    encoder = MHFPEncoder(n_permutations=64, seed=7)
+    for sample, signature in zip(samples, signatures, strict=True):
+        assert signature.tolist() == encoder.encode(sample, sanitize=True).tolist()
+
+
+def test_output_schema(fixture_representation):
+    """That the output schema declares signatures of n_permutations values."""
+    representation = fixture_representation
+    schema = representation.output_schema(n_permutations=16)
+    assert schema[representation_name].dtype == "uint32"
+    assert schema[representation_name].length == 16
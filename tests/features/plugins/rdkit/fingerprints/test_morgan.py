@@ -1,7 +1,11 @@
+import numpy as np
 import pytest
 
 from molflux.features import Representation, list_representations, load_representation
+from molflux.features.cache import FeaturisationCache
+from molflux.features.info import FeatureSchema
 from molflux.features.representations.rdkit.fingerprints.morgan import Morgan
+from molflux.features.utils import unpack_fingerprints
 
 representation_name = "morgan"
 
@@ -70,3 +74,75 @@ def test_default_compute(fixture_representation):
     samples = ["CCCC"]
     result = representation.featurise(samples, n_bits=12)
     assert result["morgan"] == [[1, 0, 0, 0, 1, 0, 0, 0, 0, 1, 1, 0]]
+
+
+def test_packed_output_format(fixture_representation):
+    """That packed fingerprints unpack to the default bit lists."""
+    representation = fixture_representation
+    samples = ["CCCC", "c1ccccc1", ""]
+    bits = representation.featurise(samples, n_bits=12)[representation_name]
+    result = representation.featurise(samples, n_bits=12, output_format="packed")
+    packed = result[representation_name]
+    assert all(isinstance(fingerprint, bytes) for fingerprint in packed)
+    assert all(len(fingerprint) == 2 for fingerprint in packed)
+    assert unpack_fingerprints(packed, n_bits=12).tolist() == bits
+
+
+def test_numpy_output_format(fixture_representation):
+    """That numpy fingerprints are returned as a uint8 matrix."""
+    representation = fixture_representation
+    samples = ["CCCC", "c1ccccc1"]
+    bits = representation.featurise(samples, n_bits=64)[representation_name]
+    result = representation.featurise(samples, n_bits=64, output_format="numpy")
+    matrix = result[representation_name]
+    assert isinstance(matrix, np.ndarray)
+    assert matrix.dtype == np.uint8
+    assert matrix.shape == (2, 64)
+    assert matrix.tolist() == bits
+
+
+def test_invalid_output_format_raises(fixture_representation):
+    """That an unknown output format raises an informative error."""
+    representation = fixture_representation
+    with pytest.raises(ValueError, match="Unsupported fingerprint output format"):
+        representation.featurise(["CCCC"], output_format="sparse")
+
+
+@pytest.mark.parametrize("output_format", ["bits", "packed", "numpy"])
+def test_output_schema_matches_featurised_outputs(
+    fixture_representation,
+    output_format,
+):
+    """That the declared output schema matches the generated fingerprints."""
+    representation = fixture_representation
+    result = representation.featurise(
+        ["CCCC"],
+        n_bits=64,
+        output_format=output_format,
+    )
+    schema = representation.output_schema(n_bits=64, output_format=output_format)
+    assert list(schema) == list(result)
+    if output_format == "packed":
+        assert schema[representation_name] == FeatureSchema(dtype="binary")
+    else:
+        assert schema[representation_name] == FeatureSchema(dtype="uint8", length=64)
+
+
+def test_numpy_output_format_is_cached(fixture_representation, tmp_path):
+    """That cached numpy fingerprints are returned as a uint8 matrix."""
+    representation = fixture_representation
+    samples = ["CCCC", "c1ccccc1"]
+    expected = representation.featurise(samples, n_bits=64, output_format="numpy")
+    with FeaturisationCache(tmp_path / "cache.sqlite") as cache:
+        for _ in range(2):
+            result = representation.featurise(
+                samples,
+                n_bits=64,
+                output_format="numpy",
+                cache=cache,
+            )
+            matrix = result[representation_name]
+            assert isinstance(matrix, np.ndarray)
+            assert matrix.dtype == np.uint8
+            assert np.array_equal(matrix, expected[representation_name])
+        assert cache.hits == 2
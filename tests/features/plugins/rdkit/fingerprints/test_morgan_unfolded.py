@@ -30,3 +30,45 @@ def test_implements_protocol(fixture_representation):
     """That the representation implements the public Representation protocol."""
     representation = fixture_representation
     assert isinstance(representation, Representation)
+
+
+def test_sparse_output_format_matches_dict(fixture_representation):
+    """That sparse fingerprints hold the same elements as dictionaries."""
+    representation = fixture_representation
+    samples = ["CCO", "c1ccccc1"]
+    dicts = representation.featurise(samples)[representation_name]
+    sparse = representation.featurise(samples, output_format="sparse")
+
+    indices = sparse[f"{representation_name}::indices"]
+    counts = sparse[f"{representation_name}::counts"]
+    for expected, sample_indices, sample_counts in zip(
+        dicts,
+        indices,
+        counts,
+        strict=True,
+    ):
+        assert list(sample_indices) == sorted(sample_indices)
+        assert {
+            str(k): v
+            for k, v in zip(
+                sample_indices,
+                sample_counts,
+                strict=True,
+            )
+        } == expected
+
+
+def test_sparse_output_schema(fixture_representation):
+    """That sparse fingerprints declare variable-length features."""
+    representation = fixture_representation
+    schema = representation.output_schema(output_format="sparse")
+    assert schema is not None
+    assert schema[f"{representation_name}::indices"].length == -1
+    assert representation.output_schema() is None
+
+
+def test_unsupported_output_format_raises(fixture_representation):
+    """That an unsupported output format raises an error."""
+    representation = fixture_representation
+    with pytest.raises(ValueError, match="Unsupported fingerprint output format"):
+        representation.featurise(["CCO"], output_format="bits")
@@ -1,6 +1,13 @@
+from hashlib import blake2b
+
+import numpy as np
 import pytest
 
 from molflux.features import Representation, list_representations, load_representation
+from molflux.features.representations.rdkit.reaction._drfp_vendored import (
+    DrfpEncoder,
+    _component_shingling,
+)
 from molflux.features.representations.rdkit.reaction.drfp import DRFP
 
 representation_name = "drfp"
@@ -67,3 +74,54 @@ def test_default_compute(fixture_representation, samples, expected_result):
     result = representation.featurise(samples, length=16)
     assert "drfp" in result
     assert result["drfp"] == expected_result
+
+
+def test_batch_compute_matches_single_compute(fixture_representation):
+    """That reactions featurised in a batch match reactions featurised one by one."""
+    representation = fixture_representation
+    samples = [
+        "CO.O.O=C(NC(=S)Nc1nc(-c2ccccc2)cs1)c1ccccc1.[Na+].[OH-]>>NC(=S)Nc1nc(-c2ccccc2)cs1",
+        "CCO.CC(=O)O>O>CC(=O)OCC",
+        "c1ccccc1Br.OB(O)c1ccccc1>[Pd]>c1ccc(-c2ccccc2)cc1",
+    ]
+    result = representation.featurise(samples, length=128)
+    expected = [
+        DrfpEncoder.encode_one(
+            sample,
+            length=128,
+            min_radius=0,
+            max_radius=3,
+            include_rings=True,
+            root_central_atom=True,
+            include_hydrogens=False,
+        )
+        for sample in samples
+    ]
+    assert result["drfp"] == expected
+
+
+def test_recurring_components_are_shingled_once(fixture_representation):
+    """That the shingling of components recurring across reactions is cached."""
+    representation = fixture_representation
+    _component_shingling.cache_clear()
+    representation.featurise(["CCO.CC(=O)O>O>CC(=O)OCC", "CCO.CCC(=O)O>O>CCC(=O)OCC"])
+    cache_info = _component_shingling.cache_info()
+    assert cache_info.hits == 2
+    assert cache_info.misses == 6
+
+
+def test_hash_matches_hexdigest():
+    """That shingles are hashed to the signed 32-bit integers of their digests."""
+    shingling = [b"C", b"[CH3][OH]", b"c1ccccc1", b"[Na+]"]
+    expected = np.array(
+        [int(blake2b(t, digest_size=4).hexdigest(), 16) for t in shingling],
+    ).astype(np.int32)
+    np.testing.assert_array_equal(DrfpEncoder.hash(shingling), expected)
+    assert DrfpEncoder.hash([]).shape == (0,)
+
+
+def test_invalid_reaction_raises(fixture_representation):
+    """That featurising a non-reaction SMILES raises an error."""
+    representation = fixture_representation
+    with pytest.raises(RuntimeError, match="CCO"):
+        representation.featurise(["CCO"])
@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+from rdkit import Chem, DataStructs
+from rdkit.Chem import rdFingerprintGenerator
+
+from molflux.features import Representation, list_representations, load_representation
+from molflux.features.info import FeatureSchema
+from molflux.features.representations.rdkit.similarity.tanimoto_knn import (
+    TanimotoKNN,
+    build_tanimoto_index,
+)
+
+representation_name = "tanimoto_knn"
+
+_REFERENCES = ["CCO", "c1ccccc1", "CCN", "CC(=O)O", "c1ccncc1", "CCCCCC"]
+_QUERIES = ["CCCO", "c1ccccc1O", "CC(=O)N"]
+
+
+@pytest.fixture(scope="function")
+def fixture_representation() -> Representation:
+    return load_representation(representation_name)
+
+
+def test_representation_in_catalogue():
+    """That the representation is registered in the catalogue."""
+    catalogue = list_representations()
+    all_representation_names = [name for names in catalogue.values() for name in names]
+    assert representation_name in all_representation_names
+
+
+def test_representation_is_mapped_to_correct_class(fixture_representation):
+    """That the catalogue name is mapped to the appropriate class."""
+    representation = fixture_representation
+    assert isinstance(representation, TanimotoKNN)
+
+
+def test_implements_protocol(fixture_representation):
+    """That the representation implements the public Representation protocol."""
+    representation = fixture_representation
+    assert isinstance(representation, Representation)
+
+
+def test_matches_rdkit_bulk_tanimoto_similarity(fixture_representation):
+    """That nearest neighbours match those found with rdkit."""
+    representation = fixture_representation
+    representation.update_state(references=_REFERENCES)
+    result = representation.featurise(_QUERIES, k=3)
+
+    generator = rdFingerprintGenerator.GetMorganGenerator(radius=2, fpSize=2048)
+    reference_fps = [
+        generator.GetFingerprint(Chem.MolFromSmiles(s)) for s in _REFERENCES
+    ]
+    for i, query in enumerate(_QUERIES):
+        query_fp = generator.GetFingerprint(Chem.MolFromSmiles(query))
+        expected = np.array(DataStructs.BulkTanimotoSimilarity(query_fp, reference_fps))
+        expected_indices = np.argsort(-expected, kind="stable")[:3]
+        assert result["tanimoto_knn::indices"][i].tolist() == expected_indices.tolist()
+        np.testing.assert_allclose(
+            result["tanimoto_knn::similarities"][i],
+            expected[expected_indices],
+            rtol=1e-6,
+        )
+
+
+def test_raises_if_not_fitted(fixture_representation):
+    """That featurising without references raises."""
+    representation = fixture_representation
+    with pytest.raises(ValueError, match="references"):
+        representation.featurise(_QUERIES)
+
+
+def test_reference_index_is_reused(fixture_representation, monkeypatch):
+    """That the index of the references is only built once."""
+    from molflux.features.representations.rdkit.similarity import tanimoto_knn
+
+    calls = []
+
+    def build(*args, **kwargs):
+        calls.append(args)
+        return build_tanimoto_index(*args, **kwargs)
+
+    monkeypatch.setattr(tanimoto_knn, "build_tanimoto_index", build)
+    representation = fixture_representation
+    representation.update_state(references=_REFERENCES)
+    representation.featurise(_QUERIES)
+    representation.featurise(_QUERIES)
+    assert len(calls) == 1
+
+
+def test_references_are_hashed_once(fixture_representation, monkeypatch):
+    """That the references are hashed when fitted, and not on every featurisation."""
+    from molflux.features.representations.rdkit.similarity import tanimoto_knn
+
+    calls = []
+
+    def digest(references):
+        calls.append(references)
+        return tanimoto_knn._digest_sample(tuple(references))
+
+    monkeypatch.setattr(tanimoto_knn, "_digest_references", digest)
+    representation = fixture_representation
+    representation.update_state(references=_REFERENCES)
+    representation.featurise(_QUERIES)
+    representation.featurise(_QUERIES)
+    assert len(calls) == 1
+
+
+def test_reference_index_is_rebuilt_for_new_references(fixture_representation):
+    """That refitting the representation with other references rebuilds their index."""
+    representation = fixture_representation
+    representation.update_state(references=_REFERENCES)
+    representation.featurise(_QUERIES)
+    representation.update_state(references=_REFERENCES[::-1])
+    result = representation.featurise(_QUERIES, k=len(_REFERENCES))
+
+    expected = load_representation(representation_name).featurise(
+        _QUERIES,
+        references=_REFERENCES[::-1],
+        k=len(_REFERENCES),
+    )
+    for name, values in expected.items():
+        np.testing.assert_array_equal(result[name], values)
+
+
+def test_saved_index(fixture_representation, tmp_path):
+    """That featurising with a saved index matches featurising with references."""
+    path = str(tmp_path / "index.npz")
+    build_tanimoto_index(_REFERENCES, radius=1, n_bits=512).save(path)
+
+    representation = fixture_representation
+    result = representation.featurise(_QUERIES, index_path=path)
+    expected = representation.featurise(
+        _QUERIES,
+        references=_REFERENCES,
+        radius=1,
+        n_bits=512,
+    )
+    for name, values in expected.items():
+        np.testing.assert_array_equal(result[name], values)
+
+
+def test_overwritten_saved_index_is_reloaded(fixture_representation, tmp_path):
+    """That featurising with an overwritten index uses its new contents."""
+    path = str(tmp_path / "index.npz")
+    build_tanimoto_index(_REFERENCES).save(path)
+
+    representation = fixture_representation
+    representation.update_state(index_path=path)
+    representation.featurise(_QUERIES)
+
+    build_tanimoto_index(_REFERENCES[:2]).save(path)
+    result = representation.featurise(_QUERIES, k=3)
+    assert (result["tanimoto_knn::indices"][:, 2] == -1).all()
+
+
+def test_output_schema(fixture_representation):
+    """That the declared output schema matches the requested number of neighbours."""
+    representation = fixture_representation
+    assert representation.output_schema(k=2) == {
+        "tanimoto_knn::similarities": FeatureSchema("float32", 2),
+        "tanimoto_knn::indices": FeatureSchema("int64", 2),
+    }
@@ -1,11 +1,19 @@
+import numpy as np
 import pytest
-from rdkit.Chem import Mol
+from rdkit import Chem
+from rdkit.Chem import AllChem, Mol, rdFingerprintGenerator
 
+from molflux.features import load_from_dicts, load_representation
+from molflux.features.errors import FeaturisationError
+from molflux.features.representations.rdkit import _utils
 from molflux.features.representations.rdkit._utils import (
+    generate_fingerprints,
+    rdkit_mol_from_sample,
     rdkit_mol_from_smiles,
     to_rdkit_mol,
     to_smiles,
 )
+from molflux.features.utils import shared_molecules_context
 
 representation_name = "avalon"
 
@@ -85,3 +93,207 @@ def test_hex_to_oemol():
 
     out_as_smiles = to_smiles(out)
     assert out_as_smiles == "CC(=O)O"
+
+
+def test_to_rdkit_mol_is_shared_within_context():
+    """That samples are parsed only once within a shared molecules context."""
+    with shared_molecules_context():
+        mol = to_rdkit_mol("c1ccccc1")
+        assert to_rdkit_mol("c1ccccc1") is mol
+        assert to_rdkit_mol("CCC") is not mol
+
+    # contexts do not leak
+    assert to_rdkit_mol("c1ccccc1") is not mol
+
+
+def test_representations_share_parsed_molecules(monkeypatch):
+    """That a collection of representations parses each sample only once."""
+    parsed = []
+
+    def mock_parse_rdkit_mol(sample):
+        parsed.append(sample)
+        return rdkit_mol_from_smiles(sample)
+
+    monkeypatch.setattr(_utils, "_parse_rdkit_mol_via_smiles", mock_parse_rdkit_mol)
+
+    representations = load_from_dicts(
+        [{"name": "morgan"}, {"name": "maccs_rdkit"}, {"name": "toxicophores"}],
+    )
+    samples = ["c1ccccc1", "CCC"]
+    representations.featurise(samples)
+    assert parsed == samples
+
+
+def test_rdkit_mol_from_sample_is_shared_within_context():
+    """That samples parsed via their SMILES are only parsed once within a context."""
+    mol_bytes = rdkit_mol_from_smiles("c1ccccc1").ToBinary()
+    with shared_molecules_context():
+        mol = rdkit_mol_from_sample(mol_bytes)
+        assert rdkit_mol_from_sample(mol_bytes) is mol
+        # molecules used as they are are not shared with those parsed via SMILES
+        assert rdkit_mol_from_sample(mol_bytes, parse_via_smiles=False) is not mol
+
+
+@pytest.mark.parametrize(
+    ("name", "kwargs"),
+    [
+        ("morgan", {}),
+        ("maccs_rdkit", {}),
+        ("topological_torsion_unfolded", {}),
+        ("rdkit_descriptors_2d", {"include": ["MolWt", "BalabanJ", "TPSA"]}),
+    ],
+)
+def test_representations_featurise_bytes_and_smiles_identically(name, kwargs):
+    """That bytes and SMILES inputs of the same molecule give identical features."""
+    smiles = ["CC(=O)Oc1ccccc1C(=O)O", "CCO"]
+    mol_bytes = [rdkit_mol_from_smiles(sample).ToBinary() for sample in smiles]
+
+    representation = load_representation(name)
+    assert representation.featurise(mol_bytes, **kwargs) == representation.featurise(
+        smiles,
+        **kwargs,
+    )
+
+
+def test_representations_featurise_mol_inputs_via_smiles():
+    """That Chem.Mol and bytes inputs with explicit hydrogens and conformers
+    are featurised as the molecule of their SMILES, unless asked otherwise."""
+    mol = Chem.AddHs(rdkit_mol_from_smiles("CCO"))
+    AllChem.EmbedMolecule(mol, randomSeed=42)
+    mol_bytes = mol.ToBinary()
+
+    assert rdkit_mol_from_sample(mol).GetNumAtoms() == 3
+    assert rdkit_mol_from_sample(mol).GetNumConformers() == 0
+
+    representation = load_representation("morgan")
+    expected = representation.featurise(["CCO"])
+    assert representation.featurise([mol]) == expected
+    assert representation.featurise([mol_bytes]) == expected
+
+
+@pytest.mark.parametrize(
+    ("names", "presets"),
+    [
+        (
+            [
+                "atom_pair",
+                "atom_pair_unfolded",
+                "avalon",
+                "layered",
+                "maccs_rdkit",
+                "map_light",
+                "mhfp",
+                "mhfp_unfolded",
+                "morgan",
+                "morgan_unfolded",
+                "pattern",
+                "rdkit_descriptors_2d",
+                "topological",
+                "topological_torsion",
+                "topological_torsion_unfolded",
+                "toxicophores",
+            ],
+            {},
+        ),
+        (
+            [
+                "atom_pair",
+                "maccs_rdkit",
+                "map_light",
+                "morgan",
+                "rdkit_descriptors_2d",
+                "topological_torsion_unfolded",
+                "toxicophores",
+            ],
+            {"parse_via_smiles": False},
+        ),
+    ],
+)
+def test_representations_sharing_molecules_match_each_alone(names, presets):
+    """That representations featurising shared molecules give the same results
+    as each representation featurising its own molecules."""
+    mol = Chem.AddHs(rdkit_mol_from_smiles("CC(=O)Oc1ccccc1C(=O)O"))
+    AllChem.EmbedMolecule(mol, randomSeed=42)
+    samples = ["c1ccccc1O", mol.ToBinary(), rdkit_mol_from_smiles("CCN(CC)CC"), mol]
+
+    expected = {}
+    for name in names:
+        representation = load_representation(name)
+        representation.update_state(**presets)
+        expected.update(representation.featurise(samples))
+
+    representations = load_from_dicts(
+        [{"name": name, "presets": presets} for name in names],
+    )
+    np.testing.assert_equal(representations.featurise(samples), expected)
+
+
+def test_representations_featurise_mol_and_bytes_inputs_as_they_are():
+    """That Chem.Mol and bytes inputs can be featurised without losing their conformers."""
+    mol = Chem.AddHs(rdkit_mol_from_smiles("CCO"))
+    AllChem.EmbedMolecule(mol, randomSeed=42)
+    mol_bytes = mol.ToBinary()
+
+    assert to_rdkit_mol(mol) is mol
+    assert to_rdkit_mol(mol_bytes).GetNumConformers() == 1
+    assert rdkit_mol_from_sample(mol, parse_via_smiles=False) is mol
+
+    representation = load_representation("morgan")
+    from_mol = representation.featurise([mol], parse_via_smiles=False)
+    from_bytes = representation.featurise([mol_bytes], parse_via_smiles=False)
+    assert from_mol == from_bytes
+    assert from_mol != representation.featurise([mol])
+
+
+def test_bytes_without_ring_info_to_rdkit_mol():
+    """That molecules pickled without ring information have their rings perceived."""
+    mol = Chem.MolFromSmiles("C1CCCCC1O", sanitize=False)
+    mol_bytes = mol.ToBinary()
+
+    out = to_rdkit_mol(mol_bytes)
+    assert out.GetRingInfo().NumRings() == 1
+
+
+def test_generate_fingerprints_in_bulk_matches_one_at_a_time():
+    """That bulk fingerprinting matches fingerprinting molecules one at a time."""
+    generator = rdFingerprintGenerator.GetMorganGenerator(radius=2)
+    samples = ["c1ccccc1", "CCO", "CC(C)Cc1ccc(cc1)[C@@H](C)C(=O)O"]
+    expected = [
+        generator.GetSparseCountFingerprint(rdkit_mol_from_smiles(sample))
+        for sample in samples
+    ]
+
+    fingerprints = generate_fingerprints(
+        generator,
+        samples,
+        sparse_counts=True,
+        n_threads=2,
+    )
+    assert fingerprints == expected
+
+
+def test_generate_fingerprints_with_per_molecule_options():
+    """That per-molecule options are applied to each molecule."""
+    generator = rdFingerprintGenerator.GetMorganGenerator(radius=2)
+    samples = ["c1ccccc1O", "CCO"]
+    expected = [
+        generator.GetFingerprint(rdkit_mol_from_smiles(sample), fromAtoms=[0])
+        for sample in samples
+    ]
+
+    bit_info = {-1: ()}
+    fingerprints = generate_fingerprints(
+        generator,
+        samples,
+        from_atoms=[0],
+        bit_info=bit_info,
+    )
+    assert fingerprints == expected
+    assert set(bit_info) == set(fingerprints[-1].GetOnBits())
+
+
+def test_generate_fingerprints_reports_invalid_sample():
+    """That invalid samples raise a featurisation error naming the sample."""
+    generator = rdFingerprintGenerator.GetMorganGenerator(radius=2)
+    with pytest.raises(FeaturisationError, match="parrot"):
+        generate_fingerprints(generator, ["CCO", "parrot"])
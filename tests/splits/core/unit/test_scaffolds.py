@@ -0,0 +1,113 @@
+import logging
+
+from molflux.splits.scaffolds import ScaffoldIndex, bucket_scaffolds, compute_scaffolds
+
+
+def _first_letter(sample):
+    if isinstance(sample, bytes):
+        sample = sample.decode()
+    return sample[0].upper() if sample[0].isalpha() else None
+
+
+def test_bucket_scaffolds_largest_first():
+    """That samples are grouped by scaffold, from the largest to the smallest group."""
+    scaffolds = ["a", "b", "a", "c", "b", "b"]
+    assert bucket_scaffolds(scaffolds) == [[1, 4, 5], [0, 2], [3]]
+
+
+def test_bucket_scaffolds_breaks_ties_by_last_first_index():
+    """That groups of the same size are ordered by decreasing first index."""
+    scaffolds = ["a", "b", "c"]
+    assert bucket_scaffolds(scaffolds) == [[2], [1], [0]]
+
+
+def test_compute_scaffolds():
+    """That the scaffold of each sample is computed."""
+    samples = ["abc", "axy", b"bcd"]
+    scaffolds = compute_scaffolds(
+        samples,
+        scaffold=_first_letter,
+        serialise=bytes,
+        options=(),
+        scaffold_index=ScaffoldIndex(),
+    )
+    assert scaffolds == ["A", "A", "B"]
+
+
+def test_compute_scaffolds_memoises_scaffolds():
+    """That scaffolds in the index are not computed again."""
+    calls = []
+
+    def scaffold(sample):
+        calls.append(sample)
+        return _first_letter(sample)
+
+    index = ScaffoldIndex()
+    samples = ["abc", "axy", "abc"]
+    for _ in range(3):
+        scaffolds = compute_scaffolds(
+            samples,
+            scaffold=scaffold,
+            serialise=bytes,
+            options=(),
+            scaffold_index=index,
+        )
+        assert scaffolds == ["A", "A", "A"]
+
+    assert calls == ["abc", "axy"]
+    assert len(index) == 2
+
+
+def test_compute_scaffolds_keys_by_options():
+    """That the scaffolds of samples computed with other options are computed again."""
+    index = ScaffoldIndex()
+    compute_scaffolds(
+        ["abc"],
+        scaffold=_first_letter,
+        serialise=bytes,
+        options=("upper",),
+        scaffold_index=index,
+    )
+    scaffolds = compute_scaffolds(
+        ["abc"],
+        scaffold=str.lower,
+        serialise=bytes,
+        options=("lower",),
+        scaffold_index=index,
+    )
+    assert scaffolds == ["abc"]
+    assert len(index) == 2
+
+
+def test_compute_scaffolds_falls_back_to_samples(caplog):
+    """That samples without scaffolds are their own scaffolds, with a single warning."""
+    samples = ["1ab", "2cd", b"3"]
+    with caplog.at_level(logging.WARNING):
+        scaffolds = compute_scaffolds(
+            samples,
+            scaffold=_first_letter,
+            serialise=bytes,
+            options=(),
+            scaffold_index=ScaffoldIndex(),
+        )
+    assert scaffolds == ["1ab", "2cd", b"3".hex()]
+    assert len(caplog.records) == 1
+    assert "3 molecule(s)" in caplog.text
+
+
+def test_scaffold_index_evicts_least_recently_used():
+    """That the index holds at most max_size scaffolds, evicting the least recently used."""
+    index = ScaffoldIndex(max_size=2)
+    index.update([b"a", b"b"], ["A", "B"])
+    assert index.lookup([b"a"]) == ["A"]
+    index.update([b"c"], ["C"])
+    assert index.lookup([b"a", b"b", b"c"]) == ["A", None, "C"]
+
+
+def test_scaffold_index_clear():
+    """That the index can be cleared."""
+    index = ScaffoldIndex()
+    index.update([b"a"], ["A"])
+    index.clear()
+    assert len(index) == 0
+    assert index.lookup([b"a"]) == [None]
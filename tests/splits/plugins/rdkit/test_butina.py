@@ -0,0 +1,159 @@
+import numpy as np
+import pytest
+from rdkit import DataStructs
+from rdkit.ML.Cluster import Butina
+
+from molflux.features.similarity import tanimoto_neighbours
+from molflux.splits.catalogue import list_splitting_strategies
+from molflux.splits.load import load_splitting_strategy
+from molflux.splits.strategies.rdkit._utils import pack_bit_vectors
+from molflux.splits.strategies.rdkit.butina import cluster_neighbours
+from molflux.splits.strategy import SplittingStrategy
+
+strategy_name = "butina_rdkit"
+
+
+@pytest.fixture(scope="module")
+def fixture_test_strategy():
+    return load_splitting_strategy(strategy_name)
+
+
+@pytest.fixture(scope="module")
+def fixture_sample_dataset():
+    # three series of homologues, and singletons
+    return [
+        *("C" * n for n in range(12, 20)),
+        *("c1ccccc1" + "C" * n for n in range(8, 12)),
+        *("OC" + "C" * n + "O" for n in range(10, 14)),
+        "c1ccncc1",
+        "CC(=O)O",
+        "C1CCNCC1",
+        "c1ccsc1",
+    ]
+
+
+def _random_fingerprints(n_samples, n_bits, density, seed=0):
+    rng = np.random.default_rng(seed)
+    fingerprints = []
+    for _ in range(n_samples):
+        fingerprint = DataStructs.ExplicitBitVect(n_bits)
+        fingerprint.SetBitsFromList(
+            np.flatnonzero(rng.random(n_bits) < density).tolist(),
+        )
+        fingerprints.append(fingerprint)
+    return fingerprints
+
+
+def test_is_in_catalogue():
+    """That the strategy is registered in the catalogue."""
+    catalogue = list_splitting_strategies()
+    all_strategy_names = [name for names in catalogue.values() for name in names]
+    assert strategy_name in all_strategy_names
+
+
+def test_implements_protocol(fixture_test_strategy):
+    """That the strategy implements the protocol."""
+    strategy = fixture_test_strategy
+    assert isinstance(strategy, SplittingStrategy)
+
+
+@pytest.mark.parametrize(("n_bits", "threshold"), [(16, 0.5), (64, 0.3), (100, 0.25)])
+def test_clusters_match_rdkit(n_bits, threshold):
+    """That Taylor-Butina clusters are those of rdkit."""
+    fingerprints = _random_fingerprints(60, n_bits=n_bits, density=0.3)
+
+    distances = [
+        1 - similarity
+        for i in range(1, len(fingerprints))
+        for similarity in DataStructs.BulkTanimotoSimilarity(
+            fingerprints[i],
+            fingerprints[:i],
+        )
+    ]
+    expected = Butina.ClusterData(
+        distances,
+        len(fingerprints),
+        1 - threshold,
+        isDistData=True,
+    )
+
+    neighbours = tanimoto_neighbours(
+        pack_bit_vectors(fingerprints),
+        threshold=threshold,
+    )
+    labels = cluster_neighbours(neighbours)
+    clusters = [set(np.flatnonzero(labels == label)) for label in range(len(expected))]
+    assert labels.max() + 1 == len(expected)
+    assert clusters == [set(cluster) for cluster in expected]
+
+
+def test_sphere_exclusion_clusters():
+    """That sphere exclusion chooses centroids in order of index."""
+    neighbours = np.zeros((5, 5), dtype=bool)
+    for i, j in [(0, 3), (1, 2), (2, 3), (3, 4)]:
+        neighbours[i, j] = neighbours[j, i] = True
+    labels = cluster_neighbours(neighbours, method="sphere_exclusion")
+    assert labels.tolist() == [0, 1, 1, 0, 2]
+
+
+def test_unknown_clustering_method_raises():
+    """That unknown clustering methods raise."""
+    with pytest.raises(ValueError, match="Unknown clustering method"):
+        cluster_neighbours(np.zeros((2, 2)), method="k_means")
+
+
+@pytest.mark.parametrize("method", ["butina", "sphere_exclusion"])
+def test_similar_molecules_are_in_the_same_split(
+    fixture_sample_dataset,
+    fixture_test_strategy,
+    method,
+):
+    """That series of similar molecules are not spread across splits."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    for folds in strategy.split(
+        dataset=dataset,
+        y=dataset,
+        n_splits=3,
+        threshold=0.5,
+        method=method,
+        seed=0,
+    ):
+        split_of_sample = {i: split for split, fold in enumerate(folds) for i in fold}
+        assert sorted(split_of_sample) == list(range(len(dataset)))
+        for series in (range(0, 8), range(8, 12), range(12, 16)):
+            assert len({split_of_sample[i] for i in series}) == 1
+
+
+def test_group_k_fold(fixture_sample_dataset, fixture_test_strategy):
+    """That clusters can be split by group k-fold cross-validation."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    folds = list(
+        strategy.split(
+            dataset=dataset,
+            y=dataset,
+            group_strategy="group_k_fold",
+            n_splits=3,
+            threshold=0.5,
+        ),
+    )
+    assert len(folds) == 3
+    validation_indices = sorted(i for _, fold, _ in folds for i in fold)
+    assert validation_indices == list(range(len(dataset)))
+
+
+def test_unknown_group_strategy_raises(fixture_sample_dataset, fixture_test_strategy):
+    """That only group-based splitting strategies can split clusters."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    with pytest.raises(ValueError, match="Unknown group splitting strategy"):
+        next(strategy.split(dataset=dataset, y=dataset, group_strategy="k_fold"))
+
+
+def test_missing_y_raises(fixture_sample_dataset, fixture_test_strategy):
+    """That SMILES must be provided."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    with pytest.raises(ValueError, match="y parameter"):
+        next(strategy.split(dataset=dataset))
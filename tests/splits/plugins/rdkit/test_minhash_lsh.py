@@ -0,0 +1,144 @@
+import pytest
+
+from molflux.splits.catalogue import list_splitting_strategies
+from molflux.splits.load import load_splitting_strategy
+from molflux.splits.strategy import SplittingStrategy
+
+strategy_name = "minhash_lsh_rdkit"
+
+
+@pytest.fixture(scope="module")
+def fixture_test_strategy():
+    return load_splitting_strategy(strategy_name)
+
+
+@pytest.fixture(scope="module")
+def fixture_sample_dataset():
+    # three series of homologues, and singletons
+    return [
+        *("C" * n for n in range(12, 20)),
+        *("c1ccccc1" + "C" * n for n in range(8, 12)),
+        *("OC" + "C" * n + "O" for n in range(10, 14)),
+        "c1ccncc1",
+        "CC(=O)O",
+        "C1CCNCC1",
+        "c1ccsc1",
+    ]
+
+
+def test_is_in_catalogue():
+    """That the strategy is registered in the catalogue."""
+    catalogue = list_splitting_strategies()
+    all_strategy_names = [name for names in catalogue.values() for name in names]
+    assert strategy_name in all_strategy_names
+
+
+def test_implements_protocol(fixture_test_strategy):
+    """That the strategy implements the protocol."""
+    strategy = fixture_test_strategy
+    assert isinstance(strategy, SplittingStrategy)
+
+
+def test_yields_one_fold(fixture_sample_dataset, fixture_test_strategy):
+    """That the splitting strategy only yields one set of splits."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    indices = strategy.split(dataset=dataset, y=dataset)
+    assert len(list(indices)) == 1
+
+
+def test_splits_cover_dataset_without_overlap(
+    fixture_sample_dataset,
+    fixture_test_strategy,
+):
+    """That each sample is assigned to exactly one split."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    train_indices, validation_indices, test_indices = next(
+        strategy.split(dataset=dataset, y=dataset),
+    )
+    assert sorted([*train_indices, *validation_indices, *test_indices]) == list(
+        range(len(dataset)),
+    )
+
+
+def test_similar_molecules_are_in_the_same_split(
+    fixture_sample_dataset,
+    fixture_test_strategy,
+):
+    """That series of similar molecules are not spread across splits."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    folds = next(
+        strategy.split(
+            dataset=dataset,
+            y=dataset,
+            train_fraction=0.5,
+            validation_fraction=0.25,
+            test_fraction=0.25,
+            threshold=0.5,
+        ),
+    )
+    split_of_sample = {i: split for split, fold in enumerate(folds) for i in fold}
+    for series in (range(0, 8), range(8, 12), range(12, 16)):
+        assert len({split_of_sample[i] for i in series}) == 1
+
+
+def test_largest_clusters_are_in_train(fixture_sample_dataset, fixture_test_strategy):
+    """That clusters are assigned from the largest to the smallest one."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    train_indices, _, test_indices = next(
+        strategy.split(
+            dataset=dataset,
+            y=dataset,
+            train_fraction=0.5,
+            validation_fraction=0.25,
+            test_fraction=0.25,
+            threshold=0.5,
+        ),
+    )
+    assert set(range(8)) <= set(train_indices)
+    assert len(test_indices) > 0
+
+
+def test_deterministic_split(fixture_sample_dataset, fixture_test_strategy):
+    """That split results are deterministic."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    assert next(strategy.split(dataset=dataset, y=dataset)) == next(
+        strategy.split(dataset=dataset, y=dataset),
+    )
+
+
+def test_missing_y_raises(fixture_sample_dataset, fixture_test_strategy):
+    """That SMILES must be provided."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    with pytest.raises(ValueError, match="y parameter"):
+        next(strategy.split(dataset=dataset))
+
+
+def test_invalid_smiles_raise(fixture_test_strategy):
+    """That unparseable SMILES raise."""
+    dataset = ["CCO", "not a smiles"]
+    strategy = fixture_test_strategy
+    with pytest.raises(ValueError, match="Could not parse"):
+        next(strategy.split(dataset=dataset, y=dataset))
+
+
+def test_inconsistent_split_fractions_raise(
+    fixture_sample_dataset,
+    fixture_test_strategy,
+):
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    indices = strategy.split(
+        dataset=dataset,
+        y=dataset,
+        train_fraction=0.6,
+        validation_fraction=0.1,
+        test_fraction=0.1,
+    )
+    with pytest.raises(AssertionError):
+        next(indices)
@@ -1,7 +1,10 @@
 import pytest
+from rdkit import Chem
 
 from molflux.splits.catalogue import list_splitting_strategies
 from molflux.splits.load import load_splitting_strategy
+from molflux.splits.scaffolds import ScaffoldIndex
+from molflux.splits.strategies.rdkit import scaffold
 from molflux.splits.strategy import SplittingStrategy
 
 strategy_name = "scaffold_rdkit"
@@ -197,3 +200,48 @@ def test_inconsistent_split_fractions_raise(
     )
     with pytest.raises(AssertionError):
         next(indices)
+
+
+def test_mol_and_bytes_inputs(fixture_sample_dataset, fixture_test_strategy):
+    """That molecules and mol bytes are split as their SMILES."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    mols = [Chem.MolFromSmiles(smiles) for smiles in dataset]
+    mol_bytes = [mol.ToBinary() for mol in mols]
+    expected = next(strategy.split(dataset=dataset, y=dataset))
+    assert next(strategy.split(dataset=dataset, y=mols)) == expected
+    assert next(strategy.split(dataset=dataset, y=mol_bytes)) == expected
+
+
+def test_parallel_scaffolds(fixture_sample_dataset, fixture_test_strategy):
+    """That scaffolds computed over worker processes give the same splits."""
+    dataset = fixture_sample_dataset * 20
+    strategy = fixture_test_strategy
+    expected = next(strategy.split(dataset=dataset, y=dataset))
+    folds = strategy.split(
+        dataset=dataset,
+        y=dataset,
+        n_jobs=2,
+        scaffold_index=ScaffoldIndex(),
+    )
+    assert next(folds) == expected
+
+
+def test_scaffolds_are_memoised(
+    monkeypatch,
+    fixture_sample_dataset,
+    fixture_test_strategy,
+):
+    """That repeated splits of the same molecules only compute their scaffolds once."""
+    dataset = fixture_sample_dataset
+    strategy = fixture_test_strategy
+    index = ScaffoldIndex()
+    expected = next(strategy.split(dataset=dataset, y=dataset, scaffold_index=index))
+    assert len(index) == len(set(dataset))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("scaffold computed again")
+
+    monkeypatch.setattr(scaffold, "_generate_scaffold", fail)
+    folds = strategy.split(dataset=dataset, y=dataset, scaffold_index=index)
+    assert next(folds) == expected
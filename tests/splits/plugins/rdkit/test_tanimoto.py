@@ -1,7 +1,10 @@
+import numpy as np
 import pytest
+from rdkit import DataStructs
 
 from molflux.splits.catalogue import list_splitting_strategies
 from molflux.splits.load import load_splitting_strategy
+from molflux.splits.strategies.rdkit.tanimoto import _split_fingerprints
 from molflux.splits.strategy import SplittingStrategy
 
 strategy_name = "tanimoto_rdkit"
@@ -88,3 +91,76 @@ def test_inconsistent_split_fractions_raise(
     )
     with pytest.raises(AssertionError):
         next(indices)
+
+
+def _split_fingerprints_by_deletion(fps, size1, size2):
+    """The reference implementation of the fingerprint splitting algorithm."""
+    fp_in_group = [[fps[0]], []]
+    indices_in_group = ([0], [])
+    remaining_fp = fps[1:]
+    remaining_indices = list(range(1, len(fps)))
+    max_similarity_to_group = [
+        DataStructs.BulkTanimotoSimilarity(fps[0], remaining_fp),
+        [0] * len(remaining_fp),
+    ]
+    while len(remaining_fp) > 0:
+        group = 0 if len(fp_in_group[0]) / size1 <= len(fp_in_group[1]) / size2 else 1
+        i = np.argmin(max_similarity_to_group[1 - group])
+        fp = remaining_fp[i]
+        fp_in_group[group].append(fp)
+        indices_in_group[group].append(remaining_indices[i])
+        similarity = DataStructs.BulkTanimotoSimilarity(fp, remaining_fp)
+        max_similarity_to_group[group] = np.delete(
+            np.maximum(similarity, max_similarity_to_group[group]),
+            i,
+        )
+        max_similarity_to_group[1 - group] = np.delete(
+            max_similarity_to_group[1 - group],
+            i,
+        )
+        del remaining_fp[i]
+        del remaining_indices[i]
+    return indices_in_group
+
+
+def _random_fingerprints(rng, n_samples, n_bits, density):
+    fingerprints = []
+    for _ in range(n_samples):
+        fingerprint = DataStructs.ExplicitBitVect(n_bits)
+        fingerprint.SetBitsFromList(
+            np.flatnonzero(rng.random(n_bits) < density).tolist(),
+        )
+        fingerprints.append(fingerprint)
+    return fingerprints
+
+
+@pytest.mark.parametrize(
+    ("n_bits", "density"),
+    [
+        (1024, 0.05),
+        # many ties and empty fingerprints
+        (16, 0.05),
+        # fingerprints not a whole number of 64-bit words
+        (100, 0.3),
+    ],
+)
+@pytest.mark.parametrize(("size1", "size2"), [(80, 20), (50, 50), (1, 99), (99, 1)])
+def test_split_fingerprints_matches_reference(n_bits, density, size1, size2):
+    """That fingerprints are split exactly as by the reference algorithm."""
+    rng = np.random.default_rng(n_bits)
+    fingerprints = _random_fingerprints(rng, size1 + size2, n_bits, density)
+    expected = _split_fingerprints_by_deletion(fingerprints, size1, size2)
+    assert _split_fingerprints(fingerprints, size1, size2) == expected
+
+
+def test_split_single_fingerprint():
+    """That a single fingerprint is assigned to the first group."""
+    fingerprints = [DataStructs.ExplicitBitVect(8)]
+    assert _split_fingerprints(fingerprints, 1, 0) == ([0], [])
+
+
+def test_split_fingerprints_with_incompatible_sizes_raises():
+    """That the sizes of the groups must add up to the number of fingerprints."""
+    fingerprints = [DataStructs.ExplicitBitVect(8)] * 3
+    with pytest.raises(ValueError, match="Incompatible"):
+        _split_fingerprints(fingerprints, 1, 1)